@@ -12,6 +12,8 @@ from event_handler import EventHandler
 from canvas_renderer import CanvasRenderer
 from pdf_importer import PdfBackgroundLayer
 from throttle_manager import ThrottleManager
+from spatial_index import StrokeSpatialIndex
+from stroke_ids import StrokeIdIndex, get_stroke_id
 
 # Araç modüllerini import et
 from selection_tool import SelectionTool
@@ -25,6 +27,7 @@ from line_tool import LineTool
 from rectangle_tool import RectangleTool
 from circle_tool import CircleTool
 from stroke_handler import StrokeHandler
+from stroke_points import snapshot_stroke
 
 
 class LayerManager:
@@ -36,6 +39,12 @@ class LayerManager:
         self.layer_order = []
         self._id_counter = 0
         self.active_layer_id = None
+        self._spatial_indexes = {}  # layer_id -> StrokeSpatialIndex
+        self._id_indexes = {}  # layer_id -> StrokeIdIndex
+        self._visible_stroke_count = 0  # Görünür katmanlardaki stroke sayısı (+/- güncellenir)
+        self._held_stroke_changes = None  # hold_stroke_notifications ile biriken bildirimler
+        # Son undo kaydından beri değiştiği bildirilen stroke kimlikleri (None: hepsi)
+        self._changed_stroke_ids = None
         self.create_layer("Layer 1")
 
     # ------------------------------------------------------------------
@@ -71,7 +80,11 @@ class LayerManager:
 
         was_active = layer_id == self.active_layer_id
         self.layer_order.remove(layer_id)
-        self.layers.pop(layer_id, None)
+        layer = self.layers.pop(layer_id)
+        if layer['visible']:
+            self._visible_stroke_count -= len(layer['strokes'])
+        self._spatial_indexes.pop(layer_id, None)
+        self._id_indexes.pop(layer_id, None)
 
         if was_active:
             self.active_layer_id = self.layer_order[-1]
@@ -87,7 +100,7 @@ class LayerManager:
                 self.active_layer_id = layer_id
                 self.drawing_widget.selection_tool.clear_selection()
                 self.drawing_widget.activeLayerChanged.emit(layer_id)
-                self._emit_changes(update_only=False)
+                self._emit_changes(update_only=False, contents=False)
             return True
         return False
 
@@ -103,11 +116,132 @@ class LayerManager:
         return layer['strokes']
 
     def set_active_strokes(self, strokes):
+        """Aktif katmanın tüm stroke listesini (kopyalayarak) değiştir.
+
+        Tek stroke ekleme/silme/sıralama için append_stroke, insert_strokes,
+        remove_strokes, replace_strokes ve reorder_strokes kullanılmalıdır.
+        """
         layer = self.get_active_layer()
         if layer is not None:
+            old_count = len(layer['strokes'])
             layer['strokes'] = copy.deepcopy(list(strokes))
+            if layer['visible']:
+                self._visible_stroke_count += len(layer['strokes']) - old_count
+            self.mark_strokes_changed()
             self._emit_changes()
 
+    # ------------------------------------------------------------------
+    # Stroke değişiklikleri
+    # ------------------------------------------------------------------
+    def replace_strokes(self, start, count, strokes, layer_id=None, invalidate=True):
+        """Katmanda strokes[start:start + count] aralığını verilen stroke'larla değiştir
+
+        Liste yerinde düzenlenir; uzamsal indeks, sayaç ve karolar sadece
+        değişen aralık için güncellenir ve strokesChanged ile bildirilir.
+        invalidate=False ise karoları çağıran geçersiz kılar (ör. silgi).
+        Çıkarılan stroke'ları döndürür.
+        """
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        layer = self.layers.get(layer_id)
+        if layer is None:
+            return []
+        layer_strokes = layer['strokes']
+        start = max(0, min(int(start), len(layer_strokes)))
+        inserted = list(strokes)
+        removed = layer_strokes[start:start + max(0, int(count))]
+        if not removed and not inserted:
+            return []
+        layer_strokes[start:start + len(removed)] = inserted
+        self.update_stroke_range(start, removed, inserted, layer_id)
+        self.mark_strokes_changed(inserted)
+        selection_tool = getattr(self.drawing_widget, 'selection_tool', None)
+        if selection_tool is not None and layer_id == self.active_layer_id:
+            selection_tool.remap_selection(start, removed, inserted)
+        if invalidate:
+            self.drawing_widget.invalidate_canvas_strokes(removed + inserted)
+        self._notify_stroke_range(layer_id, start, len(removed), len(inserted))
+        return removed
+
+    def append_stroke(self, stroke_data, layer_id=None):
+        """Stroke'u katmanın en üstüne ekle; index'ini döndür"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        layer = self.layers.get(layer_id)
+        if layer is None:
+            return None
+        index = len(layer['strokes'])
+        self.replace_strokes(index, 0, [stroke_data], layer_id)
+        return index
+
+    def insert_strokes(self, index, strokes, layer_id=None):
+        """Stroke'ları katmanda index konumuna ekle"""
+        self.replace_strokes(index, 0, strokes, layer_id)
+
+    def remove_strokes(self, indices, layer_id=None):
+        """Verilen index'lerdeki stroke'ları kaldır; çıkarılanları sırasıyla döndür"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        layer = self.layers.get(layer_id)
+        if layer is None:
+            return []
+        total = len(layer['strokes'])
+        ordered = sorted(set(i for i in indices if 0 <= i < total), reverse=True)
+        removed = []
+        # Sondan başa ardışık blokları tek seferde kaldır (önceki index'ler kaymaz)
+        position = 0
+        while position < len(ordered):
+            end = ordered[position]
+            start = end
+            position += 1
+            while position < len(ordered) and ordered[position] == start - 1:
+                start = ordered[position]
+                position += 1
+            removed[:0] = self.replace_strokes(start, end - start + 1, [], layer_id)
+        return removed
+
+    def reorder_strokes(self, new_order, layer_id=None):
+        """Katmanı aynı stroke'ların yeni sırasıyla güncelle (z-sırası işlemleri)
+
+        Sadece sırası değişen aralık yeniden indekslenir ve bildirilir.
+        """
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        layer = self.layers.get(layer_id)
+        if layer is None:
+            return
+        current = layer['strokes']
+        if len(new_order) != len(current):
+            return
+        first = 0
+        while first < len(current) and current[first] is new_order[first]:
+            first += 1
+        if first == len(current):
+            return
+        last = len(current)
+        while current[last - 1] is new_order[last - 1]:
+            last -= 1
+        self.replace_strokes(first, last - first, new_order[first:last], layer_id)
+
+    def hold_stroke_notifications(self):
+        """strokesChanged bildirimlerini release_stroke_notifications'a kadar biriktir"""
+        if self._held_stroke_changes is None:
+            self._held_stroke_changes = []
+
+    def release_stroke_notifications(self):
+        """Biriken strokesChanged bildirimlerini sırasıyla gönder"""
+        changes = self._held_stroke_changes
+        self._held_stroke_changes = None
+        for change in changes or ():
+            self.drawing_widget.strokesChanged.emit(*change)
+
+    def _notify_stroke_range(self, layer_id, start, removed, inserted):
+        change = (layer_id, start, removed, inserted)
+        if self._held_stroke_changes is not None:
+            self._held_stroke_changes.append(change)
+        else:
+            self.drawing_widget.strokesChanged.emit(*change)
+
     def iter_layers(self):
         for layer_id in self.layer_order:
             layer = self.layers[layer_id]
@@ -124,18 +258,23 @@ class LayerManager:
 
     def set_layer_visibility(self, layer_id, visible):
         if layer_id in self.layers:
-            self.layers[layer_id]['visible'] = bool(visible)
+            layer = self.layers[layer_id]
+            visible = bool(visible)
+            if layer['visible'] != visible:
+                count = len(layer['strokes'])
+                self._visible_stroke_count += count if visible else -count
+            layer['visible'] = visible
             self._emit_changes()
 
     def set_layer_locked(self, layer_id, locked):
         if layer_id in self.layers:
             self.layers[layer_id]['locked'] = bool(locked)
-            self._emit_changes()
+            self._emit_changes(contents=False)
 
     def rename_layer(self, layer_id, name):
         if layer_id in self.layers:
             self.layers[layer_id]['name'] = name
-            self._emit_changes()
+            self._emit_changes(contents=False)
 
     def move_layer(self, layer_id, new_index):
         if layer_id not in self.layers:
@@ -152,9 +291,28 @@ class LayerManager:
     def clear_all(self):
         for layer in self.layers.values():
             layer['strokes'].clear()
+        self._visible_stroke_count = 0
         self._emit_changes()
 
-    def export_state(self):
+    def mark_strokes_changed(self, strokes=None):
+        """Stroke'ların yerinde değiştiğini undo kaydı için bildir (None: hepsi)"""
+        if strokes is None:
+            self._changed_stroke_ids = None
+        elif self._changed_stroke_ids is not None:
+            self._changed_stroke_ids.update(
+                stroke_id for stroke_id in map(get_stroke_id, strokes) if stroke_id is not None
+            )
+
+    def take_changed_stroke_ids(self, reset=True):
+        """Bildirilen değişiklikleri döndür (reset ise sıfırla); None ise tüm stroke'lar kontrol edilmeli"""
+        changed = self._changed_stroke_ids
+        if reset:
+            self._changed_stroke_ids = set()
+        return changed
+
+    def export_state(self, copy_strokes=True):
+        """Katman durumunu dışa aktar; copy_strokes=False ise stroke listeleri
+        kopyalanmadan (canlı nesnelerle) döner, sadece okunmalıdır."""
         return {
             'active_layer': self.active_layer_id,
             'layer_order': list(self.layer_order),
@@ -164,15 +322,36 @@ class LayerManager:
                     'name': layer_data['name'],
                     'visible': layer_data['visible'],
                     'locked': layer_data['locked'],
-                    'strokes': copy.deepcopy(layer_data['strokes'])
+                    'strokes': (copy.deepcopy(layer_data['strokes']) if copy_strokes
+                                else list(layer_data['strokes']))
                 }
                 for layer_id, layer_data in self.layers.items()
             },
             'group_names': copy.deepcopy(getattr(self.drawing_widget, 'group_names', {}))
         }
 
-    def import_state(self, state):
+    @staticmethod
+    def snapshot_state(state):
+        """export_state çıktısının stroke'larını snapshot_stroke ile değişmez kıl"""
+        state = dict(state)
+        layers = {}
+        for layer_id, layer_data in state.get('layers', {}).items():
+            layer_data = dict(layer_data)
+            layer_data['strokes'] = [snapshot_stroke(stroke) for stroke in layer_data.get('strokes', [])]
+            layers[layer_id] = layer_data
+        state['layers'] = layers
+        return state
+
+    def export_snapshot(self):
+        """Arka planda kaydedilebilecek ucuz, değişmez durum kopyası"""
+        return self.snapshot_state(self.export_state(copy_strokes=False))
+
+    def import_state(self, state, copy_strokes=True):
+        """Katman durumunu içe aktar; copy_strokes=False ise stroke nesneleri
+        sahiplenilir (çağıran bunları başka yerde kullanmamalıdır)."""
         self.layers = {}
+        self._spatial_indexes = {}
+        self._id_indexes = {}
         self.layer_order = list(state.get('layer_order', []))
         self.active_layer_id = state.get('active_layer')
 
@@ -188,7 +367,8 @@ class LayerManager:
                 'name': layer_data.get('name', layer_id),
                 'visible': layer_data.get('visible', True),
                 'locked': layer_data.get('locked', False),
-                'strokes': copy.deepcopy(layer_data.get('strokes', []))
+                'strokes': (copy.deepcopy(layer_data.get('strokes', [])) if copy_strokes
+                            else list(layer_data.get('strokes', [])))
             }
 
         if not self.layer_order:
@@ -196,10 +376,15 @@ class LayerManager:
             self.layer_order = []
             self.active_layer_id = None
             self.create_layer("Layer 1")
+        self.recount_visible_strokes()
+        self.mark_strokes_changed()
 
         if self.active_layer_id not in self.layers:
             self.active_layer_id = self.layer_order[-1]
 
+        # Stroke kimliklerini hemen ata ki sonraki undo kaydı içerik farkı görmesin
+        self._index_all_stroke_ids()
+
         # ID sayacını güncelle
         numeric_ids = []
         for layer_id in self.layer_order:
@@ -221,12 +406,171 @@ class LayerManager:
             self.drawing_widget.group_names = {}
 
     def count_visible_strokes(self):
-        count = 0
-        for layer in self.iter_visible_layers():
-            count += len(layer['strokes'])
-        return count
+        """Görünür katmanlardaki stroke sayısı
+
+        Sayaç stroke ekleme/silme ve katman görünürlüğü/silme işlemlerinde
+        farkla güncellenir; sadece durum içe aktarılınca veya listeler API
+        dışında değiştirilince (update_contents) yeniden sayılır.
+        """
+        return self._visible_stroke_count
+
+    def recount_visible_strokes(self):
+        """Görünür stroke sayacını katman listelerinden yeniden hesapla"""
+        self._visible_stroke_count = sum(
+            len(layer['strokes']) for layer in self.iter_visible_layers())
+
+    # ------------------------------------------------------------------
+    # Uzamsal indeks
+    # ------------------------------------------------------------------
+    def get_spatial_index(self, layer_id=None):
+        """Katmanın uzamsal indeksini döndür (yoksa oluştur)"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        if layer_id not in self.layers:
+            return None
+        index = self._spatial_indexes.get(layer_id)
+        if index is None:
+            index = self._spatial_indexes[layer_id] = StrokeSpatialIndex()
+        return index
+
+    def query_strokes_in_rect(self, rect, layer_id=None):
+        """Katmanda rect ile kesişen stroke index'lerini çizim sırasıyla döndür"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        index = self.get_spatial_index(layer_id)
+        if index is None:
+            return []
+        return index.query_rect(self.layers[layer_id]['strokes'], rect)
+
+    def query_strokes_near_point(self, pos, radius, layer_id=None):
+        """Katmanda pos noktasına radius mesafesinde olabilecek stroke index'leri"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        index = self.get_spatial_index(layer_id)
+        if index is None:
+            return []
+        return index.query_point(self.layers[layer_id]['strokes'], pos, radius)
+
+    def update_stroke_bounds(self, strokes, layer_id=None):
+        """Yerinde dönüştürülen stroke'ların saklı sınırlarını ve indeks kayıtlarını güncelle"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        for stroke_data in strokes:
+            StrokeHandler.update_stroke_bounds(stroke_data)
+        self.mark_strokes_changed(strokes)
+        index = self._spatial_indexes.get(layer_id)
+        if index is not None and layer_id in self.layers:
+            index.update_strokes(self.layers[layer_id]['strokes'], strokes)
+
+    def update_stroke_range(self, start, removed, inserted, layer_id=None):
+        """Listede yerinde yapılan ekleme/silme sonrası indeksi güncelle"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        layer = self.layers.get(layer_id)
+        if layer is not None and layer['visible']:
+            self._visible_stroke_count += len(inserted) - len(removed)
+        index = self._spatial_indexes.get(layer_id)
+        if index is not None and layer_id in self.layers:
+            index.splice(self.layers[layer_id]['strokes'], start, removed, inserted)
+        id_index = self.get_stroke_id_index(layer_id)
+        if id_index is not None:
+            id_index.splice(self.layers[layer_id]['strokes'], start, removed, inserted,
+                            lambda stroke_id: self._is_stroke_id_taken(stroke_id, layer_id))
+
+    def invalidate_spatial_index(self, layer_id=None):
+        """Uzamsal indeksleri geçersiz kıl (layer_id yoksa tüm katmanlar)"""
+        if layer_id is None:
+            for index in self._spatial_indexes.values():
+                index.invalidate()
+        else:
+            index = self._spatial_indexes.get(layer_id)
+            if index is not None:
+                index.invalidate()
 
-    def _emit_changes(self, update_only=True):
+    # ------------------------------------------------------------------
+    # Stroke kimlikleri
+    # ------------------------------------------------------------------
+    def get_stroke_id_index(self, layer_id=None):
+        """Katmanın kimlik indeksini döndür (yoksa oluştur)"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        if layer_id not in self.layers:
+            return None
+        index = self._id_indexes.get(layer_id)
+        if index is None:
+            index = self._id_indexes[layer_id] = StrokeIdIndex()
+        return index
+
+    def _index_all_stroke_ids(self):
+        """Tüm katmanları indeksle; katmanlar arası yinelenen kimlikleri yenile"""
+        seen = set()
+        for layer_id in self.layer_order:
+            strokes = self.layers[layer_id]['strokes']
+            self.get_stroke_id_index(layer_id).rebuild(strokes, seen.__contains__)
+            seen.update(get_stroke_id(stroke) for stroke in strokes)
+
+    def _is_stroke_id_taken(self, stroke_id, layer_id):
+        return any(index.contains(stroke_id)
+                   for other_id, index in self._id_indexes.items() if other_id != layer_id)
+
+    def find_stroke(self, stroke_id):
+        """Kimliğin (layer_id, index) konumu; aktif katmana önce bakılır"""
+        layer_ids = [self.active_layer_id] + [l for l in self.layer_order if l != self.active_layer_id]
+        for layer_id in layer_ids:
+            index = self.get_stroke_id_index(layer_id)
+            if index is None:
+                continue
+            position = index.index_of(self.layers[layer_id]['strokes'], stroke_id)
+            if position is not None:
+                return layer_id, position
+        return None, None
+
+    def get_stroke_by_id(self, stroke_id):
+        layer_id, position = self.find_stroke(stroke_id)
+        if layer_id is None:
+            return None
+        return self.layers[layer_id]['strokes'][position]
+
+    def stroke_ids_at(self, indices, layer_id=None):
+        """Katmandaki index'lerin stroke kimlikleri"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        index = self.get_stroke_id_index(layer_id)
+        if index is None:
+            return []
+        strokes = self.layers[layer_id]['strokes']
+        index.sync(strokes)
+        return [get_stroke_id(strokes[i]) for i in indices if 0 <= i < len(strokes)]
+
+    def stroke_indices(self, stroke_ids, layer_id=None):
+        """Katmanda bulunan kimliklerin index'leri (artan sırada)"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        index = self.get_stroke_id_index(layer_id)
+        if index is None:
+            return []
+        return index.indices_of(self.layers[layer_id]['strokes'], stroke_ids)
+
+    def group_member_indices(self, group_id, layer_id=None, parent=False):
+        """Katmanda group_id'ye (parent ise parent_group_id olarak) sahip stroke'ların index'leri"""
+        if layer_id is None:
+            layer_id = self.active_layer_id
+        index = self.get_stroke_id_index(layer_id)
+        if index is None:
+            return []
+        return index.group_members(self.layers[layer_id]['strokes'], group_id, parent)
+
+    def _emit_changes(self, update_only=True, contents=True):
+        """Katman değişikliğini bildir; contents=True ise çizilen içerik değişmiştir
+        ve stroke karoları ile uzamsal indeks geçersiz kılınır."""
+        if contents and hasattr(self.drawing_widget, 'invalidate_contents'):
+            self.drawing_widget.invalidate_contents()
+        for index in self._id_indexes.values():
+            # group_id'ler yerinde değiştirilebilir (grupla/grubu çöz)
+            index.invalidate_groups()
+        if self._held_stroke_changes:
+            # Tam yenileme bekleyen aralık bildirimlerini kapsar
+            self._held_stroke_changes.clear()
         self.drawing_widget.layersChanged.emit()
         if not update_only:
             self.drawing_widget.activeLayerChanged.emit(self.active_layer_id)
@@ -234,6 +578,8 @@ class LayerManager:
 class DrawingWidget(QWidget):
     layersChanged = pyqtSignal()
     activeLayerChanged = pyqtSignal(str)
+    # Katmanda stroke aralığı değişti: layer_id, başlangıç, çıkarılan, eklenen sayısı
+    strokesChanged = pyqtSignal(str, int, int, int)
 
     def __init__(self):
         super().__init__()
@@ -301,7 +647,7 @@ class DrawingWidget(QWidget):
         }
 
         # Araç örnekleri
-        self.selection_tool = SelectionTool()
+        self.selection_tool = SelectionTool(self.layer_manager)
         self.move_tool = MoveTool()
         self._move_state_saved = False  # Move için state kaydedildi mi
         self.rotate_tool = RotateTool()
@@ -321,6 +667,7 @@ class DrawingWidget(QWidget):
         # Zoom ayarları - varsayılan %200
         self.zoom_level = 2.0
         self.zoom_offset = QPointF(0, 0)  # Pan offset
+        self._dirty_scene_rect = None  # Kısmi yeniden çizim için biriken sahne bölgesi
         
         # Pan ayarları
         self.is_panning = False
@@ -355,10 +702,9 @@ class DrawingWidget(QWidget):
 
     @strokes.setter
     def strokes(self, value):
+        # set_active_strokes katman listesine bildirimi kendisi yapar
         self.layer_manager.set_active_strokes(value)
         self.update()
-        # Katman listesini güncelle
-        self.layer_manager._emit_changes()
 
     def get_layer_overview(self):
         return list(self.layer_manager.iter_layers())
@@ -734,7 +1080,13 @@ class DrawingWidget(QWidget):
 
         current_state = self.layer_manager.export_state()
 
+        if self.pdf_background_layer is not None and self.pdf_background_layer is not layer:
+            # Eski PDF'nin arka plan rasterizer thread'ini durdur
+            self.pdf_background_layer.close()
         self.pdf_background_layer = layer
+        if layer is not None and hasattr(layer, 'notifier'):
+            layer.notifier.tileReady.connect(self._on_pdf_tile_ready)
+            layer.notifier.pageReady.connect(self._on_pdf_page_ready)
 
         if layer and layer.has_document():
             self._initialize_pdf_page_states(layer.page_count)
@@ -747,12 +1099,24 @@ class DrawingWidget(QWidget):
         self.update_canvas_size()
         self.update()
 
+    def _on_pdf_tile_ready(self, page_index: int):
+        """Arka planda render edilen PDF karosu hazır - stroke karolarını koruyarak yeniden çiz"""
+        if self.pdf_background_layer and self.pdf_background_layer.current_page == page_index:
+            self.update_overlay()
+
+    def _on_pdf_page_ready(self, page_index: int):
+        """Arka planda render edilen PDF sayfası hazır - boyutu doğrula ve yeniden çiz"""
+        if self.pdf_background_layer and self.pdf_background_layer.current_page == page_index:
+            self.update_canvas_size()
+
     def get_pdf_background_layer(self) -> Optional[PdfBackgroundLayer]:
         return self.pdf_background_layer
 
     def clear_pdf_background(self):
         if self.pdf_background_layer and self.pdf_background_layer.has_document():
             self._save_current_pdf_page_state()
+        if self.pdf_background_layer is not None:
+            self.pdf_background_layer.close()
         self.pdf_background_layer = None
         self.pdf_page_states = {}
         self.update_canvas_size()
@@ -820,6 +1184,37 @@ class DrawingWidget(QWidget):
             'page_states': page_states
         }
 
+    def snapshot_pdf_page_layer_states(self):
+        """get_pdf_page_layer_states'in derin kopyasız, değişmez karşılığı"""
+        if not self.has_pdf_background():
+            return None
+        current_page = self.pdf_background_layer.current_page
+        page_states = {}
+        for index, state in self.pdf_page_states.items():
+            if index == current_page:
+                page_states[index] = self.layer_manager.export_snapshot()
+            elif state is not None:
+                page_states[index] = LayerManager.snapshot_state(state)
+        if current_page not in page_states:
+            page_states[current_page] = self.layer_manager.export_snapshot()
+        return {
+            'page_count': self.pdf_background_layer.page_count,
+            'current_page': current_page,
+            'page_states': page_states
+        }
+
+    def iter_pdf_page_layer_states(self):
+        """Stroke'u olabilecek sayfaların (index, katman durumu) çiftleri.
+
+        Stroke listeleri kopyalanmaz (dışa aktarma için); sadece okunmalıdır.
+        """
+        if not self.has_pdf_background():
+            return []
+        current_page = self.pdf_background_layer.current_page
+        states = {index: state for index, state in self.pdf_page_states.items() if state is not None}
+        states[current_page] = self.layer_manager.export_state(copy_strokes=False)
+        return sorted(states.items(), key=lambda item: item[0])
+
     def import_pdf_page_states(self, payload):
         if not self.pdf_background_layer or not self.pdf_background_layer.has_document():
             return
@@ -860,7 +1255,8 @@ class DrawingWidget(QWidget):
             'source_path': self.pdf_background_layer.source_path,
             'page_count': self.pdf_background_layer.page_count,
             'current_page': self.pdf_background_layer.current_page,
-            'dpi': self.pdf_background_layer.dpi
+            'dpi': self.pdf_background_layer.dpi,
+            'ink_token': self.pdf_background_layer.ink_token
         }
 
     def import_pdf_background_state(self, state, pdf_importer=None):
@@ -876,7 +1272,8 @@ class DrawingWidget(QWidget):
             return
 
         try:
-            layer = importer.load_pdf(state['source_path'], dpi=state.get('dpi', 150))
+            layer = importer.load_pdf(state['source_path'], dpi=state.get('dpi', 150),
+                                     ink_token=state.get('ink_token'))
         except Exception:
             return
 
@@ -923,28 +1320,55 @@ class DrawingWidget(QWidget):
         transformed_x = (pos.x() - current_offset.x()) / current_zoom
         transformed_y = (pos.y() - current_offset.y()) / current_zoom
         return QPointF(transformed_x, transformed_y)
+
+    def transform_mouse_points(self, xy):
+        """transform_mouse_pos'un (N, 2) NumPy dizisi için vektörel karşılığı"""
+        current_zoom = self.zoom_level
+        current_offset = self.zoom_offset
+        if hasattr(self, 'zoom_manager'):
+            current_zoom = self.zoom_manager.get_zoom_level()
+            current_offset = self.zoom_manager.get_pan_offset()
+        return (np.asarray(xy, dtype=np.float64) - (current_offset.x(), current_offset.y())) / current_zoom
+
+    def process_tablet_samples(self):
+        """Kare başında tampondaki tablet örneklerini toplu olarak işle"""
+        samples = self.tablet_handler.take_samples()
+        if samples is None:
+            return False
+        if self.freehand_tool.is_drawing:
+            xy = self.transform_mouse_points(samples[:, :2])
+            pressures = self.tablet_handler.smooth_pressures(samples[:, 2])
+            self.freehand_tool.add_points(xy, pressures, True)  # True = tablet
+            self.mark_dirty(self.freehand_tool.take_dirty_rect())
+        return True
     
     def set_zoom_level(self, zoom_level):
         """Zoom seviyesini ayarla"""
         self.zoom_level = zoom_level
-        self.update()
+        # Karolar zoom seviyesine göre anahtarlandığı için içerik geçersiz kılınmaz
+        self.update_overlay()
     
     def set_pan_offset(self, pan_offset):
         """Pan offset'ini ayarla"""
         self.zoom_offset = pan_offset
-        self.update()
+        self.update_overlay()
         
     def save_current_state(self, description="Action"):
         """Mevcut durumu undo manager'a kaydet"""
         if self.undo_manager:
-            self.undo_manager.save_state(self.layer_manager.export_state(), description)
+            # Undo manager sadece yeni/değiştiği bildirilen stroke'ları inceler ve kopyalar
+            self.undo_manager.save_state(self.layer_manager.export_state(copy_strokes=False), description,
+                                         changed_ids=self.layer_manager.take_changed_stroke_ids())
 
     def undo(self):
         """Geri al"""
         if self.undo_manager:
-            previous_state = self.undo_manager.undo()
+            live_state = self.layer_manager.export_state(copy_strokes=False)
+            previous_state = self.undo_manager.undo(live_state, self.layer_manager.take_changed_stroke_ids(reset=False))
             if previous_state is not None:
-                self.layer_manager.import_state(previous_state)
+                self.layer_manager.import_state(previous_state, copy_strokes=False)
+                # Canlı durum artık geçmişteki kayıtla aynı
+                self.layer_manager.take_changed_stroke_ids()
                 self.update()
                 # Seçimi temizle
                 self.selection_tool.clear_selection()
@@ -953,9 +1377,11 @@ class DrawingWidget(QWidget):
     def redo(self):
         """İleri al"""
         if self.undo_manager:
-            next_state = self.undo_manager.redo()
+            live_state = self.layer_manager.export_state(copy_strokes=False)
+            next_state = self.undo_manager.redo(live_state, self.layer_manager.take_changed_stroke_ids(reset=False))
             if next_state is not None:
-                self.layer_manager.import_state(next_state)
+                self.layer_manager.import_state(next_state, copy_strokes=False)
+                self.layer_manager.take_changed_stroke_ids()
                 self.update()
                 # Seçimi temizle
                 self.selection_tool.clear_selection()
@@ -1011,14 +1437,10 @@ class DrawingWidget(QWidget):
                 strokes_list[i - 1], strokes_list[i] = strokes_list[i], strokes_list[i - 1]
                 selected_flags[i - 1], selected_flags[i] = selected_flags[i], selected_flags[i - 1]
 
-        # Yeni seçim index'leri
-        new_selected = [i for i, flag in enumerate(selected_flags) if flag]
-
-        # Uygula
-        self.strokes = strokes_list
-        self.selection_tool.selected_strokes = new_selected
+        # Uygula - seçili index'ler reorder_strokes içinde stroke kimlikleriyle taşınır
+        self.layer_manager.reorder_strokes(strokes_list)
         self.update_shape_properties()
-        self.update()
+        self.update_overlay()
 
     def send_selected_to_back(self):
         """Seçili şekilleri en alta gönder (aynı katman içinde)."""
@@ -1044,14 +1466,10 @@ class DrawingWidget(QWidget):
         non_selected_items = [strokes_list[i] for i in range(total) if i not in selected_set]
         new_order = selected_items + non_selected_items
 
-        # Yeni seçim index'leri: 0..len(selected)-1
-        new_selected = list(range(len(selected_items)))
-
-        # Uygula
-        self.strokes = new_order
-        self.selection_tool.selected_strokes = new_selected
+        # Uygula - seçili index'ler reorder_strokes içinde stroke kimlikleriyle taşınır
+        self.layer_manager.reorder_strokes(new_order)
         self.update_shape_properties()
-        self.update()
+        self.update_overlay()
 
     def send_selected_forward(self):
         """Seçili şekilleri bir basamak üste gönder (aynı katman içinde)."""
@@ -1079,12 +1497,10 @@ class DrawingWidget(QWidget):
                 strokes_list[i + 1], strokes_list[i] = strokes_list[i], strokes_list[i + 1]
                 selected_flags[i + 1], selected_flags[i] = selected_flags[i], selected_flags[i + 1]
 
-        new_selected = [i for i, flag in enumerate(selected_flags) if flag]
-
-        self.strokes = strokes_list
-        self.selection_tool.selected_strokes = new_selected
+        # Uygula - seçili index'ler reorder_strokes içinde stroke kimlikleriyle taşınır
+        self.layer_manager.reorder_strokes(strokes_list)
         self.update_shape_properties()
-        self.update()
+        self.update_overlay()
 
     def send_selected_to_front(self):
         """Seçili şekilleri en üste gönder (aynı katman içinde)."""
@@ -1109,14 +1525,10 @@ class DrawingWidget(QWidget):
         non_selected_items = [strokes_list[i] for i in range(total) if i not in selected_set]
         new_order = non_selected_items + selected_items
 
-        # Yeni seçim index'leri: son N
-        start = len(non_selected_items)
-        new_selected = list(range(start, start + len(selected_items)))
-
-        self.strokes = new_order
-        self.selection_tool.selected_strokes = new_selected
+        # Uygula - seçili index'ler reorder_strokes içinde stroke kimlikleriyle taşınır
+        self.layer_manager.reorder_strokes(new_order)
         self.update_shape_properties()
-        self.update()
+        self.update_overlay()
 
     def clear_all_strokes(self):
         """Tüm çizimleri temizle"""
@@ -1155,12 +1567,12 @@ class DrawingWidget(QWidget):
         self.event_handler.handle_mouse_move(event)
                 
     def _throttled_update(self):
-        """Akıllı throttling - ThrottleManager'a yönlendir"""
+        """Akıllı throttling - ThrottleManager'a yönlendir (overlay güncellemesi)"""
         self.throttle_manager.throttled_update()
             
-    def _throttled_freehand_update(self):
+    def _throttled_freehand_update(self, dirty_only=False):
         """Freehand için minimal throttling - ThrottleManager'a yönlendir"""
-        self.throttle_manager.throttled_freehand_update()
+        self.throttle_manager.throttled_freehand_update(dirty_only)
 
     def mouseReleaseEvent(self, event: QMouseEvent):
         """Mouse release olayını event handler'a yönlendir"""
@@ -1172,9 +1584,9 @@ class DrawingWidget(QWidget):
         
     # Tablet handle metodları EventHandler'a taşındı
         
-    def _throttled_tablet_update(self):
+    def _throttled_tablet_update(self, dirty_only=False):
         """Tablet için akıllı throttling - ThrottleManager'a yönlendir"""
-        self.throttle_manager.throttled_tablet_update()
+        self.throttle_manager.throttled_tablet_update(dirty_only)
 
     # Tool handle metodları EventHandler'a taşındı
 
@@ -1186,9 +1598,12 @@ class DrawingWidget(QWidget):
         # Geçici seçim listesi oluştur (asıl seçimi değiştirmez)
         temp_selected = list(self.selection_tool.selected_strokes) if self.selection_tool.ctrl_pressed else []
         
-        for stroke_index, stroke_data in enumerate(self.strokes):
+        strokes = self.strokes
+        candidates = self.layer_manager.query_strokes_in_rect(self.selection_tool.selection_rect)
+        for stroke_index in candidates:
             if stroke_index in temp_selected:
                 continue
+            stroke_data = strokes[stroke_index]
                 
             # Image stroke kontrolü
             if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
@@ -1217,9 +1632,90 @@ class DrawingWidget(QWidget):
 
     # Geri kalan handle metodları EventHandler'a taşındı
 
+    def update_contents(self, *args):
+        """Stroke'lar yerinde değiştirildikten sonra karoları geçersiz kılıp yeniden çiz.
+
+        Düz update() karolara dokunmaz; değişen stroke'lar biliniyorsa
+        invalidate_canvas_strokes daha ucuzdur.
+        """
+        self.invalidate_contents()
+        layer_manager = getattr(self, 'layer_manager', None)
+        if layer_manager is not None:
+            # Hangi stroke'un değiştiği bilinmiyor; sonraki undo kaydı hepsini kontrol eder
+            layer_manager.mark_strokes_changed()
+            # Listeler API dışında da değişmiş olabilir
+            layer_manager.recount_visible_strokes()
+        super().update(*args)
+
+    def invalidate_contents(self):
+        """Stroke karolarını ve uzamsal indeksi yeniden çizim istemeden geçersiz kıl"""
+        renderer = getattr(self, 'canvas_renderer', None)
+        if renderer is not None:
+            renderer.invalidate_tiles()
+        layer_manager = getattr(self, 'layer_manager', None)
+        if layer_manager is not None:
+            # Stroke'lar yerinde değişmiş olabilir; sınırlar bir sonraki sorguda yenilenir
+            layer_manager.invalidate_spatial_index()
+
+    def update_overlay(self, *args):
+        """Karoları koruyarak yeniden çiz (sadece geçici katman değişti)"""
+        super().update(*args)
+
+    def scene_rect_to_widget(self, scene_rect):
+        """Sahne koordinatındaki dikdörtgeni widget piksel dikdörtgenine çevir"""
+        zoom = self.zoom_level
+        offset = self.zoom_offset
+        if hasattr(self, 'zoom_manager'):
+            zoom = self.zoom_manager.get_zoom_level()
+            offset = self.zoom_manager.get_pan_offset()
+        # paint_event ile aynı dönüşüm: önce zoom, sonra pan
+        widget_rect = QRectF(
+            (scene_rect.x() + offset.x()) * zoom, (scene_rect.y() + offset.y()) * zoom,
+            scene_rect.width() * zoom, scene_rect.height() * zoom
+        )
+        return widget_rect.toAlignedRect().adjusted(-1, -1, 1, 1)
+
+    def mark_dirty(self, scene_rect):
+        """Sahne koordinatında değişen bölgeyi bir sonraki kısmi yeniden çizime ekle"""
+        if scene_rect is None:
+            return
+        if self._dirty_scene_rect is None:
+            self._dirty_scene_rect = QRectF(scene_rect)
+        else:
+            self._dirty_scene_rect = self._dirty_scene_rect.united(scene_rect)
+
+    def update_dirty(self):
+        """Biriken kirli bölgeyi karoları koruyarak yeniden çiz"""
+        scene_rect = self._dirty_scene_rect
+        self._dirty_scene_rect = None
+        if scene_rect is None:
+            return
+        super().update(self.scene_rect_to_widget(scene_rect))
+
+    def update_live_stroke(self):
+        """Canlı serbest çizimde kalem ucunun çevresini bir sonraki karede yeniden çiz"""
+        self.mark_dirty(self.freehand_tool.take_dirty_rect())
+        self._throttled_tablet_update(dirty_only=True)
+
+    def invalidate_canvas_rect(self, scene_rect):
+        """Sahne koordinatındaki bir bölgenin karolarını geçersiz kıl"""
+        if scene_rect is None:
+            return
+        renderer = getattr(self, 'canvas_renderer', None)
+        if renderer is not None:
+            renderer.invalidate_tiles(scene_rect)
+
+    def invalidate_canvas_strokes(self, strokes):
+        """Verilen stroke'ların kapladığı karoları geçersiz kıl"""
+        renderer = getattr(self, 'canvas_renderer', None)
+        if renderer is not None:
+            renderer.invalidate_strokes(strokes)
+
     def paintEvent(self, event):
-        """Paint olayını canvas renderer'a yönlendir"""
+        """Paint olayını canvas renderer'a yönlendir ve süresini ölç"""
+        start = time.perf_counter()
         self.canvas_renderer.paint_event(event)
+        self.throttle_manager.record_frame_time(time.perf_counter() - start)
             
     # Render metodları CanvasRenderer'a taşındı
             
@@ -1,8 +1,16 @@
 from PyQt6.QtCore import QPointF, Qt
 from PyQt6.QtGui import QPainter, QPen, QPainterPath, QColor
 import math
+import numpy as np
 from typing import List
 
+def _points_to_array(points):
+    """QPointF listesi veya StrokePoints'i (N, 2) float64 diziye çevir"""
+    xy = getattr(points, 'xy', None)
+    if xy is not None:
+        return np.asarray(xy, dtype=np.float64)
+    return np.array([(p.x(), p.y()) for p in points], dtype=np.float64).reshape(-1, 2)
+
 def rgba_to_qcolor(color):
     """RGBA tuple'ını QColor'a çevir"""
     if isinstance(color, (tuple, list)) and len(color) >= 3:
@@ -157,11 +165,8 @@ class SimpleBrush:
     """Basit ve hızlı brush - varsayılan kullanım"""
     
     @staticmethod
-    def draw_simple_stroke(painter: QPainter, points: List[QPointF], color, width: float, tablet_mode=False, line_style=Qt.PenStyle.SolidLine):
-        """Basit stroke çizimi (antialias + tek path ile pürüzsüz eklemler)"""
-        if len(points) < 2:
-            return
-            
+    def create_pen(color, width: float, line_style=Qt.PenStyle.SolidLine) -> QPen:
+        """Basit brush kalemi (yuvarlak uç ve eklem)"""
         pen = QPen(rgba_to_qcolor(color))
         pen.setWidthF(max(1.0, width))
         pen.setCapStyle(Qt.PenCapStyle.RoundCap)
@@ -171,6 +176,61 @@ class SimpleBrush:
         if isinstance(line_style, int):
             line_style = Qt.PenStyle(line_style)
         pen.setStyle(line_style)
+        return pen
+
+    @staticmethod
+    def jitter_distance(width: float):
+        """İnce kalemde (<=2.5) atılacak titreme mesafesi, kalın kalemde None"""
+        if width <= 2.5:
+            return max(0.6, width * 0.6)
+        return None
+
+    @staticmethod
+    def stroke_path(points, width: float) -> QPainterPath:
+        """draw_simple_stroke'un çizdiği yumuşatılmış path (sınır hesabı için de kullanılır)"""
+        # Tüm segmentleri tek bir path; Catmull–Rom'dan cubic Bézier'e dönüştürerek yumuşat
+        def _build_smooth_path(xy: np.ndarray) -> QPainterPath:
+            n = len(xy)
+            if n < 3:
+                path_local = QPainterPath(QPointF(*xy[0].tolist()))
+                path_local.lineTo(QPointF(*xy[-1].tolist()))
+                return path_local
+            # Catmull–Rom -> Bezier: c1 = p1 + (p2 - p0)/6, c2 = p2 - (p3 - p1)/6
+            prev_pts = np.vstack((xy[:1], xy[:-2]))
+            next_pts = np.vstack((xy[2:], xy[-1:]))
+            c1 = xy[:-1] + (xy[1:] - prev_pts) / 6.0
+            c2 = xy[1:] - (next_pts - xy[:-1]) / 6.0
+            segments = np.hstack((c1, c2, xy[1:])).tolist()
+            path_local = QPainterPath(QPointF(*xy[0].tolist()))
+            cubic_to = path_local.cubicTo
+            for c1x, c1y, c2x, c2y, px, py in segments:
+                cubic_to(c1x, c1y, c2x, c2y, px, py)
+            return path_local
+
+        xy = _points_to_array(points)
+
+        # İnce kalemde (<=2.5) daha güçlü yumuşatma uygula
+        jitter = SimpleBrush.jitter_distance(width)
+        if jitter is not None:
+            # Küçük jitter'ları at: birbirine çok yakın noktaları filtrele
+            min_dist_sq = jitter ** 2
+            keep = []
+            last_x = last_y = None
+            for i, (x, y) in enumerate(xy.tolist()):
+                if last_x is None or (x - last_x) ** 2 + (y - last_y) ** 2 >= min_dist_sq:
+                    keep.append(i)
+                    last_x, last_y = x, y
+            if len(keep) >= 2:
+                xy = xy[keep]
+        return _build_smooth_path(xy)
+
+    @staticmethod
+    def draw_simple_stroke(painter: QPainter, points: List[QPointF], color, width: float, tablet_mode=False, line_style=Qt.PenStyle.SolidLine):
+        """Basit stroke çizimi (antialias + tek path ile pürüzsüz eklemler)"""
+        if len(points) < 2:
+            return
+            
+        pen = SimpleBrush.create_pen(color, width, line_style)
         
         painter.save()
         painter.setPen(pen)
@@ -184,52 +244,6 @@ class SimpleBrush:
             pass
         painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
 
-        # Tüm segmentleri tek bir path olarak çiz; Catmull–Rom'dan cubic Bézier'e dönüştürerek yumuşat
-        def _build_smooth_path(pts: List[QPointF]) -> QPainterPath:
-            n = len(pts)
-            if n < 3:
-                path_local = QPainterPath(pts[0])
-                path_local.lineTo(pts[-1])
-                return path_local
-            path_local = QPainterPath(pts[0])
-            for i in range(n - 1):
-                p0 = pts[i - 1] if i - 1 >= 0 else pts[i]
-                p1 = pts[i]
-                p2 = pts[i + 1]
-                p3 = pts[i + 2] if i + 2 < n else pts[i + 1]
-                # Catmull–Rom -> Bezier: c1 = p1 + (p2 - p0)/6, c2 = p2 - (p3 - p1)/6
-                c1 = QPointF(
-                    p1.x() + (p2.x() - p0.x()) / 6.0,
-                    p1.y() + (p2.y() - p0.y()) / 6.0,
-                )
-                c2 = QPointF(
-                    p2.x() - (p3.x() - p1.x()) / 6.0,
-                    p2.y() - (p3.y() - p1.y()) / 6.0,
-                )
-                path_local.cubicTo(c1, c2, p2)
-            return path_local
-
-        # İnce kalemde (<=2.5) daha güçlü yumuşatma uygula
-        if width <= 2.5:
-            # Küçük jitter'ları at: birbirine çok yakın noktaları filtrele
-            filtered: List[QPointF] = []
-            last = None
-            min_dist = max(0.6, width * 0.6)
-            for pt in points:
-                if last is None:
-                    filtered.append(pt)
-                    last = pt
-                else:
-                    dx = pt.x() - last.x()
-                    dy = pt.y() - last.y()
-                    if (dx * dx + dy * dy) >= (min_dist * min_dist):
-                        filtered.append(pt)
-                        last = pt
-            if len(filtered) < 2:
-                filtered = points
-            path = _build_smooth_path(filtered)
-        else:
-            path = _build_smooth_path(points)
-        painter.drawPath(path)
+        painter.drawPath(SimpleBrush.stroke_path(points, width))
             
         painter.restore() 
\ No newline at end of file
@@ -3,7 +3,133 @@ from PyQt6.QtGui import QPen, QPainter, QPainterPath, QBrush
 from PyQt6.QtCore import Qt, QPointF
 from scipy.interpolate import splprep, splev
 import numpy as np
+from collections import OrderedDict
 from shadow_renderer import ShadowRenderer
+from stroke_points import StrokePoints, rdp_importance
+
+
+# Örneklenmiş B-spline geometrisi için önbellek: içerik anahtarı -> (QPainterPath, tck, LOD verisi)
+# Anahtar edit_points/closed/knots içeriğinden üretildiği için undo/redo ve katman
+# kopyalarında (deepcopy) aynı eğri tekrar fit edilmez.
+_GEOMETRY_CACHE = OrderedDict()
+_GEOMETRY_CACHE_LIMIT = 1024
+
+
+def _geometry_key(stroke_data):
+    """Stroke'un çizim geometrisini belirleyen içerik anahtarını üret"""
+    def _blob(value):
+        if value is None:
+            return None
+        try:
+            return np.asarray(value, dtype=float).tobytes()
+        except Exception:
+            return repr(value)
+
+    return (
+        bool(stroke_data.get('closed', False)),
+        stroke_data.get('degree'),
+        _blob(stroke_data.get('edit_points')),
+        _blob(stroke_data.get('knots')),
+        _blob(stroke_data.get('control_points')),
+    )
+
+
+def _samples_to_path(samples, closed):
+    """Eğri örneklerinden path üret; kapalı eğride uçlar cubic ile birleştirilir"""
+    x_fine = samples[:, 0]
+    y_fine = samples[:, 1]
+    path = QPainterPath()
+    path.moveTo(QPointF(x_fine[0], y_fine[0]))
+    for i in range(1, len(x_fine)):
+        path.lineTo(QPointF(x_fine[i], y_fine[i]))
+    # Kapalı eğri: son noktadan ilk noktaya yumuşak (cubic) bağ kur
+    if closed and len(x_fine) >= 4:
+        p_last = QPointF(x_fine[-1], y_fine[-1])
+        p_prev1 = QPointF(x_fine[-2], y_fine[-2])
+        p_first = QPointF(x_fine[0], y_fine[0])
+        p_next1 = QPointF(x_fine[1], y_fine[1])
+        # Türev tahmini (tangent)
+        t_end = QPointF(p_last.x() - p_prev1.x(), p_last.y() - p_prev1.y())
+        t_start = QPointF(p_next1.x() - p_first.x(), p_next1.y() - p_first.y())
+        alpha = 0.35
+        c1 = QPointF(p_last.x() + t_end.x() * alpha, p_last.y() + t_end.y() * alpha)
+        c2 = QPointF(p_first.x() - t_start.x() * alpha, p_first.y() - t_start.y() * alpha)
+        path.cubicTo(c1, c2, p_first)
+    return path
+
+
+def get_bspline_geometry(stroke_data):
+    """Örneklenmiş B-spline path'ini önbellekten al, yoksa fit edip sakla"""
+    key = _geometry_key(stroke_data)
+    cached = _GEOMETRY_CACHE.get(key)
+    if cached is not None:
+        _GEOMETRY_CACHE.move_to_end(key)
+        return cached
+
+    # Eğer edit_points varsa spline'ı yeniden kurarak edit sonrası
+    # interpolasyonlu ve pürüzsüz kapanış elde ederiz.
+    edit_points = stroke_data.get('edit_points')
+    try:
+        if edit_points is not None:
+            pts = np.array(edit_points, dtype=float)
+            closed = bool(stroke_data.get('closed', False))
+            try:
+                if closed and len(pts) >= 4:
+                    k = 3
+                    wrapped = np.vstack([pts, pts[:k]])
+                    s_factor = max(0.0, len(pts) * 0.3)
+                    tck, u = splprep(wrapped.T, s=s_factor, k=k, per=True)
+                else:
+                    s_factor = len(pts) * 3.0
+                    tck, u = splprep(pts.T, s=s_factor, k=min(3, max(1, len(pts)-1)), per=False)
+            except Exception:
+                # Düştüğünde eski tck'yi kullan
+                tck = (np.array(stroke_data['knots']), np.array(stroke_data['control_points']).T, stroke_data['degree'])
+                u = np.array(stroke_data['u'])
+        else:
+            control_points = stroke_data['control_points']
+            knots = stroke_data['knots']
+            degree = stroke_data['degree']
+            u = stroke_data['u']
+            tck = (np.array(knots), np.array(control_points).T, degree)
+
+        # u dizisini numpy yap
+        u = np.asarray(u, dtype=float)
+
+        # Örnekleme: kapalı eğrilerde dikiş köşesini önlemek için endpoint=False ve daha yoğun örnekleme kullan
+        num_ctrl = int(np.array(tck[1]).T.shape[0])
+        # Örnek sayısını kontrol noktası sayısına bağlı, ancak sınırlı tut
+        base_samples = int(max(200, min(1000, num_ctrl * 40)))
+        is_closed = bool(stroke_data.get('closed', False))
+        # Kapalıda endpoint=False: son==ilk örneklemesini engelleyip tek hatlık çizim yap
+        ts = np.linspace(0, u[-1], base_samples, endpoint=False)
+        x_fine, y_fine = splev(ts, tck)
+    except Exception:
+        return None
+
+    samples = np.column_stack((x_fine, y_fine))
+    path = _samples_to_path(samples, is_closed)
+
+    # LOD: örneklerin RDP önem değerleri ilk uzak zoom çiziminde hesaplanır
+    cached = (path, tck, {'samples': samples, 'closed': is_closed, 'importance': None, 'paths': {}})
+    _GEOMETRY_CACHE[key] = cached
+    while len(_GEOMETRY_CACHE) > _GEOMETRY_CACHE_LIMIT:
+        _GEOMETRY_CACHE.popitem(last=False)
+    return cached
+
+
+def invalidate_bspline_geometry(stroke_data):
+    """Stroke'un önbellekteki geometrisini sil (noktalar değişmeden önce çağrılmalı)"""
+    try:
+        _GEOMETRY_CACHE.pop(_geometry_key(stroke_data), None)
+    except Exception:
+        pass
+
+
+def clear_bspline_geometry_cache():
+    """Tüm B-spline geometri önbelleğini temizle"""
+    _GEOMETRY_CACHE.clear()
+
 
 class BSplineTool:
     def __init__(self):
@@ -227,6 +353,7 @@ class BSplineTool:
                 return False
                 
             if stroke_data.get('type') == 'bspline' or stroke_data.get('tool_type') == 'bspline':
+                invalidate_bspline_geometry(stroke_data)
                 if 'edit_points' in stroke_data:
                     # Edit point'i güncelle
                     stroke_data['edit_points'][cp_index] = [new_pos.x(), new_pos.y()]
@@ -300,6 +427,7 @@ class BSplineTool:
                 tck, u = splprep(points_array.T, s=s_factor, k=k, per=False, w=weights)
             
             # Stroke data'yı güncelle
+            invalidate_bspline_geometry(stroke_data)
             stroke_data['control_points'] = np.array(tck[1]).T.tolist()
             stroke_data['knots'] = np.array(tck[0]).tolist()
             stroke_data['degree'] = int(tck[2])
@@ -346,8 +474,30 @@ class BSplineTool:
                 painter.drawLine(point1, point2)
             painter.restore()
             
-    def draw_bspline(self, painter, stroke_data):
-        """B-spline çiz"""
+    @staticmethod
+    def _lod_path(path, lod, tolerance):
+        """Örneklenmiş eğrinin tolerance'a uygun sadeleştirilmiş path'i"""
+        level = None
+        for candidate in StrokePoints.LOD_TOLERANCES:
+            if candidate > tolerance:
+                break
+            level = candidate
+        if level is None:
+            return path
+        lod_path = lod['paths'].get(level)
+        if lod_path is None:
+            if lod['importance'] is None:
+                lod['importance'] = rdp_importance(lod['samples'], StrokePoints.LOD_TOLERANCES[0])
+            keep = lod['importance'] > level
+            lod_path = lod['paths'][level] = _samples_to_path(lod['samples'][keep], lod['closed'])
+        return lod_path
+
+    def draw_bspline(self, painter, stroke_data, lod_tolerance=None):
+        """B-spline çiz
+
+        lod_tolerance (sahne birimi) verilirse eğri örneklerinin
+        sadeleştirilmiş seviyesi çizilir (uzak zoom).
+        """
         # Image stroke kontrolü
         if hasattr(stroke_data, 'stroke_type'):
             return
@@ -355,32 +505,14 @@ class BSplineTool:
         if stroke_data.get('type') != 'bspline' and stroke_data.get('tool_type') != 'bspline':
             return
             
-        # Eğer edit_points varsa, her çizimde spline'ı yeniden kurarak edit sonrası
-        # interpolasyonlu ve pürüzsüz kapanış elde ederiz.
         edit_points = stroke_data.get('edit_points')
-        if edit_points is not None:
-            pts = np.array(edit_points, dtype=float)
-            closed = bool(stroke_data.get('closed', False))
-            try:
-                if closed and len(pts) >= 4:
-                    k = 3
-                    wrapped = np.vstack([pts, pts[:k]])
-                    s_factor = max(0.0, len(pts) * 0.3)
-                    tck, u = splprep(wrapped.T, s=s_factor, k=k, per=True)
-                else:
-                    s_factor = len(pts) * 3.0
-                    tck, u = splprep(pts.T, s=s_factor, k=min(3, max(1, len(pts)-1)), per=False)
-            except Exception:
-                # Düştüğünde eski tck'yi kullan
-                tck = (np.array(stroke_data['knots']), np.array(stroke_data['control_points']).T, stroke_data['degree'])
-                u = np.array(stroke_data['u'])
-        else:
-            control_points = stroke_data['control_points']
-            knots = stroke_data['knots']
-            degree = stroke_data['degree']
-            u = stroke_data['u']
-            tck = (np.array(knots), np.array(control_points).T, degree)
-        
+        geometry = get_bspline_geometry(stroke_data)
+        if geometry is None:
+            return
+        path, tck, lod = geometry
+        if lod_tolerance is not None:
+            path = self._lod_path(path, lod, lod_tolerance)
+
         # B-spline eğrisini çiz
         painter.save()
         color = stroke_data.get('color', Qt.GlobalColor.black)
@@ -398,36 +530,6 @@ class BSplineTool:
                   Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
         painter.setPen(pen)
         
-        # u dizisini numpy yap
-        if isinstance(u, list):
-            u = np.array(u, dtype=float)
-        
-        # Örnekleme: kapalı eğrilerde dikiş köşesini önlemek için endpoint=False ve daha yoğun örnekleme kullan
-        num_ctrl = int(np.array(tck[1]).T.shape[0])
-        # Örnek sayısını kontrol noktası sayısına bağlı, ancak sınırlı tut
-        base_samples = int(max(200, min(1000, num_ctrl * 40)))
-        is_closed = bool(stroke_data.get('closed', False))
-        # Kapalıda endpoint=False: son==ilk örneklemesini engelleyip tek hatlık çizim yap
-        ts = np.linspace(0, u[-1], base_samples, endpoint=False)
-        x_fine, y_fine = splev(ts, tck)
-        path = QPainterPath()
-        path.moveTo(QPointF(x_fine[0], y_fine[0]))
-        for i in range(1, len(x_fine)):
-            path.lineTo(QPointF(x_fine[i], y_fine[i]))
-        # Kapalı eğri: son noktadan ilk noktaya yumuşak (cubic) bağ kur
-        if is_closed and len(x_fine) >= 4:
-            p_last = QPointF(x_fine[-1], y_fine[-1])
-            p_prev1 = QPointF(x_fine[-2], y_fine[-2])
-            p_first = QPointF(x_fine[0], y_fine[0])
-            p_next1 = QPointF(x_fine[1], y_fine[1])
-            # Türev tahmini (tangent)
-            t_end = QPointF(p_last.x() - p_prev1.x(), p_last.y() - p_prev1.y())
-            t_start = QPointF(p_next1.x() - p_first.x(), p_next1.y() - p_first.y())
-            alpha = 0.35
-            c1 = QPointF(p_last.x() + t_end.x() * alpha, p_last.y() + t_end.y() * alpha)
-            c2 = QPointF(p_first.x() - t_start.x() * alpha, p_first.y() - t_start.y() * alpha)
-            path.cubicTo(c1, c2, p_first)
-
         ShadowRenderer.draw_shape_shadow(painter, 'path', path, stroke_data)
 
         # Dolgu varsa fırçayı ayarla ve hem doldur hem çiz
@@ -536,9 +638,9 @@ class BSplineTool:
         """Gölge kalitesini ayarla"""
         self.shadow_quality = quality
     
-    def draw_stroke(self, painter, stroke_data):
+    def draw_stroke(self, painter, stroke_data, lod_tolerance=None):
         """Tek bir B-spline stroke çiz (modüler sistem için)"""
-        self.draw_bspline(painter, stroke_data)
+        self.draw_bspline(painter, stroke_data, lod_tolerance)
     
     def draw_all_bsplines(self, painter, strokes):
         """Tüm B-spline'ları çiz"""
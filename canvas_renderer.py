@@ -1,15 +1,227 @@
-from typing import Optional, Sequence
+import math
+from collections import OrderedDict
 
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QImage
+from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QImage, QPicture, QTransform
 from PyQt6.QtCore import Qt, QRectF, QPointF
+from stroke_points import ensure_stroke_points
+
+
+class StrokeTileCache:
+    """Tamamlanmış stroke'lar için zoom seviyesine bağlı raster karo önbelleği.
+
+    Karolar zoom uygulanmış sahne koordinatlarında sabit bir ızgaraya oturur;
+    böylece pan sırasında mevcut karolar tekrar kullanılır. Karolar tam cihaz
+    piksellerine blit edilir; pan offset'inin piksel altı kısmı (faz) karoya
+    çizilirken uygulanır ve anahtara girer. Değişen bölgeler sahne
+    koordinatında dirty rect ile geçersiz kılınır.
+    """
+
+    TILE_SIZE = 256
+
+    def __init__(self, max_bytes=128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._tiles = OrderedDict()  # (zoom_key, dpr, faz, tx, ty) -> QImage
+        self._bytes = 0
+
+    @staticmethod
+    def zoom_key(zoom):
+        return round(float(zoom), 4)
+
+    def get(self, key):
+        image = self._tiles.get(key)
+        if image is not None:
+            self._tiles.move_to_end(key)
+        return image
+
+    def put(self, key, image):
+        old = self._tiles.pop(key, None)
+        if old is not None:
+            self._bytes -= old.sizeInBytes()
+        self._tiles[key] = image
+        self._bytes += image.sizeInBytes()
+        while self._bytes > self.max_bytes and len(self._tiles) > 1:
+            _, evicted = self._tiles.popitem(last=False)
+            self._bytes -= evicted.sizeInBytes()
+
+    def invalidate(self, scene_rect=None):
+        """Verilen sahne dikdörtgenine değen karoları sil; rect yoksa hepsini sil"""
+        if scene_rect is None:
+            self._tiles.clear()
+            self._bytes = 0
+            return
+        if scene_rect.isEmpty() and scene_rect.width() <= 0 and scene_rect.height() <= 0:
+            scene_rect = scene_rect.adjusted(-1, -1, 1, 1)
+        tile = self.TILE_SIZE
+        for key in list(self._tiles.keys()):
+            zoom, _dpr, phase, tx, ty = key
+            if zoom <= 0:
+                continue
+            span = tile / zoom
+            # Faz bir pikselden küçüktür; karo sahnede bir piksel kadar genişletilir
+            pad = 1.0 / zoom
+            tile_rect = QRectF(tx * span - pad, ty * span - pad, span + pad, span + pad)
+            if tile_rect.intersects(scene_rect):
+                self._bytes -= self._tiles.pop(key).sizeInBytes()
+
+    def clear(self):
+        self.invalidate(None)
+
 
 class CanvasRenderer:
     """DrawingWidget için render işlemlerini yöneten sınıf"""
     
     def __init__(self, drawing_widget):
         self.drawing_widget = drawing_widget
+        self.tile_cache = StrokeTileCache()
+        # Arka plan (renk, çizgiler, PDF sayfası) aynı karo ızgarasında ayrıca saklanır;
+        # ayarlar/boyut değişince (background_cache_key) tamamen silinir
+        self.background_cache = StrokeTileCache(max_bytes=64 * 1024 * 1024)
+        self._background_key = None
+        # Taşı/döndür/boyutlandır önizlemesi: seçim karolardan çıkarılır, bir kez
+        # QPicture'a kaydedilip rasterlanır ve her karede bu dönüşümle çizilir
+        self.transform_preview = None
+        self._preview_picture = None
+        self._preview_raster = None
+        self._preview_ids = frozenset()
+
+    # ------------------------------------------------------------------
+    # Karo önbelleği yardımcıları
+    # ------------------------------------------------------------------
+    def invalidate_tiles(self, scene_rect=None):
+        """Tamamlanmış stroke karolarını (tamamen veya bölgesel) geçersiz kıl"""
+        self.tile_cache.invalidate(scene_rect)
+
+    def invalidate_background(self):
+        """Arka plan karolarını sil (anahtara girmeyen bir değişiklik için)"""
+        self.background_cache.clear()
+
+    @staticmethod
+    def _settings_key(settings):
+        """Ayar sözlüğünün karşılaştırılabilir parmak izi (renkler RGBA olarak)"""
+        if not settings:
+            return ()
+        items = []
+        for name, value in settings.items():
+            if isinstance(value, (QColor, Qt.GlobalColor)):
+                value = QColor(value).rgba()
+            elif isinstance(value, (list, dict)):
+                value = repr(value)
+            items.append((name, value))
+        return tuple(sorted(items, key=lambda item: item[0]))
+
+    def background_cache_key(self):
+        """Arka planı belirleyen her şey: ayarlar, widget boyutu ve PDF sayfası"""
+        widget = self.drawing_widget
+        pdf_key = None
+        if hasattr(widget, 'has_pdf_background') and widget.has_pdf_background():
+            layer = widget.get_pdf_background_layer()
+            if layer:
+                # Sayfa resmi burada istenmez; sadece hazır olup olmadığı anahtara girer
+                try:
+                    ready = layer.is_page_ready(layer.current_page)
+                except Exception:
+                    ready = None
+                pdf_key = (id(layer), layer.current_page, layer.dpi, ready)
+        return (
+            self._settings_key(widget.background_settings),
+            self._settings_key(getattr(widget, 'grid_settings', None)),
+            widget.width(), widget.height(),
+            pdf_key,
+        )
+
+    @staticmethod
+    def stroke_dirty_rect(stroke_data):
+        """Stroke'un ekranda kapladığı alanı (kalınlık + gölge payı dahil) döndür"""
+        from stroke_handler import StrokeHandler
+        return StrokeHandler.get_stroke_render_bounds(stroke_data)
+
+    def invalidate_strokes(self, strokes):
+        """Verilen stroke'ların kapladığı karoları geçersiz kıl"""
+        for stroke_data in strokes:
+            rect = self.stroke_dirty_rect(stroke_data)
+            if rect is None:
+                # Sınır bulunamadıysa güvenli tarafta kal
+                self.tile_cache.invalidate(None)
+                return
+            self.tile_cache.invalidate(rect)
         
+    # ------------------------------------------------------------------
+    # Dönüşüm önizlemesi
+    # ------------------------------------------------------------------
+    # Önizleme rasterının üst sınırı; aşılırsa kayıt her karede vektörel oynatılır
+    PREVIEW_RASTER_MAX_PIXELS = 4096 * 4096
+
+    def begin_transform_preview(self, strokes):
+        """Stroke'ları (vurgularıyla) QPicture'a kaydet ve karolardan çıkar"""
+        picture = QPicture()
+        picture_painter = QPainter(picture)
+        picture_painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        picture_painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+        for stroke_data in strokes:
+            if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
+                stroke_data.render(picture_painter)
+            elif 'type' in stroke_data:
+                self.draw_stroke_full(picture_painter, stroke_data)
+        self.drawing_widget.selection_tool.draw_selected_stroke_highlight(
+            picture_painter, self.drawing_widget.strokes)
+        picture_painter.end()
+
+        self._preview_picture = picture
+        self._preview_raster = None
+        self._preview_ids = frozenset(id(stroke_data) for stroke_data in strokes)
+        self.transform_preview = QTransform()
+        self.invalidate_strokes(strokes)
+
+    def set_transform_preview(self, transform):
+        self.transform_preview = QTransform(transform)
+
+    def end_transform_preview(self):
+        """Önizlemeyi bitir; stroke'lar tekrar karolarda çizilir"""
+        self.transform_preview = None
+        self._preview_picture = None
+        self._preview_raster = None
+        self._preview_ids = frozenset()
+
+    def _get_preview_raster(self, zoom, dpr):
+        """Kaydı mevcut zoom'da bir kez rasterla; sürükleme boyunca sadece bu görüntü dönüştürülür"""
+        key = (StrokeTileCache.zoom_key(zoom), dpr)
+        if self._preview_raster is not None and self._preview_raster[0] == key:
+            return self._preview_raster[1], self._preview_raster[2]
+        self._preview_raster = None
+        rect = QRectF(self._preview_picture.boundingRect()).adjusted(-4, -4, 4, 4)
+        width = int(math.ceil(rect.width() * zoom * dpr))
+        height = int(math.ceil(rect.height() * zoom * dpr))
+        if rect.isEmpty() or width * height > self.PREVIEW_RASTER_MAX_PIXELS:
+            return None, None
+        image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        if image.isNull():
+            return None, None
+        image.fill(Qt.GlobalColor.transparent)
+        raster_painter = QPainter(image)
+        raster_painter.scale(width / rect.width(), height / rect.height())
+        raster_painter.translate(-rect.left(), -rect.top())
+        raster_painter.drawPicture(0, 0, self._preview_picture)
+        raster_painter.end()
+        self._preview_raster = (key, image, rect)
+        return image, rect
+
+    def _draw_transform_preview(self, painter, zoom):
+        try:
+            dpr = float(self.drawing_widget.devicePixelRatioF())
+        except Exception:
+            dpr = 1.0
+        image, rect = self._get_preview_raster(zoom, dpr)
+        painter.save()
+        painter.setTransform(self.transform_preview, True)
+        if image is None:
+            painter.drawPicture(0, 0, self._preview_picture)
+        else:
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+            painter.drawImage(rect, image)
+        painter.restore()
+
     def paint_event(self, event):
         """Ana paintEvent metodunu işle"""
         painter = QPainter(self.drawing_widget)
@@ -26,80 +238,35 @@ class CanvasRenderer:
         painter.scale(current_zoom, current_zoom)
         painter.translate(current_offset)
         
-        # Arka planı çiz
-        self.draw_background(painter)
-
         # Visible rect hesapla (performans için)
         visible_rect = event.rect()
         transform = painter.transform()
         inverse_transform = transform.inverted()[0]
         scene_rect = inverse_transform.mapRect(QRectF(visible_rect))
-        
-        # Akıllı render optimizasyonu
-        total_strokes = self.drawing_widget.layer_manager.count_visible_strokes()
-        use_culling = total_strokes > 100  # Moderate threshold - viewport culling
-        use_lod = total_strokes > 50  # Level of Detail optimization
-        
-        # LOD hesaplama - zoom seviyesine göre
-        zoom_level = current_zoom
-        high_detail = zoom_level > 1.0  # Yakın zoom - full detail
-        medium_detail = zoom_level > 0.5  # Orta zoom - reduced detail  
-        low_detail = zoom_level <= 0.5  # Uzak zoom - minimal detail
-        
-        # Tüm tamamlanmış stroke'ları çiz
-        for layer in self.drawing_widget.layer_manager.iter_layers():
-            if not layer['visible']:
-                continue
-            for stroke_data in layer['strokes']:
-                # Viewport culling kontrolü
-                if use_culling:
-                    try:
-                        if not self.stroke_intersects_scene(stroke_data, scene_rect):
-                            continue  # Görünmeyen stroke'ları atla
-                    except:
-                        pass  # Hata durumunda stroke'u çiz
 
-                # Image stroke kontrolü
-                if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
-                    # Resim stroke'ları için conditional antialiasing
-                    if not stroke_data.is_loading:
-                        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-                        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
-                    stroke_data.render(painter)
-                    continue
-
-                # Güvenlik kontrolü - eski stroke'lar için
-                if 'type' not in stroke_data:
-                    continue
-
-                # LOD bazlı rendering ayarları
-                if use_lod and low_detail:
-                    # Uzak zoom - minimal antialiasing, basit çizim
-                    painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-                    try:
-                        painter.setRenderHint(QPainter.RenderHint.HighQualityAntialiasing, True)
-                    except Exception:
-                        pass
-                    self.draw_stroke_simple(painter, stroke_data)
-                elif use_lod and medium_detail:
-                    # Orta zoom - orta kalite
-                    painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-                    try:
-                        painter.setRenderHint(QPainter.RenderHint.HighQualityAntialiasing, True)
-                    except Exception:
-                        pass
-                    self.draw_stroke_medium(painter, stroke_data)
-                else:
-                    # Yakın zoom veya LOD yok - full kalite
-                    painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-                    try:
-                        painter.setRenderHint(QPainter.RenderHint.HighQualityAntialiasing, True)
-                    except Exception:
-                        pass
-                    self.draw_stroke_full(painter, stroke_data)
+        # Arka planı çiz (mümkünse önbellekteki karolardan)
+        if self.background_cache.enabled:
+            key = self.background_cache_key()
+            if key != self._background_key:
+                self.background_cache.clear()
+                self._background_key = key
+            self._draw_tiled(painter, self.background_cache, visible_rect, current_zoom,
+                             current_offset, self._render_background_region)
+        else:
+            self.draw_background(painter, scene_rect, current_zoom)
+        
+        # Tamamlanmış stroke'ları çiz (mümkünse önbellekteki karolardan)
+        if self.tile_cache.enabled:
+            self._draw_tiled(painter, self.tile_cache, visible_rect, current_zoom,
+                             current_offset, self._render_strokes_region)
+        else:
+            self.draw_committed_strokes(painter, scene_rect, current_zoom)
 
-        # Seçim vurgusunu çiz
-        self.drawing_widget.selection_tool.draw_selected_stroke_highlight(painter, self.drawing_widget.strokes)
+        # Seçim vurgusunu çiz (önizlemede seçim vurgusuyla birlikte dönüştürülerek çizilir)
+        if self.transform_preview is not None:
+            self._draw_transform_preview(painter, current_zoom)
+        else:
+            self.drawing_widget.selection_tool.draw_selected_stroke_highlight(painter, self.drawing_widget.strokes)
         
         # Seçim dikdörtgenini çiz
         self.drawing_widget.selection_tool.draw_selection(painter)
@@ -144,6 +311,183 @@ class CanvasRenderer:
         except Exception:
             pass
 
+    # Uzak zoom sadeleştirmesinin izin verilen hatası (cihaz pikseli)
+    LOD_SCREEN_TOLERANCE = 0.5
+
+    def draw_committed_strokes(self, painter, scene_rect, current_zoom, use_culling=None):
+        """Görünür katmanlardaki tamamlanmış stroke'ları çiz.
+
+        Çizim sırasında yüklenmekte olan bir resim varsa False döner; bu durumda
+        sonuç önbelleğe alınmamalıdır.
+        """
+        complete = True
+        # Akıllı render optimizasyonu
+        total_strokes = self.drawing_widget.layer_manager.count_visible_strokes()
+        if use_culling is None:
+            use_culling = total_strokes > 100  # Moderate threshold - viewport culling
+        # LOD: uzak zoom'da serbest çizim/B-spline'lar önceden hesaplanmış
+        # sadeleştirme seviyesinden çizilir (hata LOD_SCREEN_TOLERANCE pikseli aşmaz)
+        lod_tolerance = None
+        if current_zoom < 1.0:
+            try:
+                dpr = float(painter.device().devicePixelRatioF())
+            except Exception:
+                dpr = 1.0
+            lod_tolerance = self.LOD_SCREEN_TOLERANCE / max(current_zoom * dpr, 1e-6)
+        
+        # Dönüşüm önizlemesindeki stroke'lar ayrıca çizilir
+        floating = self._preview_ids
+
+        # Tüm tamamlanmış stroke'ları çiz
+        layer_manager = self.drawing_widget.layer_manager
+        for layer in layer_manager.iter_layers():
+            if not layer['visible']:
+                continue
+            layer_strokes = layer['strokes']
+            if use_culling:
+                # Viewport culling - görünür alanla kesişen stroke'lar uzamsal indeksten
+                try:
+                    indices = layer_manager.query_strokes_in_rect(scene_rect, layer['id'])
+                    layer_strokes = [layer['strokes'][i] for i in indices]
+                except Exception:
+                    layer_strokes = layer['strokes']  # Hata durumunda hepsini çiz
+            for stroke_data in layer_strokes:
+                if floating and id(stroke_data) in floating:
+                    continue
+                # Image stroke kontrolü
+                if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
+                    # Resim stroke'ları için conditional antialiasing
+                    if stroke_data.is_loading:
+                        complete = False
+                    else:
+                        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+                        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+                    stroke_data.render(painter)
+                    continue
+
+                # Güvenlik kontrolü - eski stroke'lar için
+                if 'type' not in stroke_data:
+                    continue
+
+                painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+                try:
+                    painter.setRenderHint(QPainter.RenderHint.HighQualityAntialiasing, True)
+                except Exception:
+                    pass
+                if lod_tolerance is not None:
+                    self.draw_stroke_lod(painter, stroke_data, lod_tolerance)
+                else:
+                    self.draw_stroke_full(painter, stroke_data)
+
+        return complete
+
+    def _draw_tiled(self, painter, cache, visible_rect, zoom, offset, draw_region):
+        """Önbellekteki karoları blit et, eksik karoları draw_region ile üret"""
+        tile = cache.TILE_SIZE
+        if zoom <= 0:
+            return
+        try:
+            dpr = float(self.drawing_widget.devicePixelRatioF())
+        except Exception:
+            dpr = 1.0
+        zoom_key = cache.zoom_key(zoom)
+
+        # Cihaz koordinatı = zoom * (sahne + offset); karo ızgarası zoom * sahne üzerinde.
+        # Izgara tam cihaz pikseline oturtulur, kalan piksel altı faz karoya çizilir
+        # (aksi halde karolar yarım piksel kayıp doğrudan çizimden farklı örneklenir)
+        base_x, phase_x = self._snap_to_device(zoom * offset.x(), dpr)
+        base_y, phase_y = self._snap_to_device(zoom * offset.y(), dpr)
+        phase = (phase_x, phase_y)
+        first_tx = math.floor((visible_rect.left() - base_x) / tile)
+        last_tx = math.floor((visible_rect.right() + 1 - base_x) / tile)
+        first_ty = math.floor((visible_rect.top() - base_y) / tile)
+        last_ty = math.floor((visible_rect.bottom() + 1 - base_y) / tile)
+
+        # Eksik karoları tek geçişte üret: stroke'lar karo başına tekrar çizilmez
+        missing = [
+            (tx, ty)
+            for ty in range(first_ty, last_ty + 1)
+            for tx in range(first_tx, last_tx + 1)
+            if cache.get((zoom_key, dpr, phase, tx, ty)) is None
+        ]
+        fresh = self._render_tiles(cache, missing, zoom, dpr, phase, draw_region) if missing else {}
+
+        painter.save()
+        painter.resetTransform()
+        for ty in range(first_ty, last_ty + 1):
+            for tx in range(first_tx, last_tx + 1):
+                image = fresh.get((tx, ty))
+                if image is None:
+                    image = cache.get((zoom_key, dpr, phase, tx, ty))
+                if image is None:
+                    continue
+                painter.drawImage(QPointF(base_x + tx * tile, base_y + ty * tile), image)
+        painter.restore()
+
+    @staticmethod
+    def _snap_to_device(value, dpr):
+        """Mantıksal koordinatı tam cihaz pikseline indir: (tam kısım, faz)
+
+        Faz mantıksal birimdedir ve [0, 1/dpr) aralığındadır; anahtar olarak
+        kullanıldığı için kayan nokta gürültüsü yuvarlanarak atılır.
+        """
+        pixels = round(value * dpr, 4)
+        whole = math.floor(pixels)
+        return whole / dpr, round((pixels - whole) / dpr, 4)
+
+    def _render_tiles(self, cache, tiles, zoom, dpr, phase, draw_region):
+        """Verilen karoları kapsayan bölgeyi bir kez çiz ve karolara böl
+
+        draw_region(painter, region, zoom) bölgenin içeriğini sahne koordinatında
+        çizer; False dönerse (eksik veri) karolar önbelleğe alınmaz. Bölge
+        faz kadar kaydırılır: karo pikselleri doğrudan çizimle aynı ızgaradadır.
+        """
+        tile = cache.TILE_SIZE
+        min_tx = min(t[0] for t in tiles)
+        max_tx = max(t[0] for t in tiles)
+        min_ty = min(t[1] for t in tiles)
+        max_ty = max(t[1] for t in tiles)
+        cols = max_tx - min_tx + 1
+        rows = max_ty - min_ty + 1
+        tile_pixels = max(1, int(math.ceil(tile * dpr)))
+
+        canvas = QImage(cols * tile_pixels, rows * tile_pixels, QImage.Format.Format_ARGB32_Premultiplied)
+        if canvas.isNull():
+            return {}
+        canvas.setDevicePixelRatio(dpr)
+        canvas.fill(Qt.GlobalColor.transparent)
+
+        span = tile / zoom
+        region = QRectF(min_tx * span - phase[0] / zoom, min_ty * span - phase[1] / zoom,
+                        cols * span, rows * span)
+
+        region_painter = QPainter(canvas)
+        region_painter.scale(zoom, zoom)
+        region_painter.translate(-region.left(), -region.top())
+        complete = draw_region(region_painter, region, zoom)
+        region_painter.end()
+
+        zoom_key = cache.zoom_key(zoom)
+        result = {}
+        for tx, ty in tiles:
+            image = canvas.copy((tx - min_tx) * tile_pixels, (ty - min_ty) * tile_pixels,
+                                tile_pixels, tile_pixels)
+            image.setDevicePixelRatio(dpr)
+            result[(tx, ty)] = image
+            if complete:
+                # Yüklenmekte olan resim/PDF karosu varsa karolar önbelleğe alınmaz
+                cache.put((zoom_key, dpr, phase, tx, ty), image)
+        return result
+
+    def _render_strokes_region(self, painter, region, zoom):
+        # Bölge dışından taşan gölge/kalınlık için culling alanını biraz genişlet
+        cull_margin = 64.0
+        cull_rect = region.adjusted(-cull_margin, -cull_margin, cull_margin, cull_margin)
+        return self.draw_committed_strokes(painter, cull_rect, zoom, use_culling=True)
+
+    def _render_background_region(self, painter, region, zoom):
+        return self.draw_background(painter, region, zoom)
+
     def _draw_snap_indicator(self, painter):
         from grid_snap_utils import GridSnapUtils
         mouse_pos = self.drawing_widget.mapFromGlobal(self.drawing_widget.cursor().pos())
@@ -164,116 +508,114 @@ class CanvasRenderer:
         painter.restore()
             
     def stroke_intersects_scene(self, stroke_data, scene_rect):
-        """Gelişmiş stroke-viewport intersection kontrolü"""
-        try:
-            # Resim stroke'ları için
-            if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
-                stroke_rect = QRectF(stroke_data.position.x(), stroke_data.position.y(), 
-                                   stroke_data.size.x(), stroke_data.size.y())
-                return scene_rect.intersects(stroke_rect)
+        """Stroke'un çizim sınırı (kalınlık + gölge dahil) sahne alanıyla kesişiyor mu"""
+        rect = self.stroke_dirty_rect(stroke_data)
+        if rect is None:
+            return True  # Bilinmeyen tip veya hata - güvenli taraf
+        return scene_rect.intersects(rect)
             
-            # Normal stroke'lar için optimized bounds check
-            if 'points' in stroke_data and stroke_data['points']:
-                points = stroke_data['points']
-                if not points:
-                    return True
-                
-                # İlk ve son nokta ile hızlı pre-check
-                first_point = points[0]
-                last_point = points[-1]
-                width = stroke_data.get('width', 2) + 5  # Biraz margin
-                
-                # Bounding box hesapla (vectorized)
-                if len(points) == 1:
-                    min_x = max_x = first_point.x()
-                    min_y = max_y = first_point.y()
-                elif len(points) == 2:
-                    min_x = min(first_point.x(), last_point.x())
-                    max_x = max(first_point.x(), last_point.x())
-                    min_y = min(first_point.y(), last_point.y())
-                    max_y = max(first_point.y(), last_point.y())
-                else:
-                    # Çok nokta varsa sampling yap (performans)
-                    sample_points = points[::max(1, len(points)//10)]  # Her 10'da bir
-                    x_coords = [p.x() for p in sample_points]
-                    y_coords = [p.y() for p in sample_points]
-                    min_x, max_x = min(x_coords), max(x_coords)
-                    min_y, max_y = min(y_coords), max(y_coords)
-                
-                # Margin ile stroke rect
-                stroke_rect = QRectF(min_x - width, min_y - width, 
-                                   max_x - min_x + 2*width, max_y - min_y + 2*width)
-                
-                return scene_rect.intersects(stroke_rect)
-                
-            # Diğer stroke tipleri için
-            elif stroke_data.get('type') == 'line':
-                start = stroke_data['start_point']
-                end = stroke_data['end_point']
-                width = stroke_data.get('width', 2) + 5
-                min_x = min(start[0], end[0]) - width
-                max_x = max(start[0], end[0]) + width
-                min_y = min(start[1], end[1]) - width
-                max_y = max(start[1], end[1]) + width
-                stroke_rect = QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
-                return scene_rect.intersects(stroke_rect)
-                
-            elif stroke_data.get('type') == 'rectangle':
-                if 'corners' in stroke_data:
-                    corners = stroke_data['corners']
-                    x_coords = [c[0] for c in corners]
-                    y_coords = [c[1] for c in corners]
-                else:
-                    tl, br = stroke_data['top_left'], stroke_data['bottom_right']
-                    x_coords = [tl[0], br[0]]
-                    y_coords = [tl[1], br[1]]
-                
-                width = (stroke_data.get('line_width', stroke_data.get('width', 2))) + 5
-                min_x, max_x = min(x_coords) - width, max(x_coords) + width
-                min_y, max_y = min(y_coords) - width, max(y_coords) + width
-                stroke_rect = QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
-                return scene_rect.intersects(stroke_rect)
-                
-            elif stroke_data.get('type') == 'circle':
-                center = stroke_data['center']
-                radius = stroke_data['radius'] + (stroke_data.get('line_width', stroke_data.get('width', 2))) + 5
-                stroke_rect = QRectF(center[0] - radius, center[1] - radius, 
-                                   2 * radius, 2 * radius)
-                return scene_rect.intersects(stroke_rect)
-                
-            return True  # Bilinmeyen tip - güvenli taraf
-        except:
-            return True  # Hata durumunda çiz
-            
-    def draw_background(self, painter):
-        """Arka planı çiz"""
+    def draw_background(self, painter, scene_rect=None, zoom=1.0):
+        """Arka planı çiz
+
+        scene_rect verilirse (paint event'in kirli bölgesi) sadece o bölge çizilir.
+        PDF karoları henüz hazır değilse False döner (sonuç önbelleğe alınmamalı).
+        """
         # Arka plan rengini ayarla
         bg_color = QColor(self.drawing_widget.background_settings['background_color'])
-        painter.fillRect(self.drawing_widget.rect(), QBrush(bg_color))
+        fill_rect = QRectF(self.drawing_widget.rect())
+        if scene_rect is not None:
+            fill_rect = fill_rect.intersected(scene_rect)
+        painter.fillRect(fill_rect, QBrush(bg_color))
 
         if hasattr(self.drawing_widget, 'has_pdf_background') and self.drawing_widget.has_pdf_background():
             layer = self.drawing_widget.get_pdf_background_layer()
             if layer:
+                # Hazır değilse boş resim döner; sayfa gelince pageReady yeniden çizdirir
                 try:
                     image = layer.get_current_page_image()
+                    page_size = image.size() if not image.isNull() else layer.get_current_page_size()
                 except Exception:
-                    image = QImage()
-                if not image.isNull():
-                    painter.drawImage(0, 0, image)
-                    return
+                    image, page_size = QImage(), None
+                if page_size is not None:
+                    complete = None
+                    if scene_rect is not None:
+                        complete = self._draw_pdf_tiles(painter, layer, image, page_size, scene_rect, zoom)
+                    if complete is None:
+                        if image.isNull():
+                            return False
+                        self._draw_page_image(painter, image, scene_rect)
+                        complete = True
+                    return complete
 
         # Grid/Pattern çizimi
         if self.drawing_widget.background_settings['type'] == 'grid':
-            self.draw_grid_background(painter)
+            self.draw_grid_background(painter, scene_rect)
         elif self.drawing_widget.background_settings['type'] == 'dots':
-            self.draw_dots_background(painter)
+            self.draw_dots_background(painter, scene_rect)
         
         # Snap grid'i her arka plan tipinde göster (grid ayarları etkinse)
         if (hasattr(self.drawing_widget, 'grid_settings') and 
             self.drawing_widget.grid_settings.get('enabled', False)):
-            self.draw_snap_grid(painter)
+            self.draw_snap_grid(painter, scene_rect)
+        return True
+
+    @staticmethod
+    def _draw_page_image(painter, image, scene_rect=None):
+        """Sayfa resmini (sahnede 1 piksel = 1 birim) sadece görünen kısmıyla çiz"""
+        if scene_rect is None:
+            painter.drawImage(0, 0, image)
+            return
+        visible = QRectF(image.rect()).intersected(scene_rect.adjusted(-1, -1, 1, 1))
+        if not visible.isEmpty():
+            painter.drawImage(visible, image, visible)
+
+    @staticmethod
+    def _visible_lines(step, limit, scene_rect, axis, margin):
+        """0..limit arasında step aralıklı çizgilerden kirli bölgeye düşenlerin indeksleri"""
+        if step <= 0:
+            return range(0)
+        low, high = 0.0, float(limit)
+        if scene_rect is not None:
+            if axis == 'x':
+                low = max(low, scene_rect.left() - margin)
+                high = min(high, scene_rect.right() + margin)
+            else:
+                low = max(low, scene_rect.top() - margin)
+                high = min(high, scene_rect.bottom() + margin)
+        if high < low:
+            return range(0)
+        return range(max(0, math.ceil(low / step)), int(math.floor(high / step)) + 1)
             
-    def draw_grid_background(self, painter):
+    def _draw_pdf_tiles(self, painter, layer, page_image, page_size, scene_rect, zoom):
+        """PDF sayfasını zoom'a uygun çözünürlükteki karolarla çiz
+
+        Zoom ~%100 ise None döner ve tam sayfa resmi kullanılır. Hazır olmayan
+        karoların yerine önce sayfa resmi (hazırsa) ve önbellekteki kaba karolar
+        çizilir; bu durumda False, tüm karolar hazırsa True döner.
+        """
+        if not hasattr(layer, 'get_page_tiles'):
+            return None
+        device = painter.device()
+        dpr = device.devicePixelRatioF() if device is not None else 1.0
+        level = layer.tile_level_for_scale(zoom * dpr)
+        if level == 1.0:
+            return None
+
+        try:
+            tiles, placeholders, complete = layer.get_page_tiles(
+                layer.current_page, level, scene_rect, page_size)
+        except Exception:
+            return None
+
+        if not complete and not page_image.isNull():
+            self._draw_page_image(painter, page_image, scene_rect)
+        for target, tile_image in placeholders:
+            painter.drawImage(target, tile_image)
+        for target, tile_image in tiles:
+            painter.drawImage(target, tile_image)
+        return bool(complete)
+
+    def draw_grid_background(self, painter, scene_rect=None):
         """Çizgili arka plan çiz (sadece yatay çizgiler) - Major/Minor sistem"""
         # Minor grid ayarları
         minor_color = QColor(self.drawing_widget.background_settings.get('grid_color', QColor(200, 200, 200)))
@@ -298,17 +640,19 @@ class CanvasRenderer:
         
         # Sadece yatay çizgiler (çizgili kağıt gibi)
         minor_step = max(1.0, grid_size * minor_interval_val)
-        y = 0.0
-        while y <= height:
+        margin = max(minor_width, major_width) + 1
+        major_pen = QPen(major_color, major_width)
+        minor_pen = QPen(minor_color, minor_width)
+        for line_index in self._visible_lines(minor_step, height, scene_rect, 'y', margin):
+            y = line_index * minor_step
             idx = int(round(y / grid_size)) if grid_size > 0 else 0
             if idx % int(max(1, round(major_interval))) == 0:
-                painter.setPen(QPen(major_color, major_width))
+                painter.setPen(major_pen)
             else:
-                painter.setPen(QPen(minor_color, minor_width))
+                painter.setPen(minor_pen)
             painter.drawLine(0, int(round(y)), width, int(round(y)))
-            y += minor_step
              
-    def draw_snap_grid(self, painter):
+    def draw_snap_grid(self, painter, scene_rect=None):
         """Snap grid çiz - tüm arka plan tiplerinde görünür"""
         # Ayrı grid ayarlarını kullan
         grid_settings = getattr(self.drawing_widget, 'grid_settings', {})
@@ -328,31 +672,29 @@ class CanvasRenderer:
         width = rect.width()
         height = rect.height()
         
+        margin = max(minor_width, major_width) + 1
+        major_pen = QPen(major_color, major_width, Qt.PenStyle.DotLine)
+        minor_pen = QPen(minor_color, minor_width, Qt.PenStyle.DotLine)
+
         # Dikey çizgiler
-        x = 0.0
-        line_count = 0
-        while x <= width:
+        for line_count in self._visible_lines(grid_size, width, scene_rect, 'x', margin):
+            x = line_count * grid_size
             if line_count % major_interval == 0:
-                painter.setPen(QPen(major_color, major_width, Qt.PenStyle.DotLine))
+                painter.setPen(major_pen)
             else:
-                painter.setPen(QPen(minor_color, minor_width, Qt.PenStyle.DotLine))
+                painter.setPen(minor_pen)
             painter.drawLine(int(round(x)), 0, int(round(x)), height)
-            x += grid_size
-            line_count += 1
             
         # Yatay çizgiler
-        y = 0.0
-        line_count = 0
-        while y <= height:
+        for line_count in self._visible_lines(grid_size, height, scene_rect, 'y', margin):
+            y = line_count * grid_size
             if line_count % major_interval == 0:
-                painter.setPen(QPen(major_color, major_width, Qt.PenStyle.DotLine))
+                painter.setPen(major_pen)
             else:
-                painter.setPen(QPen(minor_color, minor_width, Qt.PenStyle.DotLine))
+                painter.setPen(minor_pen)
             painter.drawLine(0, int(round(y)), width, int(round(y)))
-            y += grid_size
-            line_count += 1
             
-    def draw_dots_background(self, painter):
+    def draw_dots_background(self, painter, scene_rect=None):
         """Kareli arka plan çiz (hem yatay hem dikey çizgiler) - Major/Minor sistem"""
         # Minor grid ayarları
         minor_color = QColor(self.drawing_widget.background_settings['grid_color'])
@@ -371,41 +713,35 @@ class CanvasRenderer:
         width = rect.width()
         height = rect.height()
         
+        margin = max(minor_width, major_width) + 1
+        major_pen = QPen(major_color, major_width)
+        minor_pen = QPen(minor_color, minor_width)
+
         # Dikey çizgiler (kareli için)
-        x = 0
-        line_count = 0
-        while x <= width:
+        for line_count in self._visible_lines(grid_size, width, scene_rect, 'x', margin):
+            x = line_count * grid_size
             # Her major_interval çizgide bir major grid çiz
             if line_count % major_interval == 0:
                 # Major çizgi
-                pen = QPen(major_color, major_width)
-                painter.setPen(pen)
+                painter.setPen(major_pen)
             else:
                 # Minor çizgi
-                pen = QPen(minor_color, minor_width)
-                painter.setPen(pen)
+                painter.setPen(minor_pen)
             
             painter.drawLine(x, 0, x, height)
-            x += grid_size
-            line_count += 1
             
         # Yatay çizgiler (kareli için)
-        y = 0
-        line_count = 0
-        while y <= height:
+        for line_count in self._visible_lines(grid_size, height, scene_rect, 'y', margin):
+            y = line_count * grid_size
             # Her major_interval çizgide bir major grid çiz
             if line_count % major_interval == 0:
                 # Major çizgi
-                pen = QPen(major_color, major_width)
-                painter.setPen(pen)
+                painter.setPen(major_pen)
             else:
                 # Minor çizgi
-                pen = QPen(minor_color, minor_width)
-                painter.setPen(pen)
+                painter.setPen(minor_pen)
             
             painter.drawLine(0, y, width, y)
-            y += grid_size
-            line_count += 1
 
     def render(self, painter):
         """PDF export için özel render metodu - zoom/pan olmadan sadece içerik"""
@@ -436,78 +772,22 @@ class CanvasRenderer:
             elif stroke_data['type'] == 'circle':
                 self.drawing_widget.circle_tool.draw_stroke(painter, stroke_data)
 
-    def render_pdf_background_only(
-        self,
-        painter,
-        preloaded_images: Optional[Sequence[QImage]] = None,
-        page_index: Optional[int] = None,
-    ):
-        """Sadece PDF arka planını çiz (stroke'lar olmadan)."""
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        # Önce PDF arka planını çizmeyi dene
-        drew_pdf = False
-        if (
-            hasattr(self.drawing_widget, 'has_pdf_background')
-            and self.drawing_widget.has_pdf_background()
-        ):
-            layer = self.drawing_widget.get_pdf_background_layer()
-            if layer:
-                image = QImage()
-                if (
-                    preloaded_images is not None
-                    and page_index is not None
-                    and 0 <= page_index < len(preloaded_images)
-                ):
-                    candidate = preloaded_images[page_index]
-                    if isinstance(candidate, QImage):
-                        image = candidate
-                if image.isNull():
-                    try:
-                        image = layer.get_current_page_image()
-                    except Exception:
-                        image = QImage()
-                if not image.isNull():
-                    painter.drawImage(0, 0, image)
-                    drew_pdf = True
-
-        # Eğer PDF arka planı yoksa beyaz doldur
-        if not drew_pdf:
-            bg_color = QColor(Qt.GlobalColor.white)
-            painter.fillRect(self.drawing_widget.rect(), QBrush(bg_color))
-
-    def render_with_pdf_background(
-        self,
-        painter,
-        preloaded_images: Optional[Sequence[QImage]] = None,
-        page_index: Optional[int] = None,
-    ):
-        """PDF arka planıyla birlikte export render (zoom/pan olmadan)."""
-        self.render_pdf_background_only(
-            painter,
-            preloaded_images=preloaded_images,
-            page_index=page_index,
-        )
-
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        # Üstüne tüm stroke'ları çiz
-        for stroke_data in self.drawing_widget.strokes:
-            if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
-                stroke_data.render(painter)
+    def draw_layer_state(self, painter, state):
+        """export_state biçimindeki katman durumunun görünür stroke'larını tam kalitede çiz (dışa aktarma)"""
+        layers = state.get('layers', {})
+        for layer_id in state.get('layer_order', list(layers.keys())):
+            layer = layers.get(layer_id)
+            if not layer or not layer.get('visible', True):
                 continue
-            if 'type' not in stroke_data:
-                continue
-            if stroke_data['type'] == 'bspline':
-                self.drawing_widget.bspline_tool.draw_stroke(painter, stroke_data)
-            elif stroke_data['type'] == 'freehand':
-                self.drawing_widget.freehand_tool.draw_stroke(painter, stroke_data)
-            elif stroke_data['type'] == 'line':
-                self.drawing_widget.line_tool.draw_stroke(painter, stroke_data)
-            elif stroke_data['type'] == 'rectangle':
-                self.drawing_widget.rectangle_tool.draw_stroke(painter, stroke_data)
-            elif stroke_data['type'] == 'circle':
-                self.drawing_widget.circle_tool.draw_stroke(painter, stroke_data)
+            for stroke_data in layer.get('strokes', ()):
+                if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
+                    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+                    stroke_data.render(painter)
+                    continue
+                if 'type' not in stroke_data:
+                    continue
+                painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+                self.draw_stroke_full(painter, stroke_data)
 
     def draw_stroke_full(self, painter, stroke_data):
         """Full kalite stroke çizimi"""
@@ -522,66 +802,18 @@ class CanvasRenderer:
         elif stroke_data['type'] == 'circle':
             self.drawing_widget.circle_tool.draw_stroke(painter, stroke_data)
     
-    def draw_stroke_medium(self, painter, stroke_data):
-        """Orta kalite stroke çizimi - nokta sayısını azalt"""
-        if stroke_data['type'] == 'freehand' and 'points' in stroke_data:
-            # Freehand için nokta sayısını azalt (performans)
-            original_points = stroke_data['points']
-            if len(original_points) > 10:
-                # Her 2. noktayı al
-                simplified_data = stroke_data.copy()
-                simplified_data['points'] = original_points[::2]
-                self.drawing_widget.freehand_tool.draw_stroke(painter, simplified_data)
-            else:
-                self.drawing_widget.freehand_tool.draw_stroke(painter, stroke_data)
-        else:
-            # Diğer tipler için normal çizim
-            self.draw_stroke_full(painter, stroke_data)
-    
-    def draw_stroke_simple(self, painter, stroke_data):
-        """Basit/hızlı stroke çizimi - minimal detail"""
-        # Renk ve kalınlık al
-        color = stroke_data.get('color', Qt.GlobalColor.black)
-        width = max(1, stroke_data.get('width', 2) * 0.7)  # İnce çiz
-        
-        # Basit pen oluştur
-        if isinstance(color, str):
-            color = QColor(color)
-        
-        pen = QPen(color)
-        pen.setWidthF(width)
-        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-        painter.setPen(pen)
-        
-        # Stroke tipine göre basit çizim
-        if stroke_data['type'] in ['freehand', 'bspline'] and 'points' in stroke_data:
-            points = stroke_data['points']
-            if len(points) > 4:
-                # Çok basitleştir - sadece start, mid, end
-                simplified_points = [points[0], points[len(points)//2], points[-1]]
-                for i in range(len(simplified_points) - 1):
-                    painter.drawLine(simplified_points[i], simplified_points[i + 1])
-            else:
-                # Az nokta varsa normal çiz
-                for i in range(len(points) - 1):
-                    painter.drawLine(points[i], points[i + 1])
-        elif stroke_data['type'] == 'line':
-            start = stroke_data['start_point']
-            end = stroke_data['end_point']
-            painter.drawLine(QPointF(start[0], start[1]), QPointF(end[0], end[1]))
-        elif stroke_data['type'] == 'rectangle':
-            if 'corners' in stroke_data:
-                corners = stroke_data['corners']
-                for i in range(4):
-                    p1 = QPointF(corners[i][0], corners[i][1])
-                    p2 = QPointF(corners[(i+1)%4][0], corners[(i+1)%4][1])
-                    painter.drawLine(p1, p2)
-            else:
-                tl, br = stroke_data['top_left'], stroke_data['bottom_right']
-                rect = QRectF(tl[0], tl[1], br[0]-tl[0], br[1]-tl[1])
-                painter.drawRect(rect)
-        elif stroke_data['type'] == 'circle':
-            center = stroke_data['center']
-            radius = stroke_data['radius']
-            rect = QRectF(center[0]-radius, center[1]-radius, 2*radius, 2*radius)
-            painter.drawEllipse(rect) 
\ No newline at end of file
+    def draw_stroke_lod(self, painter, stroke_data, tolerance):
+        """Uzak zoom çizimi: tolerance'a (sahne birimi) uygun RDP seviyesi kullanılır"""
+        stroke_type = stroke_data['type']
+        if stroke_type == 'freehand':
+            points = ensure_stroke_points(stroke_data)
+            simplified = points.simplified(tolerance)
+            if simplified is not points:
+                lod_data = dict(stroke_data)
+                lod_data['points'] = simplified
+                self.drawing_widget.freehand_tool.draw_stroke(painter, lod_data)
+                return
+        elif stroke_type == 'bspline':
+            self.drawing_widget.bspline_tool.draw_stroke(painter, stroke_data, tolerance)
+            return
+        self.draw_stroke_full(painter, stroke_data)
@@ -3,6 +3,7 @@ from PyQt6.QtGui import QPen, QBrush
 from PyQt6.QtCore import Qt
 from grid_snap_utils import GridSnapUtils
 from shadow_renderer import ShadowRenderer
+from stroke_handler import StrokeHandler
 
 class CircleTool:
     def __init__(self):
@@ -236,6 +237,24 @@ class CircleTool:
         
         painter.restore()
         
+    def get_preview_rect(self):
+        """Önizlemenin kapladığı sahne alanı (kalınlık + gölge payı dahil)"""
+        if not self.is_drawing or not self.start_point or not self.current_point:
+            return None
+        rect = QRectF(self.start_point, self.current_point).normalized()
+        # Çember, yardımcı dikdörtgenin merkezinde ortalama yarıçapla çizilir
+        radius = (rect.width() + rect.height()) / 4
+        rect = rect.united(QRectF(rect.center().x() - radius, rect.center().y() - radius, radius * 2, radius * 2))
+        pad = StrokeHandler.get_render_padding({
+            'width': self.line_width,
+            'has_shadow': self.has_shadow,
+            'shadow_blur': self.shadow_blur,
+            'shadow_size': self.shadow_size,
+            'shadow_offset_x': self.shadow_offset_x,
+            'shadow_offset_y': self.shadow_offset_y,
+        })
+        return rect.adjusted(-pad, -pad, pad, pad)
+
     def draw_current_stroke(self, painter):
         """Aktif olarak çizilen çemberi çiz"""
         if not self.is_drawing or not self.start_point or not self.current_point:
@@ -1,17 +1,165 @@
+import copy
+
+import numpy as np
 from PyQt6.QtCore import QPointF, QRectF, Qt
-from PyQt6.QtGui import QPainter, QPen
-from stroke_handler import ensure_qpointf
+from PyQt6.QtGui import QPainter, QPainterPath, QPen, QPolygonF
+from stroke_points import BOUNDS_KEY, StrokePoints, ensure_stroke_points
+
+
+# Parça uçlarında sayısal tolerans (segment parametresi cinsinden)
+_T_EPS = 1e-6
+# Bu uzunluktan kısa kalan çizgi parçaları atılır
+_MIN_PIECE_LENGTH = 0.5
+# Dikdörtgen/çember çerçevesi bu aralıkla örneklenir; serbest çizim
+# yumuşatması köşeleri yarım pikselden fazla yuvarlamaz
+_OUTLINE_STEP = 2.0
+# Çerçeve parçalara ayrılınca anlamını yitiren şekil alanları
+_SHAPE_ONLY_KEYS = frozenset((
+    'corners', 'top_left', 'bottom_right', 'center', 'radius', 'corner_radius',
+    'line_width', 'line_color', 'line_style', 'fill', 'fill_color', 'fill_opacity',
+    'is_filled', 'inner_shadow', BOUNDS_KEY,
+))
+
+
+def _linear_interval(g0, dg, g_min, g_max):
+    """g0 + t*dg değerinin [g_min, g_max] içinde kaldığı t aralığı (vektörel)"""
+    flat = np.abs(dg) < 1e-12
+    safe = np.where(flat, 1.0, dg)
+    t_a = (g_min - g0) / safe
+    t_b = (g_max - g0) / safe
+    lo = np.minimum(t_a, t_b)
+    hi = np.maximum(t_a, t_b)
+    inside = (g0 >= g_min) & (g0 <= g_max)
+    lo = np.where(flat, np.where(inside, -np.inf, np.inf), lo)
+    hi = np.where(flat, np.where(inside, np.inf, -np.inf), hi)
+    return lo, hi
+
+
+def _disk_interval(p0, d, center, radius):
+    """p0 + t*d doğrularının merkez/yarıçap dairesi içinde kalan t aralıkları"""
+    f = p0 - center
+    qa = (d * d).sum(axis=1)
+    qb = 2.0 * (d * f).sum(axis=1)
+    qc = (f * f).sum(axis=1) - radius * radius
+    degenerate = qa < 1e-12
+    safe_a = np.where(degenerate, 1.0, qa)
+    disc = qb * qb - 4.0 * safe_a * qc
+    root = np.sqrt(np.maximum(disc, 0.0))
+    lo = (-qb - root) / (2.0 * safe_a)
+    hi = (-qb + root) / (2.0 * safe_a)
+    miss = (disc < 0) & ~degenerate
+    # Sıfır uzunluklu segment: nokta daire içindeyse tamamı
+    lo = np.where(degenerate, np.where(qc <= 0, -np.inf, np.inf), np.where(miss, np.inf, lo))
+    hi = np.where(degenerate, np.where(qc <= 0, np.inf, -np.inf), np.where(miss, -np.inf, hi))
+    return lo, hi
+
+
+def segment_capsule_intervals(p0, p1, a, b, radius):
+    """p0[i] -> p1[i] segmentlerinin a-b kapsülü içinde kalan [lo, hi] aralıkları.
+
+    Kapsül; a ve b merkezli iki daire ile aradaki dikdörtgenin birleşimidir.
+    Dışbükey olduğundan her segmentle kesişimi tek bir aralıktır; üç parçanın
+    aralıklarının zarfı alınır. lo > hi ise segment kapsüle değmiyor.
+    """
+    p0 = np.asarray(p0, dtype=np.float64).reshape(-1, 2)
+    p1 = np.asarray(p1, dtype=np.float64).reshape(-1, 2)
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    d = p1 - p0
+
+    lo, hi = _disk_interval(p0, d, a, radius)
+    axis = b - a
+    length = float(np.hypot(axis[0], axis[1]))
+    if length > 1e-9:
+        b_lo, b_hi = _disk_interval(p0, d, b, radius)
+        lo = np.minimum(lo, b_lo)
+        hi = np.maximum(hi, b_hi)
+
+        # Daireler arasındaki dikdörtgen: eksen boyunca [0, L], dik yönde [-r, r]
+        u = axis / length
+        n = np.array([-u[1], u[0]])
+        rel = p0 - a
+        s_lo, s_hi = _linear_interval(rel @ u, d @ u, 0.0, length)
+        h_lo, h_hi = _linear_interval(rel @ n, d @ n, -radius, radius)
+        r_lo = np.maximum(s_lo, h_lo)
+        r_hi = np.minimum(s_hi, h_hi)
+        valid = r_lo <= r_hi
+        lo = np.where(valid, np.minimum(lo, r_lo), lo)
+        hi = np.where(valid, np.maximum(hi, r_hi), hi)
+
+    return np.maximum(lo, 0.0), np.minimum(hi, 1.0)
+
+
+def split_polyline(array, lo, hi):
+    """(N, K) nokta dizisini silinen segment aralıklarının dışında kalan parçalara böl.
+
+    lo/hi segment başına silinen parametre aralığıdır (lo > hi: dokunulmamış).
+    Kesim noktaları (basınç dahil tüm sütunlar) doğrusal enterpolasyonla eklenir.
+    """
+    count = len(array)
+    touched = np.flatnonzero(lo <= hi)
+
+    def at(index, t):
+        return array[index] + (array[index + 1] - array[index]) * t
+
+    pieces = []
+    start = (0, 0.0)  # Açık parçanın başlangıcı: (segment, parametre)
+    previous = -1
+    for k in touched.tolist():
+        t0 = float(lo[k])
+        t1 = float(hi[k])
+        if start is None and k > previous + 1:
+            # Sayısal sınırda dokunulmamış kalan nokta: yeni parça oradan başlar
+            start = (previous + 1, 0.0)
+        if start is not None:
+            head = at(*start)[None, :]
+            body = array[start[0] + 1:k + 1]
+            if t0 > _T_EPS:
+                pieces.append(np.vstack([head, body, at(k, t0)[None, :]]))
+            else:
+                pieces.append(np.vstack([head, body]))
+        start = (k, t1) if t1 < 1.0 - _T_EPS else None
+        previous = k
+
+    if start is None and previous + 1 < count - 1:
+        start = (previous + 1, 0.0)
+    if start is not None:
+        pieces.append(np.vstack([at(*start)[None, :], array[start[0] + 1:]]))
+
+    return [piece for piece in pieces if len(piece) >= 2]
+
+
+def split_closed_polyline(array, lo, hi):
+    """Kapalı (ilk nokta == son nokta) diziyi böl; ek yerinden geçen parça birleştirilir"""
+    pieces = split_polyline(array, lo, hi)
+    head_kept = not (lo[0] <= hi[0] and lo[0] <= _T_EPS)
+    tail_kept = not (lo[-1] <= hi[-1] and hi[-1] >= 1.0 - _T_EPS)
+    if len(pieces) >= 2 and head_kept and tail_kept:
+        pieces = [np.vstack([pieces[-1], pieces[0][1:]])] + pieces[1:-1]
+    return pieces
+
+
+def resample_polyline(xy, step):
+    """(N, 2) diziye, ardışık noktalar arası step'i geçmeyecek şekilde ara nokta ekle"""
+    segments = np.diff(xy, axis=0)
+    counts = np.maximum(1, np.ceil(np.hypot(segments[:, 0], segments[:, 1]) / step)).astype(np.int64)
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    t = (offsets / np.repeat(counts, counts))[:, None]
+    dense = np.repeat(xy[:-1], counts, axis=0) + np.repeat(segments, counts, axis=0) * t
+    return np.vstack([dense, xy[-1:]])
 
 
 class EraserTool:
     """Silgi aracı: fırça benzeri dairesel silme.
 
     Mantık:
-    - Canvas vektör tabanlı. Silme, vuruş (stroke) noktalarını silgi dairesiyle
-      kesişen kısımlardan kırparak yapılır.
-    - İlk sürüm: Silgi yarıçapı içinde kalan noktaları kaldırır.
-      Çok seyrekleşen stroke (<=1 nokta) tamamen silinir.
-    - Performans için sade bir yaklaşım.
+    - Canvas vektör tabanlı. Silgi her adımda önceki ve yeni imleç konumu
+      arasındaki kapsülü (süpürülen alan) siler; hızlı harekette boşluk kalmaz.
+    - Serbest çizimler ve çizgiler kapsülün kestiği yerden tam segment
+      kesişimiyle bölünür; kalan her parça ayrı stroke olur.
+    - Dikdörtgen/çember çerçevesi kapalı bir çoklu çizgiye çevrilip aynı
+      şekilde bölünür; kalan parçalar serbest çizim olur (dolgu düşer).
+    - Adaylar katmanın uzamsal indeksinden alınır, testler NumPy ile vektöreldir.
     """
 
     def __init__(self):
@@ -19,8 +167,7 @@ class EraserTool:
         self.radius = 16.0
         self.hardness = 1.0  # Gelecekte yumuşak silgi için
         self.current_pos = None
-        self._to_remove = set()
-        self._pending_compact = False
+        self._dirty_rect = None  # Son silme adımında değişen sahne bölgesi
 
     def set_radius(self, radius: float):
         try:
@@ -34,104 +181,249 @@ class EraserTool:
         self.current_pos = QPointF(pos)
 
     def update_erase(self, pos: QPointF, drawing_widget):
-        """Silme işlemini sürdür. Aktif katmandaki stroke'ları düzenler.
+        """Silme işlemini sürdür. Aktif katmandaki stroke'ları yerinde düzenler.
 
-        Nokta-tabanlı stroke'larda (freehand/bspline) silgi dairesi içinde kalan
-        noktaları kaldırır. Çizgi/şekiller için basit bir yakınlık kontrolü ile
-        tümü kaldırılır (ilk sürümde basitleştirilmiş davranış).
+        Önceki konumdan yeni konuma süpürülen kapsül ile kesişen stroke'lar
+        bölünür ya da kaldırılır. Değişiklik olduysa True döner.
         """
         if not self.is_erasing:
             return False
 
+        previous = self.current_pos if self.current_pos is not None else QPointF(pos)
         self.current_pos = QPointF(pos)
-
-        changed = False
-        # Aktif katman stroke listesini yerinde (in-place) düzenle
-        strokes = drawing_widget.strokes
-
-        from PyQt6.QtCore import QPointF as QPF, QRectF
-        try:
-            from stroke_handler import StrokeHandler
-        except Exception:
-            StrokeHandler = None
+        a = (previous.x(), previous.y())
+        b = (self.current_pos.x(), self.current_pos.y())
 
         r = float(self.radius)
-        r2 = r * r
-        erase_rect = QRectF(self.current_pos.x() - r, self.current_pos.y() - r, 2 * r, 2 * r)
+        sweep_rect = QRectF(QPointF(*a), QPointF(*b)).normalized().adjusted(-r, -r, r, r)
+
+        # Aktif katman stroke listesi yerinde (in-place) düzenlenir
+        strokes = drawing_widget.strokes
 
-        def point_inside(qp: QPF) -> bool:
-            dx = qp.x() - self.current_pos.x()
-            dy = qp.y() - self.current_pos.y()
-            return (dx * dx + dy * dy) <= r2
+        # Aday stroke'lar uzamsal indeksten (yarıçap kadar margin ile)
+        layer_manager = getattr(drawing_widget, 'layer_manager', None)
+        if layer_manager is not None:
+            candidates = layer_manager.query_strokes_in_rect(sweep_rect.adjusted(-r, -r, r, r))
+        else:
+            candidates = range(len(strokes))
 
-        for idx, s in enumerate(list(strokes)):
+        changed = False
+        # Sondan başa: parça ekleme/silme önceki index'leri kaydırmaz
+        for idx in sorted(candidates, reverse=True):
+            s = strokes[idx]
             # Image stroke'ları silgi ile işlemiyoruz (ileri sürümde maske olabilir)
             if hasattr(s, 'stroke_type') and getattr(s, 'stroke_type', None) == 'image':
                 continue
-
             if not hasattr(s, 'get') or 'type' not in s:
                 continue
 
-            stype = s.get('type')
-            # Hızlı bounding kontrolü (varsa)
-            if StrokeHandler is not None:
-                try:
-                    bounds = StrokeHandler.get_stroke_bounds(s)
-                    if bounds is not None:
-                        # Bir miktar margin ekle (yarıçap)
-                        inflated = bounds.adjusted(-r, -r, r, r)
-                        if not inflated.intersects(erase_rect):
-                            continue
-                except Exception:
-                    pass
-
-            if stype in ('freehand', 'bspline') and 'points' in s:
-                points = s['points']
-                kept = []
-                # In-place filtreleme (kopya listeyi oluşturup atayacağız)
-                for p in points:
-                    q = ensure_qpointf(p)
-                    if not point_inside(q):
-                        kept.append(q)
-                if len(kept) > 1:
-                    if len(kept) != len(points):
-                        s['points'] = kept
-                        changed = True
-                else:
-                    # Çok az nokta kaldıysa stroke'u tamamen kaldır (release'te compact edilir)
-                    self._to_remove.add(idx)
-                    self._pending_compact = True
-                    changed = True
-            elif stype in ('line', 'rectangle', 'circle'):
-                # Basit: silgi merkezine yakınsa tüm şekli kaldır
-                # Daha iyi: kenar-segment yakınlık testi (ileride)
-                if StrokeHandler is not None:
-                    try:
-                        if StrokeHandler.is_point_near_stroke(s, self.current_pos, tolerance=max(8, int(self.radius))):
-                            self._to_remove.add(idx)
-                            self._pending_compact = True
-                            changed = True
-                            continue
-                    except Exception:
-                        pass
-            else:
+            # Değişmeden önceki alan; parçalar bu alanın içinde kalır
+            before = self._stroke_dirty_rect(s)
+            try:
+                pieces = self._erase_stroke(s, a, b, r)
+            except Exception:
+                pieces = None
+            if pieces is None:
                 continue
 
-        # In-place değişiklikler yapıldı; anlık ek maliyet olmadan ekranda güncellenecek
+            self._mark_dirty(before)
+            if layer_manager is not None:
+                # Karolar take_dirty_rect ile (değişmeden önceki alan dahil) geçersiz kılınır;
+                # katman paneli bildirimleri silme bitene kadar biriktirilir
+                layer_manager.hold_stroke_notifications()
+                layer_manager.replace_strokes(idx, 1, pieces, invalidate=False)
+            else:
+                strokes[idx:idx + 1] = pieces
+            changed = True
+
         return changed
 
+    def _erase_stroke(self, s, a, b, r):
+        """Tek stroke'a kapsülü uygula.
+
+        None: dokunulmadı, []: tamamen silindi, aksi halde yerine geçecek
+        parçalar (ilki her zaman stroke'un kendisidir).
+        """
+        stype = s.get('type')
+        # Kesim, kalem kalınlığının yarısı kadar geniş yapılır; yuvarlak uç
+        # silgi dairesinin kenarına kadar uzanır
+        reach = r + float(s.get('width', s.get('line_width', 0)) or 0) / 2.0
+
+        if stype == 'freehand' and 'points' in s:
+            points = ensure_stroke_points(s)
+            array = points.array
+            if len(array) < 2:
+                if len(array) == 1:
+                    lo, hi = segment_capsule_intervals(array[:, :2], array[:, :2], a, b, reach)
+                    if lo[0] <= hi[0]:
+                        return []
+                return None
+            xy = array[:, :2]
+            lo, hi = segment_capsule_intervals(xy[:-1], xy[1:], a, b, reach)
+            if not (lo <= hi).any():
+                return None
+            pieces = split_polyline(array.astype(np.float64), lo, hi)
+            if not pieces:
+                return []
+            # Basınç değerleri noktalarla birlikte kırpılır
+            s['points'] = StrokePoints(pieces[0])
+            return [s] + [self._clone_with(s, points=StrokePoints(piece)) for piece in pieces[1:]]
+
+        if stype == 'line':
+            start = np.array(s['start_point'][:2], dtype=np.float64)
+            end = np.array(s['end_point'][:2], dtype=np.float64)
+            lo, hi = segment_capsule_intervals(start, end, a, b, reach)
+            if lo[0] > hi[0]:
+                return None
+            length = float(np.hypot(*(end - start)))
+            spans = [(0.0, float(lo[0])), (float(hi[0]), 1.0)]
+            spans = [(t0, t1) for t0, t1 in spans if (t1 - t0) * length >= _MIN_PIECE_LENGTH]
+            if not spans:
+                return []
+            ends = [(tuple((start + (end - start) * t0).tolist()), tuple((start + (end - start) * t1).tolist()))
+                    for t0, t1 in spans]
+            s['start_point'], s['end_point'] = ends[0]
+            return [s] + [self._clone_with(s, start_point=p0, end_point=p1) for p0, p1 in ends[1:]]
+
+        if stype in ('rectangle', 'circle'):
+            if stype == 'circle':
+                # Hızlı eleme: merkezin kapsül eksenine en yakın uzaklığı R + r'den
+                # küçük ve en uzak ucu R - r'den büyük değilse çembere değilmez
+                center = np.array(s['center'][:2], dtype=np.float64)
+                radius = float(s.get('radius', 0))
+                near, far = self._segment_distance_range(center, a, b)
+                if near > radius + reach or far < radius - reach:
+                    return None
+            outline = self._shape_outline(s)
+            if outline is None:
+                return None
+            lo, hi = segment_capsule_intervals(outline[:-1], outline[1:], a, b, reach)
+            if not (lo <= hi).any():
+                return None
+            array = np.ones((len(outline), 3), dtype=np.float64)
+            array[:, :2] = outline
+            pieces = split_closed_polyline(array, lo, hi)
+            if not pieces:
+                return []
+            # Açılan çerçeve dolgu tutamaz: şekil yerinde serbest çizime dönüşür
+            # (kimlik, grup ve gölge alanları korunur)
+            converted = self._shape_as_freehand(s)
+            s.clear()
+            s.update(converted)
+            s['points'] = StrokePoints(pieces[0])
+            return [s] + [self._clone_with(s, points=StrokePoints(piece)) for piece in pieces[1:]]
+
+        return None
+
+    @staticmethod
+    def _clone_with(stroke_data, **fields):
+        """Stroke'un bağımsız kopyasını, verilen alanlar değiştirilmiş olarak üret"""
+        clone = {key: copy.deepcopy(value) for key, value in stroke_data.items() if key not in fields}
+        clone.update(fields)
+        return clone
+
+    @staticmethod
+    def _shape_as_freehand(stroke_data):
+        """Şekil stroke'unun çerçeve görünümünü taşıyan serbest çizim alanları"""
+        converted = {key: value for key, value in stroke_data.items() if key not in _SHAPE_ONLY_KEYS}
+        converted['type'] = 'freehand'
+        converted['color'] = stroke_data.get('color', stroke_data.get('line_color', Qt.GlobalColor.black))
+        converted['width'] = stroke_data.get('line_width', stroke_data.get('width', 2))
+        converted['style'] = stroke_data.get('line_style', Qt.PenStyle.SolidLine)
+        if stroke_data.get('inner_shadow', False):
+            # İç gölge açık çizgide anlamsız
+            converted['has_shadow'] = False
+        return converted
+
+    @staticmethod
+    def _shape_outline(stroke_data):
+        """Dikdörtgen/çember çerçevesini kapalı, sık örneklenmiş (N, 2) diziye çevir"""
+        path = QPainterPath()
+        if stroke_data.get('type') == 'circle':
+            radius = float(stroke_data.get('radius', 0) or 0)
+            if radius <= 0:
+                return None
+            center = QPointF(stroke_data['center'][0], stroke_data['center'][1])
+            path.addEllipse(center, radius, radius)
+        else:
+            corners = EraserTool._rectangle_corners(stroke_data)
+            if corners is None:
+                return None
+            points = [QPointF(x, y) for x, y in corners.tolist()]
+            corner_radius = float(stroke_data.get('corner_radius', 0) or 0)
+            # Eksenlere paralel dikdörtgen drawRoundedRect ile çizilir; döndürülmüşte
+            # köşeler quadTo ile yuvarlanır
+            first_edge = corners[1] - corners[0]
+            axis_aligned = len(corners) == 4 and np.abs(first_edge).min() < 1e-6
+            if corner_radius > 0 and axis_aligned:
+                path.addRoundedRect(QRectF(points[0], points[2]).normalized(), corner_radius, corner_radius)
+            elif corner_radius > 0:
+                from shadow_renderer import ShadowRenderer
+                path = ShadowRenderer._create_rounded_rectangle_path_for_clip(points, corner_radius)
+            else:
+                path.addPolygon(QPolygonF(points))
+                path.closeSubpath()
+
+        polygons = path.toSubpathPolygons()
+        if not polygons or polygons[0].count() < 2:
+            return None
+        xy = np.array([(point.x(), point.y()) for point in polygons[0]], dtype=np.float64)
+        if not np.allclose(xy[0], xy[-1]):
+            xy = np.vstack([xy, xy[:1]])
+        return resample_polyline(xy, _OUTLINE_STEP)
+
+    @staticmethod
+    def _rectangle_corners(stroke_data):
+        if 'corners' in stroke_data:
+            corners = np.array([c[:2] for c in stroke_data['corners']], dtype=np.float64)
+            return corners if len(corners) >= 2 else None
+        if 'top_left' in stroke_data and 'bottom_right' in stroke_data:
+            x0, y0 = stroke_data['top_left'][:2]
+            x1, y1 = stroke_data['bottom_right'][:2]
+            return np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)], dtype=np.float64)
+        return None
+
+    @staticmethod
+    def _segment_distance_range(point, a, b):
+        """point'in a-b segmentine en yakın ve en uzak mesafesi"""
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        axis = b - a
+        length_sq = float(axis @ axis)
+        t = 0.0 if length_sq < 1e-12 else min(1.0, max(0.0, float((point - a) @ axis) / length_sq))
+        near = float(np.hypot(*(point - (a + axis * t))))
+        far = max(float(np.hypot(*(point - a))), float(np.hypot(*(point - b))))
+        return near, far
+
+    @staticmethod
+    def _stroke_dirty_rect(stroke_data):
+        try:
+            from canvas_renderer import CanvasRenderer
+            return CanvasRenderer.stroke_dirty_rect(stroke_data)
+        except Exception:
+            return None
+
+    def _mark_dirty(self, rect):
+        """Stroke'un değişmeden önceki alanını dirty bölgeye ekle"""
+        if rect is None:
+            return
+        self._dirty_rect = rect if self._dirty_rect is None else self._dirty_rect.united(rect)
+
+    def take_dirty_rect(self):
+        """Biriken dirty bölgeyi döndür ve sıfırla"""
+        rect = self._dirty_rect
+        self._dirty_rect = None
+        return rect
+
     def finish_erase(self):
         self.is_erasing = False
-        # Kaldırılacaklar varsa, listeyi sıkıştır ve setter ile yaz (undo noktası sonrası)
-        if self._pending_compact and hasattr(self, '_to_remove') and self._to_remove:
-            # Mevcut aktif katman stroke listesi
-            try:
-                # drawing_widget'a erişim yok; kompakt işlemi EventHandler'da setter ile yapılacak
-                # Bu nedenle burada sadece bayrakları temizle
-                pass
-            finally:
-                self._to_remove.clear()
-                self._pending_compact = False
+
+    def cursor_rect(self):
+        """Silgi imlecinin kapladığı sahne alanı"""
+        if self.current_pos is None:
+            return None
+        r = self.radius + 2.0
+        return QRectF(self.current_pos.x() - r, self.current_pos.y() - r, 2 * r, 2 * r)
 
     def draw_cursor(self, painter: QPainter):
         if self.current_pos is None:
@@ -1,10 +1,16 @@
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtGui import QMouseEvent, QTabletEvent
-from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtCore import Qt, QPointF, QRectF
 import time
+from grid_snap_utils import GridSnapUtils
+from stroke_handler import StrokeHandler
 
 class EventHandler:
     """DrawingWidget için event handling işlemlerini yöneten sınıf"""
+
+    # Seçim katmanı için pay: sınır kutusu boşluğu (15-20), tutamaklar ve sayaç etiketi
+    SELECTION_OVERLAY_PADDING = 40
+    SELECTION_LABEL_WIDTH = 260
     
     def __init__(self, drawing_widget):
         self.drawing_widget = drawing_widget
@@ -12,6 +18,10 @@ class EventHandler:
         self._eraser_temp_active = False
         # Freehand otomatik grup kimliği (katman bazlı - sabit)
         self._freehand_active_group_id = None
+        # Kısmi yeniden çizim için araçların bir önceki önizleme alanları
+        self._preview_rect = None
+        self._rotate_line_rect = None
+        self._preview_base = None  # Dönüşüm önizlemesi başlangıç sınırı ve seçim alanı
         
     def handle_mouse_press(self, event: QMouseEvent):
         """Mouse press event'i işle"""
@@ -200,6 +210,15 @@ class EventHandler:
 
     def handle_tablet_event(self, event: QTabletEvent):
         """Tablet kalemi event'lerini işle"""
+        if event.type() == QTabletEvent.Type.TabletMove and self._queues_tablet_moves():
+            # Serbest çizimde örnekler tampona alınır, bir sonraki karede toplu işlenir
+            self.drawing_widget.tablet_handler.queue_event(event)
+            self.drawing_widget._throttled_tablet_update(dirty_only=True)
+            event.accept()
+            return
+        # Diğer olaylardan önce bekleyen örnekler sırayla işlenmeli
+        self.drawing_widget.process_tablet_samples()
+
         # Tablet handler ile optimize et
         pos, pressure, should_process = self.drawing_widget.tablet_handler.handle_tablet_event(event)
         
@@ -241,6 +260,13 @@ class EventHandler:
             
         event.accept()
 
+    def _queues_tablet_moves(self):
+        """Tablet hareketleri örnek tamponuna alınabilir mi (aktif serbest çizim)"""
+        if getattr(self, '_eraser_temp_active', False):
+            return False
+        return (self.drawing_widget.active_tool == "freehand"
+                and self.drawing_widget.freehand_tool.is_drawing)
+
     def _handle_tablet_press(self, pos, pressure):
         """Tablet press event'i işle"""
         using_eraser = (getattr(self.drawing_widget, 'active_tool', '') == 'eraser') or self._eraser_temp_active
@@ -249,7 +275,7 @@ class EventHandler:
             if not self.drawing_widget.eraser_tool.is_erasing:
                 self.drawing_widget.eraser_tool.start_erase(pos)
             # Donma hissini azaltmak için anlık update
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
             return
         if self.drawing_widget.active_tool == "bspline":
             if self.drawing_widget.bspline_tool.select_control_point(pos, self.drawing_widget.strokes):
@@ -285,13 +311,12 @@ class EventHandler:
         if using_eraser:
             if not self.drawing_widget.eraser_tool.is_erasing:
                 self.drawing_widget.eraser_tool.start_erase(pos)
-            if self.drawing_widget.eraser_tool.update_erase(pos, self.drawing_widget):
-                # Donma hissini azaltmak için anlık update
-                self.drawing_widget.update()
+            # Donma hissini azaltmak için anlık update (sadece değişen bölge)
+            self._erase_step(pos)
             return
         if self.drawing_widget.active_tool == "bspline":
             if self.drawing_widget.bspline_tool.selected_control_point is not None:
-                if self.drawing_widget.bspline_tool.move_control_point(pos, self.drawing_widget.strokes):
+                if self._move_bspline_control_point(pos):
                     self.drawing_widget._throttled_update()
             elif self.drawing_widget.bspline_tool.is_drawing:
                 self.drawing_widget.bspline_tool.add_point(pos, pressure)
@@ -299,19 +324,22 @@ class EventHandler:
         elif self.drawing_widget.active_tool == "freehand":
             if self.drawing_widget.freehand_tool.is_drawing:
                 self.drawing_widget.freehand_tool.add_point(pos, pressure, True)  # True = tablet
-                self.drawing_widget.update()  # INSTANT update - ASLA throttling yok
+                self.drawing_widget.update_live_stroke()  # Sadece kalem ucu bölgesi, bir sonraki karede
         elif self.drawing_widget.active_tool == "line":
             if self.drawing_widget.line_tool.is_drawing:
                 self.drawing_widget.line_tool.add_point(pos, pressure)
-                self.drawing_widget._throttled_tablet_update()
+                self._mark_shape_preview_dirty(self.drawing_widget.line_tool, pos)
+                self.drawing_widget._throttled_tablet_update(dirty_only=True)
         elif self.drawing_widget.active_tool == "rectangle":
             if self.drawing_widget.rectangle_tool.is_drawing:
                 self.drawing_widget.rectangle_tool.add_point(pos, pressure)
-                self.drawing_widget._throttled_tablet_update()
+                self._mark_shape_preview_dirty(self.drawing_widget.rectangle_tool, pos)
+                self.drawing_widget._throttled_tablet_update(dirty_only=True)
         elif self.drawing_widget.active_tool == "circle":
             if self.drawing_widget.circle_tool.is_drawing:
                 self.drawing_widget.circle_tool.add_point(pos, pressure)
-                self.drawing_widget._throttled_tablet_update()
+                self._mark_shape_preview_dirty(self.drawing_widget.circle_tool, pos)
+                self.drawing_widget._throttled_tablet_update(dirty_only=True)
         elif self.drawing_widget.active_tool == "select":
             self.handle_select_move(pos)
         elif self.drawing_widget.active_tool == "move":
@@ -331,56 +359,41 @@ class EventHandler:
             self._apply_eraser_compaction()
             self.drawing_widget.save_current_state("Erase")
             self.drawing_widget.eraser_tool.finish_erase()
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
             return
         if self.drawing_widget.active_tool == "bspline":
             if self.drawing_widget.bspline_tool.selected_control_point is not None:
                 self.drawing_widget.bspline_tool.clear_selection()
-                self.drawing_widget.update()
+                self.drawing_widget.update_overlay()
             elif self.drawing_widget.bspline_tool.is_drawing:
                 stroke_data = self.drawing_widget.bspline_tool.finish_stroke()
                 if stroke_data is not None:
-                    current_strokes = list(self.drawing_widget.strokes)
-                    current_strokes.append(stroke_data)
-                    self.drawing_widget.strokes = current_strokes
-                    self.drawing_widget.save_current_state("Add B-spline")
-                self.drawing_widget.update()
+                    self._commit_stroke(stroke_data, "Add B-spline")
+                self.drawing_widget.update_overlay()
         elif self.drawing_widget.active_tool == "freehand":
             if self.drawing_widget.freehand_tool.is_drawing:
                 stroke_data = self.drawing_widget.freehand_tool.finish_stroke()
                 if stroke_data is not None:
-                    current_strokes = list(self.drawing_widget.strokes)
-                    current_strokes.append(stroke_data)
-                    self.drawing_widget.strokes = current_strokes
-                    self.drawing_widget.save_current_state("Add freehand")
-                self.drawing_widget.update()
+                    self._commit_stroke(stroke_data, "Add freehand")
+                self.drawing_widget.update_overlay()
         elif self.drawing_widget.active_tool == "line":
             if self.drawing_widget.line_tool.is_drawing:
                 stroke_data = self.drawing_widget.line_tool.finish_stroke()
                 if stroke_data is not None:
-                    current_strokes = list(self.drawing_widget.strokes)
-                    current_strokes.append(stroke_data)
-                    self.drawing_widget.strokes = current_strokes
-                    self.drawing_widget.save_current_state("Add line")
-                self.drawing_widget.update()
+                    self._commit_stroke(stroke_data, "Add line")
+                self.drawing_widget.update_overlay()
         elif self.drawing_widget.active_tool == "rectangle":
             if self.drawing_widget.rectangle_tool.is_drawing:
                 stroke_data = self.drawing_widget.rectangle_tool.finish_stroke()
                 if stroke_data is not None:
-                    current_strokes = list(self.drawing_widget.strokes)
-                    current_strokes.append(stroke_data)
-                    self.drawing_widget.strokes = current_strokes
-                    self.drawing_widget.save_current_state("Add rectangle")
-                self.drawing_widget.update()
+                    self._commit_stroke(stroke_data, "Add rectangle")
+                self.drawing_widget.update_overlay()
         elif self.drawing_widget.active_tool == "circle":
             if self.drawing_widget.circle_tool.is_drawing:
                 stroke_data = self.drawing_widget.circle_tool.finish_stroke()
                 if stroke_data is not None:
-                    current_strokes = list(self.drawing_widget.strokes)
-                    current_strokes.append(stroke_data)
-                    self.drawing_widget.strokes = current_strokes
-                    self.drawing_widget.save_current_state("Add circle")
-                self.drawing_widget.update()
+                    self._commit_stroke(stroke_data, "Add circle")
+                self.drawing_widget.update_overlay()
         elif self.drawing_widget.active_tool == "select":
             self.handle_select_release(pos)
         elif self.drawing_widget.active_tool == "move":
@@ -399,14 +412,205 @@ class EventHandler:
         transformed_pos = self.drawing_widget.transform_mouse_pos(QPointF(event.pos()))
         self.drawing_widget.eraser_tool.start_erase(transformed_pos)
         # İlk anda da silme uygula
-        if self.drawing_widget.eraser_tool.update_erase(transformed_pos, self.drawing_widget):
-            self.drawing_widget.update()
+        self._erase_step(transformed_pos)
 
     def handle_eraser_move(self, event):
         if event.buttons() == Qt.MouseButton.LeftButton:
             transformed_pos = self.drawing_widget.transform_mouse_pos(QPointF(event.pos()))
-            if self.drawing_widget.eraser_tool.update_erase(transformed_pos, self.drawing_widget):
-                self.drawing_widget.update()
+            self._erase_step(transformed_pos)
+
+    def _erase_step(self, pos):
+        """Silgi adımı: sadece silinen bölge ile eski ve yeni imleç alanı yeniden çizilir"""
+        tool = self.drawing_widget.eraser_tool
+        self.drawing_widget.mark_dirty(tool.cursor_rect())
+        if tool.update_erase(pos, self.drawing_widget):
+            dirty = tool.take_dirty_rect()
+            if dirty is not None:
+                self.drawing_widget.invalidate_canvas_rect(dirty)
+                self.drawing_widget.mark_dirty(dirty)
+        self.drawing_widget.mark_dirty(tool.cursor_rect())
+        self.drawing_widget.update_dirty()
+
+    def _selection_render_bounds(self, indices):
+        """Verilen stroke'ların çizim sınırlarının birleşimi; bilinmiyorsa None"""
+        strokes = self.drawing_widget.strokes
+        rect = QRectF()
+        for index in indices:
+            if not 0 <= index < len(strokes):
+                continue
+            bounds = StrokeHandler.get_stroke_render_bounds(strokes[index])
+            if bounds is None:
+                return None
+            rect = rect.united(bounds)
+        return rect
+
+    def _overlay_rect_around(self, rect):
+        """Sınırın etrafına vurgu, sınır kutusu, tutamak ve etiket payını ekle"""
+        pad = self.SELECTION_OVERLAY_PADDING
+        rect = rect.adjusted(-pad, -pad, pad, pad)
+        # Sayaç etiketi sağ üst köşeden sola doğru taşabilir
+        label = QRectF(rect.right() - self.SELECTION_LABEL_WIDTH, rect.top() - pad,
+                       self.SELECTION_LABEL_WIDTH, pad)
+        return rect.united(label)
+
+    def _selection_overlay_rect(self, indices):
+        """Verilen stroke'ların vurgu, sınır kutusu, tutamak ve etiket alanı
+
+        Sınırı hesaplanamayan bir stroke varsa None döner.
+        """
+        rect = self._selection_render_bounds(indices)
+        if rect is None or rect.isNull():
+            return rect
+        return self._overlay_rect_around(rect)
+
+    def _mark_selection_dirty(self, indices):
+        """Seçim katmanının alanını kirli işaretle; alan bilinmiyorsa False döner"""
+        rect = self._selection_overlay_rect(indices)
+        if rect is None:
+            return False
+        if not rect.isNull():
+            self.drawing_widget.mark_dirty(rect)
+        return True
+
+    def _mark_shape_preview_dirty(self, tool, pos):
+        """Şekil aracının eski ve yeni önizleme alanını (snap göstergesi dahil) kirli işaretle"""
+        rect = tool.get_preview_rect()
+        if rect is not None and getattr(tool, 'shift_constrain', False):
+            snap_points = GridSnapUtils.get_snap_indicator_points(
+                pos, getattr(self.drawing_widget, 'background_settings', None))
+            for point in snap_points:
+                rect = rect.united(QRectF(point.x() - 2, point.y() - 2, 4, 4))
+        self.drawing_widget.mark_dirty(self._preview_rect)
+        self.drawing_widget.mark_dirty(rect)
+        self._preview_rect = rect
+
+    def _update_selection_drag(self, pos):
+        """Seçim dikdörtgenini güncelle; eski/yeni dikdörtgen ve değişen önizleme vurguları yenilenir"""
+        selection = self.drawing_widget.selection_tool
+        old_rect = selection.selection_rect
+        old_preview = set(selection.preview_strokes)
+        selection.update_selection(pos)
+        self.drawing_widget.preview_selection()
+
+        for rect in (old_rect, selection.selection_rect):
+            if rect is not None:
+                # Kenarlık kalemi 2px
+                self.drawing_widget.mark_dirty(rect.adjusted(-2, -2, 2, 2))
+        new_preview = set(selection.preview_strokes)
+        if new_preview != old_preview:
+            # Önizleme değişince tüm seçim kutusu ve sayaç etiketi de değişir
+            selected = set(selection.selected_strokes)
+            if not (self._mark_selection_dirty(selected | old_preview)
+                    and self._mark_selection_dirty(selected | new_preview)):
+                self.drawing_widget.update_overlay()
+                return
+        self.drawing_widget.update_dirty()
+
+    def _selected_stroke_objects(self):
+        strokes = self.drawing_widget.strokes
+        return [strokes[i] for i in self.drawing_widget.selection_tool.selected_strokes if 0 <= i < len(strokes)]
+
+    def _transform_selection(self, apply, tool, extra_dirty=None):
+        """Seçili stroke'ları dönüştür ve değişen alanı yeniden çiz.
+
+        Araç bir önizleme dönüşümü (preview_transform) tutuyorsa geometri
+        bırakılana kadar değişmez: seçim karolardan çıkarılır ve tek bir
+        QTransform ile çizilir, her adımda sadece eski ve yeni alan yenilenir.
+        """
+        if getattr(tool, 'preview_transform', None) is None:
+            return self._mutate_selection(apply, extra_dirty)
+
+        renderer = self.drawing_widget.canvas_renderer
+        if renderer.transform_preview is None:
+            self._begin_transform_preview()
+        old_rect = self._transform_preview_rect(renderer.transform_preview)
+        changed = apply()
+        if changed:
+            renderer.set_transform_preview(tool.preview_transform)
+            if old_rect is None:
+                self.drawing_widget.update_overlay()
+                return changed
+            self.drawing_widget.mark_dirty(old_rect)
+            self.drawing_widget.mark_dirty(self._transform_preview_rect(renderer.transform_preview))
+            if extra_dirty is not None:
+                for rect in extra_dirty():
+                    self.drawing_widget.mark_dirty(rect)
+            self.drawing_widget.update_dirty()
+        return changed
+
+    def _mutate_selection(self, apply, extra_dirty=None):
+        """Seçili stroke'ları yerinde değiştir; eski ve yeni alanları geçersiz kılıp yeniden çiz"""
+        selected = self._selected_stroke_objects()
+        indices = self.drawing_widget.selection_tool.selected_strokes
+        self.drawing_widget.invalidate_canvas_strokes(selected)
+        old_known = self._mark_selection_dirty(indices)
+        changed = apply()
+        if changed:
+            # Araçlar stroke'ları yerinde ya da kopyayla değiştirebilir; güncel listeden tekrar al
+            selected = self._selected_stroke_objects()
+            self.drawing_widget.layer_manager.update_stroke_bounds(selected)
+            self.drawing_widget.invalidate_canvas_strokes(selected)
+            if old_known and self._mark_selection_dirty(indices):
+                if extra_dirty is not None:
+                    for rect in extra_dirty():
+                        self.drawing_widget.mark_dirty(rect)
+                self.drawing_widget.update_dirty()
+            else:
+                self.drawing_widget.update_overlay()
+        return changed
+
+    def _begin_transform_preview(self):
+        """Seçimi önizleme katmanına al; başlangıç alanı bir kez yeniden çizilir"""
+        indices = self.drawing_widget.selection_tool.selected_strokes
+        bounds = self._selection_render_bounds(indices)
+        if bounds is None or bounds.isNull():
+            self._preview_base = None
+        else:
+            self._preview_base = (bounds, self._overlay_rect_around(bounds))
+        self.drawing_widget.canvas_renderer.begin_transform_preview(self._selected_stroke_objects())
+
+    def _transform_preview_rect(self, transform):
+        """Önizlemenin verilen dönüşümle kapladığı alan; bilinmiyorsa None"""
+        if self._preview_base is None:
+            return None
+        bounds, overlay = self._preview_base
+        # Kaydedilmiş içerik dönüşümle birlikte ölçeklenir; araç tutamakları ise
+        # dönüştürülmüş sınırın etrafına sabit payla çizilir
+        return transform.mapRect(overlay).united(self._overlay_rect_around(transform.mapRect(bounds)))
+
+    def _commit_transform_preview(self, commit):
+        """Önizleme dönüşümünü gerçek geometriye bir kez uygula ve etkilenen alanı yenile"""
+        renderer = self.drawing_widget.canvas_renderer
+        if renderer.transform_preview is None:
+            return
+        old_rect = self._transform_preview_rect(renderer.transform_preview)
+        renderer.end_transform_preview()
+        self._preview_base = None
+        commit(self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes)
+
+        # Başlangıç alanının karoları önizleme sırasında seçimsiz yeniden üretildi;
+        # stroke'ların yeni yerindeki karolar geçersiz kılınır
+        selected = self._selected_stroke_objects()
+        self.drawing_widget.layer_manager.update_stroke_bounds(selected)
+        self.drawing_widget.invalidate_canvas_strokes(selected)
+        if old_rect is not None and self._mark_selection_dirty(self.drawing_widget.selection_tool.selected_strokes):
+            self.drawing_widget.mark_dirty(old_rect)
+            self.drawing_widget.update_dirty()
+        else:
+            self.drawing_widget.update_overlay()
+
+    def _move_bspline_control_point(self, pos):
+        """Kontrol noktasını taşı ve etkilenen eğrinin karolarını geçersiz kıl"""
+        tool = self.drawing_widget.bspline_tool
+        strokes = self.drawing_widget.strokes
+        stroke_index = tool.selected_control_point[0] if tool.selected_control_point else None
+        affected = [strokes[stroke_index]] if stroke_index is not None and 0 <= stroke_index < len(strokes) else []
+        self.drawing_widget.invalidate_canvas_strokes(affected)
+        moved = tool.move_control_point(pos, strokes)
+        if moved and affected:
+            self.drawing_widget.layer_manager.update_stroke_bounds([strokes[stroke_index]])
+            self.drawing_widget.invalidate_canvas_strokes([strokes[stroke_index]])
+        return moved
 
     def handle_eraser_release(self, event):
         # Final kompakt ve undo kaydı
@@ -414,36 +618,22 @@ class EventHandler:
         if self.drawing_widget.eraser_tool.is_erasing:
             self.drawing_widget.save_current_state("Erase")
         self.drawing_widget.eraser_tool.finish_erase()
-        self.drawing_widget.update()
+        self.drawing_widget.update_overlay()
 
     def _apply_eraser_compaction(self):
-        """EraserTool'un işaretlediği stroke'ları kalıcı olarak kaldır."""
-        tool = getattr(self.drawing_widget, 'eraser_tool', None)
-        if tool is None:
-            return
-        remove_set = set(getattr(tool, '_to_remove', set()))
-        pending = bool(getattr(tool, '_pending_compact', False))
-        # Ayrıca 1 noktadan az kalan freehand stroke'ları at
-        if not remove_set and not pending:
-            return
-        strokes_list = list(self.drawing_widget.strokes)
-        new_strokes = []
-        for i, s in enumerate(strokes_list):
-            if i in remove_set:
-                continue
-            if hasattr(s, 'get') and s.get('type') == 'freehand':
-                pts = s.get('points', [])
-                if pts is None or len(pts) <= 1:
-                    continue
-            new_strokes.append(s)
-        # Uygula
-        self.drawing_widget.strokes = new_strokes
-        # Bayrakları sıfırla
-        try:
-            tool._to_remove.clear()
-        except Exception:
-            pass
-        tool._pending_compact = False
+        """Silme boyunca biriken stroke aralığı bildirimlerini gönder.
+
+        EraserTool listeyi LayerManager.replace_strokes ile yerinde düzenler;
+        katman paneli sadece silme bitince, değişen aralıklar için güncellenir.
+        """
+        layer_manager = getattr(self.drawing_widget, 'layer_manager', None)
+        if layer_manager is not None:
+            layer_manager.release_stroke_notifications()
+
+    def _commit_stroke(self, stroke_data, description):
+        """Tamamlanan stroke'u aktif katmana ekle ve geri alma noktası oluştur"""
+        self.drawing_widget.layer_manager.append_stroke(stroke_data)
+        self.drawing_widget.save_current_state(description)
 
     def handle_key_press(self, event):
         """Klavye tuşu basıldığında"""
@@ -458,7 +648,7 @@ class EventHandler:
                 self.drawing_widget.scale_tool.set_shift_pressed(True)
                 # Eğer aktif olarak ölçeklendirme yapılıyorsa, ekranı güncelle
                 if self.drawing_widget.scale_tool.is_scaling:
-                    self.drawing_widget.update()
+                    self.drawing_widget.update_overlay()
             # Line tool için yatay/dikey kısıtlama
             if hasattr(self.drawing_widget, 'line_tool'):
                 self.drawing_widget.line_tool.shift_constrain = True
@@ -485,7 +675,7 @@ class EventHandler:
                 self.drawing_widget.scale_tool.set_shift_pressed(False)
                 # Eğer aktif olarak ölçeklendirme yapılıyorsa, ekranı güncelle
                 if self.drawing_widget.scale_tool.is_scaling:
-                    self.drawing_widget.update()
+                    self.drawing_widget.update_overlay()
             # Line tool için kısıtlamayı kapat
             if hasattr(self.drawing_widget, 'line_tool'):
                 self.drawing_widget.line_tool.shift_constrain = False
@@ -517,7 +707,7 @@ class EventHandler:
                                 s['show_control_points'] = False
                                 changed = True
                 if changed:
-                    self.drawing_widget.update()
+                    self.drawing_widget.update_contents()
                 # Cursor ve araç reset
                 self.drawing_widget.setCursor(Qt.CursorShape.ArrowCursor)
                 if hasattr(self.drawing_widget, 'main_window') and self.drawing_widget.main_window:
@@ -569,7 +759,7 @@ class EventHandler:
             # Sürüklerken kapalı el
             self.drawing_widget.setCursor(Qt.CursorShape.ClosedHandCursor)
             transformed_pos = self.drawing_widget.transform_mouse_pos(QPointF(event.pos()))
-            if self.drawing_widget.bspline_tool.move_control_point(transformed_pos, self.drawing_widget.strokes):
+            if self._move_bspline_control_point(transformed_pos):
                 self.drawing_widget._throttled_update()
         # B-spline çizimi devam ediyorsa (edit_mode değilken)
         elif (not getattr(self.drawing_widget.bspline_tool, 'edit_mode', False)
@@ -586,7 +776,7 @@ class EventHandler:
         # Eğer kontrol noktası taşınıyorsa, seçimi temizle
         if self.drawing_widget.bspline_tool.selected_control_point is not None:
             self.drawing_widget.bspline_tool.clear_selection()
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
             # Bırakınca edit modundaysa PointingHand, değilse varsayılan
             if getattr(self.drawing_widget.bspline_tool, 'edit_mode', False):
                 self.drawing_widget.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -596,11 +786,8 @@ class EventHandler:
         elif self.drawing_widget.bspline_tool.is_drawing:
             stroke_data = self.drawing_widget.bspline_tool.finish_stroke()
             if stroke_data is not None:
-                current_strokes = list(self.drawing_widget.strokes)
-                current_strokes.append(stroke_data)
-                self.drawing_widget.strokes = current_strokes
-                self.drawing_widget.save_current_state("Add B-spline")
-            self.drawing_widget.update()
+                self._commit_stroke(stroke_data, "Add B-spline")
+            self.drawing_widget.update_overlay()
 
     def handle_freehand_press(self, event):
         """Serbest çizim başlat"""
@@ -615,7 +802,7 @@ class EventHandler:
         except Exception:
             active_layer_id = None
         self._freehand_active_group_id = f"freehand_{active_layer_id}" if active_layer_id else "freehand_default"
-        self.drawing_widget.update()
+        self.drawing_widget.update_overlay()
 
     def handle_freehand_move(self, event):
         """Serbest çizim devam ettir"""
@@ -625,12 +812,13 @@ class EventHandler:
             pressure = self.drawing_widget.tablet_handler.get_optimized_pressure(event)
             is_tablet = self.drawing_widget.tablet_handler.is_tablet_in_use()
             self.drawing_widget.freehand_tool.add_point(transformed_pos, pressure, is_tablet)
+            self.drawing_widget.mark_dirty(self.drawing_widget.freehand_tool.take_dirty_rect())
             
             # Tablet kullanımındaysa tablet throttling, değilse freehand throttling
             if is_tablet:
-                self.drawing_widget._throttled_tablet_update()
+                self.drawing_widget._throttled_tablet_update(dirty_only=True)
             else:
-                self.drawing_widget._throttled_freehand_update()
+                self.drawing_widget._throttled_freehand_update(dirty_only=True)
 
     def handle_freehand_release(self, event):
         """Serbest çizimi tamamla"""
@@ -645,11 +833,8 @@ class EventHandler:
                         setattr(stroke_data, 'group_id', self._freehand_active_group_id)
                 except Exception:
                     pass
-                current_strokes = list(self.drawing_widget.strokes)
-                current_strokes.append(stroke_data)
-                self.drawing_widget.strokes = current_strokes
-                self.drawing_widget.save_current_state("Add freehand")
-            self.drawing_widget.update()
+                self._commit_stroke(stroke_data, "Add freehand")
+            self.drawing_widget.update_overlay()
         # Freehand bitince (bir sonraki stroke da aynı katman kimliği ile ayarlanır)
         self._freehand_active_group_id = None
 
@@ -663,7 +848,7 @@ class EventHandler:
         except Exception:
             pass
         self.drawing_widget.line_tool.start_stroke(transformed_pos, pressure)
-        self.drawing_widget.update()
+        self.drawing_widget.update_overlay()
 
     def handle_line_move(self, event):
         """Çizgi çizimi devam ettir"""
@@ -676,18 +861,16 @@ class EventHandler:
             except Exception:
                 pass
             self.drawing_widget.line_tool.add_point(transformed_pos, pressure)
-            self.drawing_widget._throttled_freehand_update()
+            self._mark_shape_preview_dirty(self.drawing_widget.line_tool, transformed_pos)
+            self.drawing_widget._throttled_freehand_update(dirty_only=True)
 
     def handle_line_release(self, event):
         """Çizgiyi tamamla"""
         if self.drawing_widget.line_tool.is_drawing:
             stroke_data = self.drawing_widget.line_tool.finish_stroke()
             if stroke_data is not None:
-                current_strokes = list(self.drawing_widget.strokes)
-                current_strokes.append(stroke_data)
-                self.drawing_widget.strokes = current_strokes
-                self.drawing_widget.save_current_state("Add line")
-            self.drawing_widget.update()
+                self._commit_stroke(stroke_data, "Add line")
+            self.drawing_widget.update_overlay()
 
     def handle_rectangle_press(self, event):
         """Dikdörtgen çizimi başlat"""
@@ -698,7 +881,7 @@ class EventHandler:
         except Exception:
             pass
         self.drawing_widget.rectangle_tool.start_stroke(transformed_pos, pressure)
-        self.drawing_widget.update()
+        self.drawing_widget.update_overlay()
 
     def handle_rectangle_move(self, event):
         """Dikdörtgen çizimi devam ettir"""
@@ -710,18 +893,16 @@ class EventHandler:
             except Exception:
                 pass
             self.drawing_widget.rectangle_tool.add_point(transformed_pos, pressure)
-            self.drawing_widget._throttled_freehand_update()
+            self._mark_shape_preview_dirty(self.drawing_widget.rectangle_tool, transformed_pos)
+            self.drawing_widget._throttled_freehand_update(dirty_only=True)
 
     def handle_rectangle_release(self, event):
         """Dikdörtgeni tamamla"""
         if self.drawing_widget.rectangle_tool.is_drawing:
             stroke_data = self.drawing_widget.rectangle_tool.finish_stroke()
             if stroke_data is not None:
-                current_strokes = list(self.drawing_widget.strokes)
-                current_strokes.append(stroke_data)
-                self.drawing_widget.strokes = current_strokes
-                self.drawing_widget.save_current_state("Add rectangle")
-            self.drawing_widget.update()
+                self._commit_stroke(stroke_data, "Add rectangle")
+            self.drawing_widget.update_overlay()
 
     def handle_circle_press(self, event):
         """Çember çizimi başlat"""
@@ -732,7 +913,7 @@ class EventHandler:
         except Exception:
             pass
         self.drawing_widget.circle_tool.start_stroke(transformed_pos, pressure)
-        self.drawing_widget.update()
+        self.drawing_widget.update_overlay()
 
     def handle_circle_move(self, event):
         """Çember çizimi devam ettir"""
@@ -744,32 +925,28 @@ class EventHandler:
             except Exception:
                 pass
             self.drawing_widget.circle_tool.add_point(transformed_pos, pressure)
-            self.drawing_widget._throttled_freehand_update()
+            self._mark_shape_preview_dirty(self.drawing_widget.circle_tool, transformed_pos)
+            self.drawing_widget._throttled_freehand_update(dirty_only=True)
 
     def handle_circle_release(self, event):
         """Çemberi tamamla"""
         if self.drawing_widget.circle_tool.is_drawing:
             stroke_data = self.drawing_widget.circle_tool.finish_stroke()
             if stroke_data is not None:
-                current_strokes = list(self.drawing_widget.strokes)
-                current_strokes.append(stroke_data)
-                self.drawing_widget.strokes = current_strokes
-                self.drawing_widget.save_current_state("Add circle")
-            self.drawing_widget.update()
+                self._commit_stroke(stroke_data, "Add circle")
+            self.drawing_widget.update_overlay()
 
     def handle_select_press(self, pos):
         """Seçim başlat - hybrid sistem: hem tek tıklama hem sürükleme"""
         # Her zaman seçim dikdörtgenini başlat (sürükleme için)
         self.drawing_widget.selection_tool.start_selection(pos)
-        self.drawing_widget.update()
+        self.drawing_widget.update_overlay()
 
     def handle_select_move(self, pos):
         """Seçim güncelle"""
         if self.drawing_widget.selection_tool.is_selecting:
-            self.drawing_widget.selection_tool.update_selection(pos)
             # Real-time seçim güncellemesi (preview)
-            self.drawing_widget.preview_selection()
-            self.drawing_widget.update()
+            self._update_selection_drag(pos)
 
     def handle_select_release(self, pos):
         """Seçimi tamamla - hybrid sistem"""
@@ -789,7 +966,7 @@ class EventHandler:
                 
             # Seçim değişti - shape properties dock'unu güncelle
             self.drawing_widget.update_shape_properties()
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
 
     def handle_move_press(self, pos):
         """Taşıma başlat - hybrid sistem: tek tıklama + sürükleme seçimi"""
@@ -808,14 +985,14 @@ class EventHandler:
                 if clicked_stroke in selected_list:
                     self.drawing_widget._move_state_saved = True
                     self.drawing_widget.move_tool.start_move(pos, self.drawing_widget.strokes, selected_list)
-                    self.drawing_widget.update()
+                    self.drawing_widget.update_overlay()
                     return
                 else:
                     bounding_rect = self.drawing_widget.selection_tool.get_selection_bounding_rect(self.drawing_widget.strokes)
                     if bounding_rect and bounding_rect.contains(pos):
                         self.drawing_widget._move_state_saved = True
                         self.drawing_widget.move_tool.start_move(pos, self.drawing_widget.strokes, selected_list)
-                        self.drawing_widget.update()
+                        self.drawing_widget.update_overlay()
                         return
 
             # Aksi halde: tekli seçim davranışı - tıklanan stroke'u seç ve taşı
@@ -823,7 +1000,7 @@ class EventHandler:
             self.drawing_widget._move_state_saved = True
             self.drawing_widget.move_tool.start_move(pos, self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes)
             self.drawing_widget.update_shape_properties()
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
         elif self.drawing_widget.selection_tool.selected_strokes:
             # Seçili nesneler var ama tıklanan yerde nesne yok
             # Seçili nesnelerden birinin üzerinde mi veya bounding rect içinde mi kontrol et
@@ -838,28 +1015,27 @@ class EventHandler:
                 # Seçili nesne üzerine tıklandı - taşımayı başlat
                 self.drawing_widget._move_state_saved = True
                 self.drawing_widget.move_tool.start_move(pos, self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes)
-                self.drawing_widget.update()
+                self.drawing_widget.update_overlay()
             else:
                 # Seçili nesne dışında bir yere tıklandı - sürükleme seçimi başlat
                 self.drawing_widget.selection_tool.start_selection(pos)
-                self.drawing_widget.update()
+                self.drawing_widget.update_overlay()
         else:
             # Nesne yok ve mevcut seçim de yok - sürükleme seçimi başlat
             self.drawing_widget.selection_tool.start_selection(pos)
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
 
     def handle_move_move(self, pos):
         """Taşıma devam ettir veya seçim güncelle"""
         if self.drawing_widget.selection_tool.is_selecting:
             # Seçim modunda - dikdörtgen güncelle
-            self.drawing_widget.selection_tool.update_selection(pos)
-            self.drawing_widget.preview_selection()
-            self.drawing_widget.update()
+            self._update_selection_drag(pos)
         else:
             # Taşıma modunda
             selected_strokes = self.drawing_widget.selection_tool.selected_strokes
-            if self.drawing_widget.move_tool.update_move(pos, self.drawing_widget.strokes, selected_strokes):
-                self.drawing_widget.update()
+            self._transform_selection(
+                lambda: self.drawing_widget.move_tool.update_move(pos, self.drawing_widget.strokes, selected_strokes),
+                self.drawing_widget.move_tool)
 
     def handle_move_release(self, pos):
         """Taşımayı tamamla veya seçimi bitir"""
@@ -877,8 +1053,11 @@ class EventHandler:
                 selected = self.drawing_widget.selection_tool.finish_selection(self.drawing_widget.strokes)
                     
             self.drawing_widget.update_shape_properties()
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
         else:
+            # Önizlenen dönüşümü geometriye uygula
+            self._commit_transform_preview(self.drawing_widget.move_tool.apply_move)
+            
             # Taşıma bitişinde final state'i kaydet
             if self.drawing_widget._move_state_saved:
                 self.drawing_widget.save_current_state("Move end")
@@ -904,13 +1083,13 @@ class EventHandler:
                 # Tutamakları oluştur
                 self.drawing_widget.rotate_tool.create_rotation_handles(self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes)
             self.drawing_widget.update_shape_properties()
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
         elif self.drawing_widget.selection_tool.selected_strokes:
             # Seçili nesneler var - döndürme tutamağına mı yoksa nesneye mi tıklandı kontrol et
             if self.drawing_widget.rotate_tool.start_rotate(pos, self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes):
                 # Döndürme tutamağına tıklandı
                 self.drawing_widget._rotate_state_saved = True
-                self.drawing_widget.update()
+                self.drawing_widget.update_overlay()
             else:
                 # Tutamak değil - seçili nesnelerden birinin üzerinde mi kontrol et
                 selected_clicked = any(self.drawing_widget.selection_tool.get_stroke_at_point(pos, [self.drawing_widget.strokes[i]], tolerance=25) is not None 
@@ -919,27 +1098,36 @@ class EventHandler:
                 if not selected_clicked:
                     # Seçili nesne dışında bir yere tıklandı - sürükleme seçimi başlat
                     self.drawing_widget.selection_tool.start_selection(pos)
-                    self.drawing_widget.update()
+                    self.drawing_widget.update_overlay()
         else:
             # Nesne yok ve mevcut seçim de yok - sürükleme seçimi başlat
             self.drawing_widget.selection_tool.start_selection(pos)
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
 
     def handle_rotate_move(self, pos):
         """Döndürme devam ettir veya seçim güncelle"""
         if self.drawing_widget.selection_tool.is_selecting:
             # Seçim modunda - dikdörtgen güncelle
-            self.drawing_widget.selection_tool.update_selection(pos)
-            self.drawing_widget.preview_selection()
-            self.drawing_widget.update()
+            self._update_selection_drag(pos)
         else:
             # Döndürme modunda
             # Mouse pozisyonunu kaydet (görsel feedback için)
             self.drawing_widget.rotate_tool.set_current_mouse_pos(pos)
             
             # Döndürme işlemi varsa güncelle
-            if self.drawing_widget.rotate_tool.update_rotate(pos, self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes):
-                self.drawing_widget.update()
+            self._transform_selection(
+                lambda: self.drawing_widget.rotate_tool.update_rotate(pos, self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes),
+                self.drawing_widget.rotate_tool,
+                extra_dirty=lambda: self._rotate_line_dirty_rects(pos))
+
+    def _rotate_line_dirty_rects(self, pos):
+        """Döndürme merkezinden imlece çizilen yardımcı çizginin eski ve yeni alanı"""
+        center = getattr(self.drawing_widget.rotate_tool, 'rotation_center', None)
+        previous = self._rotate_line_rect
+        self._rotate_line_rect = None
+        if center is not None:
+            self._rotate_line_rect = QRectF(center, pos).normalized().adjusted(-4, -4, 4, 4)
+        return [rect for rect in (previous, self._rotate_line_rect) if rect is not None]
 
     def handle_rotate_release(self, pos):
         """Döndürmeyi tamamla veya seçimi bitir"""
@@ -960,8 +1148,11 @@ class EventHandler:
                     self.drawing_widget.rotate_tool.create_rotation_handles(self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes)
                     
             self.drawing_widget.update_shape_properties()
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
         else:
+            # Önizlenen dönüşümü geometriye uygula
+            self._commit_transform_preview(self.drawing_widget.rotate_tool.apply_rotation)
+            
             # Rotate bitişinde final state'i kaydet
             if self.drawing_widget._rotate_state_saved:
                 self.drawing_widget.save_current_state("Rotate end")
@@ -987,13 +1178,13 @@ class EventHandler:
                 # Tutamakları oluştur
                 self.drawing_widget.scale_tool.create_scale_handles(self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes)
             self.drawing_widget.update_shape_properties()
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
         elif self.drawing_widget.selection_tool.selected_strokes:
             # Seçili nesneler var - boyutlandırma tutamağına mı yoksa nesneye mi tıklandı kontrol et
             if self.drawing_widget.scale_tool.start_scale(pos, self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes):
                 # Boyutlandırma tutamağına tıklandı
                 self.drawing_widget._scale_state_saved = True
-                self.drawing_widget.update()
+                self.drawing_widget.update_overlay()
             else:
                 # Tutamak değil - seçili nesnelerden birinin üzerinde mi kontrol et
                 selected_clicked = any(self.drawing_widget.selection_tool.get_stroke_at_point(pos, [self.drawing_widget.strokes[i]], tolerance=25) is not None 
@@ -1002,27 +1193,26 @@ class EventHandler:
                 if not selected_clicked:
                     # Seçili nesne dışında bir yere tıklandı - sürükleme seçimi başlat
                     self.drawing_widget.selection_tool.start_selection(pos)
-                    self.drawing_widget.update()
+                    self.drawing_widget.update_overlay()
         else:
             # Nesne yok ve mevcut seçim de yok - sürükleme seçimi başlat
             self.drawing_widget.selection_tool.start_selection(pos)
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
 
     def handle_scale_move(self, pos):
         """Boyutlandırma devam ettir veya seçim güncelle"""
         if self.drawing_widget.selection_tool.is_selecting:
             # Seçim modunda - dikdörtgen güncelle
-            self.drawing_widget.selection_tool.update_selection(pos)
-            self.drawing_widget.preview_selection()
-            self.drawing_widget.update()
+            self._update_selection_drag(pos)
         else:
             # Boyutlandırma modunda
             # Mouse pozisyonunu kaydet (görsel feedback için)
             self.drawing_widget.scale_tool.set_current_mouse_pos(pos)
             
             # Boyutlandırma işlemi varsa güncelle
-            if self.drawing_widget.scale_tool.update_scale(pos, self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes):
-                self.drawing_widget.update()
+            self._transform_selection(
+                lambda: self.drawing_widget.scale_tool.update_scale(pos, self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes),
+                self.drawing_widget.scale_tool)
 
     def handle_scale_release(self, pos):
         """Boyutlandırmayı tamamla veya seçimi bitir"""
@@ -1043,8 +1233,11 @@ class EventHandler:
                     self.drawing_widget.scale_tool.create_scale_handles(self.drawing_widget.strokes, self.drawing_widget.selection_tool.selected_strokes)
                     
             self.drawing_widget.update_shape_properties()
-            self.drawing_widget.update()
+            self.drawing_widget.update_overlay()
         else:
+            # Önizlenen dönüşümü geometriye uygula
+            self._commit_transform_preview(self.drawing_widget.scale_tool.apply_scale)
+            
             # Scale bitişinde final state'i kaydet
             if self.drawing_widget._scale_state_saved:
                 self.drawing_widget.save_current_state("Scale end")
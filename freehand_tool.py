@@ -1,9 +1,13 @@
 from PyQt6.QtCore import QPointF, Qt
-from PyQt6.QtGui import QPainter, QPen, QPainterPath
+from PyQt6.QtGui import QPainter, QPen
 import math
 import time
+import numpy as np
+from scipy.signal import lfilter
 from advanced_brush import AdvancedBrush, SimpleBrush
 from shadow_renderer import ShadowRenderer
+from live_stroke import LiveStrokeRenderer
+from stroke_points import StrokePoints, ensure_stroke_points
 
 def ensure_qpointf(point):
     """Point'i QPointF'e dönüştür (dict'ten veya zaten QPointF'ten)"""
@@ -19,6 +23,7 @@ class FreehandTool:
     def __init__(self):
         self.is_drawing = False
         self.current_stroke = None
+        self.live_stroke = None  # Canlı çizimin artımlı görüntüsü
         self.current_color = Qt.GlobalColor.black
         self.current_width = 2
         self.line_style = Qt.PenStyle.SolidLine
@@ -56,10 +61,11 @@ class FreehandTool:
         """Yeni bir serbest çizim başlat"""
         self.is_drawing = True
         self.smoothing_buffer = [pos]
+        points = StrokePoints(capacity=256)
+        points.append(pos, pressure)
         self.current_stroke = {
             'type': 'freehand',
-            'points': [pos],
-            'pressures': [pressure],
+            'points': points,
             'color': self.current_color,
             'width': self.current_width,
             'style': self.line_style,  # 'style' field'ını kullan
@@ -78,7 +84,13 @@ class FreehandTool:
             'cap_style': Qt.PenCapStyle.RoundCap,
             'join_style': Qt.PenJoinStyle.RoundJoin
         }
+        self.live_stroke = LiveStrokeRenderer(
+            self.current_color, self.current_width, self.line_style, self.current_stroke)
+        self.live_stroke.add_point(pos.x(), pos.y())
         self._last_update_time = time.time()
+        # add_points için ham örnek izi (son ham nokta ve toplam yay uzunluğu)
+        self._raw_last = np.array((pos.x(), pos.y()), dtype=np.float64)
+        self._raw_travel = 0.0
         
     def add_point(self, pos, pressure=1.0, is_tablet=False):
         """Serbest çizime nokta ekle (tablet yazımı optimize)"""
@@ -95,31 +107,67 @@ class FreehandTool:
                 return
         
         # Tablet yazımında smoothing'i azalt (daha net harfler)
-        if is_tablet:
-            # Tablet için minimal smoothing - sadece jitter azaltma
-            if len(self.current_stroke['points']) > 0:
-                last_pos = self.current_stroke['points'][-1]
-                # Ayarlanabilir smoothing
-                smoothed_pos = QPointF(
-                    last_pos.x() * self.tablet_smoothing + pos.x() * (1.0 - self.tablet_smoothing),
-                    last_pos.y() * self.tablet_smoothing + pos.y() * (1.0 - self.tablet_smoothing)
-                )
-                self.current_stroke['points'].append(smoothed_pos)
-            else:
-                self.current_stroke['points'].append(pos)
+        points = self.current_stroke['points']
+        smoothing = self.tablet_smoothing if is_tablet else self.mouse_smoothing
+        if len(points) > 0:
+            # Ayarlanabilir smoothing (tablet için minimal - sadece jitter azaltma)
+            last_pos = points[-1]
+            smoothed_pos = QPointF(
+                last_pos.x() * smoothing + pos.x() * (1.0 - smoothing),
+                last_pos.y() * smoothing + pos.y() * (1.0 - smoothing)
+            )
+            points.append(smoothed_pos, pressure)
         else:
-            # Mouse için normal smoothing
-            if len(self.current_stroke['points']) > 0:
-                last_pos = self.current_stroke['points'][-1]
-                smoothed_pos = QPointF(
-                    last_pos.x() * self.mouse_smoothing + pos.x() * (1.0 - self.mouse_smoothing),
-                    last_pos.y() * self.mouse_smoothing + pos.y() * (1.0 - self.mouse_smoothing)
-                )
-                self.current_stroke['points'].append(smoothed_pos)
-            else:
-                self.current_stroke['points'].append(pos)
-            
-        self.current_stroke['pressures'].append(pressure)
+            smoothed_pos = pos
+            points.append(pos, pressure)
+        if self.live_stroke is not None:
+            self.live_stroke.add_point(smoothed_pos.x(), smoothed_pos.y())
+
+    def add_points(self, xy, pressures, is_tablet=False):
+        """Bir karede biriken örnekleri toplu ekle (vektörel filtre ve smoothing)
+
+        Ham örnekler yay uzunluğu boyunca min_distance aralıklarına seyreltilir
+        (yavaş hareketteki küçük adımlar birikir, kaybolmaz), ardından add_point
+        ile aynı üstel smoothing tek lfilter çağrısıyla uygulanır.
+        Eklenen nokta sayısını döndürür.
+        """
+        if not self.is_drawing or not self.current_stroke:
+            return 0
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        if not len(xy):
+            return 0
+        pressures = np.asarray(pressures, dtype=np.float64)
+
+        min_dist = self.tablet_min_distance if is_tablet else self.min_distance
+        steps = np.hypot(*np.diff(np.vstack((self._raw_last, xy)), axis=0).T)
+        travel = self._raw_travel + np.cumsum(steps)
+        if min_dist > 0:
+            bins = np.floor(travel / min_dist)
+            previous = np.floor(self._raw_travel / min_dist)
+            keep = np.flatnonzero(np.diff(np.concatenate(([previous], bins))) > 0)
+        else:
+            keep = np.flatnonzero(steps > 0)
+        self._raw_last = xy[-1].copy()
+        self._raw_travel = float(travel[-1])
+        if not len(keep):
+            return 0
+
+        points = self.current_stroke['points']
+        smoothing = self.tablet_smoothing if is_tablet else self.mouse_smoothing
+        last = np.asarray(points.xy[-1], dtype=np.float64)
+        smoothed = lfilter([1.0 - smoothing], [1.0, -smoothing], xy[keep], axis=0,
+                           zi=(smoothing * last)[None, :])[0]
+        points.extend(smoothed, pressures[keep])
+        if self.live_stroke is not None:
+            for x, y in smoothed.tolist():
+                self.live_stroke.add_point(x, y)
+        return len(keep)
+
+    def take_dirty_rect(self):
+        """Canlı çizimde son yeniden çizimden beri değişen sahne bölgesi (yoksa None)"""
+        if self.live_stroke is None:
+            return None
+        return self.live_stroke.take_dirty_rect()
     
     def _should_update(self):
         """Her zaman güncelle - throttling YOK"""
@@ -129,12 +177,16 @@ class FreehandTool:
         """Serbest çizimi tamamla (optimized)"""
         if self.is_drawing and self.current_stroke and len(self.current_stroke['points']) > 1:
             stroke_data = self.current_stroke.copy()
+            # Büyüme kapasitesini bırak, kompakt kopya sakla
+            stroke_data['points'] = stroke_data['points'].copy()
             self.current_stroke = None
+            self.live_stroke = None
             self.is_drawing = False
             self.smoothing_buffer = []
             return stroke_data
         else:
             self.current_stroke = None
+            self.live_stroke = None
             self.is_drawing = False
             self.smoothing_buffer = []
             return None
@@ -142,6 +194,7 @@ class FreehandTool:
     def cancel_stroke(self):
         """Aktif çizimi iptal et"""
         self.current_stroke = None
+        self.live_stroke = None
         self.is_drawing = False
         self.smoothing_buffer = []
         
@@ -150,7 +203,7 @@ class FreehandTool:
         if stroke_data['type'] != 'freehand':
             return
             
-        points = stroke_data['points']
+        points = ensure_stroke_points(stroke_data)
         
         if len(points) < 2:
             return
@@ -166,18 +219,12 @@ class FreehandTool:
         if isinstance(color, str):
             color = QColor(color)
             
-        # QPointF listesine çevir
-        qpoint_list = [ensure_qpointf(p) for p in points]
-
-        if len(qpoint_list) >= 2:
-            path = QPainterPath(qpoint_list[0])
-            for qp in qpoint_list[1:]:
-                path.lineTo(qp)
-            ShadowRenderer.draw_shape_shadow(painter, 'path', path, stroke_data)
+        if stroke_data.get('has_shadow', False):
+            ShadowRenderer.draw_shape_shadow(painter, 'path', points.to_path(), stroke_data)
 
         # Brush mode'a göre çiz
         if brush_mode == 'advanced':
-            AdvancedBrush.draw_pen_stroke(painter, qpoint_list, color, width, advanced_style)
+            AdvancedBrush.draw_pen_stroke(painter, points.tolist(), color, width, advanced_style)
         else:
             # Varsayılan hızlı çizim - tablet mode bilgisini stroke'tan al
             tablet_mode = stroke_data.get('tablet_mode', False)
@@ -190,49 +237,26 @@ class FreehandTool:
                 painter.setRenderHint(QPainter.RenderHint.HighQualityAntialiasing, True)
             except Exception:
                 pass
-            SimpleBrush.draw_simple_stroke(painter, qpoint_list, color, width, tablet_mode, line_style)
+            SimpleBrush.draw_simple_stroke(painter, points, color, width, tablet_mode, line_style)
     
     def set_color(self, color):
         """Aktif rengi ayarla"""
         self.current_color = color
             
     def draw_current_stroke(self, painter):
-        """Aktif olarak çizilen serbest çizimi çiz (optimized)"""
+        """Aktif olarak çizilen serbest çizimi çiz (artımlı, nokta başına sabit maliyet)"""
         if not self.is_drawing or not self.current_stroke or len(self.current_stroke['points']) < 2:
             return
 
-        points = self.current_stroke['points']
-
-        qpoint_list = [ensure_qpointf(p) for p in points]
-        if len(qpoint_list) >= 2:
-            preview_data = {
-                'type': 'freehand',
-                'width': self.current_width,
-                'has_shadow': self.has_shadow,
-                'shadow_color': self.shadow_color,
-                'shadow_offset_x': self.shadow_offset_x,
-                'shadow_offset_y': self.shadow_offset_y,
-                'shadow_blur': self.shadow_blur,
-                'shadow_size': self.shadow_size,
-                'shadow_opacity': self.shadow_opacity,
-                'inner_shadow': self.inner_shadow,
-                'shadow_quality': self.shadow_quality,
-                'cap_style': Qt.PenCapStyle.RoundCap,
-                'join_style': Qt.PenJoinStyle.RoundJoin
-            }
-            path = QPainterPath(qpoint_list[0])
-            for qp in qpoint_list[1:]:
-                path.lineTo(qp)
-            ShadowRenderer.draw_shape_shadow(painter, 'path', path, preview_data)
+        if self.live_stroke is not None:
+            self.live_stroke.draw(painter)
+            return
 
         # Aktif çizim için her zaman simple brush kullan (performans)
         tablet_mode = self.current_stroke.get('tablet_mode', False)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        try:
-            painter.setRenderHint(QPainter.RenderHint.HighQualityAntialiasing, True)
-        except Exception:
-            pass
-        SimpleBrush.draw_simple_stroke(painter, points, self.current_color, self.current_width, tablet_mode, self.line_style)
+        SimpleBrush.draw_simple_stroke(painter, self.current_stroke['points'], self.current_color,
+                                       self.current_width, tablet_mode, self.line_style)
     
     def set_width(self, width):
         """Aktif çizgi kalınlığını ayarla"""
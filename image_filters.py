@@ -0,0 +1,148 @@
+import numpy as np
+from scipy.ndimage import uniform_filter1d
+from PyQt6.QtGui import QImage
+
+
+def image_array(image):
+    """QImage piksellerini (yükseklik, genişlik, 4) uint8 NumPy görünümü olarak döndür
+
+    Görünüm kopya değildir; dizi üzerindeki değişiklikler doğrudan resme yansır.
+    Resim 32 bit (RGBA8888 / ARGB32 türevi) formatta olmalıdır.
+    """
+    height = image.height()
+    width = image.width()
+    bytes_per_line = image.bytesPerLine()
+    buffer = image.bits()
+    buffer.setsize(image.sizeInBytes())
+    array = np.frombuffer(buffer, dtype=np.uint8).reshape(height, bytes_per_line)
+    return array[:, :width * 4].reshape(height, width, 4)
+
+
+def _box_blur_axis(values, radius, axis):
+    """Sıfır dolgulu kayan ortalama (tek eksen, O(n))"""
+    if radius <= 0:
+        return values
+    return uniform_filter1d(values, 2 * radius + 1, axis=axis, mode='constant')
+
+
+def _box_radii(sigma, passes=3):
+    """Gauss bulanıklığına yaklaşan ardışık kutu yarıçapları"""
+    ideal = np.sqrt(12.0 * sigma * sigma / passes + 1.0)
+    lower = int(np.floor(ideal))
+    if lower % 2 == 0:
+        lower -= 1
+    upper = lower + 2
+    m = round((12.0 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes)
+              / (-4 * lower - 4))
+    sizes = [lower if i < m else upper for i in range(passes)]
+    return [max(0, (size - 1) // 2) for size in sizes]
+
+
+def blur_spread(radius):
+    """blur_array'in şekli dışarı yaydığı mesafe (piksel; kutu yarıçapları toplamı)"""
+    if radius <= 0:
+        return 0
+    return sum(_box_radii(max(0.5, float(radius) * 0.6)))
+
+
+def blur_array(array, radius):
+    """(h, w, c) diziye Gauss benzeri bulanıklık uygula, float32 sonuç döndür
+
+    radius, QGraphicsBlurEffect'teki yarıçapa yakın sonuç verecek şekilde
+    ölçeklenir (sigma ~ 0.6 * radius).
+    Kenarların dışı şeffaf (sıfır) kabul edilir.
+    """
+    values = array.astype(np.float32)
+    if radius <= 0:
+        return values
+    sigma = max(0.5, float(radius) * 0.6)
+    for box_radius in _box_radii(sigma):
+        values = _box_blur_axis(values, box_radius, 0)
+        values = _box_blur_axis(values, box_radius, 1)
+    return values
+
+
+def blur_image(image, radius):
+    """QImage'in bulanıklaştırılmış kopyasını döndür (premultiplied RGBA)"""
+    result = image.convertToFormat(QImage.Format.Format_RGBA8888_Premultiplied)
+    if radius <= 0 or result.isNull():
+        return result
+    pixels = image_array(result)
+    blurred = blur_array(pixels, radius)
+    np.clip(np.rint(blurred), 0, 255, out=blurred)
+    pixels[...] = blurred.astype(np.uint8)
+    return result
+
+
+def blur_shadow_image(image, radius, color):
+    """Tek renkli gölge resmini bulanıklaştır (premultiplied RGBA)
+
+    Gölge tek renk olduğundan yalnızca alfa kanalı bulanıklaştırılır; renk
+    kanalları premultiplied formülle alfadan yeniden üretilir (4 kat daha az iş).
+    """
+    result = image.convertToFormat(QImage.Format.Format_RGBA8888_Premultiplied)
+    if result.isNull():
+        return result
+    pixels = image_array(result)
+    alpha = pixels[..., 3:4]
+    if radius > 0:
+        alpha = np.clip(np.rint(blur_array(alpha, radius)), 0, 255)
+    alpha = alpha.astype(np.float32)
+    rgb = np.array((color.red(), color.green(), color.blue()), dtype=np.float32) / 255.0
+    pixels[..., :3] = np.rint(alpha * rgb).astype(np.uint8)
+    pixels[..., 3:4] = alpha.astype(np.uint8)
+    return result
+
+
+def apply_color_filter(image, filter_type, intensity):
+    """Renk filtresini (grayscale, sepia, invert) uygulanmış yeni QImage döndür
+
+    Hesaplar premultiply edilmemiş RGBA üzerinde yapılır, alfa korunur.
+    """
+    result = image.convertToFormat(QImage.Format.Format_RGBA8888)
+    if result.isNull() or filter_type not in ("grayscale", "sepia", "invert"):
+        return result
+
+    pixels = image_array(result)
+    rgb = pixels[..., :3].astype(np.float64)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+    if filter_type == "grayscale":
+        # Gri tonlama: luminance hesabı
+        gray = np.floor(0.299 * r + 0.587 * g + 0.114 * b)
+        target = np.stack((gray, gray, gray), axis=-1)
+    elif filter_type == "sepia":
+        target = np.minimum(255.0, np.floor(np.stack((
+            r * 0.393 + g * 0.769 + b * 0.189,
+            r * 0.349 + g * 0.686 + b * 0.168,
+            r * 0.272 + g * 0.534 + b * 0.131,
+        ), axis=-1)))
+    else:
+        target = 255.0 - rgb
+
+    mixed = np.trunc(rgb + (target - rgb) * float(intensity))
+    pixels[..., :3] = np.clip(mixed, 0, 255).astype(np.uint8)
+    return result
+
+
+def apply_rounded_corners(image, radius):
+    """Köşeleri yumuşak kenarlı (antialias) yuvarlatılmış yeni QImage döndür"""
+    result = image.convertToFormat(QImage.Format.Format_RGBA8888_Premultiplied)
+    height = result.height()
+    width = result.width()
+    radius = min(float(radius), width / 2.0, height / 2.0)
+    if radius <= 0 or result.isNull():
+        return result
+
+    # Her pikselin merkezinden en yakın köşe yayı merkezine uzaklık
+    xs = np.arange(width, dtype=np.float32) + 0.5
+    ys = np.arange(height, dtype=np.float32) + 0.5
+    dx = np.maximum(0.0, np.maximum(radius - xs, xs - (width - radius)))
+    dy = np.maximum(0.0, np.maximum(radius - ys, ys - (height - radius)))
+    distance = np.sqrt(dy[:, None] ** 2 + dx[None, :] ** 2)
+    coverage = np.clip(radius - distance + 0.5, 0.0, 1.0)
+
+    pixels = image_array(result)
+    # Premultiplied formatta tüm kanallar kapsama ile çarpılır
+    pixels[...] = np.rint(pixels * coverage[..., None]).astype(np.uint8)
+    return result
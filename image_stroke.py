@@ -3,6 +3,7 @@ import hashlib
 from PyQt6.QtGui import QPixmap, QPainter, QTransform, QColor
 from PyQt6.QtCore import QPointF, QRectF, QRect, QSize, Qt
 import shutil
+from image_filters import blur_image, apply_color_filter, apply_rounded_corners
 
 class ImageStroke:
     """Resim stroke'u - canvas'a eklenen resimler için"""
@@ -16,7 +17,9 @@ class ImageStroke:
         self.cache_manager = cache_manager
         self.is_loading = False
         self.render_pixmap = None  # Render için kullanılacak pixmap
+        self._effects_cache = None  # (parametreler, işlenmiş pixmap)
         self.group_id = None  # Grup ID'si
+        self.stroke_id = None  # Kalıcı stroke kimliği (katmana eklenirken atanır)
         
         # Kenarlık özellikleri
         self.has_border = False
@@ -462,132 +465,60 @@ class ImageStroke:
         """Pixmap'e blur efekti uygula"""
         if radius <= 0:
             return pixmap
-            
-        from PyQt6.QtWidgets import QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect
-        from PyQt6.QtGui import QPixmap
-        
-        # QGraphicsScene kullanarak blur efekti uygula
-        scene = QGraphicsScene()
-        item = QGraphicsPixmapItem(pixmap)
-        scene.addItem(item)
-        
-        # Blur efekti oluştur
-        blur_effect = QGraphicsBlurEffect()
-        blur_effect.setBlurRadius(radius)
-        item.setGraphicsEffect(blur_effect)
-        
-        # Yeni pixmap oluştur
-        blurred_pixmap = QPixmap(pixmap.size())
-        blurred_pixmap.fill(Qt.GlobalColor.transparent)
-        
-        painter = QPainter(blurred_pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        scene.render(painter)
-        painter.end()
-        
-        return blurred_pixmap
+        return QPixmap.fromImage(blur_image(pixmap.toImage(), radius))
     
     def _apply_all_effects(self, pixmap):
-        """Tüm efektleri uygula (blur + filtreler + yuvarlak kenarlar)"""
-        processed_pixmap = pixmap
-        
-        # Önce blur uygula
-        if self.blur_radius > 0:
-            processed_pixmap = self._apply_blur(processed_pixmap, self.blur_radius)
-        
-        # Sonra filtreleri uygula
-        processed_pixmap = self._apply_filter(processed_pixmap)
-        
-        # Son olarak yuvarlak kenarları uygula
-        if self.corner_radius > 0:
-            processed_pixmap = self._apply_rounded_corners(processed_pixmap)
-        
+        """Tüm efektleri uygula (blur + filtreler + yuvarlak kenarlar)
+
+        Sonuç parametreler ve kaynak pixmap değişmedikçe yeniden kullanılır.
+        """
+        cache_key = (
+            pixmap.cacheKey(),
+            self.filter_type,
+            self.filter_intensity,
+            self.blur_radius,
+            self.corner_radius,
+            pixmap.width(),
+            pixmap.height(),
+        )
+        if self._effects_cache is not None and self._effects_cache[0] == cache_key:
+            return self._effects_cache[1]
+
+        has_filter = self.filter_type != "none" and self.filter_intensity > 0.0
+        if self.blur_radius <= 0 and not has_filter and self.corner_radius <= 0:
+            processed_pixmap = pixmap
+        else:
+            image = pixmap.toImage()
+            # Önce blur uygula
+            if self.blur_radius > 0:
+                image = blur_image(image, self.blur_radius)
+            # Sonra filtreleri uygula
+            if has_filter:
+                image = apply_color_filter(image, self.filter_type, self.filter_intensity)
+            # Son olarak yuvarlak kenarları uygula
+            if self.corner_radius > 0:
+                image = apply_rounded_corners(image, self.corner_radius)
+            processed_pixmap = QPixmap.fromImage(image)
+
+        self._effects_cache = (cache_key, processed_pixmap)
         return processed_pixmap
     
     def _apply_rounded_corners(self, pixmap):
         """Pixmap'e yuvarlak kenarlar uygula"""
         if not pixmap or pixmap.isNull() or self.corner_radius <= 0:
             return pixmap
-            
-        # Yeni pixmap oluştur
-        rounded = QPixmap(pixmap.size())
-        rounded.fill(Qt.GlobalColor.transparent)
-        
-        painter = QPainter(rounded)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Yuvarlak maske oluştur
-        from PyQt6.QtGui import QPainterPath
-        path = QPainterPath()
-        rect = QRectF(0, 0, pixmap.width(), pixmap.height())
-        path.addRoundedRect(rect, self.corner_radius, self.corner_radius)
-        
-        # Maskeyi uygula
-        painter.setClipPath(path)
-        painter.drawPixmap(0, 0, pixmap)
-        painter.end()
-        
-        return rounded
+        return QPixmap.fromImage(apply_rounded_corners(pixmap.toImage(), self.corner_radius))
     
     def _apply_filter(self, pixmap):
         """Pixmap'e filtre uygula"""
         if self.filter_type == "none" or self.filter_intensity <= 0.0:
             return pixmap
             
-        # QImage'e çevir (pixel manipülasyonu için)
         image = pixmap.toImage()
         if image.isNull():
             return pixmap
-            
-        # RGBA format'a çevir
-        image = image.convertToFormat(image.Format.Format_RGBA8888)
-        
-        width = image.width()
-        height = image.height()
-        
-        for y in range(height):
-            for x in range(width):
-                pixel = image.pixelColor(x, y)
-                r, g, b, a = pixel.red(), pixel.green(), pixel.blue(), pixel.alpha()
-                
-                if self.filter_type == "grayscale":
-                    # Gri tonlama: luminance hesabı
-                    gray = int(0.299 * r + 0.587 * g + 0.114 * b)
-                    new_r = int(r + (gray - r) * self.filter_intensity)
-                    new_g = int(g + (gray - g) * self.filter_intensity)
-                    new_b = int(b + (gray - b) * self.filter_intensity)
-                    
-                elif self.filter_type == "sepia":
-                    # Sepia efekti
-                    sepia_r = min(255, int(r * 0.393 + g * 0.769 + b * 0.189))
-                    sepia_g = min(255, int(r * 0.349 + g * 0.686 + b * 0.168))
-                    sepia_b = min(255, int(r * 0.272 + g * 0.534 + b * 0.131))
-                    new_r = int(r + (sepia_r - r) * self.filter_intensity)
-                    new_g = int(g + (sepia_g - g) * self.filter_intensity)
-                    new_b = int(b + (sepia_b - b) * self.filter_intensity)
-                    
-                elif self.filter_type == "invert":
-                    # Renk tersçevirme
-                    inv_r = 255 - r
-                    inv_g = 255 - g
-                    inv_b = 255 - b
-                    new_r = int(r + (inv_r - r) * self.filter_intensity)
-                    new_g = int(g + (inv_g - g) * self.filter_intensity)
-                    new_b = int(b + (inv_b - b) * self.filter_intensity)
-                    
-                else:
-                    new_r, new_g, new_b = r, g, b
-                
-                # Yeni rengi ayarla
-                new_color = QColor(
-                    max(0, min(255, new_r)),
-                    max(0, min(255, new_g)), 
-                    max(0, min(255, new_b)),
-                    a
-                )
-                image.setPixelColor(x, y, new_color)
-        
-        # QPixmap'e geri çevir
+        
+        image = apply_color_filter(image, self.filter_type, self.filter_intensity)
         return QPixmap.fromImage(image)
     
     def copy(self):
@@ -599,6 +530,7 @@ class ImageStroke:
             self.rotation,
             self.opacity
         )
+        new_stroke.stroke_id = self.stroke_id
         new_stroke.group_id = self.group_id
         new_stroke.has_border = self.has_border
         new_stroke.border_color = QColor(self.border_color)
@@ -629,6 +561,7 @@ class ImageStroke:
             self.rotation,
             self.opacity
         )
+        new_stroke.stroke_id = self.stroke_id
         new_stroke.group_id = self.group_id
         new_stroke.has_border = self.has_border
         new_stroke.border_color = QColor(self.border_color)
@@ -681,6 +614,7 @@ class ImageStroke:
             'rotation': self.rotation,
             'opacity': self.opacity,
             'file_hash': self.file_hash,
+            'stroke_id': self.stroke_id,
             'group_id': self.group_id,
             'has_border': self.has_border,
             'border_color': self.border_color.name(),
@@ -716,6 +650,7 @@ class ImageStroke:
             data.get('opacity', 1.0)
         )
         
+        image_stroke.stroke_id = data.get('stroke_id', None)
         image_stroke.group_id = data.get('group_id', None)
         
         # Kenarlık özellikleri
@@ -1,16 +1,24 @@
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
-    QTreeWidget,
-    QTreeWidgetItem,
-    QListWidgetItem,
+    QTreeView,
+    QAbstractItemView,
     QHBoxLayout,
     QToolButton,
     QLineEdit,
     QPushButton
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtCore import (
+    Qt,
+    QTimer,
+    QAbstractItemModel,
+    QModelIndex,
+    QItemSelection,
+    QItemSelectionModel,
+    pyqtSignal
+)
+
+from stroke_ids import get_stroke_id
 
 
 class LayerItemWidget(QWidget):
@@ -68,6 +76,17 @@ class LayerItemWidget(QWidget):
             self.name_edit.setText(name)
             callback(self.layer_id, name)
 
+    def set_state(self, name, visible, locked):
+        """Katman durumunu sinyal üretmeden göster"""
+        for button, checked in ((self.visibility_button, visible), (self.lock_button, locked)):
+            button.blockSignals(True)
+            button.setChecked(bool(checked))
+            button.blockSignals(False)
+        self._update_visibility_icon()
+        self._update_lock_icon()
+        if not self.name_edit.hasFocus() and self.name_edit.text() != name:
+            self.name_edit.setText(name)
+
     def _update_visibility_icon(self):
         if self.visibility_button.isChecked():
             self.visibility_button.setText("👁")
@@ -81,6 +100,586 @@ class LayerItemWidget(QWidget):
             self.lock_button.setText("🔓")
 
 
+class _LayerTreeNode:
+    """Modeldeki bir satır: katman, grup veya stroke."""
+
+    __slots__ = ('kind', 'key', 'text', 'payload', 'group_id', 'parent', 'children', 'row')
+
+    def __init__(self, kind, key, text, payload=None, group_id=None, parent=None):
+        self.kind = kind
+        self.key = key
+        self.text = text
+        self.payload = payload  # katman id'si, grup üye index'leri veya stroke index'i
+        self.group_id = group_id
+        self.parent = parent
+        self.children = [] if kind == 'stroke' else None  # None: alt satırlar henüz oluşturulmadı
+        self.row = 0
+
+
+class LayerTreeModel(QAbstractItemModel):
+    """Katman / grup / şekil ağacı için model.
+
+    Katman satırları her zaman hazırdır; grup ve şekil satırları düğüm ilk
+    açıldığında (fetchMore) oluşturulur. Üst seviye satırlar çapalarına (stroke
+    index'i veya grubun en üstteki üyesi) göre azalan sıradadır; bir stroke
+    aralığı değiştiğinde (apply_stroke_range) sadece çapası aralığa ulaşan
+    satırlar yeniden hesaplanır. Grup üyeleri LayerManager'ın kimlik
+    indeksinden okunur ve görünüme sadece farklar bildirilir.
+    """
+
+    PAYLOAD_ROLE = Qt.ItemDataRole.UserRole
+    KIND_ROLE = Qt.ItemDataRole.UserRole + 1
+    GROUP_ROLE = Qt.ItemDataRole.UserRole + 2
+
+    itemRenamed = pyqtSignal(QModelIndex, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.drawing_widget = None
+        self._roots = []  # Görüntü sırasında (üstteki katman önce) katman düğümleri
+        self._overlapping_layers = set()  # Bir stroke'un birden fazla satırda göründüğü katmanlar
+
+    # ------------------------------------------------------------------
+    # QAbstractItemModel arayüzü
+    # ------------------------------------------------------------------
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        children = self._children_of(parent)
+        if not children or row >= len(children):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        children = self._children_of(parent)
+        return len(children) if children is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 2
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self._roots)
+        if parent.column() > 0:
+            return False
+        node = parent.internalPointer()
+        if node.children is not None:
+            return bool(node.children)
+        return True  # Oluşturulmamış düğümler boş bırakılmaz (bkz. _make_layer_node)
+
+    def canFetchMore(self, parent):
+        if not parent.isValid() or parent.column() > 0:
+            return False
+        return parent.internalPointer().children is None
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        node = parent.internalPointer()
+        specs = self._child_specs(node)
+        if not specs:
+            node.children = []
+            return
+        self.beginInsertRows(parent, 0, len(specs) - 1)
+        node.children = [self._make_node(spec, node, row) for row, spec in enumerate(specs)]
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == self.KIND_ROLE:
+            return node.kind
+        if role == self.PAYLOAD_ROLE:
+            return list(node.payload) if node.kind == 'group' else node.payload
+        if role == self.GROUP_ROLE:
+            return node.group_id
+        if index.column() == 0 and role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return node.text
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        text = str(value).strip()
+        if not text or index.internalPointer().kind not in ('stroke', 'group'):
+            return False
+        # Adı DrawingWidget'a işlemek panelin işi; model sonra senkronlanır
+        self.itemRenamed.emit(index, text)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == 0 and index.internalPointer().kind in ('stroke', 'group'):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    # ------------------------------------------------------------------
+    # Senkronizasyon
+    # ------------------------------------------------------------------
+    def set_drawing_widget(self, drawing_widget):
+        self.drawing_widget = drawing_widget
+        self.reset_layers()
+
+    def reset_layers(self):
+        """Modeli baştan kur (sadece katman satırları; alt satırlar açılınca)"""
+        self.beginResetModel()
+        self._roots = []
+        self._overlapping_layers.clear()
+        if self.drawing_widget is not None:
+            layers = list(self.drawing_widget.layer_manager.iter_layers())
+            for row, layer in enumerate(reversed(layers)):
+                self._roots.append(self._make_layer_node(layer, row))
+        self.endResetModel()
+
+    def sync_layers(self):
+        """Katman listesini güncelle; katmanlar eklendi/silindi/taşındıysa modeli sıfırla.
+
+        Model sıfırlandıysa True döner.
+        """
+        if self.drawing_widget is None:
+            if self._roots:
+                self.reset_layers()
+                return True
+            return False
+        layer_manager = self.drawing_widget.layer_manager
+        order = list(reversed(layer_manager.layer_order))
+        if [node.payload for node in self._roots] != order:
+            self.reset_layers()
+            return True
+        for layer_id in order:
+            self.refresh_layer(layer_id)
+        return False
+
+    def refresh_layer(self, layer_id):
+        """Katmanın adını ve (oluşturulmuşsa) şekil satırlarını güncelle"""
+        if self.drawing_widget is None:
+            return
+        layer = self.drawing_widget.layer_manager.layers.get(layer_id)
+        index = self.layer_index(layer_id)
+        if layer is None or not index.isValid():
+            return
+        node = index.internalPointer()
+        if node.text != layer['name']:
+            node.text = layer['name']
+            self.dataChanged.emit(index, index)
+        if node.children is None and not layer['strokes']:
+            node.children = []
+        self._sync_children(node, index)
+
+    def layer_index(self, layer_id):
+        for node in self._roots:
+            if node.payload == layer_id:
+                return self.createIndex(node.row, 0, node)
+        return QModelIndex()
+
+    def layer_id_for_index(self, index):
+        """Satırın ait olduğu katmanın id'si"""
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        while node.parent is not None:
+            node = node.parent
+        return node.payload
+
+    def iter_loaded_indexes(self, parent=QModelIndex()):
+        """Oluşturulmuş tüm satırların (sütun 0) index'leri"""
+        children = self._children_of(parent)
+        for row, node in enumerate(children or ()):
+            index = self.createIndex(row, 0, node)
+            yield index
+            if node.children:
+                yield from self.iter_loaded_indexes(index)
+
+    def _children_of(self, parent):
+        if not parent.isValid():
+            return self._roots
+        return parent.internalPointer().children
+
+    def apply_stroke_range(self, layer_id, start, removed, inserted):
+        """strokes[start:start + removed] yerine inserted stroke geldi; etkilenen satırları güncelle
+
+        Çapası start'tan küçük satırlar değişmez (index'leri kaymaz, üyelikleri
+        aynı kalır). Sadece üstteki satırlar yeniden üretilir; bu arada alta inen
+        veya alttan yukarı çıkan gruplar ayrıca taşınır. Satırlar stroke'ları
+        ayrık paylaşmıyorsa katmanın tüm satırları eşitlenir.
+        """
+        if self.drawing_widget is None:
+            return
+        layer = self.drawing_widget.layer_manager.layers.get(layer_id)
+        index = self.layer_index(layer_id)
+        if layer is None or not index.isValid():
+            return
+        node = index.internalPointer()
+        strokes = layer['strokes']
+        if node.children is None:
+            if not strokes:
+                node.children = []
+            return
+        children = node.children
+        if layer_id in self._overlapping_layers:
+            self._sync_children(node, index)
+            return
+        members_of = self._group_lookup(layer_id)
+
+        count = 0
+        while count < len(children) and self._row_anchor(children[count]) >= start:
+            count += 1
+        old_keys = {child.key for child in children[:count]}
+        specs = self._layer_row_specs(strokes, members_of, start)
+        new_keys = {spec[1] for spec in specs}
+
+        # Üst kısımdan çıkan grupların start altında kalan üyeleri değişmedi
+        lowered = []
+        for child in children[:count]:
+            if child.kind == 'group' and child.key not in new_keys:
+                members = [member for member in child.payload if member < start]
+                if members:
+                    lowered.append(self._group_spec(child.group_id, members))
+        # Alttan yukarı çıkan grupların eski satırı: çapası start altındaki son üyesi
+        raised = []
+        for spec in specs:
+            if spec[0] == 'group' and spec[1] not in old_keys:
+                below = [member for member in spec[3] if member < start]
+                if below:
+                    row = self._find_row(children, count, below[-1])
+                    if row is None or children[row].key != spec[1] or children[row].payload != below:
+                        raised = None
+                        break
+                    raised.append(row)
+
+        if raised is None or not self._rows_partition(strokes, specs, members_of):
+            self._sync_children(node, index)
+            return
+
+        self._apply_specs(node, index, specs, 0, count)
+        shift = len(specs) - count
+        for row in sorted(raised, reverse=True):
+            row += shift
+            self.beginRemoveRows(index, row, row)
+            del children[row]
+            self._renumber(children, row)
+            self.endRemoveRows()
+        top = len(specs)
+        for spec in lowered:
+            row = self._insert_row_for(children, top, spec[3][-1])
+            self.beginInsertRows(index, row, row)
+            children.insert(row, self._make_node(spec, node))
+            self._renumber(children, row)
+            self.endInsertRows()
+
+    def _rows_partition(self, strokes, specs, members_of):
+        """Grup satırları stroke'ları ayrık paylaşıyor mu (her stroke tek satırda mı)
+
+        Üye ya grubun kendisine (group_id) ya da grubun altındaki bir iç gruba
+        (parent_group_id) bağlı olmalı; iç grubun tüm üyeleri de bu satırda olmalı.
+        Aksi halde aynı stroke başka bir grup satırında da görünür.
+        """
+        for spec in specs:
+            if spec[0] != 'group':
+                continue
+            group_id = spec[4]
+            members = spec[3]
+            outer = members_of(group_id, True)
+            if outer and outer != members_of(group_id, False):
+                return False
+            inner_groups = set()
+            for member in members:
+                stroke = strokes[member]
+                parent_group_id = self._get_stroke_parent_group_id(stroke)
+                inner_group = self._get_stroke_group_id(stroke)
+                if parent_group_id and parent_group_id != group_id:
+                    return False
+                if parent_group_id and inner_group and inner_group != group_id:
+                    inner_groups.add(inner_group)
+            if inner_groups:
+                member_set = set(members)
+                for inner_group in inner_groups:
+                    if not member_set.issuperset(members_of(inner_group, False)):
+                        return False
+        return True
+
+    @staticmethod
+    def _row_anchor(node):
+        """Satırın z sırasındaki yeri: stroke index'i veya grubun en üstteki üyesi"""
+        if node.kind == 'group':
+            return node.payload[-1] if node.payload else -1
+        return node.payload
+
+    def _find_row(self, children, low, anchor):
+        """children[low:] içinde (azalan çapalı) verilen çapadaki satır"""
+        row = self._insert_row_for(children, low, anchor)
+        if row < len(children) and self._row_anchor(children[row]) == anchor:
+            return row
+        return None
+
+    def _insert_row_for(self, children, low, anchor):
+        """children[low:] içinde çapası anchor'dan büyük olmayan ilk satır"""
+        high = len(children)
+        while low < high:
+            middle = (low + high) // 2
+            if self._row_anchor(children[middle]) > anchor:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _sync_children(self, node, index):
+        """Oluşturulmuş alt satırları güncel listeyle karşılaştırıp farkı bildir"""
+        children = node.children
+        if children is None or node.kind == 'stroke':
+            return
+        self._apply_specs(node, index, self._child_specs(node), 0, len(children))
+
+    def _apply_specs(self, node, index, specs, first, count):
+        """node.children[first:first + count] satırlarını specs ile değiştirip farkı bildir"""
+        children = node.children
+        old_keys = [child.key for child in children[first:first + count]]
+        new_keys = [spec[1] for spec in specs]
+
+        # Ortak baş ve son kısım korunur; aradaki blok silinip yeniden eklenir
+        start = 0
+        limit = min(len(old_keys), len(new_keys))
+        while start < limit and old_keys[start] == new_keys[start]:
+            start += 1
+        old_end = len(old_keys)
+        new_end = len(new_keys)
+        while old_end > start and new_end > start and old_keys[old_end - 1] == new_keys[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+        start += first
+        old_end += first
+        new_end += first
+
+        if old_end > start:
+            self.beginRemoveRows(index, start, old_end - 1)
+            del children[start:old_end]
+            self._renumber(children, start)
+            self.endRemoveRows()
+        if new_end > start:
+            self.beginInsertRows(index, start, new_end - 1)
+            children[start:start] = [self._make_node(spec, node) for spec in specs[start:new_end]]
+            self._renumber(children, start)
+            self.endInsertRows()
+
+        first_changed = last_changed = None
+        for row, (child, spec) in enumerate(zip(children[first:], specs), first):
+            if start <= row < new_end:
+                continue
+            if child.text != spec[2] or child.payload != spec[3]:
+                child.text = spec[2]
+                child.payload = spec[3]
+                if first_changed is None:
+                    first_changed = row
+                last_changed = row
+            if child.kind == 'group' and child.children is not None:
+                self._sync_children(child, self.createIndex(row, 0, child))
+        if first_changed is not None:
+            self.dataChanged.emit(self.createIndex(first_changed, 0, children[first_changed]),
+                                  self.createIndex(last_changed, 0, children[last_changed]))
+
+    @staticmethod
+    def _renumber(children, start):
+        for row in range(start, len(children)):
+            children[row].row = row
+
+    # ------------------------------------------------------------------
+    # Satır listeleri
+    # ------------------------------------------------------------------
+    def _make_layer_node(self, layer, row):
+        node = _LayerTreeNode('layer', ('layer', layer['id']), layer['name'], layer['id'])
+        node.row = row
+        if not layer['strokes']:
+            node.children = []
+        return node
+
+    @staticmethod
+    def _make_node(spec, parent, row=0):
+        kind, key, text, payload, group_id = spec
+        node = _LayerTreeNode(kind, key, text, payload, group_id, parent)
+        node.row = row
+        return node
+
+    def _layer_strokes(self, node):
+        while node.parent is not None:
+            node = node.parent
+        layer = self.drawing_widget.layer_manager.layers.get(node.payload) if self.drawing_widget else None
+        return layer['strokes'] if layer else []
+
+    def _child_specs(self, node):
+        strokes = self._layer_strokes(node)
+        if node.kind == 'layer':
+            members_of = self._group_lookup(node.payload)
+            specs = self._layer_row_specs(strokes, members_of)
+            if self._rows_partition(strokes, specs, members_of):
+                self._overlapping_layers.discard(node.payload)
+            else:
+                self._overlapping_layers.add(node.payload)
+            return specs
+        if node.kind == 'group' and node.parent is not None and node.parent.kind == 'layer':
+            return self._group_child_specs(strokes, node.group_id, node.payload)
+        if node.kind == 'group':
+            return [self._stroke_spec(strokes, idx) for idx in node.payload if idx < len(strokes)]
+        return []
+
+    def _layer_row_specs(self, strokes, members_of, low=0):
+        """Katmanın üst seviye satırları: z sırasında üstteki önce, gruplar tek satır
+
+        Sadece çapası low ve üzerinde olan satırlar üretilir.
+        """
+        visited = set()
+        specs = []
+        for idx in range(len(strokes) - 1, low - 1, -1):
+            if idx in visited:
+                continue
+            stroke = strokes[idx]
+            # Önce parent_group_id ile dış grupları topla (iç içe grup desteği)
+            parent_group_id = self._get_stroke_parent_group_id(stroke)
+            group_id = self._get_stroke_group_id(stroke)
+            effective_group_id = parent_group_id or group_id
+            if effective_group_id:
+                members = members_of(effective_group_id, bool(parent_group_id)) or [idx]
+                visited.update(members)
+                specs.append(self._group_spec(effective_group_id, members))
+            else:
+                visited.add(idx)
+                specs.append(self._stroke_spec(strokes, idx))
+        return specs
+
+    def _group_child_specs(self, strokes, group_id, members):
+        """Grup üyeleri: tekil stroke'lar, ardından alt gruplar"""
+        subgroup_map = {}
+        specs = []
+        for member_idx in members:
+            if member_idx < len(strokes):
+                member_stroke = strokes[member_idx]
+                inner_parent = self._get_stroke_parent_group_id(member_stroke)
+                inner_group = self._get_stroke_group_id(member_stroke)
+                if inner_group and (not inner_parent or inner_parent == group_id):
+                    subgroup_map.setdefault(inner_group, []).append(member_idx)
+                else:
+                    specs.append(self._stroke_spec(strokes, member_idx))
+        for inner_group, inner_members in subgroup_map.items():
+            specs.append(self._group_spec(inner_group, inner_members))
+        return specs
+
+    def _group_lookup(self, layer_id):
+        """Katmandaki grup üyelerini (index sırasıyla) LayerManager'dan okuyan fonksiyon
+
+        members_of(grup, dış_grup_mu): dış grup için parent_group_id'si eşleşenler,
+        aksi halde group_id'si veya parent_group_id'si eşleşenler.
+        """
+        layer_manager = self.drawing_widget.layer_manager
+        cache = {}
+
+        def members_of(group_id, by_parent):
+            key = (group_id, by_parent)
+            if key not in cache:
+                members = layer_manager.group_member_indices(group_id, layer_id, parent=True)
+                if not by_parent:
+                    members = sorted(set(members).union(
+                        layer_manager.group_member_indices(group_id, layer_id)))
+                cache[key] = members
+            return cache[key]
+        return members_of
+
+    def _group_spec(self, group_id, members):
+        # Grup adı (kullanıcı tarafından atanmış olabilir)
+        display_name = self._get_group_display_name(group_id) or 'Grup'
+        text = f"{display_name} ({len(members)} öğe)"
+        return ('group', ('group', group_id), text, list(members), group_id)
+
+    def _stroke_spec(self, strokes, idx):
+        stroke = strokes[idx]
+        custom_name = self._get_stroke_name(stroke)
+        text = custom_name if custom_name else f"{self._get_stroke_type(stroke)} #{idx}"
+        # Kalıcı kimlik: undo/yükleme sonrası yeniden oluşturulan stroke'lar aynı satırda kalır
+        return ('stroke', ('stroke', get_stroke_id(stroke) or id(stroke)), text, idx, None)
+
+    def _get_stroke_group_id(self, stroke):
+        try:
+            group_id = None
+            if hasattr(stroke, 'group_id'):
+                group_id = getattr(stroke, 'group_id', None)
+            elif isinstance(stroke, dict):
+                group_id = stroke.get('group_id')
+            return group_id
+        except Exception:
+            return None
+
+    def _get_group_display_name(self, group_id):
+        try:
+            if not group_id:
+                return None
+            names = getattr(self.drawing_widget, 'group_names', None)
+            if isinstance(names, dict) and group_id in names:
+                return names.get(group_id)
+            # Varsayılan isimler
+            if isinstance(group_id, str) and group_id.startswith('freehand_'):
+                return 'Serbest Çizimler'
+            return 'Grup'
+        except Exception:
+            return 'Grup'
+
+    def _get_stroke_name(self, stroke):
+        try:
+            if hasattr(stroke, 'name'):
+                return getattr(stroke, 'name', None)
+            if isinstance(stroke, dict):
+                return stroke.get('name')
+            return None
+        except Exception:
+            return None
+
+    def _get_stroke_parent_group_id(self, stroke):
+        try:
+            parent_id = None
+            if hasattr(stroke, 'parent_group_id'):
+                parent_id = getattr(stroke, 'parent_group_id', None)
+            elif isinstance(stroke, dict):
+                parent_id = stroke.get('parent_group_id')
+            return parent_id
+        except Exception:
+            return None
+
+    def _get_stroke_type(self, stroke):
+        try:
+            if hasattr(stroke, 'stroke_type'):
+                stroke_type = getattr(stroke, 'stroke_type', 'şekil')
+            elif isinstance(stroke, dict):
+                stroke_type = stroke.get('type', 'şekil')
+            else:
+                stroke_type = 'şekil'
+            
+            # Kısa isimlere çevir (kolon genişliği için)
+            type_names = {
+                'line': 'Çizgi',
+                'rectangle': 'Dikdörtgen', 
+                'circle': 'Çember',
+                'bspline': 'Eğri',
+                'freehand': 'Kalem',
+                'image': 'Resim',
+                'text': 'Metin'
+            }
+            return type_names.get(stroke_type, stroke_type.title() if stroke_type else 'Şekil')
+        except Exception:
+            return 'Şekil'
+
+
 class LayerManagerWidget(QWidget):
     """Katmanları listeleyen ve yöneten panel."""
 
@@ -88,21 +687,24 @@ class LayerManagerWidget(QWidget):
         super().__init__(parent)
         self.drawing_widget = None
         self._updating = False
+        self._pending_stroke_ranges = {}  # katman -> birleştirilmiş (start, removed, inserted) aralığı
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(4, 4, 4, 4)
         main_layout.setSpacing(6)
 
-        self.layer_tree = QTreeWidget(self)
+        self.layer_model = LayerTreeModel(self)
+        self.layer_model.itemRenamed.connect(self._on_item_renamed)
+
+        self.layer_tree = QTreeView(self)
+        self.layer_tree.setModel(self.layer_model)
         self.layer_tree.setHeaderHidden(True)
-        self.layer_tree.setColumnCount(2)
         # Basit kolon düzeni - şekil isimleri tamamen görünsün
         self.layer_tree.setColumnWidth(0, 150)  # Şekil isimleri için
         self.layer_tree.setColumnWidth(1, 120)  # Kontroller için
-        self.layer_tree.setSelectionMode(QTreeWidget.SelectionMode.ExtendedSelection)
-        self.layer_tree.currentItemChanged.connect(self._on_selection_changed)
-        self.layer_tree.itemClicked.connect(self._on_item_clicked)
-        self.layer_tree.itemChanged.connect(self._on_item_renamed)
+        self.layer_tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.layer_tree.selectionModel().currentChanged.connect(self._on_selection_changed)
+        self.layer_tree.clicked.connect(self._on_item_clicked)
         main_layout.addWidget(self.layer_tree, 1)
 
         controls_layout = QHBoxLayout()
@@ -148,12 +750,22 @@ class LayerManagerWidget(QWidget):
                 self.drawing_widget.activeLayerChanged.disconnect(self._on_active_layer_changed)
             except Exception:
                 pass
+            try:
+                self.drawing_widget.strokesChanged.disconnect(self._on_strokes_changed)
+            except Exception:
+                pass
 
         self.drawing_widget = drawing_widget
+        self._pending_stroke_ranges.clear()
+        self._updating = True
+        self.layer_model.set_drawing_widget(drawing_widget)
+        self._updating = False
 
         if self.drawing_widget:
             self.drawing_widget.layersChanged.connect(self.refresh_layers)
             self.drawing_widget.activeLayerChanged.connect(self._on_active_layer_changed)
+            if hasattr(self.drawing_widget, 'strokesChanged'):
+                self.drawing_widget.strokesChanged.connect(self._on_strokes_changed)
             # Canvas seçimi değiştiğinde paneli güncelle
             if hasattr(self.drawing_widget, 'selection_tool'):
                 try:
@@ -163,6 +775,8 @@ class LayerManagerWidget(QWidget):
                 except Exception:
                     pass
 
+        self._sync_layer_widgets()
+        self._expand_top_layer()
         self.refresh_layers()
         # UI stabilize olsun diye bir sonraki event döngüsünde tekrar yenile
         QTimer.singleShot(0, self.refresh_layers)
@@ -171,34 +785,37 @@ class LayerManagerWidget(QWidget):
     # UI güncellemeleri
     # ------------------------------------------------------------------
     def refresh_layers(self):
+        """Katman satırlarını modelle eşitle (katman kümesi değiştiyse model sıfırlanır)"""
+        self._pending_stroke_ranges.clear()
         self._updating = True
-        
-        # Basit yenileme - expand durumunu koruma
-        was_expanded = False
-        if self.layer_tree.topLevelItemCount() > 0:
-            was_expanded = self.layer_tree.topLevelItem(0).isExpanded()
-
-        self.layer_tree.clear()
+        reset = self.layer_model.sync_layers()
+        self._sync_layer_widgets()
+        if reset:
+            self._expand_top_layer()
+        self._updating = False
 
         if not self.drawing_widget:
-            self._updating = False
             self._update_controls()
             return
 
-        layers = list(self.drawing_widget.get_layer_overview())
-        active_id = self.drawing_widget.get_active_layer_id()
-
-        # Görüntüde üstte olan layer listenin en üstünde görünsün
-        display_layers = list(reversed(layers))
-
-        for layer in display_layers:
-            # Katman üst düğümü
-            layer_item = QTreeWidgetItem(self.layer_tree)
-            layer_item.setText(0, layer['name'])
-            layer_item.setData(0, Qt.ItemDataRole.UserRole, layer['id'])
-            layer_item.setData(0, Qt.ItemDataRole.UserRole + 1, 'layer')
+        self._select_layer(self.drawing_widget.get_active_layer_id())
+        self._update_controls()
 
-            # Katman satırı için custom widget (görünür/kilit/ad)
+    def _sync_layer_widgets(self):
+        """Katman satırlarındaki görünürlük/kilit/ad kontrollerini oluştur veya güncelle"""
+        if not self.drawing_widget:
+            return
+        layers = self.drawing_widget.layer_manager.layers
+        for row in range(self.layer_model.rowCount()):
+            index = self.layer_model.index(row, 1)
+            layer = layers.get(self.layer_model.layer_id_for_index(index))
+            if layer is None:
+                continue
+            widget = self.layer_tree.indexWidget(index)
+            if isinstance(widget, LayerItemWidget) and widget.layer_id == layer['id']:
+                widget.set_state(layer['name'], layer['visible'], layer['locked'])
+                continue
+            # Widget'ı ikinci kolona koy ki expand oku ve isim korunabilsin
             widget = LayerItemWidget(
                 layer['id'],
                 layer['name'],
@@ -211,19 +828,45 @@ class LayerManagerWidget(QWidget):
                 },
                 self.layer_tree
             )
-            # Widget'ı ikinci kolona koy ki expand oku ve isim korunabilsin
-            self.layer_tree.setItemWidget(layer_item, 1, widget)
-
-            # Şekilleri (strokeleri) ekle - üstte olan önce gözüksün
-            strokes = layer.get('strokes', [])
-            self._populate_shapes_for_layer(layer_item, strokes)
-
-        # İlk katmanı aç
-        if self.layer_tree.topLevelItemCount() > 0:
-            self.layer_tree.topLevelItem(0).setExpanded(True)
+            self.layer_tree.setIndexWidget(index, widget)
+
+    def _expand_top_layer(self):
+        # İlk katmanı aç (şekil satırları bu noktada oluşturulur)
+        if self.layer_model.rowCount() > 0:
+            self.layer_tree.expand(self.layer_model.index(0, 0))
+
+    def _on_strokes_changed(self, layer_id, start, removed, inserted):
+        """Katmandaki stroke aralığı değişti; o katmanın şekil satırlarını güncelle
+
+        Aynı olay döngüsü turundaki bildirimler katman başına tek aralıkta
+        birleştirilir ve modele sadece o aralık uygulanır.
+        """
+        if not self._pending_stroke_ranges:
+            QTimer.singleShot(0, self._refresh_pending_stroke_layers)
+        pending = self._pending_stroke_ranges.get(layer_id)
+        if pending is not None:
+            # Ardışık iki değişikliği kapsayan tek aralık (eski ve yeni uzunluklarıyla)
+            first_start, first_removed, first_inserted = pending
+            merged_start = min(first_start, start)
+            middle_end = max(first_start + first_inserted, start + removed)
+            old_end = middle_end - first_inserted + first_removed
+            new_end = middle_end - removed + inserted
+            start, removed, inserted = merged_start, old_end - merged_start, new_end - merged_start
+        self._pending_stroke_ranges[layer_id] = (start, removed, inserted)
+
+    def _refresh_pending_stroke_layers(self):
+        ranges = self._pending_stroke_ranges
+        self._pending_stroke_ranges = {}
+        if not ranges or not self.drawing_widget:
+            return
 
+        self._updating = True
+        for layer_id, (start, removed, inserted) in ranges.items():
+            self.layer_model.apply_stroke_range(layer_id, start, removed, inserted)
         self._updating = False
-        self._select_layer(active_id)
+        # Silinen satırlarla birlikte kaybolan stroke vurgularını geri getir
+        if getattr(self.drawing_widget.selection_tool, 'selected_strokes', None):
+            self._on_canvas_selection_changed()
         self._update_controls()
 
     def _select_layer(self, layer_id):
@@ -232,102 +875,70 @@ class LayerManagerWidget(QWidget):
             self.layer_tree.clearSelection()
             return
 
-        for i in range(self.layer_tree.topLevelItemCount()):
-            item = self.layer_tree.topLevelItem(i)
-            if item.data(0, Qt.ItemDataRole.UserRole) == layer_id:
-                self.layer_tree.setCurrentItem(item)
-                return
+        index = self.layer_model.layer_index(layer_id)
+        if index.isValid():
+            self.layer_tree.setCurrentIndex(index)
 
     def _update_controls(self):
-        count = self.layer_tree.topLevelItemCount()
-        has_selection = self.layer_tree.currentItem() is not None
+        count = self.layer_model.rowCount()
+        current = self.layer_tree.currentIndex()
+        has_selection = current.isValid()
 
         self.remove_button.setEnabled(count > 1 and has_selection)
         self.up_button.setEnabled(has_selection)
         self.down_button.setEnabled(has_selection)
 
         if has_selection and self.drawing_widget:
-            current = self.layer_tree.currentItem()
             # Eğer bir alt öğe seçiliyse üst katmanını al
-            layer_item = current
-            while layer_item and layer_item.parent() is not None:
-                layer_item = layer_item.parent()
-            layer_id = layer_item.data(0, Qt.ItemDataRole.UserRole) if layer_item else None
+            layer_id = self.layer_model.layer_id_for_index(current)
             order = [layer['id'] for layer in self.drawing_widget.layer_manager.iter_layers()]
+            if layer_id not in order:
+                return
             index = order.index(layer_id)
             self.up_button.setEnabled(index < len(order) - 1)
             self.down_button.setEnabled(index > 0)
 
-    # ------------------------------------------------------------------
-    # Kullanıcı etkileşimleri
-    # ------------------------------------------------------------------
     def _on_selection_changed(self, current, previous):
-        if self._updating or not self.drawing_widget or current is None:
+        if self._updating or not self.drawing_widget or current is None or not current.isValid():
             self._update_controls()
             return
 
-        # Geçerli item bilgilerini hemen oku ve uygulamayı event döngüsüne ertele
-        try:
-            node_type = current.data(0, Qt.ItemDataRole.UserRole + 1)
-        except RuntimeError:
-            node_type = None
-
+        node_type = current.data(LayerTreeModel.KIND_ROLE)
         if node_type not in ('layer', 'stroke', 'group'):
             self._update_controls()
             return
 
-        # Gerekli değerleri kopyala
-        layer_id_val = None
-        selection_payload = None
-        try:
-            if node_type == 'layer':
-                layer_id_val = current.data(0, Qt.ItemDataRole.UserRole)
-            else:
-                # En üst katman düğümüne kadar yüksel ve layer_id'yi güvenli şekilde al
-                parent = current.parent()
-                while parent and parent.parent() is not None:
-                    parent = parent.parent()
-                layer_id_val = parent.data(0, Qt.ItemDataRole.UserRole) if parent else None
-                selection_payload = current.data(0, Qt.ItemDataRole.UserRole)
-        except RuntimeError:
-            layer_id_val = None
-            selection_payload = None
-
         # Çoklu seçim desteği
-        selected_items = self.layer_tree.selectedItems()
-        if not selected_items:
+        selected_indexes = [index for index in self.layer_tree.selectionModel().selectedIndexes()
+                            if index.column() == 0]
+        if not selected_indexes:
             return
 
         # Tüm seçili stroke/grup indekslerini topla
         all_selected_indices = []
+        seen = set()
         active_layer_id = None
 
-        for item in selected_items:
-            try:
-                item_node_type = item.data(0, Qt.ItemDataRole.UserRole + 1)
-                if item_node_type == 'layer':
-                    layer_id = item.data(0, Qt.ItemDataRole.UserRole)
-                    if layer_id and not active_layer_id:
-                        active_layer_id = layer_id
-                elif item_node_type in ('stroke', 'group'):
-                    # En üst katman düğümüne kadar yüksel ve güvenli layer_id al
-                    parent = item.parent()
-                    while parent and parent.parent() is not None:
-                        parent = parent.parent()
-                    layer_id = parent.data(0, Qt.ItemDataRole.UserRole) if parent else None
-                    if layer_id and not active_layer_id:
-                        active_layer_id = layer_id
-                    
-                    item_payload = item.data(0, Qt.ItemDataRole.UserRole)
-                    if item_node_type == 'stroke' and isinstance(item_payload, int):
-                        if item_payload not in all_selected_indices:
-                            all_selected_indices.append(item_payload)
-                    elif item_node_type == 'group' and isinstance(item_payload, list):
-                        for idx in item_payload:
-                            if idx not in all_selected_indices:
-                                all_selected_indices.append(idx)
-            except RuntimeError:
+        for index in selected_indexes:
+            item_node_type = index.data(LayerTreeModel.KIND_ROLE)
+            if item_node_type not in ('layer', 'stroke', 'group'):
+                continue
+            # En üst katman düğümünün id'si
+            layer_id = self.layer_model.layer_id_for_index(index)
+            if layer_id and not active_layer_id:
+                active_layer_id = layer_id
+
+            item_payload = index.data(LayerTreeModel.PAYLOAD_ROLE)
+            if item_node_type == 'stroke' and isinstance(item_payload, int):
+                payload = [item_payload]
+            elif item_node_type == 'group' and isinstance(item_payload, list):
+                payload = item_payload
+            else:
                 continue
+            for idx in payload:
+                if idx not in seen:
+                    seen.add(idx)
+                    all_selected_indices.append(idx)
 
         # Aktif katmanı ayarla
         if active_layer_id:
@@ -342,9 +953,9 @@ class LayerManagerWidget(QWidget):
 
         self._update_controls()
 
-    def _on_item_clicked(self, item, column):
+    def _on_item_clicked(self, index):
         # Aynı davranışı tıklamada da uygula (çift yönlü güvence)
-        self._on_selection_changed(item, None)
+        self._on_selection_changed(index, None)
 
     def _on_active_layer_changed(self, layer_id):
         if self._updating:
@@ -356,38 +967,33 @@ class LayerManagerWidget(QWidget):
         """Canvas'ta seçim değiştiğinde katman panelinde vurgula"""
         if self._updating or not self.drawing_widget:
             return
-        
+
         selected_strokes = self.drawing_widget.selection_tool.selected_strokes
         if not selected_strokes:
             self.layer_tree.clearSelection()
             return
-        
-        # Seçili stroke'ları ağaçta bul ve vurgula
-        self._updating = True
-        self.layer_tree.clearSelection()
-        
-        for i in range(self.layer_tree.topLevelItemCount()):
-            layer_item = self.layer_tree.topLevelItem(i)
-            self._select_strokes_in_tree(layer_item, selected_strokes)
-        
-        self._updating = False
 
-    def _select_strokes_in_tree(self, parent_item, selected_strokes):
-        """Ağaçta belirtilen stroke'ları seç"""
-        for i in range(parent_item.childCount()):
-            child = parent_item.child(i)
-            node_type = child.data(0, Qt.ItemDataRole.UserRole + 1)
-            
+        # Seçili stroke'ları oluşturulmuş satırlarda bul ve vurgula
+        selected = set(selected_strokes)
+        selection = QItemSelection()
+        for index in self.layer_model.iter_loaded_indexes():
+            node_type = index.data(LayerTreeModel.KIND_ROLE)
+            payload = index.data(LayerTreeModel.PAYLOAD_ROLE)
             if node_type == 'stroke':
-                stroke_idx = child.data(0, Qt.ItemDataRole.UserRole)
-                if stroke_idx in selected_strokes:
-                    child.setSelected(True)
+                hit = payload in selected
             elif node_type == 'group':
-                group_indices = child.data(0, Qt.ItemDataRole.UserRole)
-                if isinstance(group_indices, list) and any(idx in selected_strokes for idx in group_indices):
-                    child.setSelected(True)
-                # Grup alt öğelerini de kontrol et
-                self._select_strokes_in_tree(child, selected_strokes)
+                hit = isinstance(payload, list) and any(idx in selected for idx in payload)
+            else:
+                hit = False
+            if hit:
+                selection.select(index, index)
+
+        self._updating = True
+        self.layer_tree.selectionModel().select(
+            selection,
+            QItemSelectionModel.SelectionFlag.ClearAndSelect | QItemSelectionModel.SelectionFlag.Rows
+        )
+        self._updating = False
 
     def _on_visibility_changed(self, layer_id, visible):
         if not self.drawing_widget:
@@ -410,16 +1016,17 @@ class LayerManagerWidget(QWidget):
         self.drawing_widget.add_layer()
         self.refresh_layers()
 
+    def _current_layer_id(self):
+        # Alt öğe seçiliyse üst katmanı al
+        current = self.layer_tree.currentIndex()
+        if not current.isValid():
+            return None
+        return self.layer_model.layer_id_for_index(current)
+
     def _on_remove_layer(self):
         if not self.drawing_widget:
             return
-        current_item = self.layer_tree.currentItem()
-        if not current_item:
-            return
-        # Alt öğe seçiliyse üst katmanı al
-        while current_item and current_item.parent() is not None:
-            current_item = current_item.parent()
-        layer_id = current_item.data(0, Qt.ItemDataRole.UserRole)
+        layer_id = self._current_layer_id()
         if not layer_id:
             return
 
@@ -431,13 +1038,7 @@ class LayerManagerWidget(QWidget):
     def _move_layer(self, direction):
         if not self.drawing_widget:
             return
-        current_item = self.layer_tree.currentItem()
-        if not current_item:
-            return
-        # Alt öğe seçiliyse üst katmanı al
-        while current_item and current_item.parent() is not None:
-            current_item = current_item.parent()
-        layer_id = current_item.data(0, Qt.ItemDataRole.UserRole)
+        layer_id = self._current_layer_id()
         if not layer_id:
             return
 
@@ -451,190 +1052,19 @@ class LayerManagerWidget(QWidget):
             self.refresh_layers()
             self._select_layer(layer_id)
 
-    # ------------------------------------------------------------------
-    # Yardımcılar: şekil listesi oluşturma ve grup tespiti
-    # ------------------------------------------------------------------
-    def _populate_shapes_for_layer(self, layer_item, strokes):
-        visited_indices = set()
-
-        # Z üstte olan önce görünsün: sondan başa
-        for idx in range(len(strokes) - 1, -1, -1):
-            if idx in visited_indices:
-                continue
-            stroke = strokes[idx]
-
-            # Önce parent_group_id ile dış grupları topla (iç içe grup desteği)
-            parent_group_id = self._get_stroke_parent_group_id(stroke)
-            group_id = self._get_stroke_group_id(stroke)
-            effective_group_id = parent_group_id or group_id
-            if effective_group_id:
-                members = self._find_group_members_indices(strokes, effective_group_id, prefer_parent=bool(parent_group_id))
-                print(f"DEBUG: Found group {effective_group_id} with {len(members)} members: {members}")
-                # Tüm üyeleri visited işaretle
-                for m in members:
-                    visited_indices.add(m)
-
-                text = f"Grup ({len(members)} öğe)"
-                group_item = QTreeWidgetItem(layer_item)
-                # Grup adı (kullanıcı tarafından atanmış olabilir)
-                display_name = self._get_group_display_name(effective_group_id) or 'Grup'
-                group_item.setText(0, f"{display_name} ({len(members)} öğe)")
-                group_item.setData(0, Qt.ItemDataRole.UserRole, members)  # seçim için indeks listesi
-                group_item.setData(0, Qt.ItemDataRole.UserRole + 1, 'group')
-                group_item.setData(0, Qt.ItemDataRole.UserRole + 2, effective_group_id)  # isim için grup id
-                # Düzenlenebilir yap
-                group_item.setFlags(group_item.flags() | Qt.ItemFlag.ItemIsEditable)
-                
-                # Grup üyelerini alt düğümler olarak ekle (alt grupları tekil oluştur)
-                subgroup_map = {}
-                single_members = []
-                for member_idx in members:
-                    if member_idx < len(strokes):
-                        member_stroke = strokes[member_idx]
-                        inner_parent = self._get_stroke_parent_group_id(member_stroke)
-                        inner_group = self._get_stroke_group_id(member_stroke)
-                        if inner_group and (not inner_parent or inner_parent == effective_group_id):
-                            subgroup_map.setdefault(inner_group, []).append(member_idx)
-                        else:
-                            single_members.append(member_idx)
-
-                # Tekil üyeleri ekle
-                for member_idx in single_members:
-                    member_stroke = strokes[member_idx]
-                    custom_name = self._get_stroke_name(member_stroke)
-                    if custom_name:
-                        member_text = custom_name
-                    else:
-                        member_type = self._get_stroke_type(member_stroke)
-                        member_text = f"{member_type} #{member_idx}"
-                    member_item = QTreeWidgetItem(group_item)
-                    member_item.setText(0, member_text)
-                    member_item.setData(0, Qt.ItemDataRole.UserRole, member_idx)
-                    member_item.setData(0, Qt.ItemDataRole.UserRole + 1, 'stroke')
-                    # Düzenlenebilir yap
-                    member_item.setFlags(member_item.flags() | Qt.ItemFlag.ItemIsEditable)
-
-                # Alt grupları tekil olarak ekle
-                for ig, ig_members in subgroup_map.items():
-                    sub_item = QTreeWidgetItem(group_item)
-                    sub_name = self._get_group_display_name(ig) or 'Grup'
-                    sub_item.setText(0, f"{sub_name} ({len(ig_members)} öğe)")
-                    sub_item.setData(0, Qt.ItemDataRole.UserRole, ig_members)
-                    sub_item.setData(0, Qt.ItemDataRole.UserRole + 1, 'group')
-                    sub_item.setData(0, Qt.ItemDataRole.UserRole + 2, ig)
-                    sub_item.setFlags(sub_item.flags() | Qt.ItemFlag.ItemIsEditable)
-                    for sm_idx in ig_members:
-                        sm_stroke = strokes[sm_idx]
-                        sm_custom = self._get_stroke_name(sm_stroke)
-                        if sm_custom:
-                            sm_text = sm_custom
-                        else:
-                            sm_type = self._get_stroke_type(sm_stroke)
-                            sm_text = f"{sm_type} #{sm_idx}"
-                        sm_item = QTreeWidgetItem(sub_item)
-                        sm_item.setText(0, sm_text)
-                        sm_item.setData(0, Qt.ItemDataRole.UserRole, sm_idx)
-                        sm_item.setData(0, Qt.ItemDataRole.UserRole + 1, 'stroke')
-                        sm_item.setFlags(sm_item.flags() | Qt.ItemFlag.ItemIsEditable)
-            else:
-                visited_indices.add(idx)
-                stroke_type = self._get_stroke_type(stroke)
-                custom_name = self._get_stroke_name(stroke)
-                text = custom_name if custom_name else f"{stroke_type} #{idx}"
-                stroke_item = QTreeWidgetItem(layer_item)
-                stroke_item.setText(0, text)
-                stroke_item.setData(0, Qt.ItemDataRole.UserRole, idx)
-                stroke_item.setData(0, Qt.ItemDataRole.UserRole + 1, 'stroke')
-                stroke_item.setFlags(stroke_item.flags() | Qt.ItemFlag.ItemIsEditable)
-
-    def _get_stroke_group_id(self, stroke):
-        try:
-            group_id = None
-            if hasattr(stroke, 'group_id'):
-                group_id = getattr(stroke, 'group_id', None)
-            elif isinstance(stroke, dict):
-                group_id = stroke.get('group_id')
-            
-            if group_id:
-                print(f"DEBUG: Stroke has group_id: {group_id}")
-            return group_id
-        except Exception:
-            return None
-
-    def _get_group_display_name(self, group_id):
-        try:
-            if not group_id:
-                return None
-            names = getattr(self.drawing_widget, 'group_names', None)
-            if isinstance(names, dict) and group_id in names:
-                return names.get(group_id)
-            # Varsayılan isimler
-            if isinstance(group_id, str) and group_id.startswith('freehand_'):
-                return 'Serbest Çizimler'
-            return 'Grup'
-        except Exception:
-            return 'Grup'
-
-    def _get_stroke_name(self, stroke):
-        try:
-            if hasattr(stroke, 'name'):
-                return getattr(stroke, 'name', None)
-            if isinstance(stroke, dict):
-                return stroke.get('name')
-            return None
-        except Exception:
-            return None
-
-    def _get_stroke_parent_group_id(self, stroke):
-        try:
-            parent_id = None
-            if hasattr(stroke, 'parent_group_id'):
-                parent_id = getattr(stroke, 'parent_group_id', None)
-            elif isinstance(stroke, dict):
-                parent_id = stroke.get('parent_group_id')
-            return parent_id
-        except Exception:
-            return None
-
-    def _find_group_members_indices(self, strokes, group_id, prefer_parent=False):
-        members = []
-        for i, s in enumerate(strokes):
-            if prefer_parent:
-                gid = self._get_stroke_parent_group_id(s)
-                if gid == group_id:
-                    members.append(i)
-            else:
-                gid = self._get_stroke_group_id(s)
-                pid = self._get_stroke_parent_group_id(s)
-                if gid == group_id or pid == group_id:
-                    members.append(i)
-        return members
-
     # ------------------------------------------------------------------
     # Yeniden adlandırma
     # ------------------------------------------------------------------
-    def _on_item_renamed(self, item, column):
+    def _on_item_renamed(self, index, new_text):
         if self._updating or not self.drawing_widget:
             return
-        try:
-            node_type = item.data(0, Qt.ItemDataRole.UserRole + 1)
-        except RuntimeError:
-            node_type = None
-        if node_type not in ('stroke', 'group'):
-            return
-        new_text = item.text(0).strip()
-        if not new_text:
-            return
-        # Katman düğümünü bul
-        parent = item.parent()
-        while parent and parent.parent() is not None:
-            parent = parent.parent()
-        layer_id = parent.data(0, Qt.ItemDataRole.UserRole) if parent else None
-        if not layer_id:
+        node_type = index.data(LayerTreeModel.KIND_ROLE)
+        layer_id = self.layer_model.layer_id_for_index(index)
+        if not layer_id or layer_id not in self.drawing_widget.layer_manager.layers:
             return
         # Stroke yeniden adlandırma
         if node_type == 'stroke':
-            stroke_idx = item.data(0, Qt.ItemDataRole.UserRole)
+            stroke_idx = index.data(LayerTreeModel.PAYLOAD_ROLE)
             if isinstance(stroke_idx, int):
                 strokes = self.drawing_widget.layer_manager.layers[layer_id]['strokes']
                 if 0 <= stroke_idx < len(strokes):
@@ -648,34 +1078,10 @@ class LayerManagerWidget(QWidget):
                         s['name'] = new_text
         # Grup yeniden adlandırma
         elif node_type == 'group':
-            group_id = item.data(0, Qt.ItemDataRole.UserRole + 2)
+            group_id = index.data(LayerTreeModel.GROUP_ROLE)
             if not hasattr(self.drawing_widget, 'group_names'):
                 self.drawing_widget.group_names = {}
             if group_id:
                 self.drawing_widget.group_names[group_id] = new_text
-        # Görünümü tazele
-        self.refresh_layers()
-
-    def _get_stroke_type(self, stroke):
-        try:
-            if hasattr(stroke, 'stroke_type'):
-                stroke_type = getattr(stroke, 'stroke_type', 'şekil')
-            elif isinstance(stroke, dict):
-                stroke_type = stroke.get('type', 'şekil')
-            else:
-                stroke_type = 'şekil'
-            
-            # Kısa isimlere çevir (kolon genişliği için)
-            type_names = {
-                'line': 'Çizgi',
-                'rectangle': 'Dikdörtgen', 
-                'circle': 'Çember',
-                'bspline': 'Eğri',
-                'freehand': 'Kalem',
-                'image': 'Resim',
-                'text': 'Metin'
-            }
-            return type_names.get(stroke_type, stroke_type.title() if stroke_type else 'Şekil')
-        except Exception:
-            return 'Şekil'
-
+        # Görünümü tazele (grup adı birden çok katmanda görünebilir)
+        QTimer.singleShot(0, self.refresh_layers)
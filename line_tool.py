@@ -1,8 +1,9 @@
-from PyQt6.QtCore import QPointF
+from PyQt6.QtCore import QPointF, QRectF
 from PyQt6.QtGui import QPainter, QPen, QPainterPath
 from PyQt6.QtCore import Qt
 from grid_snap_utils import GridSnapUtils
 from shadow_renderer import ShadowRenderer
+from stroke_handler import StrokeHandler
 
 class LineTool:
     def __init__(self):
@@ -142,6 +143,21 @@ class LineTool:
         ShadowRenderer.draw_shape_shadow(painter, 'path', path, stroke_data)
         painter.drawLine(start_point, end_point)
         
+    def get_preview_rect(self):
+        """Önizlemenin kapladığı sahne alanı (kalınlık + gölge payı dahil)"""
+        if not self.is_drawing or not self.start_point or not self.current_point:
+            return None
+        rect = QRectF(self.start_point, self.current_point).normalized()
+        pad = StrokeHandler.get_render_padding({
+            'width': self.line_width,
+            'has_shadow': self.has_shadow,
+            'shadow_blur': self.shadow_blur,
+            'shadow_size': self.shadow_size,
+            'shadow_offset_x': self.shadow_offset_x,
+            'shadow_offset_y': self.shadow_offset_y,
+        })
+        return rect.adjusted(-pad, -pad, pad, pad)
+
     def draw_current_stroke(self, painter):
         """Aktif olarak çizilen çizgiyi çiz"""
         if not self.is_drawing or not self.start_point or not self.current_point:
@@ -0,0 +1,264 @@
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPen, QPixmap
+
+from advanced_brush import SimpleBrush
+
+
+class LiveStrokeRenderer:
+    """Çizilmekte olan serbest çizimi artımlı olarak çizer.
+
+    Her yeni nokta için yalnızca yeni Catmull–Rom segmentleri üretilir ve
+    kalıcı path'e eklenir. Komşu noktaları belli olan (kesinleşmiş) segmentler
+    bir kez ekran boyutundaki overlay pixmap'e basılır; her karede sadece bu
+    pixmap, henüz basılmamış birkaç segment ve son (geçici) segment çizilir.
+    Böylece nokta başına maliyet stroke uzunluğundan bağımsız kalır.
+
+    Segmentler pixmap'e tek tek değil FLUSH_SEGMENTS'lik kesintisiz parçalar
+    halinde basılır; ayrı çizilen segmentlerin kenar yumuşatması üst üste
+    binip çizgiyi kalınlaştırmaz.
+    """
+
+    FLUSH_SEGMENTS = 32
+
+    def __init__(self, color, width, line_style=Qt.PenStyle.SolidLine, shadow_data=None):
+        self.pen = SimpleBrush.create_pen(color, width, line_style)
+        self.opacity = self.pen.color().alphaF()
+        # Pixmap'e opak basılır, saydamlık kopyalanırken uygulanır (eklem yerleri koyulaşmaz)
+        opaque = QColor(self.pen.color())
+        opaque.setAlpha(255)
+        self._pixmap_pen = QPen(self.pen)
+        self._pixmap_pen.setColor(opaque)
+
+        jitter = SimpleBrush.jitter_distance(width)
+        self._min_dist_sq = jitter * jitter if jitter is not None else 0.0
+
+        self._shadow = None
+        self._shadow_data = None
+        if shadow_data and shadow_data.get('has_shadow', False):
+            self._setup_shadow(shadow_data, width)
+
+        self._xs = []
+        self._ys = []
+        self.path = QPainterPath()  # Kesinleşmiş segmentler
+        self._flushed_path = QPainterPath()  # Pixmap'e basılmış segmentler
+        self._finalized = 0
+        self._length = 0.0  # Kesinleşmiş segmentlerin uzunluğu (kesikli çizgi ofseti)
+        self._pending = []  # Pixmap'e henüz basılmamış (segment, dash ofseti)
+        self._pixmap = None
+        self._shadow_pixmap = None
+        self._pixmap_key = None
+        self._dirty_rect = None
+
+    def _setup_shadow(self, shadow_data, width):
+        """Canlı gölge önizlemesi: bulanıklaştırılmamış, kaydırılmış geniş çizgi"""
+        self._shadow_data = dict(shadow_data)
+        self._shadow_data['width'] = width
+        if shadow_data.get('inner_shadow', False):
+            # İç gölge artımlı basılamaz; tam path üzerinden ShadowRenderer kullanılır
+            return
+        shadow_color = QColor(shadow_data.get('shadow_color', Qt.GlobalColor.black))
+        shadow_color.setAlpha(255)
+        shadow_size = shadow_data.get('shadow_size', 0)
+        pen = QPen(shadow_color)
+        pen.setWidthF(max(0.1, max(0.1, float(width)) + shadow_size * 2))
+        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+        self._shadow = {
+            'pen': pen,
+            'offset': QPointF(shadow_data.get('shadow_offset_x', 5), shadow_data.get('shadow_offset_y', 5)),
+            'opacity': shadow_data.get('shadow_opacity', 0.7),
+        }
+
+    def __len__(self):
+        return len(self._xs)
+
+    def add_point(self, x, y):
+        """Nokta ekle; değişen sahne bölgesi take_dirty_rect ile alınır"""
+        xs, ys = self._xs, self._ys
+        if xs and self._min_dist_sq:
+            dx = x - xs[-1]
+            dy = y - ys[-1]
+            if dx * dx + dy * dy < self._min_dist_sq:
+                return False
+        # Eski geçici segment (son iki nokta ve komşusu) yeniden çizilecek
+        first_dirty = max(0, len(xs) - 3)
+        xs.append(float(x))
+        ys.append(float(y))
+
+        while self._finalized <= len(xs) - 3:
+            segment = self._segment_path(self._finalized)
+            if self.path.isEmpty():
+                self.path.moveTo(xs[0], ys[0])
+            self.path.connectPath(segment)
+            self._pending.append((segment, self._length))
+            self._length += segment.length()
+            self._finalized += 1
+
+        self._mark_dirty(first_dirty)
+        return True
+
+    def _segment_path(self, index):
+        """index -> index+1 arası Catmull–Rom segmentini cubic Bézier olarak döndür"""
+        xs, ys = self._xs, self._ys
+        last = len(xs) - 1
+        i0 = index - 1 if index > 0 else 0
+        i3 = min(index + 2, last)
+        x1, y1 = xs[index], ys[index]
+        x2, y2 = xs[index + 1], ys[index + 1]
+        segment = QPainterPath(QPointF(x1, y1))
+        segment.cubicTo(
+            x1 + (x2 - xs[i0]) / 6.0, y1 + (y2 - ys[i0]) / 6.0,
+            x2 - (xs[i3] - x1) / 6.0, y2 - (ys[i3] - y1) / 6.0,
+            x2, y2
+        )
+        return segment
+
+    def _tail_path(self):
+        """Henüz kesinleşmemiş son segment"""
+        count = len(self._xs)
+        if count < 2:
+            return None
+        if count == 2:
+            tail = QPainterPath(QPointF(self._xs[0], self._ys[0]))
+            tail.lineTo(self._xs[1], self._ys[1])
+            return tail
+        return self._segment_path(count - 2)
+
+    def _mark_dirty(self, first_index):
+        xs = self._xs[first_index:]
+        ys = self._ys[first_index:]
+        rect = QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+        margin = self.pen.widthF() / 2.0 + 2.0
+        rect = rect.adjusted(-margin, -margin, margin, margin)
+        if self._shadow is not None:
+            offset = self._shadow['offset']
+            shadow_margin = self._shadow['pen'].widthF() / 2.0 + 2.0
+            shadow_rect = rect.translated(offset).adjusted(
+                -shadow_margin, -shadow_margin, shadow_margin, shadow_margin)
+            rect = rect.united(shadow_rect)
+        elif self._shadow_data is not None:
+            # İç gölge tam path ile çizildiği için her karede tamamı yenilenir
+            rect = self.path.boundingRect().united(rect).adjusted(-margin, -margin, margin, margin)
+        self._dirty_rect = rect if self._dirty_rect is None else self._dirty_rect.united(rect)
+
+    def take_dirty_rect(self):
+        """Son çağrıdan beri değişen sahne bölgesini döndür ve sıfırla"""
+        rect = self._dirty_rect
+        self._dirty_rect = None
+        return rect
+
+    def _ensure_pixmaps(self, painter):
+        """Overlay pixmap'leri ekran dönüşümüne göre hazırla, biriken segmentleri bas"""
+        device = painter.device()
+        dpr = device.devicePixelRatioF() if hasattr(device, 'devicePixelRatioF') else 1.0
+        transform = painter.worldTransform()
+        key = (
+            device.width(), device.height(), dpr,
+            transform.m11(), transform.m12(), transform.m21(), transform.m22(),
+            transform.dx(), transform.dy()
+        )
+        if key != self._pixmap_key:
+            # İlk kare veya zoom/pan/boyut değişti: basılmış path'ten baştan bas
+            self._pixmap_key = key
+            self._pixmap = self._create_pixmap(device.width(), device.height(), dpr)
+            if self._shadow is not None:
+                self._shadow_pixmap = self._create_pixmap(device.width(), device.height(), dpr)
+            if not self._flushed_path.isEmpty():
+                self._paint_path(self._flushed_path, 0.0, transform)
+
+        if len(self._pending) < self.FLUSH_SEGMENTS:
+            return
+        chunk, start_length = self._pending_path()
+        self._paint_path(chunk, start_length, transform)
+        if self._flushed_path.isEmpty():
+            self._flushed_path = QPainterPath(chunk)
+        else:
+            self._flushed_path.connectPath(chunk)
+        self._pending = []
+
+    def _pending_path(self):
+        """Basılmamış segmentleri tek path olarak (ve başlangıç dash ofsetini) döndür"""
+        path = QPainterPath(self._pending[0][0])
+        for segment, _ in self._pending[1:]:
+            path.connectPath(segment)
+        return path, self._pending[0][1]
+
+    def _paint_path(self, path, start_length, transform):
+        self._paint_on(self._pixmap, path, start_length, transform, self._pixmap_pen, QPointF())
+        if self._shadow_pixmap is not None:
+            self._paint_on(self._shadow_pixmap, path, start_length, transform,
+                           self._shadow['pen'], self._shadow['offset'])
+
+    @staticmethod
+    def _create_pixmap(width, height, dpr):
+        pixmap = QPixmap(max(1, int(round(width * dpr))), max(1, int(round(height * dpr))))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        return pixmap
+
+    @staticmethod
+    def _dashed_pen(pen, start_length):
+        """Kesikli desen parçalar arasında kesintisiz devam etsin"""
+        if pen.style() == Qt.PenStyle.SolidLine or start_length <= 0:
+            return pen
+        dashed = QPen(pen)
+        dashed.setDashOffset(start_length / (pen.widthF() or 1.0))
+        return dashed
+
+    def _paint_on(self, pixmap, path, start_length, transform, pen, offset):
+        target = QPainter(pixmap)
+        target.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        target.setTransform(transform)
+        target.translate(offset)
+        target.setBrush(Qt.BrushStyle.NoBrush)
+        target.setPen(self._dashed_pen(pen, start_length))
+        target.drawPath(path)
+        target.end()
+
+    def draw(self, painter):
+        """Canlı çizimi painter'ın mevcut dönüşümüyle çiz"""
+        tail = self._tail_path()
+        if tail is None:
+            return
+        self._ensure_pixmaps(painter)
+
+        painter.save()
+        if self._shadow_data is not None and self._shadow is None:
+            from shadow_renderer import ShadowRenderer
+            full_path = QPainterPath(self.path)
+            if full_path.isEmpty():
+                full_path = QPainterPath(tail)
+            else:
+                full_path.connectPath(tail)
+            ShadowRenderer.draw_shape_shadow(painter, 'path', full_path, self._shadow_data)
+
+        # Basılmamış segmentler ve geçici son segment tek path olarak çizilir
+        if self._pending:
+            live_path, start_length = self._pending_path()
+            live_path.connectPath(tail)
+        else:
+            live_path, start_length = tail, self._length
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+
+        if self._shadow is not None:
+            painter.save()
+            painter.setOpacity(self._shadow['opacity'])
+            painter.resetTransform()
+            painter.drawPixmap(0, 0, self._shadow_pixmap)
+            painter.restore()
+            painter.save()
+            painter.setOpacity(self._shadow['opacity'])
+            painter.translate(self._shadow['offset'])
+            painter.setPen(self._shadow['pen'])
+            painter.drawPath(live_path)
+            painter.restore()
+
+        painter.save()
+        painter.setOpacity(self.opacity)
+        painter.resetTransform()
+        painter.drawPixmap(0, 0, self._pixmap)
+        painter.restore()
+        painter.setPen(self._dashed_pen(self.pen, start_length))
+        painter.drawPath(live_path)
+        painter.restore()
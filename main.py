@@ -34,6 +34,8 @@ from settings_manager import SettingsManager
 from session_manager import SessionManager
 from shape_properties_widget import ShapePropertiesWidget
 from layer_manager_widget import LayerManagerWidget
+from stroke_points import StrokePoints
+from stroke_handler import StrokeHandler
 from pdf_importer import PDFImporter
 
 class MainWindow(QMainWindow):
@@ -1174,13 +1176,13 @@ class MainWindow(QMainWindow):
                 max_x = max_y = float('-inf')
                 
                 for stroke in strokes:
-                    # Stroke tipine göre point'leri al
-                    points = self.get_stroke_points_for_bounds(stroke)
-                    for x, y in points:
-                        min_x = min(min_x, x)
-                        max_x = max(max_x, x)
-                        min_y = min(min_y, y)
-                        max_y = max(max_y, y)
+                    bounds = self.get_stroke_bounds(stroke)
+                    if bounds is None:
+                        continue
+                    min_x = min(min_x, bounds[0])
+                    min_y = min(min_y, bounds[1])
+                    max_x = max(max_x, bounds[2])
+                    max_y = max(max_y, bounds[3])
                 
                 # Şeklin merkezi
                 shape_center_x = (min_x + max_x) / 2
@@ -1221,7 +1223,7 @@ class MainWindow(QMainWindow):
                 current_widget.set_active_tool("select")
                 self.set_tool("select")
                 
-                current_widget.update()
+                current_widget.update_contents()
 
     def transform_canvas_to_world(self, canvas_x, canvas_y, drawing_widget):
         """Canvas koordinatlarını world koordinatlarına dönüştür"""
@@ -1237,54 +1239,6 @@ class MainWindow(QMainWindow):
         
         return world_x, world_y
         
-    def get_stroke_points_for_bounds(self, stroke):
-        """Stroke'tan bounding hesaplama için point'leri al"""
-        points = []
-        # ImageStroke nesneleri için doğrudan bounds'tan köşe noktalarını türet
-        if hasattr(stroke, 'stroke_type') and getattr(stroke, 'stroke_type', None) == 'image':
-            bounds = stroke.get_bounds()
-            return [
-                (bounds.left(), bounds.top()),
-                (bounds.right(), bounds.bottom())
-            ]
-
-        # Dict tabanlı stroke'lar için güvenli kontrol
-        if not isinstance(stroke, dict):
-            return points
-
-        if stroke.get('type') == 'freehand':
-            for point in stroke.get('points', []):
-                if isinstance(point, dict):
-                    points.append((point['x'], point['y']))
-
-        elif stroke.get('type') == 'bspline':
-            for cp in stroke.get('control_points', []):
-                points.append((cp[0], cp[1]))
-
-        elif stroke.get('type') == 'line':
-            if 'start_point' in stroke:
-                points.append(stroke['start_point'])
-            if 'end_point' in stroke:
-                points.append(stroke['end_point'])
-
-        elif stroke.get('type') == 'rectangle':
-            if 'corners' in stroke:
-                points.extend(stroke['corners'])
-            elif 'top_left' in stroke and 'bottom_right' in stroke:
-                points.extend([stroke['top_left'], stroke['bottom_right']])
-
-        elif stroke.get('type') == 'circle':
-            if 'center' in stroke:
-                center = stroke['center']
-                radius = stroke.get('radius', 0)
-                # Çemberin bounding box'ını hesapla
-                points.extend([
-                    (center[0] - radius, center[1] - radius),
-                    (center[0] + radius, center[1] + radius)
-                ])
-
-        return points
-        
     def apply_offset_to_stroke(self, stroke, offset_x, offset_y):
         """Stroke'a offset uygula"""
         # ImageStroke için attr tabanlı kopyalama ve kaydırma
@@ -1299,7 +1253,11 @@ class MainWindow(QMainWindow):
         new_stroke = stroke.copy()
 
         if isinstance(new_stroke, dict) and new_stroke.get('type') == 'freehand':
-            if 'points' in new_stroke:
+            if isinstance(new_stroke.get('points'), StrokePoints):
+                new_points = new_stroke['points'].copy()
+                new_points.translate(offset_x, offset_y)
+                new_stroke['points'] = new_points
+            elif 'points' in new_stroke:
                 new_points = []
                 for point in new_stroke['points']:
                     if isinstance(point, dict):
@@ -1622,7 +1580,7 @@ class MainWindow(QMainWindow):
                         continue
                     stroke['color'] = color
             
-            current_widget.update()
+            current_widget.update_contents()
             self.show_status_message("Şekil rengi değiştirildi")
         else:
             # Seçim yoksa aktif aracın rengini güncelle (freehand vb.)
@@ -1679,7 +1637,7 @@ class MainWindow(QMainWindow):
                         # Line, bspline, freehand için 'width' kullan
                         stroke['width'] = width
             
-            current_widget.update()
+            current_widget.update_contents()
             self.show_status_message("Şekil kalınlığı değiştirildi")
         else:
             # Seçim yoksa aktif aracın kalınlığını güncelle ve toolbar'ı senkronla
@@ -1718,7 +1676,7 @@ class MainWindow(QMainWindow):
                         # Line, bspline, freehand için 'style' kullan
                         stroke['style'] = line_style
             
-            current_widget.update()
+            current_widget.update_contents()
             self.show_status_message("Şekil çizgi stili değiştirildi")
             # Ayarlara da kaydet (seçim olsa bile varsayılan stil güncellensin)
             try:
@@ -1801,7 +1759,7 @@ class MainWindow(QMainWindow):
                     if stroke['type'] in ['rectangle', 'circle']:
                         stroke['fill_color'] = color
             
-            current_widget.update()
+            current_widget.update_contents()
             self.show_status_message("Şekil dolgu rengi değiştirildi")
     
     def on_shape_fill_enabled_changed(self, enabled):
@@ -1834,7 +1792,7 @@ class MainWindow(QMainWindow):
                     if stroke['type'] in ['rectangle', 'circle']:
                         stroke['fill'] = enabled
             
-            current_widget.update()
+            current_widget.update_contents()
             self.show_status_message("Şekil dolgu durumu değiştirildi")
     
     def on_shape_fill_opacity_changed(self, opacity):
@@ -1863,7 +1821,7 @@ class MainWindow(QMainWindow):
                     if stroke['type'] in ['rectangle', 'circle']:
                         stroke['fill_opacity'] = opacity
             
-            current_widget.update()
+            current_widget.update_contents()
             self.show_status_message("Şekil dolgu şeffaflığı değiştirildi")
             
     def on_background_changed(self, settings):
@@ -1916,9 +1874,9 @@ class MainWindow(QMainWindow):
     def on_canvas_orientation_changed(self, orientation):
         """Canvas yönü değiştiğinde"""
         self.settings.set_canvas_orientation(orientation)
-        # Tüm açık tab'lara uygula
+        # Tüm açık tab'lara uygula (bekleyen sekmeler yüklenirken ayarlardan alır)
         for i in range(self.tab_widget.count()):
-            drawing_widget = self.tab_manager.get_tab_widget_at_index(i)
+            drawing_widget = self.tab_manager.get_tab_widget_at_index(i, load=False)
             if drawing_widget:
                 drawing_widget.set_canvas_orientation(orientation)
         self.settings.save_settings()
@@ -1954,13 +1912,14 @@ class MainWindow(QMainWindow):
         """Resim async yüklendiğinde canvas'ı güncelle"""
         current_widget = self.get_current_drawing_widget()
         if current_widget:
-            current_widget.update()  # Canvas'ı yeniden çiz
+            current_widget.update_contents()  # Canvas'ı yeniden çiz
         
     def update_canvas_sizes(self, size):
         """Canvas boyutlarını güncelle"""
-        # Tüm açık tab'lara yeni boyutları uygula
+        # Tüm açık tab'lara yeni boyutları uygula; bekleyen sekmeler yüklenirken
+        # load_settings_to_tab ile alır (bir sekmeyi yüklemek diğerlerini yüklemesin)
         for i in range(self.tab_widget.count()):
-            drawing_widget = self.tab_manager.get_tab_widget_at_index(i)
+            drawing_widget = self.tab_manager.get_tab_widget_at_index(i, load=False)
             if drawing_widget:
                 if size == 'screen':
                     try:
@@ -2176,7 +2135,7 @@ class MainWindow(QMainWindow):
                     tool.set_shadow_quality(defaults['shadow_quality'])
                 except Exception:
                     continue
-            current_widget.update()
+            current_widget.update_contents()
 
     def on_fill_defaults_changed(self, payload):
         try:
@@ -2198,7 +2157,7 @@ class MainWindow(QMainWindow):
                     tool.set_fill_opacity(d['opacity'])
                 except Exception:
                     continue
-            current_widget.update()
+            current_widget.update_contents()
         
         # UI widget'larını güncelle
         try:
@@ -2211,20 +2170,24 @@ class MainWindow(QMainWindow):
         """Oturumu kaydet (mevcut dosya varsa üzerine yaz)"""
         if self.current_session_file:
             # Mevcut dosya üzerine kaydet
-            if self.session_manager.save_session(self, self.current_session_file):
+            # Kayıt arka planda yazılır; otomatik kayıt ancak yazım bitince silinir
+            if self.session_manager.save_session(self, self.current_session_file,
+                                                 on_finished=self._on_session_saved):
                 self.update_window_title()
-                self.session_manager.clear_auto_save()
         else:
             # İlk kez kaydetme - dosya adı sor
             self.save_session_as()
 
     def save_session_as(self):
         """Oturumu farklı kaydet"""
-        filename = self.session_manager.save_session(self)
+        filename = self.session_manager.save_session(self, on_finished=self._on_session_saved)
         if filename:
             self.current_session_file = filename
             self.update_window_title()
-            self.session_manager.clear_auto_save()
+
+    def _on_session_saved(self, filename):
+        """Arka plan kaydı diske yazıldıktan sonra otomatik kaydı temizle"""
+        self.session_manager.clear_auto_save()
 
     def load_session(self):
         """Oturum aç"""
@@ -2290,9 +2253,9 @@ class MainWindow(QMainWindow):
         self.settings.set_canvas_orientation(orientation)
         self.settings.save_settings()
         
-        # Tüm tab'lardaki canvas'ları güncelle
+        # Tüm tab'lardaki canvas'ları güncelle (bekleyen sekmeler yüklenirken ayarlardan alır)
         for i in range(self.tab_widget.count()):
-            drawing_widget = self.tab_manager.get_tab_widget_at_index(i)
+            drawing_widget = self.tab_manager.get_tab_widget_at_index(i, load=False)
             if drawing_widget:
                 drawing_widget.set_canvas_orientation(orientation)
         
@@ -2501,7 +2464,7 @@ class MainWindow(QMainWindow):
             current_widget.set_active_tool("select")
             self.set_tool("select")
             
-            current_widget.update()
+            current_widget.update_contents()
             
             self.show_status_message(f"Resim eklendi: {os.path.basename(filename)}")
             
@@ -2542,8 +2505,8 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Uygulama kapanırken ayarları kaydet"""
-        # Otomatik oturum kaydetme
-        self.session_manager.auto_save_session(self)
+        # Otomatik oturum kaydetme (arka planda süren kayıtlar bitirilir)
+        self.session_manager.auto_save_session(self, blocking=True)
         
         # Eğer kullanıcı manuel olarak kaydetmediyse image cache'i temizle
         if not self.current_session_file:
@@ -2634,7 +2597,7 @@ class MainWindow(QMainWindow):
                 elif isinstance(stroke, dict):
                     stroke['parent_group_id'] = group_id
         
-        current_widget.update()
+        current_widget.update_contents()
         
         # Katman panelini güncelle (grup ağacı için)
         current_widget.layer_manager._emit_changes()
@@ -2659,7 +2622,7 @@ class MainWindow(QMainWindow):
                     if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                         stroke.set_opacity(opacity)
             
-            current_widget.update()
+            current_widget.update_contents()
     
     def on_image_border_enabled_changed(self, enabled):
         """Resim kenarlığı etkin/pasif değişti"""
@@ -2675,7 +2638,7 @@ class MainWindow(QMainWindow):
                     if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                         stroke.has_border = enabled
             
-            current_widget.update()
+            current_widget.update_contents()
     
     def on_image_border_color_changed(self, color):
         """Resim kenarlık rengi değişti"""
@@ -2692,7 +2655,7 @@ class MainWindow(QMainWindow):
                         from PyQt6.QtGui import QColor
                         stroke.border_color = QColor(color)
             
-            current_widget.update()
+            current_widget.update_contents()
     
     def on_image_border_width_changed(self, width):
         """Resim kenarlık kalınlığı değişti"""
@@ -2708,7 +2671,7 @@ class MainWindow(QMainWindow):
                     if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                         stroke.border_width = width
             
-            current_widget.update()
+            current_widget.update_contents()
     
     def on_image_border_style_changed(self, style):
         """Resim kenarlık stili değişti"""
@@ -2724,7 +2687,7 @@ class MainWindow(QMainWindow):
                     if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                         stroke.border_style = style
             
-            current_widget.update()
+            current_widget.update_contents()
     
     def on_image_shadow_enabled_changed(self, enabled):
         """Resim gölgesi etkin/pasif değişti"""
@@ -2740,7 +2703,7 @@ class MainWindow(QMainWindow):
                     if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                         stroke.has_shadow = enabled
             
-            current_widget.update()
+            current_widget.update_contents()
     
     def on_image_shadow_color_changed(self, color):
         """Resim gölge rengi değişti"""
@@ -2757,7 +2720,7 @@ class MainWindow(QMainWindow):
                         from PyQt6.QtGui import QColor
                         stroke.shadow_color = QColor(color)
             
-            current_widget.update()
+            current_widget.update_contents()
     
     def on_image_shadow_offset_changed(self, offset_x, offset_y):
         """Resim gölge offseti değişti"""
@@ -2774,7 +2737,7 @@ class MainWindow(QMainWindow):
                         stroke.shadow_offset_x = offset_x
                         stroke.shadow_offset_y = offset_y
             
-                        current_widget.update()
+                        current_widget.update_contents()
 
     def on_image_shadow_blur_changed(self, blur):
         """Resim gölge bulanıklığı değişti"""
@@ -2790,7 +2753,7 @@ class MainWindow(QMainWindow):
                     if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                         stroke.shadow_blur = blur
             
-            current_widget.update()
+            current_widget.update_contents()
 
     def on_image_shadow_size_changed(self, size):
         """Resim gölge boyutu değişti"""
@@ -2806,7 +2769,7 @@ class MainWindow(QMainWindow):
                     if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                         stroke.shadow_size = size
             
-            current_widget.update()
+            current_widget.update_contents()
 
     def on_image_shadow_inner_changed(self, inner):
         """Resim iç gölge değişti"""
@@ -2822,7 +2785,7 @@ class MainWindow(QMainWindow):
                     if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                         stroke.inner_shadow = inner
             
-            current_widget.update()
+            current_widget.update_contents()
 
     def on_image_shadow_quality_changed(self, quality):
         """Resim gölge kalitesi değişti"""
@@ -2838,7 +2801,7 @@ class MainWindow(QMainWindow):
                     if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                         stroke.shadow_quality = quality
             
-            current_widget.update()
+            current_widget.update_contents()
 
     def on_image_filter_changed(self, filter_type, intensity):
         """Resim filtresi değişti"""
@@ -2855,7 +2818,7 @@ class MainWindow(QMainWindow):
                         stroke.filter_type = filter_type
                         stroke.filter_intensity = intensity
             
-            current_widget.update()
+            current_widget.update_contents()
 
     def on_image_transparency_changed(self, transparency):
         """Resim ekstra şeffaflığı değişti"""
@@ -2873,7 +2836,7 @@ class MainWindow(QMainWindow):
                 if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                     stroke.transparency = transparency
                     
-        drawing_widget.update()
+        drawing_widget.update_contents()
         
     def on_image_blur_changed(self, blur_radius):
         """Resim bulanıklığı değişti"""
@@ -2891,7 +2854,7 @@ class MainWindow(QMainWindow):
                 if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                     stroke.blur_radius = blur_radius
                     
-        drawing_widget.update()
+        drawing_widget.update_contents()
 
     def on_image_corner_radius_changed(self, corner_radius):
         """Resim kenar yuvarlama değişti"""
@@ -2909,7 +2872,7 @@ class MainWindow(QMainWindow):
                 if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                     stroke.corner_radius = corner_radius
                     
-        drawing_widget.update()
+        drawing_widget.update_contents()
 
     def on_image_shadow_opacity_changed(self, shadow_opacity):
         """Resim gölge şeffaflığı değişti"""
@@ -2927,7 +2890,7 @@ class MainWindow(QMainWindow):
                 if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
                     stroke.shadow_opacity = shadow_opacity
                     
-        drawing_widget.update()
+        drawing_widget.update_contents()
 
     def on_ungroup_shapes(self):
         """Seçili şekillerin grubunu çöz"""
@@ -2954,7 +2917,7 @@ class MainWindow(QMainWindow):
                         stroke['group_id'] = None
                         ungrouped_count += 1
         
-        current_widget.update()
+        current_widget.update_contents()
         
         # Katman panelini güncelle (grup ağacı için)
         current_widget.layer_manager._emit_changes()
@@ -3047,7 +3010,7 @@ class MainWindow(QMainWindow):
                 self.set_tool("select")
                 drawing_widget.set_active_tool("select")
                 
-            drawing_widget.update()
+            drawing_widget.update_contents()
             self.show_status_message("Kontrol noktaları görünürlüğü değiştirildi")
 
     def on_edit_bspline(self):
@@ -3088,7 +3051,7 @@ class MainWindow(QMainWindow):
         if hasattr(drawing_widget, 'bspline_tool'):
             drawing_widget.bspline_tool.edit_mode = True
         drawing_widget.selection_tool.clear_selection()
-        drawing_widget.update()
+        drawing_widget.update_contents()
         self.show_status_message("B-spline düzenleme modu aktif")
 
     def on_bspline_edit_toggled(self, checked):
@@ -3111,7 +3074,7 @@ class MainWindow(QMainWindow):
                         s['show_control_points'] = False
                         changed = True
             if changed:
-                drawing_widget.update()
+                drawing_widget.update_contents()
             # Aracı select yap
             self.set_tool("select")
             drawing_widget.set_active_tool("select")
@@ -3187,7 +3150,7 @@ class MainWindow(QMainWindow):
             # Offset uygula
             self.apply_offset_to_stroke_inplace(stroke, offset_x, offset_y)
         
-        drawing_widget.update()
+        drawing_widget.update_contents()
         self.show_status_message(f"Şekiller {alignment_type} hizalandı")
     
     def distribute_shapes(self, direction):
@@ -3240,28 +3203,15 @@ class MainWindow(QMainWindow):
             
             self.apply_offset_to_stroke_inplace(stroke, offset_x, offset_y)
         
-        drawing_widget.update()
+        drawing_widget.update_contents()
         self.show_status_message(f"Şekiller {direction} dağıtıldı")
     
     def get_stroke_bounds(self, stroke):
         """Stroke'un sınırlarını hesapla (min_x, min_y, max_x, max_y)"""
-        if hasattr(stroke, 'stroke_type') and stroke.stroke_type == 'image':
-            bounds = stroke.get_bounds()
-            return (bounds.left(), bounds.top(), bounds.right(), bounds.bottom())
-        
-        if 'type' not in stroke:
+        bounds = StrokeHandler.get_stroke_bounds(stroke)
+        if bounds is None:
             return None
-            
-        points = self.get_stroke_points_for_bounds(stroke)
-        if not points:
-            return None
-            
-        min_x = min(p[0] for p in points)
-        max_x = max(p[0] for p in points)
-        min_y = min(p[1] for p in points)
-        max_y = max(p[1] for p in points)
-        
-        return (min_x, min_y, max_x, max_y)
+        return (bounds.left(), bounds.top(), bounds.right(), bounds.bottom())
     
     def apply_offset_to_stroke_inplace(self, stroke, offset_x, offset_y):
         """Stroke'a offset uygula (in-place)"""
@@ -3273,7 +3223,9 @@ class MainWindow(QMainWindow):
             return
             
         if stroke['type'] == 'freehand':
-            if 'points' in stroke:
+            if isinstance(stroke.get('points'), StrokePoints):
+                stroke['points'].translate(offset_x, offset_y)
+            elif 'points' in stroke:
                 for point in stroke['points']:
                     if isinstance(point, dict):
                         point['x'] += offset_x
@@ -3325,7 +3277,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'rectangle':
                             stroke['corner_radius'] = corner_radius
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_rectangle_shadow_enabled_changed(self, enabled):
         """Dikdörtgen gölge etkin/pasif değişti"""
@@ -3355,7 +3307,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'rectangle':
                             stroke['has_shadow'] = enabled
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_rectangle_shadow_color_changed(self, color):
         """Dikdörtgen gölge rengi değişti"""
@@ -3385,7 +3337,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'rectangle':
                             stroke['shadow_color'] = color
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_rectangle_shadow_offset_changed(self, offset_x, offset_y):
         """Dikdörtgen gölge offseti değişti"""
@@ -3409,7 +3361,7 @@ class MainWindow(QMainWindow):
                             stroke['shadow_offset_x'] = offset_x
                             stroke['shadow_offset_y'] = offset_y
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_rectangle_shadow_blur_changed(self, blur):
         """Dikdörtgen gölge bulanıklığı değişti"""
@@ -3432,7 +3384,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'rectangle':
                             stroke['shadow_blur'] = blur
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_rectangle_shadow_size_changed(self, size):
         """Dikdörtgen gölge boyutu değişti"""
@@ -3455,7 +3407,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'rectangle':
                             stroke['shadow_size'] = size
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_rectangle_shadow_opacity_changed(self, opacity):
         """Dikdörtgen gölge şeffaflığı değişti"""
@@ -3478,7 +3430,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'rectangle':
                             stroke['shadow_opacity'] = opacity
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_rectangle_shadow_inner_changed(self, inner):
         """Dikdörtgen iç/dış gölge değişti"""
@@ -3501,7 +3453,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'rectangle':
                             stroke['inner_shadow'] = inner
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_rectangle_shadow_quality_changed(self, quality):
         """Dikdörtgen gölge kalitesi değişti"""
@@ -3524,7 +3476,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'rectangle':
                             stroke['shadow_quality'] = quality
                 
-                current_widget.update()
+                current_widget.update_contents()
                 
     # Çember özellikleri event handler'ları
     def on_circle_shadow_enabled_changed(self, enabled):
@@ -3555,7 +3507,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'circle':
                             stroke['has_shadow'] = enabled
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_circle_shadow_color_changed(self, color):
         """Çember gölge rengi değişti"""
@@ -3585,7 +3537,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'circle':
                             stroke['shadow_color'] = color
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_circle_shadow_offset_changed(self, offset_x, offset_y):
         """Çember gölge offseti değişti"""
@@ -3609,7 +3561,7 @@ class MainWindow(QMainWindow):
                             stroke['shadow_offset_x'] = offset_x
                             stroke['shadow_offset_y'] = offset_y
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_circle_shadow_blur_changed(self, blur):
         """Çember gölge bulanıklığı değişti"""
@@ -3632,7 +3584,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'circle':
                             stroke['shadow_blur'] = blur
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_circle_shadow_size_changed(self, size):
         """Çember gölge boyutu değişti"""
@@ -3655,7 +3607,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'circle':
                             stroke['shadow_size'] = size
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_circle_shadow_opacity_changed(self, opacity):
         """Çember gölge şeffaflığı değişti"""
@@ -3678,7 +3630,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'circle':
                             stroke['shadow_opacity'] = opacity
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_circle_shadow_inner_changed(self, inner):
         """Çember iç/dış gölge değişti"""
@@ -3701,7 +3653,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'circle':
                             stroke['inner_shadow'] = inner
                 
-                current_widget.update()
+                current_widget.update_contents()
     
     def on_circle_shadow_quality_changed(self, quality):
         """Çember gölge kalitesi değişti"""
@@ -3724,7 +3676,7 @@ class MainWindow(QMainWindow):
                         if stroke.get('type') == 'circle':
                             stroke['shadow_quality'] = quality
 
-                current_widget.update()
+                current_widget.update_contents()
 
     def on_stroke_shadow_enabled_changed(self, enabled):
         """Çizgi gölge etkin/pasif değişti"""
@@ -3748,12 +3700,12 @@ class MainWindow(QMainWindow):
                             continue
                         if stroke['type'] in ['line', 'freehand', 'bspline']:
                             stroke['has_shadow'] = enabled
-                current_widget.update()
+                current_widget.update_contents()
         if current_widget:
             if hasattr(current_widget.line_tool, 'set_shadow_enabled'):
                 current_widget.line_tool.set_shadow_enabled(enabled)
             # Aktif araç çizgiyse anında görünür değişim için update
-            current_widget.update()
+            current_widget.update_contents()
             if hasattr(current_widget.freehand_tool, 'set_shadow_enabled'):
                 current_widget.freehand_tool.set_shadow_enabled(enabled)
             if hasattr(current_widget.bspline_tool, 'set_shadow_enabled'):
@@ -3780,11 +3732,11 @@ class MainWindow(QMainWindow):
                             continue
                         if stroke['type'] in ['line', 'freehand', 'bspline']:
                             stroke['shadow_color'] = color
-                current_widget.update()
+                current_widget.update_contents()
         if current_widget:
             if hasattr(current_widget.line_tool, 'set_shadow_color'):
                 current_widget.line_tool.set_shadow_color(color)
-            current_widget.update()
+            current_widget.update_contents()
             if hasattr(current_widget.freehand_tool, 'set_shadow_color'):
                 current_widget.freehand_tool.set_shadow_color(color)
             if hasattr(current_widget.bspline_tool, 'set_shadow_color'):
@@ -3812,11 +3764,11 @@ class MainWindow(QMainWindow):
                         if stroke['type'] in ['line', 'freehand', 'bspline']:
                             stroke['shadow_offset_x'] = offset_x
                             stroke['shadow_offset_y'] = offset_y
-                current_widget.update()
+                current_widget.update_contents()
         if current_widget:
             if hasattr(current_widget.line_tool, 'set_shadow_offset'):
                 current_widget.line_tool.set_shadow_offset(offset_x, offset_y)
-            current_widget.update()
+            current_widget.update_contents()
             if hasattr(current_widget.freehand_tool, 'set_shadow_offset'):
                 current_widget.freehand_tool.set_shadow_offset(offset_x, offset_y)
             if hasattr(current_widget.bspline_tool, 'set_shadow_offset'):
@@ -3843,11 +3795,11 @@ class MainWindow(QMainWindow):
                             continue
                         if stroke['type'] in ['line', 'freehand', 'bspline']:
                             stroke['shadow_blur'] = blur
-                current_widget.update()
+                current_widget.update_contents()
         if current_widget:
             if hasattr(current_widget.line_tool, 'set_shadow_blur'):
                 current_widget.line_tool.set_shadow_blur(blur)
-            current_widget.update()
+            current_widget.update_contents()
             if hasattr(current_widget.freehand_tool, 'set_shadow_blur'):
                 current_widget.freehand_tool.set_shadow_blur(blur)
             if hasattr(current_widget.bspline_tool, 'set_shadow_blur'):
@@ -3874,11 +3826,11 @@ class MainWindow(QMainWindow):
                             continue
                         if stroke['type'] in ['line', 'freehand', 'bspline']:
                             stroke['shadow_size'] = size
-                current_widget.update()
+                current_widget.update_contents()
         if current_widget:
             if hasattr(current_widget.line_tool, 'set_shadow_size'):
                 current_widget.line_tool.set_shadow_size(size)
-            current_widget.update()
+            current_widget.update_contents()
             if hasattr(current_widget.freehand_tool, 'set_shadow_size'):
                 current_widget.freehand_tool.set_shadow_size(size)
             if hasattr(current_widget.bspline_tool, 'set_shadow_size'):
@@ -3905,11 +3857,11 @@ class MainWindow(QMainWindow):
                             continue
                         if stroke['type'] in ['line', 'freehand', 'bspline']:
                             stroke['shadow_opacity'] = opacity
-                current_widget.update()
+                current_widget.update_contents()
         if current_widget:
             if hasattr(current_widget.line_tool, 'set_shadow_opacity'):
                 current_widget.line_tool.set_shadow_opacity(opacity)
-            current_widget.update()
+            current_widget.update_contents()
             if hasattr(current_widget.freehand_tool, 'set_shadow_opacity'):
                 current_widget.freehand_tool.set_shadow_opacity(opacity)
             if hasattr(current_widget.bspline_tool, 'set_shadow_opacity'):
@@ -3936,11 +3888,11 @@ class MainWindow(QMainWindow):
                             continue
                         if stroke['type'] in ['line', 'freehand', 'bspline']:
                             stroke['inner_shadow'] = inner
-                current_widget.update()
+                current_widget.update_contents()
         if current_widget:
             if hasattr(current_widget.line_tool, 'set_inner_shadow'):
                 current_widget.line_tool.set_inner_shadow(inner)
-            current_widget.update()
+            current_widget.update_contents()
             if hasattr(current_widget.freehand_tool, 'set_inner_shadow'):
                 current_widget.freehand_tool.set_inner_shadow(inner)
             if hasattr(current_widget.bspline_tool, 'set_inner_shadow'):
@@ -3967,11 +3919,11 @@ class MainWindow(QMainWindow):
                             continue
                         if stroke['type'] in ['line', 'freehand', 'bspline']:
                             stroke['shadow_quality'] = quality
-                current_widget.update()
+                current_widget.update_contents()
         if current_widget:
             if hasattr(current_widget.line_tool, 'set_shadow_quality'):
                 current_widget.line_tool.set_shadow_quality(quality)
-            current_widget.update()
+            current_widget.update_contents()
             if hasattr(current_widget.freehand_tool, 'set_shadow_quality'):
                 current_widget.freehand_tool.set_shadow_quality(quality)
             if hasattr(current_widget.bspline_tool, 'set_shadow_quality'):
@@ -4115,7 +4067,7 @@ class MainWindow(QMainWindow):
         # Seçimi temizle
         current_widget.selection_tool.clear_selection()
         current_widget.update_shape_properties()
-        current_widget.update()
+        current_widget.update_contents()
         
         self.show_status_message(f"{len(self.clipboard_strokes)} öğe kesildi")
         
@@ -4156,7 +4108,7 @@ class MainWindow(QMainWindow):
         # Yapıştırılan stroke'ları seç
         current_widget.selection_tool.selected_strokes = pasted_indices
         current_widget.update_shape_properties()
-        current_widget.update()
+        current_widget.update_contents()
         
         # Offset'i artır (bir sonraki yapıştırma için)
         self.clipboard_offset += QPointF(20, 20)
@@ -4244,7 +4196,7 @@ class MainWindow(QMainWindow):
         
         current_widget.selection_tool.selected_strokes = pasted_indices
         current_widget.update_shape_properties()
-        current_widget.update()
+        current_widget.update_contents()
         self.show_status_message("Özel yapıştır tamamlandı")
 
     def _scale_stroke_inplace(self, stroke, scale_factor: float):
@@ -4389,7 +4341,7 @@ class MainWindow(QMainWindow):
         current_widget.selection_tool.selected_strokes = [idx]
         current_widget.set_active_tool("select")
         self.set_tool("select")
-        current_widget.update()
+        current_widget.update_contents()
         self.show_status_message("Pano resmi eklendi")
         return True
         
@@ -4417,7 +4369,7 @@ class MainWindow(QMainWindow):
         # Seçimi temizle
         current_widget.selection_tool.clear_selection()
         current_widget.update_shape_properties()
-        current_widget.update()
+        current_widget.update_contents()
         
         self.show_status_message(f"{deleted_count} öğe silindi")
 
@@ -4546,11 +4498,9 @@ class MainWindow(QMainWindow):
                 group_id = f"group_{int(time.time() * 1000)}"
                 for s in strokes_to_add:
                     s['parent_group_id'] = group_id
-                new_list = list(current_widget.strokes)
-                new_list.extend(strokes_to_add)
-                current_widget.strokes = new_list
+                current_widget.layer_manager.insert_strokes(len(current_widget.strokes), strokes_to_add)
                 current_widget.save_current_state("Prompt draw" + (" (LLM)" if result_cache.get("used_llm") else ""))
-                current_widget.update()
+                current_widget.update_overlay()
                 dlg.append_log("Çizim tamamlandı.")
                 dlg.accept()
 
@@ -4595,11 +4545,9 @@ class MainWindow(QMainWindow):
         group_id = f"group_{int(time.time() * 1000)}"
         for s in strokes_to_add:
             s['parent_group_id'] = group_id
-        new_list = list(current_widget.strokes)
-        new_list.extend(strokes_to_add)
-        current_widget.strokes = new_list
+        current_widget.layer_manager.insert_strokes(len(current_widget.strokes), strokes_to_add)
         current_widget.save_current_state("Prompt draw" + (" (LLM)" if used_llm else ""))
-        current_widget.update()
+        current_widget.update_overlay()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
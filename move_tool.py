@@ -1,6 +1,8 @@
 from PyQt6.QtCore import QPointF, QRectF
+from PyQt6.QtGui import QTransform
 from stroke_handler import StrokeHandler
 from grid_snap_utils import GridSnapUtils
+from stroke_points import StrokePoints
 import numpy as np
 
 class MoveTool:
@@ -13,12 +15,16 @@ class MoveTool:
         self.shift_constrain = False  # Shift tuşu ile snap zorlaması
         self._selection_bounds_start = None  # Başlangıçta seçimin bounding rect'i
         self._click_offset_from_topleft = None  # Tıklama noktasının bounding rect sol-üst'ünden ofseti
+        self.total_delta = QPointF()  # Sürükleme boyunca biriken, henüz uygulanmamış taşıma
+        self.preview_transform = None  # Sürükleme önizlemesi (bırakınca geometriye uygulanır)
         
     def start_move(self, pos, strokes=None, selected_strokes=None):
         """Taşıma işlemini başlat"""
         self.is_moving = True
         self.last_pos = QPointF(pos)
         self.start_pos = QPointF(pos)
+        self.total_delta = QPointF()
+        self.preview_transform = QTransform()
         
         # Seçimin bounding rect'ini hesapla ve tıklama ofsetini kaydet
         if strokes is not None and selected_strokes:
@@ -39,7 +45,7 @@ class MoveTool:
             self._click_offset_from_topleft = None
         
     def update_move(self, pos, strokes, selected_strokes):
-        """Seçilen stroke'ları taşı"""
+        """Taşıma önizlemesini güncelle; stroke'lar apply_move ile taşınır"""
         if not self.is_moving or not selected_strokes:
             return False
             
@@ -85,8 +91,24 @@ class MoveTool:
         
         if abs(delta.x()) < 0.001 and abs(delta.y()) < 0.001:
             return False
-            
-        # Tüm seçili stroke'ları taşı
+
+        # Geometri bırakılana kadar değişmez; sadece önizleme dönüşümü güncellenir
+        self.total_delta += delta
+        self.preview_transform = QTransform.fromTranslate(self.total_delta.x(), self.total_delta.y())
+        return True
+
+    def apply_move(self, strokes, selected_strokes):
+        """Biriken taşımayı seçili stroke'lara tek seferde uygula"""
+        delta = self.total_delta
+        self.total_delta = QPointF()
+        self.preview_transform = QTransform()
+        if abs(delta.x()) < 0.001 and abs(delta.y()) < 0.001:
+            return False
+        self._translate_strokes(strokes, selected_strokes, delta)
+        return True
+
+    def _translate_strokes(self, strokes, selected_strokes, delta):
+        """Seçili stroke'ları delta kadar taşı"""
         for selected_stroke in selected_strokes:
             if selected_stroke < len(strokes):
                 stroke_data = strokes[selected_stroke]
@@ -105,8 +127,6 @@ class MoveTool:
                 elif hasattr(stroke_data, 'get'):
                     # Yeni hassas move_stroke fonksiyonunu kullan
                     self.move_stroke_precise(stroke_data, delta)
-            
-        return True
         
     def finish_move(self):
         """Taşıma işlemini tamamla"""
@@ -115,35 +135,11 @@ class MoveTool:
         self.start_pos = None
         self._selection_bounds_start = None
         self._click_offset_from_topleft = None
+        self.total_delta = QPointF()
+        self.preview_transform = None
         
     def cancel_move(self, strokes, selected_strokes):
-        """Taşıma işlemini iptal et - başlangıç pozisyonuna geri dön"""
-        if not self.start_pos or not selected_strokes:
-            return
-            
-        # Başlangıçtan şimdiye kadar olan toplam hareketi hesapla
-        if self.last_pos:
-            total_delta = self.last_pos - self.start_pos
-            
-            # Tüm seçili stroke'ları ters yönde hareket ettir
-            for selected_stroke in selected_strokes:
-                if selected_stroke < len(strokes):
-                    stroke_data = strokes[selected_stroke]
-                    
-                    # Image stroke kontrolü
-                    if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
-                        # Resim pozisyonunu ters yönde güncelle
-                        current_pos = stroke_data.position
-                        new_pos = QPointF(current_pos.x() - total_delta.x(), current_pos.y() - total_delta.y())
-                        stroke_data.set_position(new_pos)
-                        continue
-                    
-                    # Güvenlik kontrolü - eski stroke'lar için
-                    if hasattr(stroke_data, 'get') and 'type' not in stroke_data:
-                        continue
-                    elif hasattr(stroke_data, 'get'):
-                        StrokeHandler.move_stroke(stroke_data, -total_delta.x(), -total_delta.y())
-                
+        """Taşıma işlemini iptal et - geometri henüz değişmediği için önizleme atılır"""
         self.finish_move()
         
     def set_background_settings(self, settings):
@@ -155,7 +151,10 @@ class MoveTool:
         stroke_type = stroke.get('type', '')
         
         if stroke_type == 'freehand':
-            if 'points' in stroke:
+            if isinstance(stroke.get('points'), StrokePoints):
+                # Serbest çizimler için her noktayı ayrı ayrı snap'leme, sadece delta'yı uygula
+                stroke['points'].translate(delta.x(), delta.y())
+            elif 'points' in stroke:
                 # Serbest çizimler için her noktayı ayrı ayrı snap'leme, sadece delta'yı uygula
                 for i, point in enumerate(stroke['points']):
                     # Point QPointF veya dict formatında olabilir
@@ -224,48 +223,4 @@ class MoveTool:
         """Seçilen stroke'ların gerçek bounding rect'ini hesapla (padding yok)"""
         if not selected_strokes:
             return None
-            
-        min_x = None
-        max_x = None
-        min_y = None
-        max_y = None
-        
-        for stroke_index in selected_strokes:
-            if stroke_index < len(strokes):
-                stroke_data = strokes[stroke_index]
-                
-                # Image stroke kontrolü
-                if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
-                    bounds = stroke_data.get_bounds()
-                    if min_x is None:
-                        min_x = bounds.left()
-                        max_x = bounds.right()
-                        min_y = bounds.top()
-                        max_y = bounds.bottom()
-                    else:
-                        min_x = min(min_x, bounds.left())
-                        max_x = max(max_x, bounds.right())
-                        min_y = min(min_y, bounds.top())
-                        max_y = max(max_y, bounds.bottom())
-                    continue
-                
-                # Güvenlik kontrolü - eski stroke'lar için
-                if 'type' not in stroke_data:
-                    continue
-                    
-                points = StrokeHandler.get_stroke_points(stroke_data)
-                for point in points:
-                    x, y = point[0], point[1]
-                    if min_x is None:
-                        min_x = max_x = x
-                        min_y = max_y = y
-                    else:
-                        min_x = min(min_x, x)
-                        max_x = max(max_x, x)
-                        min_y = min(min_y, y)
-                        max_y = max(max_y, y)
-                
-        if min_x is None:
-            return None
-            
-        return QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
\ No newline at end of file
+        return StrokeHandler.get_strokes_bounds(strokes, selected_strokes)
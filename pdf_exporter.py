@@ -1,23 +1,39 @@
 import errno
 import os
 
-from PyQt6.QtPrintSupport import QPrinter
-from PyQt6.QtGui import QPainter, QColor, QPageSize, QPageLayout, QImage
-from PyQt6.QtCore import QMarginsF
+from PyQt6.QtGui import QPageSize
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 from datetime import datetime
 
+from pdf_vector_export import VectorPdfExporter
+
 class PDFExporter:
-    """PDF dışa aktarma işlemlerini yöneten sınıf"""
+    """PDF dışa aktarma işlemlerini yöneten sınıf
+
+    Stroke'lar vektör olarak yazılır (VectorPdfExporter); PDF arka planlı
+    sekmelerde kaynak sayfalar yeniden rasterize edilmeden kopyalanır.
+    """
     
     def __init__(self, main_window):
         self.main_window = main_window
+
+    def _page_size(self, drawing_widget):
+        """Canvas yönüne göre A4 sayfa boyutu (nokta)"""
+        if hasattr(drawing_widget, 'get_canvas_orientation'):
+            orientation = drawing_widget.get_canvas_orientation()
+        else:
+            # Fallback: Settings'den PDF yönünü al
+            orientation = self.main_window.settings.get_pdf_orientation()
+        size = QPageSize(QPageSize.PageSizeId.A4).size(QPageSize.Unit.Point)
+        if orientation == 'landscape':
+            return size.height(), size.width()
+        return size.width(), size.height()
     
     def export_to_pdf(self):
         """Tüm sekmeleri PDF olarak dışa aktar"""
         if self.main_window.tab_widget.count() == 0:
             QMessageBox.warning(self.main_window, "Uyarı", "Dışa aktarılacak sekme yok!")
-            return
+            return False
         
         # PDF dosya adı sor
         filename, _ = QFileDialog.getSaveFileName(
@@ -27,53 +43,32 @@ class PDFExporter:
         )
         
         if not filename:
-            return
+            return False
             
+        tab_manager = self.main_window.tab_manager
+        loaded_for_export = []  # Bekleyen (lazy/uyutulmuş) olup sadece dışa aktarma için yüklenen sekmeler
         try:
-            # PDF printer oluştur
-            printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-            printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-            printer.setOutputFileName(filename)
-            printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
-            
-            # Sayfa yönünü canvas yönüne göre otomatik belirle
-            # İlk tab'ın canvas yönünü al
-            first_drawing_widget = self.main_window.tab_manager.get_tab_widget_at_index(0)
-            if first_drawing_widget and hasattr(first_drawing_widget, 'get_canvas_orientation'):
-                canvas_orientation = first_drawing_widget.get_canvas_orientation()
-                if canvas_orientation == 'landscape':
-                    printer.setPageOrientation(QPageLayout.Orientation.Landscape)
-                else:
-                    printer.setPageOrientation(QPageLayout.Orientation.Portrait)
-            else:
-                # Fallback: Settings'den PDF yönünü al
-                orientation = self.main_window.settings.get_pdf_orientation()
-                if orientation == 'landscape':
-                    printer.setPageOrientation(QPageLayout.Orientation.Landscape)
-                else:
-                    printer.setPageOrientation(QPageLayout.Orientation.Portrait)
-            
-            printer.setPageMargins(QMarginsF(5, 5, 5, 5), QPageLayout.Unit.Millimeter)
-            
-            painter = QPainter()
-            painter.begin(printer)
-            
-            # Her sekmeyi ayrı sayfa olarak ekle
+            # Her sekme ayrı sayfa
+            tabs = []
             for i in range(self.main_window.tab_widget.count()):
-                if i > 0:
-                    printer.newPage()  # Yeni sayfa
-                
-                # Drawing widget'ı tab manager'dan al
-                drawing_widget = self.main_window.tab_manager.get_tab_widget_at_index(i)
+                if not tab_manager.is_tab_loaded(i):
+                    loaded_for_export.append(i)
+                drawing_widget = tab_manager.get_tab_widget_at_index(i)
                 if drawing_widget:
-                    self._render_page(painter, drawing_widget, i)
-            
-            painter.end()
+                    tabs.append((drawing_widget, self.main_window.tab_widget.tabText(i)))
+
+            VectorPdfExporter().export_tabs(filename, tabs, self._page_size)
             
             QMessageBox.information(self.main_window, "Başarılı", f"PDF başarıyla oluşturuldu:\n{filename}")
+            return True
             
         except Exception as e:
             QMessageBox.critical(self.main_window, "Hata", f"PDF oluşturulamadı:\n{str(e)}")
+            return False
+        finally:
+            # Dışa aktarma bekleyen sekmeleri bellekte yüklü bırakmasın
+            for i in loaded_for_export:
+                tab_manager.hibernate_tab(i)
     
     def export_current_tab_with_pdf_pages(self):
         """Geçerli sekmenin PDF arka planındaki TÜM sayfalarını tek PDF'e dışa aktar."""
@@ -100,63 +95,8 @@ class PDFExporter:
             return
 
         try:
-            printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-            printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-            printer.setOutputFileName(filename)
-            printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
-
-            # Yönlendirme: canvas yönü
-            if hasattr(drawing_widget, 'get_canvas_orientation') and drawing_widget.get_canvas_orientation() == 'landscape':
-                printer.setPageOrientation(QPageLayout.Orientation.Landscape)
-            else:
-                printer.setPageOrientation(QPageLayout.Orientation.Portrait)
-
-            printer.setPageMargins(QMarginsF(5, 5, 5, 5), QPageLayout.Unit.Millimeter)
-
-            painter = QPainter()
-            painter.begin(printer)
-
-            # Orijinal sayfayı hatırla
-            original_page = layer.current_page
-
-            for page_index in range(layer.page_count):
-                if page_index > 0:
-                    printer.newPage()
-
-                # Sayfayı değiştir ve PDF arka planıyla birlikte çiz
-                if hasattr(drawing_widget, 'go_to_pdf_page'):
-                    drawing_widget.go_to_pdf_page(page_index)
-                else:
-                    layer.set_current_page(page_index)
-
-                widget_rect = drawing_widget.rect()
-                page_rect = painter.viewport()
-                scale_x = page_rect.width() / widget_rect.width()
-                scale_y = page_rect.height() / widget_rect.height()
-                base_scale = min(scale_x, scale_y) * 0.98
-
-                scaled_width = widget_rect.width() * base_scale
-                scaled_height = widget_rect.height() * base_scale
-                x_offset = (page_rect.width() - scaled_width) / 2
-                y_offset = (page_rect.height() - scaled_height) / 2
-
-                painter.save()
-                painter.translate(x_offset, y_offset)
-                painter.scale(base_scale, base_scale)
-
-                # PDF arka planını da içeren render
-                if hasattr(drawing_widget, 'canvas_renderer') and hasattr(drawing_widget.canvas_renderer, 'render_with_pdf_background'):
-                    drawing_widget.canvas_renderer.render_with_pdf_background(painter)
-                else:
-                    drawing_widget.render(painter)
-
-                painter.restore()
-
-            # Orijinal sayfaya geri dön
-            layer.set_current_page(original_page)
-
-            painter.end()
-
+            # Kaynak sayfalar olduğu gibi kopyalanır, mürekkep vektör olarak eklenir
+            VectorPdfExporter().export_pdf_pages(drawing_widget, filename)
             QMessageBox.information(self.main_window, "Başarılı", f"PDF kaydedildi:\n{filename}")
         except Exception as e:
             QMessageBox.critical(self.main_window, "Hata", f"PDF kaydedilemedi:\n{str(e)}")
@@ -208,101 +148,9 @@ class PDFExporter:
                 self.export_current_tab_with_pdf_pages()
             return False
 
-        printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-        printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-        printer.setOutputFileName(target_path)
-        printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
-
-        orientation = None
-        if hasattr(drawing_widget, 'get_canvas_orientation'):
-            orientation = drawing_widget.get_canvas_orientation()
-
-        if orientation == 'landscape':
-            printer.setPageOrientation(QPageLayout.Orientation.Landscape)
-        elif orientation == 'portrait':
-            printer.setPageOrientation(QPageLayout.Orientation.Portrait)
-        else:
-            fallback_orientation = self.main_window.settings.get_pdf_orientation()
-            if fallback_orientation == 'landscape':
-                printer.setPageOrientation(QPageLayout.Orientation.Landscape)
-            else:
-                printer.setPageOrientation(QPageLayout.Orientation.Portrait)
-
-        printer.setPageMargins(QMarginsF(5, 5, 5, 5), QPageLayout.Unit.Millimeter)
-
-        painter = QPainter()
-        original_page = layer.current_page
-
-        # Preload the PDF background images before the source file is opened
-        # for writing. This ensures we never try to read from a file that is
-        # currently being truncated by the printer backend.
-        preloaded_images = []
-        try:
-            for page_index in range(layer.page_count):
-                image = layer.get_page_image(page_index)
-                if image.isNull():
-                    preloaded_images.append(QImage())
-                else:
-                    # Detach the image data so future modifications to the
-                    # cache do not affect the copy used during export.
-                    preloaded_images.append(image.copy())
-        except Exception:
-            # If preloading fails we still continue, the renderer will fall
-            # back to loading from the layer which keeps the previous
-            # behaviour.
-            preloaded_images = []
-
         try:
-            if not painter.begin(printer):
-                raise RuntimeError("PDF yazıcısı başlatılamadı.")
-            for page_index in range(layer.page_count):
-                if page_index > 0:
-                    printer.newPage()
-
-                if hasattr(drawing_widget, 'go_to_pdf_page'):
-                    drawing_widget.go_to_pdf_page(page_index)
-                else:
-                    layer.set_current_page(page_index)
-
-                widget_rect = drawing_widget.rect()
-                page_rect = painter.viewport()
-                if widget_rect.width() == 0 or widget_rect.height() == 0:
-                    continue
-
-                scale_x = page_rect.width() / widget_rect.width()
-                scale_y = page_rect.height() / widget_rect.height()
-                base_scale = min(scale_x, scale_y) * 0.98
-
-                scaled_width = widget_rect.width() * base_scale
-                scaled_height = widget_rect.height() * base_scale
-                x_offset = (page_rect.width() - scaled_width) / 2
-                y_offset = (page_rect.height() - scaled_height) / 2
-
-                painter.save()
-                painter.translate(x_offset, y_offset)
-                painter.scale(base_scale, base_scale)
-
-                if hasattr(drawing_widget, 'canvas_renderer'):
-                    renderer = drawing_widget.canvas_renderer
-                    if hasattr(renderer, 'render_pdf_background_only'):
-                        renderer.render_pdf_background_only(
-                            painter,
-                            preloaded_images=preloaded_images,
-                            page_index=page_index,
-                        )
-                    elif hasattr(renderer, 'render_with_pdf_background'):
-                        renderer.render_with_pdf_background(
-                            painter,
-                            preloaded_images=preloaded_images,
-                            page_index=page_index,
-                        )
-                    else:
-                        drawing_widget.render(painter)
-                else:
-                    drawing_widget.render(painter)
-
-                painter.restore()
-
+            # Mürekkep kaynak sayfaların üzerine vektör olarak eklenir; sayfalar yeniden rasterize edilmez
+            VectorPdfExporter().save_to_source(drawing_widget)
         except OSError as exc:
             if exc.errno in (errno.EACCES, errno.EPERM):
                 QMessageBox.warning(self.main_window, "Yazma Hatası", "PDF dosyası üzerine yazılamadı. Lütfen farklı kaydedin.")
@@ -313,66 +161,6 @@ class PDFExporter:
         except Exception as exc:
             QMessageBox.critical(self.main_window, "Hata", f"PDF kaydedilemedi:\n{str(exc)}")
             return False
-        finally:
-            if hasattr(drawing_widget, 'go_to_pdf_page'):
-                drawing_widget.go_to_pdf_page(original_page)
-            else:
-                layer.set_current_page(original_page)
-            painter.end()
 
         QMessageBox.information(self.main_window, "Başarılı", f"PDF kaydedildi:\n{target_path}")
         return True
-
-    def _render_page(self, painter, drawing_widget, page_index):
-        """Tek sayfa çiz"""
-        # Drawing widget'ının boyutları (A4)
-        widget_rect = drawing_widget.rect()
-        page_rect = painter.viewport()
-        
-        # PDF export için %200 zoom (canvas küçük olduğu için)
-        export_zoom = 1.0  # %200 zoom
-        
-        # A4 boyutu zaten doğru, sadece sayfa boyutuna göre ölçekle
-        scale_x = page_rect.width() / widget_rect.width()
-        scale_y = page_rect.height() / widget_rect.height()
-        base_scale = min(scale_x, scale_y) * 0.98  # %98 boyut (minimal margin için)
-        
-        # Export zoom ile birleştir
-        final_scale = base_scale * export_zoom
-        
-        # Merkeze hizala
-        scaled_width = widget_rect.width() * final_scale
-        scaled_height = widget_rect.height() * final_scale
-        x_offset = (page_rect.width() - scaled_width) / 2
-        y_offset = (page_rect.height() - scaled_height) / 2
-        
-        painter.save()
-        painter.translate(x_offset, y_offset)
-        painter.scale(final_scale, final_scale)
-        
-        # Drawing widget'ını render et (sadece çizim içeriği)
-        drawing_widget.render(painter)
-        
-        painter.restore()
-        
-        # Sayfa numarası ve tab adı ekle
-        self._add_page_info(painter, page_index, page_rect)
-    
-    def _add_page_info(self, painter, page_index, page_rect):
-        """Sayfa bilgilerini ekle"""
-        painter.save()
-        painter.setPen(QColor(0, 0, 0))
-        font = painter.font()
-        font.setPointSize(12)
-        painter.setFont(font)
-        
-        tab_title = self.main_window.tab_widget.tabText(page_index)
-        page_info = f"Sayfa {page_index + 1}/{self.main_window.tab_widget.count()} - {tab_title}"
-        
-        # Alt merkeze yazı
-        text_rect = painter.fontMetrics().boundingRect(page_info)
-        text_x = (page_rect.width() - text_rect.width()) / 2
-        text_y = page_rect.height() - 20
-        
-        painter.drawText(int(text_x), int(text_y), page_info)
-        painter.restore() 
\ No newline at end of file
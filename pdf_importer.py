@@ -1,9 +1,17 @@
 import hashlib
+import itertools
 import os
+import queue
+import struct
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+import math
+from typing import Callable, Dict, List, Optional, Tuple
 
+from PyQt6.QtCore import QObject, QRectF, QSize, pyqtSignal
 from PyQt6.QtGui import QImage
 
 try:  # PyMuPDF is the preferred backend for rasterizing PDF pages
@@ -11,18 +19,185 @@ try:  # PyMuPDF is the preferred backend for rasterizing PDF pages
 except ImportError:  # pragma: no cover - library might not be available at runtime
     fitz = None
 
+from pdf_vector_export import hide_ink_overlays
+
+
+# Raw page blobs on disk: magic, width, height, bytes per line followed by RGB888 rows
+_RAW_HEADER = struct.Struct("<4sIII")
+_RAW_MAGIC = b"DMP1"
+
+PageKey = Tuple[int, int]  # (page index, dpi)
+TileKey = Tuple[int, int, float, int, int]  # (page index, dpi, level, tx, ty)
+
+
+def _write_raw_page(path: str, image: QImage) -> int:
+    """Write an RGB888 QImage as an uncompressed blob, return the file size."""
+    buffer = image.constBits()
+    buffer.setsize(image.sizeInBytes())
+    payload = bytes(buffer)
+    with open(path, "wb") as handle:
+        handle.write(_RAW_HEADER.pack(_RAW_MAGIC, image.width(), image.height(), image.bytesPerLine()))
+        handle.write(payload)
+    return _RAW_HEADER.size + len(payload)
+
+
+def _read_raw_page(path: str) -> QImage:
+    """Load a blob written by _write_raw_page (null image on any mismatch)."""
+    try:
+        with open(path, "rb") as handle:
+            header = handle.read(_RAW_HEADER.size)
+            if len(header) != _RAW_HEADER.size:
+                return QImage()
+            magic, width, height, stride = _RAW_HEADER.unpack(header)
+            payload = handle.read()
+    except OSError:
+        return QImage()
+    if magic != _RAW_MAGIC or len(payload) != stride * height:
+        return QImage()
+    # copy() detaches the image from the Python bytes object
+    return QImage(payload, width, height, stride, QImage.Format.Format_RGB888).copy()
+
+
+class PdfPageRasterizer:
+    """Runs PyMuPDF work on a single background thread.
+
+    The worker owns the only open ``fitz.Document`` so the file is opened once
+    and PyMuPDF is never used from two threads at the same time. Jobs are
+    served by priority: pages the UI is waiting for first, prefetches after
+    them (nearest page first). Ink overlays tagged with ``hidden_ink_token``
+    are hidden in the open document; the canvas draws that ink as strokes.
+    """
+
+    def __init__(self, source_path: str, hidden_ink_token: Optional[str] = None):
+        self.source_path = source_path
+        self.hidden_ink_token = hidden_ink_token
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._document = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def document(self):
+        """The open document; only valid inside a job on the worker thread."""
+        if self._document is None:
+            self._document = fitz.open(self.source_path)
+            if self.hidden_ink_token:
+                hide_ink_overlays(self._document, self.hidden_ink_token)
+        return self._document
+
+    def submit(self, job: Callable, priority: int = 0) -> Future:
+        """Queue ``job(rasterizer)`` on the worker thread."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                future.set_exception(RuntimeError("PDF rasterizer kapatıldı."))
+                return future
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pdf-rasterizer", daemon=True)
+                self._thread.start()
+            self._queue.put((priority, next(self._counter), job, future))
+        return future
+
+    def release_document(self) -> None:
+        """Close the open document; it is reopened lazily by the next job."""
+        self.submit(self._close_document, priority=-1).result()
+
+    def close(self) -> None:
+        """Stop the worker and cancel jobs that have not started yet."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is None:
+                return
+            self._queue.put((-2, next(self._counter), None, None))
+
+    def _close_document(self, _rasterizer=None) -> None:
+        if self._document is not None:
+            try:
+                self._document.close()
+            except Exception:
+                pass
+            self._document = None
+
+    def _run(self) -> None:
+        while True:
+            _, _, job, future = self._queue.get()
+            if job is None:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(job(self))
+            except BaseException as exc:  # pragma: no cover - passed to the waiting thread
+                future.set_exception(exc)
+
+        # Remaining jobs are cancelled once the worker stops
+        while True:
+            try:
+                _, _, _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if future is not None:
+                future.cancel()
+        self._close_document()
+
+
+class PdfRenderNotifier(QObject):
+    """Carries worker-thread notifications to the GUI thread."""
+
+    tileReady = pyqtSignal(int)  # page index
+    pageReady = pyqtSignal(int)  # page index, full page image at the current dpi
+
 
 @dataclass
 class PdfBackgroundLayer:
-    """Model object that keeps track of a PDF background source."""
+    """Model object that keeps track of a PDF background source.
+
+    Pages are rasterized on a :class:`PdfPageRasterizer` worker thread and kept
+    in a byte-budgeted in-memory LRU. Pages around ``current_page`` are
+    prefetched in the background. Lookups never wait for the worker: a page
+    that is not ready yet comes back as a null image and
+    ``notifier.pageReady`` fires once it is. Rendered pages are also written to
+    ``cache_dir`` as raw RGB blobs, which reload without a PNG decode.
+
+    The full page image (level 1) defines canvas coordinates. For other zoom
+    levels the page is clip-rendered into tiles at ``dpi * level`` on the
+    worker thread; see :meth:`get_page_tiles`.
+
+    ``ink_token`` identifies the ink overlays this tab saved into the source
+    file (see :mod:`pdf_vector_export`); they are left out of the background.
+    """
+
+    TILE_SIZE = 512  # Tile edge in device pixels
+    MIN_TILE_LEVEL = 0.25
+    MAX_TILE_LEVEL = 8.0
 
     source_path: str
     page_count: int
     dpi: int = 150
     cache_dir: Optional[str] = None
     current_page: int = 0
-    _page_cache: Dict[int, QImage] = field(default_factory=dict, init=False, repr=False)
-    _page_paths: Dict[int, str] = field(default_factory=dict, init=False, repr=False)
+    memory_budget_bytes: int = 192 * 1024 * 1024
+    disk_budget_bytes: int = 1024 * 1024 * 1024
+    prefetch_radius: int = 2
+    ink_token: Optional[str] = None
+    page_sizes: Optional[List[Tuple[float, float]]] = None  # Page sizes in PDF points
+    _page_cache: "OrderedDict[PageKey, QImage]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _page_cache_bytes: int = field(default=0, init=False, repr=False)
+    _page_paths: "OrderedDict[PageKey, Tuple[str, int]]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _page_paths_bytes: int = field(default=0, init=False, repr=False)
+    _pending: Dict[PageKey, Tuple[Future, bool]] = field(default_factory=dict, init=False, repr=False)
+    _prefetch_center: Optional[PageKey] = field(default=None, init=False, repr=False)
+    _rasterizer: Optional[PdfPageRasterizer] = field(default=None, init=False, repr=False)
+    tile_budget_bytes: int = 96 * 1024 * 1024
+    _tile_cache: "OrderedDict[TileKey, QImage]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _tile_cache_bytes: int = field(default=0, init=False, repr=False)
+    _tile_pending: Dict[TileKey, Future] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+    notifier: PdfRenderNotifier = field(default_factory=PdfRenderNotifier, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.cache_dir is None:
@@ -39,11 +214,33 @@ class PdfBackgroundLayer:
         return os.path.exists(self.source_path) and self.page_count > 0
 
     def get_current_page_size(self):
-        image = self.get_current_page_image()
+        return self.get_page_size(self.current_page)
+
+    def get_page_size(self, index: int):
+        """Pixel size of a page at the current dpi, known before it is rendered."""
+        with self._lock:
+            image = self._page_cache.get((index, self.dpi))
+        if image is not None:
+            return image.size()
+        if fitz and self.page_sizes and 0 <= index < len(self.page_sizes):
+            width, height = self.page_sizes[index]
+            scale = self.dpi / 72.0
+            # Same rounding get_pixmap applies to the page rect
+            irect = (fitz.Rect(0, 0, width, height) * fitz.Matrix(scale, scale)).irect
+            return QSize(irect.width, irect.height)
+        image = self.get_page_image(index, wait=True)
         if image.isNull():
             return None
         return image.size()
 
+    def is_page_ready(self, index: int) -> bool:
+        with self._lock:
+            return (index, self.dpi) in self._page_cache
+
+    def get_memory_usage(self) -> int:
+        with self._lock:
+            return self._page_cache_bytes
+
     # ------------------------------------------------------------------
     # Page navigation helpers
     # ------------------------------------------------------------------
@@ -73,70 +270,351 @@ class PdfBackgroundLayer:
         self.clear_cache()
         return True
 
+    def set_ink_token(self, token: Optional[str]) -> None:
+        """Hide the ink overlays tagged with ``token`` from now on."""
+        if token == self.ink_token:
+            return
+        self.ink_token = token
+        with self._lock:
+            rasterizer = self._rasterizer
+        if rasterizer is not None:
+            rasterizer.hidden_ink_token = token
+            rasterizer.release_document()
+        self.clear_cache()
+
     def clear_cache(self) -> None:
-        for path in list(self._page_paths.values()):
-            try:
-                if os.path.exists(path):
-                    os.remove(path)
-            except OSError:
-                pass
-        self._page_cache.clear()
-        self._page_paths.clear()
+        with self._lock:
+            for future, _ in list(self._pending.values()):
+                future.cancel()
+            for future in list(self._tile_pending.values()):
+                future.cancel()
+            paths = [path for path, _ in self._page_paths.values()]
+            self._page_cache.clear()
+            self._page_cache_bytes = 0
+            self._page_paths.clear()
+            self._page_paths_bytes = 0
+            self._tile_cache.clear()
+            self._tile_cache_bytes = 0
+            self._prefetch_center = None
+        for path in paths:
+            self._remove_file(path)
+
+    # ------------------------------------------------------------------
+    # Lifetime
+    # ------------------------------------------------------------------
+    def release_document(self) -> None:
+        """Close the worker's open document (e.g. before overwriting the source)."""
+        if self._rasterizer is not None:
+            self._rasterizer.release_document()
+
+    def close(self) -> None:
+        """Stop background rendering; cached pages stay usable."""
+        with self._lock:
+            for future, _ in list(self._pending.values()):
+                future.cancel()
+            for future in list(self._tile_pending.values()):
+                future.cancel()
+            rasterizer = self._rasterizer
+            self._rasterizer = None
+        if rasterizer is not None:
+            rasterizer.close()
 
     # ------------------------------------------------------------------
     # Rendering helpers
     # ------------------------------------------------------------------
-    def get_current_page_image(self) -> QImage:
-        return self.get_page_image(self.current_page)
+    def get_current_page_image(self, wait: bool = False) -> QImage:
+        return self.get_page_image(self.current_page, wait)
 
-    def get_page_image(self, index: int) -> QImage:
-        if index in self._page_cache:
-            return self._page_cache[index]
+    def get_page_image(self, index: int, wait: bool = False) -> QImage:
+        """Cached page image, or a null image while the worker renders it.
 
-        cached = self._page_paths.get(index)
-        image = QImage()
-        if cached and os.path.exists(cached):
-            image.load(cached)
-            self._page_cache[index] = image
-            return image
+        With ``wait`` the call blocks until the page is ready; the GUI thread
+        should only do this outside of painting (e.g. when a PDF is opened).
+        """
+        key = (index, self.dpi)
+        with self._lock:
+            image = self._page_cache.get(key)
+            if image is not None:
+                self._page_cache.move_to_end(key)
 
-        if not fitz:
-            raise RuntimeError("PyMuPDF (fitz) kütüphanesi yüklü değil. PDF sayfaları rasterize edilemiyor.")
+        if image is None:
+            if not fitz:
+                raise RuntimeError("PyMuPDF (fitz) kütüphanesi yüklü değil. PDF sayfaları rasterize edilemiyor.")
+
+            if not self.has_document() or index < 0 or index >= self.page_count:
+                return QImage()
 
-        if not self.has_document():
-            return image
+            future = self._request_page(index, prefetch=False)
+            image = QImage()
+            if wait:
+                try:
+                    image = future.result()
+                except CancelledError:
+                    pass
+
+        self._schedule_prefetch()
+        return image
+
+    # ------------------------------------------------------------------
+    # Zoom-dependent tiles
+    # ------------------------------------------------------------------
+    @classmethod
+    def tile_level_for_scale(cls, scale: float) -> float:
+        """Round a device scale (zoom * devicePixelRatio) to a power-of-two level."""
+        if not math.isfinite(scale) or scale <= 0:
+            return 1.0
+        level = 2.0 ** round(math.log2(scale))
+        return min(cls.MAX_TILE_LEVEL, max(cls.MIN_TILE_LEVEL, level))
+
+    def get_page_tiles(self, index: int, level: float, scene_rect: QRectF, page_size):
+        """Tiles covering ``scene_rect`` of a page at ``level``.
+
+        Returns ``(tiles, placeholders, complete)`` where both lists hold
+        ``(target_rect, image)`` pairs in canvas coordinates. Missing tiles are
+        queued on the worker (``notifier.tileReady`` fires when one arrives);
+        ``placeholders`` are cached tiles from coarser levels between the page
+        image and ``level`` that cover the gaps. Tiles no longer visible are
+        cancelled.
+        """
+        dpi = self.dpi
+        span = self.TILE_SIZE / level
+        visible = QRectF(scene_rect).intersected(QRectF(0, 0, page_size.width(), page_size.height()))
+        if visible.isEmpty():
+            return [], [], True
+
+        tx0 = int(math.floor(visible.left() / span))
+        ty0 = int(math.floor(visible.top() / span))
+        tx1 = int(math.ceil(visible.right() / span))
+        ty1 = int(math.ceil(visible.bottom() / span))
+
+        tiles: List[Tuple[QRectF, QImage]] = []
+        placeholders = []
+        placeholder_keys = set()
+        wanted = set()
+        missing = []
+        with self._lock:
+            for ty in range(ty0, ty1):
+                for tx in range(tx0, tx1):
+                    key = (index, dpi, level, tx, ty)
+                    wanted.add(key)
+                    image = self._tile_cache.get(key)
+                    if image is not None:
+                        self._tile_cache.move_to_end(key)
+                        tiles.append((self._tile_target(tx, ty, level, image), image))
+                        continue
+                    missing.append(key)
+
+                    # Coarser tiles (if any are cached) stand in until this one is ready
+                    coarse = level / 2.0
+                    factor = 2
+                    while coarse > 1.0:
+                        coarse_key = (index, dpi, coarse, tx // factor, ty // factor)
+                        coarse_image = self._tile_cache.get(coarse_key)
+                        if coarse_image is not None:
+                            if coarse_key not in placeholder_keys:
+                                placeholder_keys.add(coarse_key)
+                                placeholders.append((coarse, self._tile_target(
+                                    coarse_key[3], coarse_key[4], coarse, coarse_image), coarse_image))
+                            break
+                        coarse /= 2.0
+                        factor *= 2
+
+            for key, future in list(self._tile_pending.items()):
+                if key not in wanted:
+                    future.cancel()
+
+            if missing and fitz and self.has_document():
+                rasterizer = self._get_rasterizer()
+                for key in missing:
+                    if key in self._tile_pending:
+                        continue
+                    future = rasterizer.submit(
+                        lambda worker, key=key, size=(page_size.width(), page_size.height()):
+                        self._render_tile(worker, key, size), priority=1)
+                    self._tile_pending[key] = future
+                    future.add_done_callback(lambda done, key=key: self._forget_tile(key, done))
+
+        # Coarsest first so finer placeholders are painted on top
+        placeholders.sort(key=lambda item: item[0])
+        return tiles, [(target, image) for _, target, image in placeholders], not missing
+
+    def _tile_target(self, tx: int, ty: int, level: float, image: QImage) -> QRectF:
+        span = self.TILE_SIZE / level
+        return QRectF(tx * span, ty * span, image.width() / level, image.height() / level)
+
+    def _forget_tile(self, key: TileKey, future: Future) -> None:
+        with self._lock:
+            if self._tile_pending.get(key) is future:
+                del self._tile_pending[key]
+
+    def _render_tile(self, rasterizer: PdfPageRasterizer, key: TileKey, page_size) -> QImage:
+        """Worker thread: clip-render one tile at ``dpi * level``."""
+        index, dpi, level, tx, ty = key
+        document = rasterizer.document
+        if index < 0 or index >= document.page_count:
+            return QImage()
+        page = document.load_page(index)
+
+        # Canvas pixels (at dpi) -> PDF points
+        span = self.TILE_SIZE / level
+        to_points = 72.0 / dpi
+        left = tx * span
+        top = ty * span
+        right = min((tx + 1) * span, page_size[0])
+        bottom = min((ty + 1) * span, page_size[1])
+        origin = page.rect.tl
+        clip = fitz.Rect(origin.x + left * to_points, origin.y + top * to_points,
+                         origin.x + right * to_points, origin.y + bottom * to_points)
+        scale = dpi * level / 72.0
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(scale, scale), clip=clip, alpha=False)
+        image = QImage(pixmap.samples, pixmap.width, pixmap.height, pixmap.stride,
+                       QImage.Format.Format_RGB888).copy()
+
+        with self._lock:
+            if dpi != self.dpi:
+                return image
+            old = self._tile_cache.pop(key, None)
+            if old is not None:
+                self._tile_cache_bytes -= old.sizeInBytes()
+            self._tile_cache[key] = image
+            self._tile_cache_bytes += image.sizeInBytes()
+            while self._tile_cache_bytes > self.tile_budget_bytes and len(self._tile_cache) > 1:
+                _, evicted = self._tile_cache.popitem(last=False)
+                self._tile_cache_bytes -= evicted.sizeInBytes()
+
+        self.notifier.tileReady.emit(index)
+        return image
 
-        with fitz.open(self.source_path) as document:
+    def _get_rasterizer(self) -> PdfPageRasterizer:
+        with self._lock:
+            if self._rasterizer is None:
+                self._rasterizer = PdfPageRasterizer(self.source_path, self.ink_token)
+            return self._rasterizer
+
+    def _request_page(self, index: int, prefetch: bool) -> Future:
+        dpi = self.dpi
+        key = (index, dpi)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                future, queued_as_prefetch = pending
+                # A waiting UI request must not sit behind other prefetches
+                if prefetch or not queued_as_prefetch or not future.cancel():
+                    return future
+
+            priority = abs(index - self.current_page) + 1 if prefetch else 0
+            future = self._get_rasterizer().submit(
+                lambda rasterizer: self._load_page(rasterizer, index, dpi), priority)
+            self._pending[key] = (future, prefetch)
+        future.add_done_callback(lambda done, key=key: self._forget_pending(key, done))
+        return future
+
+    def _forget_pending(self, key: PageKey, future: Future) -> None:
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None and pending[0] is future:
+                del self._pending[key]
+
+    def _schedule_prefetch(self) -> None:
+        """Queue pages current_page ± prefetch_radius, drop stale prefetches."""
+        center = (self.current_page, self.dpi)
+        if self.prefetch_radius <= 0 or not fitz or not self.has_document():
+            return
+        with self._lock:
+            if center == self._prefetch_center:
+                return
+            self._prefetch_center = center
+
+            for (index, dpi), (future, is_prefetch) in list(self._pending.items()):
+                if is_prefetch and (dpi != self.dpi or abs(index - self.current_page) > self.prefetch_radius):
+                    future.cancel()
+
+            for distance in range(1, self.prefetch_radius + 1):
+                for index in (self.current_page + distance, self.current_page - distance):
+                    key = (index, self.dpi)
+                    if 0 <= index < self.page_count and key not in self._page_cache and key not in self._pending:
+                        self._request_page(index, prefetch=True)
+
+    def _load_page(self, rasterizer: PdfPageRasterizer, index: int, dpi: int) -> QImage:
+        """Worker thread: raw disk blob if present, otherwise rasterize."""
+        key = (index, dpi)
+        with self._lock:
+            cached = self._page_paths.get(key)
+
+        image = _read_raw_page(cached[0]) if cached else QImage()
+        page_path = cached[0] if cached and not image.isNull() else ""
+        file_size = cached[1] if page_path else 0
+
+        if image.isNull():
+            document = rasterizer.document
             if index < 0 or index >= document.page_count:
                 return image
             page = document.load_page(index)
-            scale = self.dpi / 72.0
+            scale = dpi / 72.0
             matrix = fitz.Matrix(scale, scale)
             pixmap = page.get_pixmap(matrix=matrix, alpha=False)
-            image_bytes = pixmap.tobytes("png")
+            image = QImage(pixmap.samples, pixmap.width, pixmap.height, pixmap.stride,
+                           QImage.Format.Format_RGB888).copy()
 
-        page_path = os.path.join(self.cache_dir, f"page_{index + 1}_{self.dpi}dpi.png")
-        try:
-            with open(page_path, "wb") as handle:
-                handle.write(image_bytes)
-        except OSError:
-            # Fall back to an in-memory image if writing fails
-            page_path = ""
-
-        if image.loadFromData(image_bytes):
-            self._page_cache[index] = image
-            if page_path:
-                self._page_paths[index] = page_path
-        else:
-            # Image load failed, ensure cache entry removed
-            if page_path and os.path.exists(page_path):
-                try:
-                    os.remove(page_path)
-                except OSError:
-                    pass
+            page_path = os.path.join(self.cache_dir, f"page_{index + 1}_{dpi}dpi.raw")
+            try:
+                file_size = _write_raw_page(page_path, image)
+            except OSError:
+                # Fall back to an in-memory image if writing fails
+                self._remove_file(page_path)
+                page_path = ""
 
+        if self._store_page(key, image, page_path, file_size):
+            self.notifier.pageReady.emit(index)
         return image
 
+    def _store_page(self, key: PageKey, image: QImage, page_path: str, file_size: int) -> bool:
+        """Cache a rendered page; False if the dpi changed in the meantime."""
+        stale_paths = []
+        stored = False
+        with self._lock:
+            if key[1] != self.dpi:
+                # DPI changed while the page was rendering
+                if page_path and key not in self._page_paths:
+                    stale_paths.append(page_path)
+            else:
+                stored = True
+                old = self._page_cache.pop(key, None)
+                if old is not None:
+                    self._page_cache_bytes -= old.sizeInBytes()
+                self._page_cache[key] = image
+                self._page_cache_bytes += image.sizeInBytes()
+                # The newest and the current page always stay, even over budget
+                protected = {key, (self.current_page, self.dpi)}
+                for evict_key in list(self._page_cache):
+                    if self._page_cache_bytes <= self.memory_budget_bytes:
+                        break
+                    if evict_key not in protected:
+                        evicted = self._page_cache.pop(evict_key)
+                        self._page_cache_bytes -= evicted.sizeInBytes()
+
+                if page_path:
+                    previous = self._page_paths.pop(key, None)
+                    if previous is not None:
+                        self._page_paths_bytes -= previous[1]
+                    self._page_paths[key] = (page_path, file_size)
+                    self._page_paths_bytes += file_size
+                    while self._page_paths_bytes > self.disk_budget_bytes and len(self._page_paths) > 1:
+                        _, (evicted_path, evicted_size) = self._page_paths.popitem(last=False)
+                        self._page_paths_bytes -= evicted_size
+                        stale_paths.append(evicted_path)
+        for path in stale_paths:
+            self._remove_file(path)
+        return stored
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
 
 class PDFImporter:
     """Utility responsible for turning PDF pages into QImage instances."""
@@ -145,7 +623,8 @@ class PDFImporter:
         self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "dijital_murekkep_pdf_cache")
         os.makedirs(self.cache_dir, exist_ok=True)
 
-    def load_pdf(self, file_path: str, dpi: int = 150) -> Optional[PdfBackgroundLayer]:
+    def load_pdf(self, file_path: str, dpi: int = 150,
+                 ink_token: Optional[str] = None) -> Optional[PdfBackgroundLayer]:
         if not os.path.exists(file_path):
             raise FileNotFoundError(file_path)
 
@@ -154,6 +633,8 @@ class PDFImporter:
 
         with fitz.open(file_path) as document:
             page_count = document.page_count
+            # Canvas size is known before a page is rendered
+            page_sizes = [(page.rect.width, page.rect.height) for page in document]
 
         if page_count == 0:
             raise ValueError("Seçilen PDF dosyası boş görünüyor.")
@@ -162,9 +643,11 @@ class PDFImporter:
             source_path=file_path,
             page_count=page_count,
             dpi=dpi,
+            ink_token=ink_token,
+            page_sizes=page_sizes,
             cache_dir=os.path.join(self.cache_dir, hashlib.md5(file_path.encode("utf-8")).hexdigest())
         )
 
         # İlk sayfayı önbelleğe al - kullanıcıya daha hızlı dönüş
-        layer.get_current_page_image()
+        layer.get_current_page_image(wait=True)
         return layer
@@ -0,0 +1,343 @@
+import os
+import tempfile
+import uuid
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QMarginsF, QSizeF, Qt
+from PyQt6.QtGui import QPageSize, QPainter, QPdfWriter
+
+try:  # Overlay'leri yerleştirmek ve kaynak sayfaları kopyalamak için PyMuPDF
+    import fitz
+except ImportError:  # pragma: no cover - kütüphane kurulu olmayabilir
+    fitz = None
+
+
+INK_LAYER_NAME = "Dijital Mürekkep"  # PDF görüntüleyicide görünen içerik grubu adı
+INK_TOKEN_KEY = "DMInkToken"  # Grubu yazan sekmeyi belirten özel anahtar
+
+PAGE_MARGIN_POINTS = 5 * 72 / 25.4  # 5 mm, eski yazıcı kenar boşluğuyla aynı
+PAGE_INFO_FONT_SIZE = 12
+
+
+def new_ink_token():
+    return uuid.uuid4().hex
+
+
+def render_overlay_pdf(pages):
+    """Sayfaları QPdfWriter'a çiz; QPainter path'leri PDF path'i olarak yazılır
+
+    pages: (genişlik, yükseklik, draw) listesi; boyutlar nokta cinsinden,
+    draw(painter) nokta biriminde çizer.
+    """
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    writer = QPdfWriter(buffer)
+    writer.setResolution(72)  # Bir cihaz birimi = bir PDF noktası
+    writer.setCreator(INK_LAYER_NAME)
+
+    painter = QPainter()
+    try:
+        for index, (width, height, draw) in enumerate(pages):
+            writer.setPageSize(QPageSize(QSizeF(width, height), QPageSize.Unit.Point))
+            writer.setPageMargins(QMarginsF(0, 0, 0, 0))
+            if index == 0:
+                if not painter.begin(writer):
+                    raise RuntimeError("PDF yazıcısı başlatılamadı.")
+            else:
+                writer.newPage()
+            painter.save()
+            draw(painter)
+            painter.restore()
+    finally:
+        if painter.isActive():
+            painter.end()
+        buffer.close()
+    return bytes(data)
+
+
+def stamp_overlay(page, overlay_document, overlay_index, oc=0):
+    """Overlay sayfasını sayfanın dönüşünü izleyerek üstüne yerleştir"""
+    page.show_pdf_page(page.rect * page.derotation_matrix, overlay_document, overlay_index,
+                       rotate=page.rotation, oc=oc)
+
+
+# ----------------------------------------------------------------------
+# Mürekkep içerik grupları
+# ----------------------------------------------------------------------
+def ink_layer(document, token):
+    """token'ın mürekkebini tutan içerik grubu (yoksa oluşturulur)"""
+    for xref in document.get_ocgs():
+        if _is_ink_layer(document, xref, token):
+            return xref
+    xref = document.add_ocg(INK_LAYER_NAME, on=True)
+    document.xref_set_key(xref, INK_TOKEN_KEY, fitz.get_pdf_str(token))
+    return xref
+
+
+def _is_ink_layer(document, xref, token):
+    try:
+        kind, value = document.xref_get_key(xref, INK_TOKEN_KEY)
+    except Exception:
+        return False
+    return kind == "string" and value == token
+
+
+def hide_ink_overlays(document, token):
+    """Sadece çizilen (kaydedilmeyen) açık belgeden token'ın mürekkebini kaldır"""
+    if any(_is_ink_layer(document, xref, token) for xref in document.get_ocgs()):
+        remove_ink_overlays(document, token)
+
+
+def _delete_key(document, xref, path):
+    """path'i (ör. Resources/XObject/fzFrm0) dolaylı nesneleri izleyerek null yap"""
+    head, *rest = path.split("/")
+    while rest:
+        kind, value = document.xref_get_key(xref, head)
+        if kind == "xref":
+            xref = int(value.split()[0])
+            head, *rest = rest
+        elif kind == "dict":
+            head = f"{head}/{rest.pop(0)}"
+        else:
+            return
+    document.xref_set_key(xref, head, "null")
+
+
+def remove_ink_overlays(document, token, pages=None):
+    """token'ın içerik gruplarına yerleştirilmiş overlay'leri çıkar
+
+    show_pdf_page sayfaya "q /fzFrmN Do Q" biçiminde bir içerik akışı ekler;
+    form bu gruplardan birine aitse akış ve formun kaynak kaydı silinir.
+    Silinen akış sayısını döndürür.
+    """
+    removed = 0
+    for page_number in (range(document.page_count) if pages is None else pages):
+        page = document[page_number]
+        names = set()
+        for xref, name, *_ in page.get_xobjects():
+            try:
+                kind, value = document.xref_get_key(xref, "OC")
+            except Exception:
+                continue
+            if kind == "xref" and _is_ink_layer(document, int(value.split()[0]), token):
+                names.add(name)
+        if not names:
+            continue
+        contents = page.get_contents()
+        kept = []
+        dropped = set()
+        for xref in contents:
+            tokens = document.xref_stream(xref).split()
+            name = tokens[1][1:].decode("latin-1") if len(tokens) == 4 else None
+            if name in names and tokens[0] == b"q" and tokens[2] == b"Do" and tokens[3] == b"Q":
+                dropped.add(name)
+                continue
+            kept.append(xref)
+        if not dropped:
+            continue
+        removed += len(contents) - len(kept)
+        document.xref_set_key(page.xref, "Contents", "[%s]" % " ".join(f"{xref} 0 R" for xref in kept))
+        for name in dropped:
+            _delete_key(document, page.xref, f"Resources/XObject/{name}")
+    return removed
+
+
+def _has_ink(state):
+    return any(layer.get('visible', True) and layer.get('strokes')
+               for layer in state.get('layers', {}).values())
+
+
+def _save_document(document, target_path):
+    """Aynı klasördeki geçici dosya üzerinden target_path'e kaydet"""
+    folder = os.path.dirname(os.path.abspath(target_path))
+    handle, temp_path = tempfile.mkstemp(suffix=".pdf", dir=folder)
+    os.close(handle)
+    try:
+        document.save(temp_path, garbage=1, deflate=True)
+        document.close()
+        os.replace(temp_path, target_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class VectorPdfExporter:
+    """Canvas mürekkebini PDF'e vektör path olarak yazan sınıf
+
+    Stroke'lar araçların kendi çizim koduyla QPdfWriter'a çizilir, PyMuPDF
+    her overlay sayfasını hedef sayfaya yerleştirir. PDF arka planının
+    sayfaları yeniden rasterize edilmeden kaynaktan kopyalanır.
+
+    PDF arka planına kaydedilen mürekkep, katmanın ink_token'ıyla işaretli
+    bir içerik grubuna yazılır; tekrar kayıt bu mürekkebi değiştirir ve arka
+    plan rasterizer'ı onu gizler (canvas'ta iki kez görünmez).
+    """
+
+    def __init__(self):
+        if not fitz:
+            raise RuntimeError("PyMuPDF (fitz) kütüphanesi bulunamadı. Lütfen kurulumu tamamlayın.")
+
+    # ------------------------------------------------------------------
+    # Sayfa çizimi
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _pdf_scale(layer):
+        """Canvas birimi -> PDF noktası (sayfa resmi layer.dpi ile rasterize edilir)"""
+        return 72.0 / float(layer.dpi or 72)
+
+    @staticmethod
+    def _ink_drawer(drawing_widget, state, scale, page_info=None):
+        def draw(painter):
+            painter.save()
+            painter.scale(scale, scale)
+            drawing_widget.canvas_renderer.draw_layer_state(painter, state)
+            painter.restore()
+            if page_info:
+                VectorPdfExporter._draw_page_info(painter, page_info)
+        return draw
+
+    @staticmethod
+    def _canvas_drawer(drawing_widget, state, page_width, page_height, page_info=None):
+        """PDF arka planı olmayan canvas: arka plan + stroke'lar sayfaya ortalanır"""
+        canvas_width = max(1, drawing_widget.width())
+        canvas_height = max(1, drawing_widget.height())
+        available_width = page_width - 2 * PAGE_MARGIN_POINTS
+        available_height = page_height - 2 * PAGE_MARGIN_POINTS
+        scale = min(available_width / canvas_width, available_height / canvas_height) * 0.98
+        x_offset = (page_width - canvas_width * scale) / 2
+        y_offset = (page_height - canvas_height * scale) / 2
+
+        def draw(painter):
+            painter.save()
+            painter.translate(x_offset, y_offset)
+            painter.scale(scale, scale)
+            painter.setClipRect(drawing_widget.rect())
+            renderer = drawing_widget.canvas_renderer
+            renderer.draw_background(painter)
+            renderer.draw_layer_state(painter, state)
+            painter.restore()
+            if page_info:
+                VectorPdfExporter._draw_page_info(painter, page_info)
+        return draw
+
+    @staticmethod
+    def _draw_page_info(painter, text):
+        """Sayfa numarası ve sekme adını alt ortaya yaz"""
+        page_rect = painter.device()
+        painter.save()
+        painter.setPen(Qt.GlobalColor.black)
+        font = painter.font()
+        font.setPointSize(PAGE_INFO_FONT_SIZE)
+        painter.setFont(font)
+        text_width = painter.fontMetrics().horizontalAdvance(text)
+        painter.drawText(int((page_rect.width() - text_width) / 2), int(page_rect.height() - 20), text)
+        painter.restore()
+
+    # ------------------------------------------------------------------
+    # PDF arka planlı sekmeler
+    # ------------------------------------------------------------------
+    def _stamp_ink(self, document, targets, token=None):
+        """targets: (sayfa numarası, çizim fonksiyonu); token verilirse overlay'ler
+        o token'ın içerik grubuna yazılır"""
+        targets = [(page_number, draw) for page_number, draw in targets
+                   if 0 <= page_number < document.page_count]
+        if not targets:
+            return 0
+        pages = []
+        for page_number, draw in targets:
+            rect = document[page_number].rect
+            pages.append((rect.width, rect.height, draw))
+        overlay = fitz.open("pdf", render_overlay_pdf(pages))
+        try:
+            oc = ink_layer(document, token) if token else 0
+            for overlay_index, (page_number, _) in enumerate(targets):
+                stamp_overlay(document[page_number], overlay, overlay_index, oc=oc)
+        finally:
+            overlay.close()
+        return len(targets)
+
+    def _ink_targets(self, drawing_widget):
+        layer = drawing_widget.get_pdf_background_layer()
+        scale = self._pdf_scale(layer)
+        return [
+            (page_number, self._ink_drawer(drawing_widget, state, scale))
+            for page_number, state in drawing_widget.iter_pdf_page_layer_states()
+            if _has_ink(state)
+        ]
+
+    def export_pdf_pages(self, drawing_widget, filename):
+        """PDF arka planının tüm sayfalarını mürekkeple birlikte yeni dosyaya yaz"""
+        layer = drawing_widget.get_pdf_background_layer()
+        document = fitz.open(layer.source_path)
+        try:
+            if layer.ink_token:
+                remove_ink_overlays(document, layer.ink_token)
+            self._stamp_ink(document, self._ink_targets(drawing_widget), layer.ink_token or new_ink_token())
+            if os.path.abspath(filename) == os.path.abspath(layer.source_path):
+                layer.release_document()
+                _save_document(document, filename)
+            else:
+                document.save(filename, garbage=1, deflate=True)
+        finally:
+            if not document.is_closed:
+                document.close()
+
+    def save_to_source(self, drawing_widget):
+        """Mürekkebi kaynak PDF'e yaz; mümkünse dosyanın sonuna artımlı eklenir"""
+        layer = drawing_widget.get_pdf_background_layer()
+        token = layer.ink_token or new_ink_token()
+        document = fitz.open(layer.source_path)
+        try:
+            removed = remove_ink_overlays(document, layer.ink_token) if layer.ink_token else 0
+            stamped = self._stamp_ink(document, self._ink_targets(drawing_widget), token)
+            # Arka plan rasterizer'ı kaynak dosyayı açık tutuyor; yazmadan önce kapat
+            layer.release_document()
+            if not removed and document.can_save_incrementally():
+                if stamped:
+                    document.saveIncr()
+                document.close()
+            else:
+                # Eski overlay'ler çıkarıldı - artımlı kayıt onları dosyada bırakırdı
+                _save_document(document, layer.source_path)
+        finally:
+            if not document.is_closed:
+                document.close()
+        if stamped or removed:
+            layer.set_ink_token(token)
+
+    # ------------------------------------------------------------------
+    # Tüm sekmeler
+    # ------------------------------------------------------------------
+    def export_tabs(self, filename, tabs, page_size):
+        """Her sekmeyi (drawing_widget, başlık) bir sayfa olarak yaz
+
+        PDF arka planlı sekmelerde o anki kaynak sayfa kopyalanır; diğerleri
+        page_size(drawing_widget) boyutunda (nokta) yeni sayfaya çizilir.
+        """
+        document = fitz.open()
+        targets = []
+        try:
+            for index, (drawing_widget, title) in enumerate(tabs):
+                page_info = f"Sayfa {index + 1}/{len(tabs)} - {title}"
+                state = drawing_widget.layer_manager.export_state(copy_strokes=False)
+                if drawing_widget.has_pdf_background():
+                    layer = drawing_widget.get_pdf_background_layer()
+                    with fitz.open(layer.source_path) as source:
+                        document.insert_pdf(source, from_page=layer.current_page, to_page=layer.current_page)
+                    page_number = document.page_count - 1
+                    if layer.ink_token:
+                        remove_ink_overlays(document, layer.ink_token, [page_number])
+                    draw = self._ink_drawer(drawing_widget, state, self._pdf_scale(layer), page_info)
+                else:
+                    width, height = page_size(drawing_widget)
+                    document.new_page(width=width, height=height)
+                    page_number = document.page_count - 1
+                    draw = self._canvas_drawer(drawing_widget, state, width, height, page_info)
+                targets.append((page_number, draw))
+            self._stamp_ink(document, targets)
+            document.save(filename, garbage=1, deflate=True)
+        finally:
+            document.close()
@@ -1,8 +1,9 @@
 from PyQt6.QtCore import QPointF, QRectF
-from PyQt6.QtGui import QPainter, QPen, QBrush
+from PyQt6.QtGui import QPainter, QPen, QBrush, QTransform
 from PyQt6.QtCore import Qt
 from stroke_handler import StrokeHandler
 from grid_snap_utils import GridSnapUtils
+from stroke_ids import ensure_stroke_id
 import numpy as np
 import math
 
@@ -15,6 +16,7 @@ class RotateTool:
         self.rotation_handles = []  # Döndürme tutamakları
         self.active_handle = None   # Aktif tutamak
         self.background_settings = None  # Grid snap için
+        self.preview_transform = None  # Sürükleme önizlemesi (bırakınca geometriye uygulanır)
         
     def get_selection_center(self, strokes, selected_strokes):
         """Seçilen stroke'ların merkezini hesapla"""
@@ -42,25 +44,16 @@ class RotateTool:
         if not selected_strokes:
             return None
             
-        all_points = []
-        for stroke_index in selected_strokes:
-            if stroke_index < len(strokes):
-                stroke_data = strokes[stroke_index]
-                points = StrokeHandler.get_stroke_points(stroke_data)
-                all_points.extend(points)
-                
-        if not all_points:
+        rect = StrokeHandler.get_strokes_bounds(strokes, selected_strokes)
+        if rect is None:
             return None
-            
-        min_x = min(cp[0] for cp in all_points)
-        max_x = max(cp[0] for cp in all_points)
-        min_y = min(cp[1] for cp in all_points)
-        max_y = max(cp[1] for cp in all_points)
+        if self.is_rotating and self.preview_transform is not None:
+            # Geometri henüz döndürülmedi; tutamaklar önizlemeyi izlesin
+            rect = self.preview_transform.mapRect(rect)
         
         # Biraz padding ekle
         padding = 20
-        return QRectF(min_x - padding, min_y - padding, 
-                     max_x - min_x + 2*padding, max_y - min_y + 2*padding)
+        return rect.adjusted(-padding, -padding, padding, padding)
         
     def create_rotation_handles(self, strokes, selected_strokes):
         """Döndürme tutamakları oluştur"""
@@ -123,11 +116,12 @@ class RotateTool:
         delta = pos - self.rotation_center
         self.start_angle = math.atan2(delta.y(), delta.x())
         self.last_angle = self.start_angle
+        self.preview_transform = QTransform()
         
         return True
         
     def update_rotate(self, pos, strokes, selected_strokes):
-        """Seçilen stroke'ları döndür"""
+        """Döndürme önizlemesini güncelle; stroke'lar apply_rotation ile döndürülür"""
         if not self.is_rotating or not selected_strokes or not self.rotation_center:
             return False
             
@@ -149,9 +143,24 @@ class RotateTool:
         if abs(angle_diff) < 0.02:  # ~1 derece - daha hassas
             return False
         
-        # Tüm seçili stroke'ların kontrol noktalarını döndür
-        cos_angle = math.cos(angle_diff)
-        sin_angle = math.sin(angle_diff)
+        # Geometri bırakılana kadar değişmez; sadece önizleme dönüşümü güncellenir
+        self.last_angle = current_angle
+        self.preview_transform = self._rotation_transform(self.last_angle - self.start_angle)
+        return True
+
+    def _rotation_transform(self, angle_rad):
+        """Döndürme merkezi etrafında verilen açı kadar döndüren dönüşüm"""
+        center = self.rotation_center
+        transform = QTransform()
+        transform.translate(center.x(), center.y())
+        transform.rotate(math.degrees(angle_rad))
+        transform.translate(-center.x(), -center.y())
+        return transform
+
+    def apply_rotation(self, strokes, selected_strokes):
+        """Toplam döndürmeyi seçili stroke'lara tek seferde uygula"""
+        if not self.rotation_center or self.last_angle == self.start_angle:
+            return False
         
         for selected_stroke in selected_strokes:
             if selected_stroke < len(strokes):
@@ -164,19 +173,20 @@ class RotateTool:
                         self.original_image_data = {}
                     if not hasattr(self, 'total_rotation_angles'):
                         self.total_rotation_angles = {}
-                    if id(stroke_data) not in self.original_image_data:
-                        self.original_image_data[id(stroke_data)] = {
+                    stroke_key = ensure_stroke_id(stroke_data)
+                    if stroke_key not in self.original_image_data:
+                        self.original_image_data[stroke_key] = {
                             'position': QPointF(stroke_data.position),
                             'rotation': stroke_data.rotation
                         }
-                        self.total_rotation_angles[id(stroke_data)] = 0.0
+                        self.total_rotation_angles[stroke_key] = 0.0
                     
                     # Toplam açı değişimini güncelle
                     total_angle = self.last_angle - self.start_angle
-                    self.total_rotation_angles[id(stroke_data)] = total_angle
+                    self.total_rotation_angles[stroke_key] = total_angle
                     
                     # Orijinal değerlerden yeni pozisyonu hesapla
-                    original_data = self.original_image_data[id(stroke_data)]
+                    original_data = self.original_image_data[stroke_key]
                     original_pos = original_data['position']
                     original_bounds = QRectF(original_pos.x(), original_pos.y(), 
                                            stroke_data.size.x(), stroke_data.size.y())
@@ -205,7 +215,6 @@ class RotateTool:
                 # Hassas grid snap ile rotate uygula
                 self.rotate_stroke_precise(stroke_data)
             
-        self.last_angle = current_angle
         return True
         
     def finish_rotate(self):
@@ -216,6 +225,7 @@ class RotateTool:
         self.start_angle = 0
         self.active_handle = None
         self.rotation_handles = []
+        self.preview_transform = None
         
         # Orijinal stroke data'yı güncelle (temizleme yerine)
         if hasattr(self, 'original_stroke_data'):
@@ -292,7 +302,8 @@ class RotateTool:
     
     def rotate_stroke_precise(self, stroke_data):
         """Stroke'u hassas döndürme ile döndür - orijinal data'dan hesapla"""
-        if not hasattr(self, 'original_stroke_data') or id(stroke_data) not in self.original_stroke_data:
+        stroke_key = ensure_stroke_id(stroke_data)
+        if not hasattr(self, 'original_stroke_data') or stroke_key not in self.original_stroke_data:
             # İlk kez rotate ediliyorsa format conversion ile birlikte orijinal veriyi sakla
             if not hasattr(self, 'original_stroke_data'):
                 self.original_stroke_data = {}
@@ -315,7 +326,7 @@ class RotateTool:
                 del original_copy['top_left']
                 del original_copy['bottom_right']
             
-            self.original_stroke_data[id(stroke_data)] = original_copy
+            self.original_stroke_data[stroke_key] = original_copy
         
         # Mevcut gölge verilerini koru
         current_shadow_data = {}
@@ -327,7 +338,7 @@ class RotateTool:
                 current_shadow_data[key] = stroke_data[key]
         
         # Önce orijinal data'yı geri yükle
-        original_data = self.original_stroke_data[id(stroke_data)]
+        original_data = self.original_stroke_data[stroke_key]
         stroke_data.clear()
         stroke_data.update(original_data.copy())
         
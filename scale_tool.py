@@ -1,8 +1,10 @@
 from PyQt6.QtCore import QPointF, QRectF
-from PyQt6.QtGui import QPainter, QPen, QBrush
+from PyQt6.QtGui import QPainter, QPen, QBrush, QTransform
 from PyQt6.QtCore import Qt
 from stroke_handler import StrokeHandler
 from grid_snap_utils import GridSnapUtils
+from stroke_points import StrokePoints
+from stroke_ids import ensure_stroke_id
 import numpy as np
 import math
 
@@ -18,6 +20,8 @@ class ScaleTool:
         self.background_settings = None  # (Eski) arka plan ayarları
         self.grid_settings = None  # Tek kaynak snap ayarları
         self.shift_pressed = False   # Shift tuşu durumu
+        self.preview_transform = None  # Sürükleme önizlemesi (bırakınca geometriye uygulanır)
+        self._start_bounds = None    # Başlangıçtaki seçim sınırı (kenar tutamakları için)
         
     def get_selection_center(self, strokes, selected_strokes):
         """Seçilen stroke'ların merkezini hesapla"""
@@ -45,25 +49,16 @@ class ScaleTool:
         if not selected_strokes:
             return None
             
-        all_points = []
-        for stroke_index in selected_strokes:
-            if stroke_index < len(strokes):
-                stroke_data = strokes[stroke_index]
-                points = StrokeHandler.get_stroke_points(stroke_data)
-                all_points.extend(points)
-                
-        if not all_points:
+        rect = StrokeHandler.get_strokes_bounds(strokes, selected_strokes)
+        if rect is None:
             return None
-            
-        min_x = min(cp[0] for cp in all_points)
-        max_x = max(cp[0] for cp in all_points)
-        min_y = min(cp[1] for cp in all_points)
-        max_y = max(cp[1] for cp in all_points)
+        if self.is_scaling and self.preview_transform is not None:
+            # Geometri henüz ölçeklenmedi; tutamaklar önizlemeyi izlesin
+            rect = self.preview_transform.mapRect(rect)
         
         # Padding ekle
         padding = 15
-        return QRectF(min_x - padding, min_y - padding, 
-                     max_x - min_x + 2*padding, max_y - min_y + 2*padding)
+        return rect.adjusted(-padding, -padding, padding, padding)
         
     def create_scale_handles(self, strokes, selected_strokes):
         """Boyutlandırma tutamakları oluştur"""
@@ -194,7 +189,13 @@ class ScaleTool:
                 stroke_data = strokes[stroke_index]
                 # Image stroke kontrolü
                 if not hasattr(stroke_data, 'stroke_type'):
-                    self.original_stroke_data[id(stroke_data)] = stroke_data.copy()
+                    stroke_key = ensure_stroke_id(stroke_data)
+                    self.original_stroke_data[stroke_key] = stroke_data.copy()
+        
+        # Tek düz çizgi tutamakları uçları doğrudan taşır; diğerleri önizleme dönüşümüyle çalışır
+        if not self._is_single_line(strokes, selected_strokes):
+            self._start_bounds = self.get_selection_bounding_rect(strokes, selected_strokes)
+            self.preview_transform = QTransform()
         
         # Başlangıç mesafesini hesapla (sadece köşe tutamakları için)
         handle_type = self.handle_types[self.active_handle]
@@ -213,7 +214,7 @@ class ScaleTool:
         return True
         
     def update_scale(self, pos, strokes, selected_strokes):
-        """Seçilen stroke'ları boyutlandır"""
+        """Boyutlandırma önizlemesini güncelle; stroke'lar apply_scale ile ölçeklenir"""
         if not self.is_scaling or not selected_strokes or not self.scale_center:
             return False
             
@@ -228,17 +229,8 @@ class ScaleTool:
         # Tutamak tipine göre boyutlandırma yöntemini belirle
         handle_type = self.handle_types[self.active_handle]
         
-        # Seçilen şekillerin tümü düz çizgi mi kontrol et
-        all_lines = True
-        for selected_stroke in selected_strokes:
-            if selected_stroke < len(strokes):
-                stroke_data = strokes[selected_stroke]
-                if not hasattr(stroke_data, 'get') or stroke_data.get('type') != 'line':
-                    all_lines = False
-                    break
-        
-        # Eğer tüm seçilen şekiller düz çizgi ise, özel ölçeklendirme uygula
-        if all_lines and len(selected_strokes) == 1:
+        # Tek bir düz çizgi seçiliyse özel ölçeklendirme uygula (önizleme dönüşümü kullanılmaz)
+        if self.preview_transform is None:
             # Tek bir düz çizgi seçiliyse, doğrudan scale_stroke metodunu kullan
             selected_stroke = selected_strokes[0]
             stroke_data = strokes[selected_stroke]
@@ -246,10 +238,11 @@ class ScaleTool:
             # Orijinal stroke verilerini sakla
             if not hasattr(self, 'original_stroke_data'):
                 self.original_stroke_data = {}
-            if id(stroke_data) not in self.original_stroke_data:
-                self.original_stroke_data[id(stroke_data)] = stroke_data.copy()
+            stroke_key = ensure_stroke_id(stroke_data)
+            if stroke_key not in self.original_stroke_data:
+                self.original_stroke_data[stroke_key] = stroke_data.copy()
             
-            original_data = self.original_stroke_data[id(stroke_data)]
+            original_data = self.original_stroke_data[stroke_key]
             original_start = QPointF(original_data['start_point'][0], original_data['start_point'][1])
             original_end = QPointF(original_data['end_point'][0], original_data['end_point'][1])
             
@@ -350,34 +343,13 @@ class ScaleTool:
             # Minimum ve maksimum scale sınırları
             new_scale_factor = max(0.1, min(5.0, new_scale_factor))
             
-            # Tüm seçili stroke'ları boyutlandır
-            for selected_stroke in selected_strokes:
-                if selected_stroke < len(strokes):
-                    stroke_data = strokes[selected_stroke]
-                    
-                    # Image stroke kontrolü
-                    if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
-                        # İlk kez scale ediliyorsa orijinal boyutu sakla
-                        if not hasattr(self, 'original_image_sizes'):
-                            self.original_image_sizes = {}
-                        if id(stroke_data) not in self.original_image_sizes:
-                            self.original_image_sizes[id(stroke_data)] = QPointF(stroke_data.size)
-                        
-                        # Orijinal boyuttan yeni boyutu hesapla
-                        original_size = self.original_image_sizes[id(stroke_data)]
-                        new_size = QPointF(original_size.x() * new_scale_factor, original_size.y() * new_scale_factor)
-                        stroke_data.set_size(new_size)
-                        continue
-                    
-                    # Orijinal boyuttan direkt scale uygula (daha stabil)
-                    self.scale_stroke_precise(stroke_data, new_scale_factor)
-                
             self.scale_factor = new_scale_factor
+            self.preview_transform = self._scale_transform(new_scale_factor, new_scale_factor)
             
         else:
             # Kenar tutamakları - tek yönlü scaling
-            # Bounding rect'i al
-            bounding_rect = self.get_selection_bounding_rect(strokes, selected_strokes)
+            # Geometri önizleme süresince değişmediği için başlangıç sınırı kullanılır
+            bounding_rect = self._start_bounds
             if not bounding_rect:
                 return False
                 
@@ -421,41 +393,64 @@ class ScaleTool:
                     scale_change_y = max(0.1, min(5.0, scale_change_y))
             
             # Minimum scale değişimini kontrol et
-            if (abs(scale_change_x - 1.0) < 0.001 and abs(scale_change_y - 1.0) < 0.001):  # %0.1'den az değişim varsa atla
+            if (abs(scale_change_x - self.last_scale_x) < 0.001 and
+                    abs(scale_change_y - self.last_scale_y) < 0.001):  # %0.1'den az değişim varsa atla
                 return False
             
-            # Tüm seçili stroke'ları tek seferde scale uygula
-            for selected_stroke in selected_strokes:
-                if selected_stroke < len(strokes):
-                    stroke_data = strokes[selected_stroke]
-                    
-                    # Image stroke kontrolü
-                    if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
-                        # İlk kez scale ediliyorsa orijinal boyutu sakla
-                        if not hasattr(self, 'original_image_sizes'):
-                            self.original_image_sizes = {}
-                        if id(stroke_data) not in self.original_image_sizes:
-                            self.original_image_sizes[id(stroke_data)] = QPointF(stroke_data.size)
-                        
-                        # Orijinal boyuttan yeni boyutu hesapla
-                        original_size = self.original_image_sizes[id(stroke_data)]
-                        new_size = QPointF(original_size.x() * scale_change_x, original_size.y() * scale_change_y)
-                        stroke_data.set_size(new_size)
-                        continue
-                    
-                    # Önceki scale'i tersine çevir
-                    if hasattr(self, 'last_scale_x') and hasattr(self, 'last_scale_y'):
-                        StrokeHandler.scale_stroke(stroke_data, self.scale_center.x(), self.scale_center.y(), 
-                                                 1.0/self.last_scale_x, 1.0/self.last_scale_y)
-                    
-                    # Yeni scale uygula
-                    StrokeHandler.scale_stroke(stroke_data, self.scale_center.x(), self.scale_center.y(), 
-                                             scale_change_x, scale_change_y)
-                
-            # Sonraki iterasyon için scale değerlerini sakla
+            # Sonraki iterasyon ve bırakma için scale değerlerini sakla
             self.last_scale_x = scale_change_x
             self.last_scale_y = scale_change_y
+            self.preview_transform = self._scale_transform(scale_change_x, scale_change_y)
+        
+        return True
+
+    def _is_single_line(self, strokes, selected_strokes):
+        """Seçim tek bir düz çizgiden mi oluşuyor"""
+        if len(selected_strokes) != 1 or selected_strokes[0] >= len(strokes):
+            return False
+        stroke_data = strokes[selected_strokes[0]]
+        return hasattr(stroke_data, 'get') and stroke_data.get('type') == 'line'
+
+    def _scale_transform(self, scale_x, scale_y):
+        """Boyutlandırma merkezi etrafında ölçekleyen dönüşüm"""
+        center = self.scale_center
+        transform = QTransform()
+        transform.translate(center.x(), center.y())
+        transform.scale(scale_x, scale_y)
+        transform.translate(-center.x(), -center.y())
+        return transform
+
+    def apply_scale(self, strokes, selected_strokes):
+        """Önizlenen ölçeği seçili stroke'lara tek seferde uygula"""
+        if self.preview_transform is None or self.preview_transform.isIdentity():
+            return False
+        
+        corner = self.handle_types[self.active_handle] in ["top-left", "top-right", "bottom-left", "bottom-right"]
+        if corner:
+            scale_x = scale_y = self.scale_factor
+        else:
+            scale_x, scale_y = self.last_scale_x, self.last_scale_y
         
+        for selected_stroke in selected_strokes:
+            if selected_stroke < len(strokes):
+                stroke_data = strokes[selected_stroke]
+                
+                # Image stroke kontrolü
+                if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
+                    # Resim de diğer şekiller gibi seçim merkezine göre ölçeklenir (önizlemeyle aynı)
+                    new_center = self.preview_transform.map(stroke_data.get_bounds().center())
+                    new_size = QPointF(stroke_data.size.x() * scale_x, stroke_data.size.y() * scale_y)
+                    stroke_data.set_size(new_size)
+                    stroke_data.set_position(QPointF(new_center.x() - new_size.x() / 2,
+                                                     new_center.y() - new_size.y() / 2))
+                    continue
+                
+                if corner:
+                    # Orijinal boyuttan direkt scale uygula (daha stabil)
+                    self.scale_stroke_precise(stroke_data, scale_x)
+                else:
+                    StrokeHandler.scale_stroke(stroke_data, self.scale_center.x(), self.scale_center.y(),
+                                               scale_x, scale_y)
         return True
         
     def finish_scale(self):
@@ -467,6 +462,8 @@ class ScaleTool:
         self.active_handle = None
         self.scale_handles = []
         self.handle_types = []
+        self.preview_transform = None
+        self._start_bounds = None
         # Tek yönlü scaling için kullanılan değişkenleri temizle
         if hasattr(self, 'initial_pos'):
             delattr(self, 'initial_pos')
@@ -629,20 +626,21 @@ class ScaleTool:
                 
                 # Seçili stroke'ları ölçeklendir
                 for stroke in self.selected_strokes:
-                    original_data = self.original_stroke_data[id(stroke)]
+                    original_data = self.original_stroke_data[ensure_stroke_id(stroke)]
                     self.scale_stroke(stroke, original_data, scale_factor)
                 
-                self.drawing_widget.update()
+                self.drawing_widget.update_contents()
 
     def scale_stroke_precise(self, stroke_data, scale_factor):
         """Stroke'u hassas grid snap ile boyutlandır"""
-        if not hasattr(self, 'original_stroke_data') or id(stroke_data) not in self.original_stroke_data:
+        stroke_key = ensure_stroke_id(stroke_data)
+        if not hasattr(self, 'original_stroke_data') or stroke_key not in self.original_stroke_data:
             # İlk kez scale ediliyorsa orijinal veriyi sakla
             if not hasattr(self, 'original_stroke_data'):
                 self.original_stroke_data = {}
-            self.original_stroke_data[id(stroke_data)] = stroke_data.copy()
+            self.original_stroke_data[stroke_key] = stroke_data.copy()
         
-        original_data = self.original_stroke_data[id(stroke_data)]
+        original_data = self.original_stroke_data[stroke_key]
         self.scale_stroke(stroke_data, original_data, scale_factor)
     
     def scale_stroke(self, stroke, original_data, scale_factor):
@@ -650,7 +648,12 @@ class ScaleTool:
         stroke_type = stroke.get('type', '')
         
         if stroke_type == 'freehand':
-            if 'points' in original_data:
+            if isinstance(original_data.get('points'), StrokePoints):
+                # Orijinal noktalardan vektörel ölçekle (orijinal dizi korunur)
+                scaled_points = original_data['points'].copy()
+                scaled_points.scale(self.scale_center.x(), self.scale_center.y(), scale_factor, scale_factor)
+                stroke['points'] = scaled_points
+            elif 'points' in original_data:
                 stroke['points'] = []
                 for point in original_data['points']:
                     if isinstance(point, dict):
@@ -2,10 +2,12 @@ from PyQt6.QtCore import QPointF, QRectF
 from PyQt6.QtGui import QPainter, QPen, QBrush
 from PyQt6.QtCore import Qt
 from stroke_handler import StrokeHandler
+from stroke_ids import get_stroke_id
 import numpy as np
 
 class SelectionTool:
-    def __init__(self):
+    def __init__(self, layer_manager=None):
+        self.layer_manager = layer_manager  # Uzamsal indeks sorguları için (opsiyonel)
         self.selected_strokes = []   # Seçilen stroke'ların index'leri (çoklu seçim)
         self.selection_rect = None   # Seçim dikdörtgeni
         self.is_selecting = False    # Seçim yapılıyor mu
@@ -31,6 +33,15 @@ class SelectionTool:
             height = pos.y() - start_y
             self.selection_rect = QRectF(start_x, start_y, width, height).normalized()
         
+    def _candidate_indices(self, strokes, rect):
+        """rect ile kesişebilecek stroke index'leri - aktif katman için uzamsal indeksten"""
+        if self.layer_manager is not None and strokes is self.layer_manager.get_active_strokes():
+            try:
+                return self.layer_manager.query_strokes_in_rect(rect)
+            except Exception:
+                pass
+        return range(len(strokes))
+
     def set_preview_strokes(self, stroke_list):
         """Preview stroke listesini ayarla"""
         self.preview_strokes = stroke_list
@@ -54,7 +65,8 @@ class SelectionTool:
         
         # Stroke'ların seçim dikdörtgenine çakışıp çakışmadığını kontrol et
         newly_selected = []
-        for stroke_index, stroke_data in enumerate(strokes):
+        for stroke_index in self._candidate_indices(strokes, self.selection_rect):
+            stroke_data = strokes[stroke_index]
             # Image stroke kontrolü
             if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
                 # Resmin bounding rect'i seçim alanıyla kesişiyor mu?
@@ -111,7 +123,8 @@ class SelectionTool:
     def get_stroke_at_point(self, pos, strokes, tolerance=15):
         """Belirtilen noktada stroke index'ini bul (seçmeden) - üstteki stroke'lar önce"""
         # Stroke'ları tersten kontrol et (üstteki stroke'lar önce)
-        for stroke_index in range(len(strokes) - 1, -1, -1):
+        search_rect = QRectF(pos.x() - tolerance, pos.y() - tolerance, 2 * tolerance, 2 * tolerance)
+        for stroke_index in reversed(self._candidate_indices(strokes, search_rect)):
             stroke_data = strokes[stroke_index]
             
             # Image stroke kontrolü
@@ -241,6 +254,9 @@ class SelectionTool:
         """Belirtilen grup ID'sine sahip tüm stroke'ları bul"""
         if not group_id:
             return []
+        if self.layer_manager is not None and strokes is self.layer_manager.get_active_strokes():
+            # Aktif katman: grup indeksinden O(k)
+            return self.layer_manager.group_member_indices(group_id)
             
         group_members = []
         for i, stroke in enumerate(strokes):
@@ -276,6 +292,34 @@ class SelectionTool:
                 
         return True
         
+    def remap_selection(self, start, removed, inserted):
+        """Aktif katmanda strokes[start:start + len(removed)] inserted ile
+        değiştirildikten sonra seçili index'leri güncelle
+
+        Aralık dışındaki index'ler kaydırılır; aralıktaki seçili stroke'lar
+        kimlikleriyle yeni konumlarına taşınır (z-sırası değişiklikleri),
+        kaldırılanlar seçimden çıkar.
+        """
+        if not self.selected_strokes:
+            return
+        end = start + len(removed)
+        delta = len(inserted) - len(removed)
+        new_positions = None
+        remapped = []
+        for stroke_index in self.selected_strokes:
+            if stroke_index < start:
+                remapped.append(stroke_index)
+            elif stroke_index >= end:
+                remapped.append(stroke_index + delta)
+            else:
+                if new_positions is None:
+                    new_positions = {get_stroke_id(stroke): start + offset
+                                     for offset, stroke in enumerate(inserted)}
+                position = new_positions.get(get_stroke_id(removed[stroke_index - start]))
+                if position is not None:
+                    remapped.append(position)
+        self.selected_strokes = remapped
+
     def clear_selection(self):
         """Seçimi temizle"""
         self.selected_strokes = []
@@ -335,40 +379,8 @@ class SelectionTool:
         """Seçilen tüm stroke'ların bounding rectangle'ını hesapla"""
         if not self.selected_strokes:
             return None
-            
-        all_points = []
-        for stroke_index in self.selected_strokes:
-            if stroke_index < len(strokes):
-                stroke_data = strokes[stroke_index]
-                
-                # Image stroke kontrolü
-                if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
-                    bounds = stroke_data.get_bounds()
-                    # Köşe noktalarını ekle
-                    all_points.extend([
-                        (bounds.left(), bounds.top()),
-                        (bounds.right(), bounds.top()),
-                        (bounds.left(), bounds.bottom()),
-                        (bounds.right(), bounds.bottom())
-                    ])
-                    continue
-                
-                # Güvenlik kontrolü - eski stroke'lar için
-                if 'type' not in stroke_data:
-                    continue
-                points = StrokeHandler.get_stroke_points(stroke_data)
-                all_points.extend(points)
-                
-        if not all_points:
-            return None
-            
-        min_x = min(cp[0] for cp in all_points)
-        max_x = max(cp[0] for cp in all_points)
-        min_y = min(cp[1] for cp in all_points)
-        max_y = max(cp[1] for cp in all_points)
-        
-        # Padding kaldırıldı - sadece gerçek şekil alanı
-        return QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
+        # Padding yok - sadece gerçek şekil alanı
+        return StrokeHandler.get_strokes_bounds(strokes, self.selected_strokes)
         
     def draw_selection(self, painter):
         """Seçim göstergelerini çiz"""
@@ -447,39 +459,11 @@ class SelectionTool:
         all_selected = list(set(self.selected_strokes + self.preview_strokes))
         if all_selected:
             # Geçici bounding rect hesapla
-            all_points = []
-            for stroke_index in all_selected:
-                if stroke_index < len(strokes):
-                    stroke_data = strokes[stroke_index]
-                    
-                    # Image stroke kontrolü
-                    if hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image':
-                        bounds = stroke_data.get_bounds()
-                        all_points.extend([
-                            (bounds.left(), bounds.top()),
-                            (bounds.right(), bounds.top()),
-                            (bounds.left(), bounds.bottom()),
-                            (bounds.right(), bounds.bottom())
-                        ])
-                        continue
-                    
-                    # Güvenlik kontrolü - eski stroke'lar için
-                    if hasattr(stroke_data, 'get') and 'type' not in stroke_data:
-                        continue
-                    elif hasattr(stroke_data, 'get'):
-                        points = StrokeHandler.get_stroke_points(stroke_data)
-                        all_points.extend(points)
-                    
-            if all_points:
-                min_x = min(cp[0] for cp in all_points)
-                max_x = max(cp[0] for cp in all_points)
-                min_y = min(cp[1] for cp in all_points)
-                max_y = max(cp[1] for cp in all_points)
-                
+            bounds = StrokeHandler.get_strokes_bounds(strokes, all_selected)
+            if bounds is not None:
                 # Görsel için padding
                 padding = 15
-                bounding_rect = QRectF(min_x - padding, min_y - padding, 
-                                     max_x - min_x + 2*padding, max_y - min_y + 2*padding)
+                bounding_rect = bounds.adjusted(-padding, -padding, padding, padding)
                 
                 # Grup seçimi ise mavi, normal seçim ise yeşil
                 bounding_color = Qt.GlobalColor.blue if is_grouped else Qt.GlobalColor.green
@@ -0,0 +1,129 @@
+import json
+import zipfile
+
+import numpy as np
+
+from stroke_points import StrokePoints
+
+FORMAT_NAME = 'dijital-murekkep-session'
+FORMAT_VERSION = '2.0'
+MANIFEST_NAME = 'manifest.json'
+BLOB_KEY = '$blob'
+
+
+def is_session_archive(path):
+    """Dosya 2.x (zip tabanlı) oturum kabı mı? 1.x oturumlar düz JSON'dur."""
+    try:
+        return zipfile.is_zipfile(path)
+    except OSError:
+        return False
+
+
+def points_to_blob(points):
+    """StrokePoints'i ham little-endian float32 blob'a çevir"""
+    return np.ascontiguousarray(points.array, dtype='<f4').tobytes()
+
+
+def points_from_blob(data):
+    """points_to_blob çıktısından StrokePoints oluştur"""
+    return StrokePoints(np.frombuffer(data, dtype='<f4').reshape(-1, 3))
+
+
+def iter_blob_refs(value):
+    """Serileştirilmiş veri içindeki blob referanslarını dolaş"""
+    if isinstance(value, dict):
+        if BLOB_KEY in value:
+            yield value
+            return
+        for item in value.values():
+            yield from iter_blob_refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_blob_refs(item)
+
+
+def map_blob_refs(value, convert):
+    """Blob referanslarını convert(ref) sonucuyla değiştirilmiş bir kopya döndür"""
+    if isinstance(value, dict):
+        if BLOB_KEY in value:
+            return convert(value)
+        return {key: map_blob_refs(item, convert) for key, item in value.items()}
+    if isinstance(value, list):
+        return [map_blob_refs(item, convert) for item in value]
+    return value
+
+
+def _default_compression():
+    """Mümkünse zstd, değilse hızlı deflate (seviye 1)"""
+    zstd = getattr(zipfile, 'ZIP_ZSTANDARD', None)
+    if zstd is not None:
+        return zstd, None
+    return zipfile.ZIP_DEFLATED, 1
+
+
+class SessionArchiveWriter:
+    """Oturumu parça (chunk) başına bir zip girdisi olarak yazar.
+
+    JSON parçaları sıkıştırılır. Nokta dizileri ham little-endian float32
+    (x, y, basınç) blob'ları olarak yazılır; deflate ile küçülmedikleri için
+    zstd yoksa sıkıştırılmadan saklanır.
+    """
+
+    def __init__(self, fileobj, compression=None, compresslevel=None):
+        if compression is None:
+            compression, compresslevel = _default_compression()
+        self._compression = compression
+        self._compresslevel = compresslevel
+        self._blob_compression = compression if compression != zipfile.ZIP_DEFLATED else zipfile.ZIP_STORED
+        self._zip = zipfile.ZipFile(fileobj, 'w', compression=compression, compresslevel=compresslevel)
+        self._blob_counter = 0
+
+    def write_json(self, name, data):
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self._zip.writestr(name, payload, compress_type=self._compression, compresslevel=self._compresslevel)
+
+    def write_points(self, prefix, points):
+        """StrokePoints'i blob olarak yaz, stroke içine konacak referansı döndür"""
+        return self.write_blob(prefix, points_to_blob(points), len(points.array))
+
+    def write_blob(self, prefix, data, count):
+        """Hazır float32 blob'u yaz (bellekte bekleyen sekmelerden), referansı döndür"""
+        name = f"{prefix}/blobs/{self._blob_counter}.f32"
+        self._blob_counter += 1
+        self._zip.writestr(name, data, compress_type=self._blob_compression)
+        return {BLOB_KEY: name, 'count': int(count)}
+
+    def points_writer(self, prefix):
+        """serialize_strokes için blob yazıcı"""
+        return lambda points: self.write_points(prefix, points)
+
+    def close(self):
+        self._zip.close()
+
+
+class SessionArchiveReader:
+    """2.x oturum kabından parçaları isteğe bağlı (lazy) okur"""
+
+    def __init__(self, path):
+        self._zip = zipfile.ZipFile(path, 'r')
+        try:
+            self.manifest = self.read_json(MANIFEST_NAME)
+        except Exception:
+            self._zip.close()
+            raise
+        if self.manifest.get('format') != FORMAT_NAME:
+            self._zip.close()
+            raise ValueError("Dosya bir Dijital Mürekkep oturumu değil.")
+
+    def read_json(self, name):
+        return json.loads(self._zip.read(name).decode('utf-8'))
+
+    def read_blob(self, name):
+        return self._zip.read(name)
+
+    def read_points(self, reference):
+        """Blob referansından StrokePoints oluştur"""
+        return points_from_blob(self.read_blob(reference[BLOB_KEY]))
+
+    def close(self):
+        self._zip.close()
@@ -1,9 +1,24 @@
 import json
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
-from PyQt6.QtCore import QStandardPaths
+from PyQt6.QtCore import QObject, QStandardPaths, pyqtSignal
+from stroke_points import BOUNDS_KEY, StrokePoints, ensure_stroke_points, snapshot_stroke
+from session_archive import (
+    BLOB_KEY, FORMAT_NAME, FORMAT_VERSION, MANIFEST_NAME,
+    SessionArchiveReader, SessionArchiveWriter, is_session_archive,
+    iter_blob_refs, map_blob_refs, points_from_blob, points_to_blob
+)
+
+class SessionSaveNotifier(QObject):
+    """Arka plan kaydının sonucunu GUI thread'ine taşıyan sinyaller"""
+
+    saveDone = pyqtSignal(object)  # iç kullanım: tamamlanan kayıt işi
+    saveFinished = pyqtSignal(str)  # dosya yolu
+    saveFailed = pyqtSignal(str, str)  # dosya yolu, hata mesajı
+
 
 class SessionManager:
     """Oturum kaydetme ve açma işlemleri"""
@@ -12,6 +27,12 @@ class SessionManager:
         self.sessions_dir = self.get_sessions_directory()
         self.ensure_sessions_directory()
         self.pdf_importer = None
+        # Arka plan kaydı: tek işçi thread'i, yazılan iş ve sıradaki işler
+        self._save_executor = None
+        self._active_save = None
+        self._queued_saves = []
+        self.save_notifier = SessionSaveNotifier()
+        self.save_notifier.saveDone.connect(self._on_save_done)
 
     def set_pdf_importer(self, importer):
         self.pdf_importer = importer
@@ -43,8 +64,15 @@ class SessionManager:
             self.sessions_dir = self.get_sessions_directory()
         self.ensure_sessions_directory()
             
-    def save_session(self, main_window, filename=None):
-        """Mevcut oturumu kaydet"""
+    def save_session(self, main_window, filename=None, on_finished=None, blocking=False):
+        """Mevcut oturumu kaydet
+
+        Oturumun değişmez bir anlık görüntüsü GUI thread'inde alınır; serileştirme
+        ve dosya yazımı arka plandaki kayıt thread'inde yapılır. Sonuç
+        save_notifier sinyalleriyle bildirilir, başarılı kayıttan sonra
+        on_finished(filename) çağrılır. Kayıt sıraya alındıysa dosya adı döner.
+        blocking=True ise (ör. kapanışta) kayıt bitene kadar beklenir.
+        """
         try:
             # Eğer dosya adı verilmemişse, kullanıcıdan iste
             if not filename:
@@ -57,99 +85,197 @@ class SessionManager:
                 
             if not filename:
                 return None
-                
-            # Oturum verilerini topla
-            session_data = {
-                'version': '1.1',
-                'created': datetime.now().isoformat(),
-                'tabs': [],
-                'active_tab': main_window.tab_manager.get_current_index(),
-                'window_size': {
-                    'width': main_window.width(),
-                    'height': main_window.height()
-                },
-                'settings': self.serialize_settings(main_window.settings.get_all_settings())
-            }
-            
-            # Her tab'ın verilerini kaydet
-            for i in range(main_window.tab_manager.get_tab_count()):
-                tab_widget = main_window.tab_manager.get_tab_widget_at_index(i)
-                tab_name = main_window.tab_manager.get_tab_text(i)
-
-                if tab_widget:
-                    tab_data = {
-                        'name': tab_name,
-                        'background_settings': self.serialize_background_settings(tab_widget.background_settings)
-                    }
-
-                    if hasattr(tab_widget, 'export_pdf_background_state'):
-                        pdf_state = tab_widget.export_pdf_background_state()
-                        if pdf_state:
-                            tab_data['pdf_background'] = pdf_state
-
-                    if hasattr(tab_widget, 'layer_manager'):
-                        tab_data['layers'] = self.serialize_layers(tab_widget)
-                        if hasattr(tab_widget, 'has_pdf_background') and hasattr(tab_widget, 'export_pdf_page_states'):
-                            if tab_widget.has_pdf_background():
-                                page_states = tab_widget.export_pdf_page_states()
-                                if page_states:
-                                    serialized_pages = self.serialize_pdf_page_states(page_states)
-                                    if serialized_pages:
-                                        tab_data['pdf_page_layers'] = serialized_pages
-                    elif hasattr(tab_widget, 'strokes'):
-                        # Eski sürümler için geri uyumluluk
-                        tab_data['strokes'] = self.serialize_strokes(tab_widget.strokes)
-
-                    session_data['tabs'].append(tab_data)
-                    
-            target_directory = os.path.dirname(filename)
-            if target_directory and not os.path.exists(target_directory):
-                os.makedirs(target_directory, exist_ok=True)
 
-            temp_file = None
-            temp_path = None
-            try:
-                temp_file = tempfile.NamedTemporaryFile(
-                    'w',
-                    encoding='utf-8',
-                    delete=False,
-                    dir=target_directory if target_directory else None,
-                    prefix='.tmp_session_',
-                    suffix='.sdm'
-                )
-                temp_path = temp_file.name
-                json.dump(session_data, temp_file, indent=2, ensure_ascii=False)
-                temp_file.flush()
-                os.fsync(temp_file.fileno())
-            finally:
-                if temp_file is not None:
-                    temp_file.close()
+            job = {
+                'path': filename,
+                'main_window': main_window,
+                'auto': os.path.abspath(filename) == os.path.abspath(self.get_auto_save_path()),
+                'callbacks': [on_finished] if on_finished else [],
+                'future': None,
+                'error': None,
+            }
+            if blocking:
+                self.wait_for_saves()
+                self._start_save(job, synchronous=True)
+                return filename if job['error'] is None else None
 
-            try:
-                os.replace(temp_path, filename)
-            finally:
-                if temp_path and os.path.exists(temp_path):
-                    # os.replace başarılıysa temp_path artık filename oldu;
-                    # başarısız olduysa geçici dosyayı temizle.
-                    try:
-                        os.remove(temp_path)
-                    except FileNotFoundError:
-                        pass
-                    except Exception:
-                        pass
-                
-            # Status bar'da mesaj göster
-            if hasattr(main_window, 'show_status_message'):
-                file_name = os.path.basename(filename)
-                main_window.show_status_message(f"Oturum kaydedildi: {file_name}")
+            self._enqueue_save(job)
             return filename
-            
+
         except Exception as e:
             # Status bar'da hata mesajı göster
             if hasattr(main_window, 'show_status_message'):
                 main_window.show_status_message(f"Oturum kaydedilemedi: {str(e)}")
             return None
 
+    # ------------------------------------------------------------------
+    # Arka plan kaydı
+    # ------------------------------------------------------------------
+    def is_saving(self):
+        """Yazılmakta veya sırada bekleyen kayıt var mı?"""
+        return self._active_save is not None or bool(self._queued_saves)
+
+    def _enqueue_save(self, job):
+        """Kaydı sıraya al; aynı dosyaya bekleyen kayıt varsa onunla birleştir"""
+        for queued in self._queued_saves:
+            if queued['path'] == job['path']:
+                queued['callbacks'].extend(job['callbacks'])
+                return
+        self._queued_saves.append(job)
+        self._start_next_save()
+
+    def _start_next_save(self):
+        while self._active_save is None and self._queued_saves:
+            self._start_save(self._queued_saves.pop(0))
+
+    def _start_save(self, job, synchronous=False):
+        """Anlık görüntüyü al ve yazımı başlat (synchronous ise bu thread'de yaz)"""
+        try:
+            snapshot = self.snapshot_session(job['main_window'])
+        except Exception as e:
+            job['error'] = e
+            self._report_save(job)
+            return
+
+        if synchronous:
+            try:
+                self._write_snapshot(snapshot, job['path'])
+            except Exception as e:
+                job['error'] = e
+            self._report_save(job)
+            return
+
+        if self._save_executor is None:
+            self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='session-save')
+        self._active_save = job
+        job['future'] = self._save_executor.submit(self._write_snapshot, snapshot, job['path'])
+        # Tamamlanma işçi thread'inden sinyalle GUI thread'ine taşınır
+        job['future'].add_done_callback(lambda _future, job=job: self.save_notifier.saveDone.emit(job))
+
+    def _on_save_done(self, job):
+        if job is not self._active_save:
+            return  # wait_for_saves tarafından zaten işlendi
+        self._active_save = None
+        try:
+            job['future'].result()
+        except Exception as e:
+            job['error'] = e
+        self._report_save(job)
+        self._start_next_save()
+
+    def _report_save(self, job):
+        main_window = job['main_window']
+        file_name = os.path.basename(job['path'])
+        if job['error'] is None:
+            message = "Otomatik kayıt tamamlandı" if job['auto'] else f"Oturum kaydedildi: {file_name}"
+            self.save_notifier.saveFinished.emit(job['path'])
+            for callback in job['callbacks']:
+                try:
+                    callback(job['path'])
+                except Exception as e:
+                    print(f"Kayıt sonrası işlem başarısız: {e}")
+        else:
+            prefix = "Otomatik kayıt başarısız" if job['auto'] else "Oturum kaydedilemedi"
+            message = f"{prefix}: {str(job['error'])}"
+            self.save_notifier.saveFailed.emit(job['path'], str(job['error']))
+        if hasattr(main_window, 'show_status_message'):
+            main_window.show_status_message(message)
+
+    def wait_for_saves(self):
+        """Yazılmakta ve sırada bekleyen tüm kayıtları bitir (kapanışta)"""
+        while self.is_saving():
+            job = self._active_save
+            if job is None:
+                self._start_next_save()
+                continue
+            try:
+                job['future'].result()
+            except Exception:
+                pass
+            self._on_save_done(job)
+
+    def snapshot_session(self, main_window):
+        """Kaydedilecek her şeyin değişmez anlık görüntüsü (GUI thread'inde, ucuz)"""
+        manifest = {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'created': datetime.now().isoformat(),
+            'tabs': [],
+            'active_tab': main_window.tab_manager.get_current_index(),
+            'window_size': {
+                'width': main_window.width(),
+                'height': main_window.height()
+            },
+            'settings': self.serialize_settings(main_window.settings.get_all_settings())
+        }
+        tabs = []
+        for i in range(main_window.tab_manager.get_tab_count()):
+            tab_name = main_window.tab_manager.get_tab_text(i)
+            payload = main_window.tab_manager.get_tab_payload(i)
+            if payload is not None:
+                # Yüklenmemiş/uyutulmuş sekme: serileştirilmiş hâli değişmez, olduğu gibi yazılır
+                tabs.append({'name': tab_name, 'payload': payload})
+                continue
+            tab_widget = main_window.tab_manager.get_tab_widget_at_index(i)
+            if not tab_widget:
+                continue
+            tabs.append(self.snapshot_tab(tab_widget, tab_name))
+        return {'manifest': manifest, 'tabs': tabs}
+
+    def _write_snapshot(self, snapshot, filename):
+        """Anlık görüntüyü oturum arşivine yaz (kayıt thread'inde çalışır)"""
+        manifest = dict(snapshot['manifest'])
+        manifest['tabs'] = []
+
+        target_directory = os.path.dirname(filename)
+        if target_directory and not os.path.exists(target_directory):
+            os.makedirs(target_directory, exist_ok=True)
+
+        temp_file = None
+        temp_path = None
+        try:
+            temp_file = tempfile.NamedTemporaryFile(
+                'wb',
+                delete=False,
+                dir=target_directory if target_directory else None,
+                prefix='.tmp_session_',
+                suffix='.sdm'
+            )
+            temp_path = temp_file.name
+            writer = SessionArchiveWriter(temp_file)
+
+            # Her tab ayrı parçalara yazılır (tab / katman / PDF sayfası)
+            for tab_snapshot in snapshot['tabs']:
+                prefix = f"tabs/{len(manifest['tabs'])}"
+                if 'payload' in tab_snapshot:
+                    tab_data = self._payload_tab_data(tab_snapshot, writer, prefix)
+                else:
+                    tab_data = self.serialize_tab_snapshot(tab_snapshot, writer.points_writer(prefix))
+                chunk_name = f"{prefix}/tab.json"
+                writer.write_json(chunk_name, self._split_tab_chunks(writer, prefix, tab_data))
+                manifest['tabs'].append({'name': tab_snapshot['name'], 'chunk': chunk_name})
+
+            writer.write_json(MANIFEST_NAME, manifest)
+            writer.close()
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        finally:
+            if temp_file is not None:
+                temp_file.close()
+
+        try:
+            os.replace(temp_path, filename)
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                # os.replace başarılıysa temp_path artık filename oldu;
+                # başarısız olduysa geçici dosyayı temizle.
+                try:
+                    os.remove(temp_path)
+                except FileNotFoundError:
+                    pass
+                except Exception:
+                    pass
+
     def load_session(self, main_window, filename=None):
         """Kaydedilmiş oturumu aç"""
         try:
@@ -173,9 +299,189 @@ class SessionManager:
                 main_window.show_status_message(f"Oturum yüklenemedi: {str(e)}")
             return None
 
+    def _payload_tab_data(self, tab_snapshot, writer, prefix):
+        """Bekleyen sekme verisini blob'larını yeni arşive kopyalayarak hazırla"""
+        blobs = tab_snapshot['payload']['blobs']
+        tab_data = map_blob_refs(
+            tab_snapshot['payload']['tab_data'],
+            lambda ref: writer.write_blob(prefix, blobs[ref[BLOB_KEY]], ref.get('count', 0))
+        )
+        tab_data['name'] = tab_snapshot['name']
+        return tab_data
+
+    # ------------------------------------------------------------------
+    # Bekleyen (lazy) sekmeler
+    # ------------------------------------------------------------------
+    def create_tab_payload(self, tab_widget, tab_name):
+        """Sekmenin bellekte bekletilecek kompakt hâli
+
+        {'tab_data': JSON uyumlu tab verisi, 'blobs': {ad: float32 nokta verisi}};
+        oturum dosyasındaki tab parçalarıyla aynı biçimdedir.
+        """
+        blobs = {}
+
+        def write_points(points):
+            name = f"blobs/{len(blobs)}"
+            blobs[name] = points_to_blob(points)
+            return {BLOB_KEY: name, 'count': len(points.array)}
+
+        return {'tab_data': self.collect_tab_data(tab_widget, tab_name, write_points), 'blobs': blobs}
+
+    def _read_tab_payload(self, reader, entry):
+        """Arşivdeki bir tab'ı widget oluşturmadan kompakt hâliyle oku"""
+        tab_data = self._join_tab_chunks(reader, reader.read_json(entry['chunk']))
+        blobs = {ref[BLOB_KEY]: reader.read_blob(ref[BLOB_KEY]) for ref in iter_blob_refs(tab_data)}
+        return {'tab_data': tab_data, 'blobs': blobs}
+
+    def apply_tab_payload(self, main_window, tab_widget, payload):
+        """create_tab_payload / _read_tab_payload çıktısını widget'a yükle"""
+        blobs = payload['blobs']
+        self._apply_tab_data(main_window, tab_widget, payload['tab_data'],
+                             lambda ref: points_from_blob(blobs[ref[BLOB_KEY]]))
+
+    def collect_tab_data(self, tab_widget, tab_name, blob_writer=None):
+        """Bir tab'ın oturum verisini topla"""
+        return self.serialize_tab_snapshot(self.snapshot_tab(tab_widget, tab_name), blob_writer)
+
+    def snapshot_tab(self, tab_widget, tab_name):
+        """Tab'ın değişmez anlık görüntüsü; stroke'lar snapshot_stroke ile alınır"""
+        tab = {
+            'name': tab_name,
+            'background_settings': self.serialize_background_settings(tab_widget.background_settings)
+        }
+
+        if hasattr(tab_widget, 'export_pdf_background_state'):
+            pdf_state = tab_widget.export_pdf_background_state()
+            if pdf_state:
+                tab['pdf_background'] = pdf_state
+
+        if hasattr(tab_widget, 'layer_manager'):
+            tab['layer_state'] = tab_widget.layer_manager.export_snapshot()
+            group_names = getattr(tab_widget, 'group_names', {})
+            tab['group_names'] = dict(group_names) if isinstance(group_names, dict) else {}
+            if callable(getattr(tab_widget, 'has_pdf_background', None)) and tab_widget.has_pdf_background():
+                if callable(getattr(tab_widget, 'snapshot_pdf_page_layer_states', None)):
+                    tab['pdf_payload'] = tab_widget.snapshot_pdf_page_layer_states()
+                elif hasattr(tab_widget, 'export_pdf_page_states'):
+                    page_states = tab_widget.export_pdf_page_states() or {}
+                    tab['pdf_page_states'] = {
+                        index: tab_widget.layer_manager.snapshot_state(state)
+                        for index, state in page_states.items() if state is not None
+                    }
+        elif hasattr(tab_widget, 'strokes'):
+            # Eski sürümler için geri uyumluluk
+            tab['strokes'] = [snapshot_stroke(stroke) for stroke in tab_widget.strokes]
+
+        return tab
+
+    def serialize_tab_snapshot(self, tab, blob_writer=None):
+        """snapshot_tab çıktısını JSON'a dönüştürülebilir tab verisine çevir"""
+        tab_data = {
+            'name': tab['name'],
+            'background_settings': tab['background_settings']
+        }
+        if 'pdf_background' in tab:
+            tab_data['pdf_background'] = tab['pdf_background']
+
+        if 'layer_state' in tab:
+            tab_data['layers'] = self.serialize_layers(tab, blob_writer)
+            if 'pdf_layers' not in tab_data['layers'] and tab.get('pdf_page_states'):
+                # pdf_layers sayfa durumlarını zaten içerir; yoksa eski alanı yaz
+                serialized_pages = self.serialize_pdf_page_states(tab['pdf_page_states'], blob_writer)
+                if serialized_pages:
+                    tab_data['pdf_page_layers'] = serialized_pages
+        elif 'strokes' in tab:
+            tab_data['strokes'] = self.serialize_strokes(tab['strokes'], blob_writer)
+
+        return tab_data
+
+    def _split_tab_chunks(self, writer, prefix, tab_data):
+        """Tab verisindeki stroke listelerini ayrı parçalara taşı"""
+        tab_meta = dict(tab_data)
+
+        layers = tab_meta.get('layers')
+        if isinstance(layers, dict):
+            layers = dict(layers)
+            layer_entries = []
+            for index, layer in enumerate(layers.get('layers', [])):
+                entry = dict(layer)
+                chunk_name = f"{prefix}/layers/{index}.json"
+                writer.write_json(chunk_name, entry.pop('strokes', []))
+                entry['strokes_chunk'] = chunk_name
+                layer_entries.append(entry)
+            layers['layers'] = layer_entries
+
+            pdf_layers = layers.get('pdf_layers')
+            if isinstance(pdf_layers, dict):
+                pdf_layers = dict(pdf_layers)
+                page_chunks = {}
+                for page_index, state in (pdf_layers.pop('page_states', None) or {}).items():
+                    chunk_name = f"{prefix}/pages/{page_index}.json"
+                    writer.write_json(chunk_name, state)
+                    page_chunks[page_index] = chunk_name
+                pdf_layers['page_chunks'] = page_chunks
+                layers['pdf_layers'] = pdf_layers
+            tab_meta['layers'] = layers
+
+        page_layers = tab_meta.get('pdf_page_layers')
+        if isinstance(page_layers, dict):
+            page_chunks = {}
+            for page_index, state in page_layers.items():
+                chunk_name = f"{prefix}/pages/{page_index}.json"
+                writer.write_json(chunk_name, state)
+                page_chunks[page_index] = chunk_name
+            tab_meta['pdf_page_layers'] = {'page_chunks': page_chunks}
+
+        if 'strokes' in tab_meta:
+            chunk_name = f"{prefix}/strokes.json"
+            writer.write_json(chunk_name, tab_meta.pop('strokes'))
+            tab_meta['strokes_chunk'] = chunk_name
+
+        return tab_meta
+
+    def _join_tab_chunks(self, reader, tab_meta):
+        """_split_tab_chunks'ın tersi: parçaları okuyup tab verisini birleştir"""
+        tab_data = dict(tab_meta)
+
+        layers = tab_data.get('layers')
+        if isinstance(layers, dict):
+            layers = dict(layers)
+            layer_entries = []
+            for layer in layers.get('layers', []):
+                entry = dict(layer)
+                chunk_name = entry.pop('strokes_chunk', None)
+                entry['strokes'] = reader.read_json(chunk_name) if chunk_name else []
+                layer_entries.append(entry)
+            layers['layers'] = layer_entries
+
+            pdf_layers = layers.get('pdf_layers')
+            if isinstance(pdf_layers, dict) and 'page_chunks' in pdf_layers:
+                pdf_layers = dict(pdf_layers)
+                pdf_layers['page_states'] = {
+                    page_index: reader.read_json(chunk_name)
+                    for page_index, chunk_name in pdf_layers.pop('page_chunks').items()
+                }
+                layers['pdf_layers'] = pdf_layers
+            tab_data['layers'] = layers
+
+        page_layers = tab_data.get('pdf_page_layers')
+        if isinstance(page_layers, dict) and 'page_chunks' in page_layers:
+            tab_data['pdf_page_layers'] = {
+                page_index: reader.read_json(chunk_name)
+                for page_index, chunk_name in page_layers['page_chunks'].items()
+            }
+
+        if 'strokes_chunk' in tab_data:
+            tab_data['strokes'] = reader.read_json(tab_data.pop('strokes_chunk'))
+
+        return tab_data
+
     def _load_session_from_path(self, main_window, filename):
         """Verilen dosya yolundan oturumu yükle"""
-        # JSON dosyasından oku
+        if is_session_archive(filename):
+            return self._load_archive_session(main_window, filename)
+
+        # 1.x: tek parça JSON dosyası
         try:
             with open(filename, 'r', encoding='utf-8') as f:
                 session_data = json.load(f)
@@ -186,49 +492,107 @@ class SessionManager:
             )
             raise json.JSONDecodeError(message, decode_error.doc, decode_error.pos) from decode_error
 
+        self._prepare_session_load(main_window, session_data)
+
+        # Tab'ları yeniden oluştur
+        self._create_session_tabs(
+            main_window,
+            session_data.get('tabs', []),
+            session_data.get('active_tab', 0),
+            lambda tab_data: {'tab_data': tab_data, 'blobs': {}}
+        )
+
+        self._finish_session_load(main_window, session_data, filename)
+        return filename
+
+    def _load_archive_session(self, main_window, filename):
+        """2.x oturum: aktif tab hemen yüklenir, diğerleri kompakt hâlde bekler"""
+        reader = SessionArchiveReader(filename)
+        try:
+            manifest = reader.manifest
+            self._prepare_session_load(main_window, manifest)
+            self._create_session_tabs(
+                main_window,
+                manifest.get('tabs', []),
+                manifest.get('active_tab', 0),
+                lambda entry: self._read_tab_payload(reader, entry)
+            )
+        finally:
+            # Bekleyen sekmeler dosyaya bağlı kalmaz; üzerine kaydetme serbesttir
+            reader.close()
+
+        self._finish_session_load(main_window, manifest, filename)
+        return filename
+
+    def _create_session_tabs(self, main_window, entries, active_tab, read_payload):
+        """Aktif tab'ı hemen oluştur; diğerleri ilk açılışlarına kadar sadece
+        serileştirilmiş verileriyle (DrawingWidget olmadan) bekler"""
+        if not entries:
+            return
+        if not 0 <= active_tab < len(entries):
+            active_tab = 0
+        widget = self._create_session_tab(main_window, entries[active_tab].get('name'))
+        self.apply_tab_payload(main_window, widget, read_payload(entries[active_tab]))
+        for index, entry in enumerate(entries):
+            if index != active_tab:
+                tab_name = entry.get('name') or f'Çizim {index + 1}'
+                main_window.tab_manager.create_lazy_tab(tab_name, read_payload(entry), index)
+
+    def _prepare_session_load(self, main_window, session_data):
+        """Tab'ları temizle ve oturum ayarlarını uygula"""
         # Mevcut tab'ları temizle
         main_window.tab_manager.clear_all_tabs()
 
+        # Eski oturumdan kalan B-spline geometri önbelleğini bırak
+        try:
+            from bspline_tool import clear_bspline_geometry_cache
+            clear_bspline_geometry_cache()
+        except ImportError:
+            pass
+
         # Ayarları yükle
         if 'settings' in session_data:
             deserialized_settings = self.deserialize_settings(session_data['settings'])
             main_window.settings.load_from_dict(deserialized_settings)
 
-        # Tab'ları yeniden oluştur
-        for tab_data in session_data.get('tabs', []):
-            # Yeni tab oluştur
-            tab_name = tab_data.get('name', f'Çizim {main_window.tab_manager.get_tab_count() + 1}')
-            current_widget = main_window.tab_manager.create_new_tab(tab_name)
-
-            # Tab adını ayarla (create_new_tab zaten ayarlıyor ama emin olmak için)
-            tab_index = main_window.tab_manager.get_current_index()
-            main_window.tab_manager.set_tab_text(tab_index, tab_name)
-
-            if 'pdf_background' in tab_data and hasattr(current_widget, 'import_pdf_background_state'):
-                importer = self.pdf_importer or getattr(main_window, 'pdf_importer', None)
-                current_widget.import_pdf_background_state(tab_data['pdf_background'], importer)
-
-            # Stroke'ları veya katmanları yükle
-            if current_widget and 'layers' in tab_data:
-                self.deserialize_layers(current_widget, tab_data['layers'])
-            elif current_widget and 'strokes' in tab_data:
-                current_widget.strokes = self.deserialize_strokes(tab_data['strokes'])
-
-            # Arka plan ayarlarını yükle
-            if 'background_settings' in tab_data:
-                bg_settings = self.deserialize_background_settings(tab_data['background_settings'])
-                current_widget.set_background_settings(bg_settings)
-
-            if (
-                'pdf_page_layers' in tab_data
-                and hasattr(current_widget, 'import_pdf_page_states')
-            ):
-                page_states = self.deserialize_pdf_page_states(tab_data['pdf_page_layers'])
-                if page_states:
-                    current_widget.import_pdf_page_states(page_states)
+    def _create_session_tab(self, main_window, tab_name):
+        # Yeni tab oluştur
+        tab_name = tab_name or f'Çizim {main_window.tab_manager.get_tab_count() + 1}'
+        current_widget = main_window.tab_manager.create_new_tab(tab_name)
+
+        # Tab adını ayarla (create_new_tab zaten ayarlıyor ama emin olmak için)
+        tab_index = main_window.tab_manager.get_current_index()
+        main_window.tab_manager.set_tab_text(tab_index, tab_name)
+        return current_widget
+
+    def _apply_tab_data(self, main_window, current_widget, tab_data, blob_reader=None):
+        """Tab verisini (PDF, katmanlar, arka plan) widget'a uygula"""
+        if 'pdf_background' in tab_data and hasattr(current_widget, 'import_pdf_background_state'):
+            importer = self.pdf_importer or getattr(main_window, 'pdf_importer', None)
+            current_widget.import_pdf_background_state(tab_data['pdf_background'], importer)
+
+        # Stroke'ları veya katmanları yükle
+        if current_widget and 'layers' in tab_data:
+            self.deserialize_layers(current_widget, tab_data['layers'], blob_reader)
+        elif current_widget and 'strokes' in tab_data:
+            current_widget.strokes = self.deserialize_strokes(tab_data['strokes'], blob_reader)
+
+        # Arka plan ayarlarını yükle
+        if 'background_settings' in tab_data:
+            bg_settings = self.deserialize_background_settings(tab_data['background_settings'])
+            current_widget.set_background_settings(bg_settings)
+
+        if (
+            'pdf_page_layers' in tab_data
+            and hasattr(current_widget, 'import_pdf_page_states')
+        ):
+            page_states = self.deserialize_pdf_page_states(tab_data['pdf_page_layers'], blob_reader)
+            if page_states:
+                current_widget.import_pdf_page_states(page_states)
 
-            current_widget.update()
+        current_widget.update_contents()
 
+    def _finish_session_load(self, main_window, session_data, filename):
         # Aktif tab'ı ayarla
         active_tab = session_data.get('active_tab', 0)
         if 0 <= active_tab < main_window.tab_manager.get_tab_count():
@@ -251,10 +615,13 @@ class SessionManager:
         if hasattr(main_window, 'show_status_message'):
             file_name = os.path.basename(filename)
             main_window.show_status_message(f"Oturum yüklendi: {file_name}")
-        return filename
             
-    def serialize_strokes(self, strokes):
-        """Stroke'ları JSON'a dönüştürülebilir formata çevir"""
+    def serialize_strokes(self, strokes, blob_writer=None):
+        """Stroke'ları JSON'a dönüştürülebilir formata çevir
+
+        blob_writer verilirse serbest çizim noktaları (StrokePoints) ham
+        float32 blob olarak yazılır ve yerine blob referansı konur.
+        """
         from PyQt6.QtGui import QColor
         from PyQt6.QtCore import Qt, QPointF
         try:
@@ -270,11 +637,19 @@ class SessionManager:
                     # ImageStroke'u serialize et
                     stroke_copy = stroke.to_dict()
                 else:
-                    # Normal stroke verilerini kopyala
+                    # Normal stroke verilerini kopyala (saklı sınırlar dosyaya yazılmaz)
                     stroke_copy = stroke.copy()
+                    stroke_copy.pop(BOUNDS_KEY, None)
                 
                 # Points listesini özel olarak handle et
-                if 'points' in stroke_copy:
+                if isinstance(stroke_copy.get('points'), StrokePoints) and blob_writer is not None:
+                    stroke_copy['points'] = blob_writer(stroke_copy['points'])
+                elif isinstance(stroke_copy.get('points'), StrokePoints):
+                    # Dizi tabanlı noktalar: 1.x dosya formatı (x/y dict + pressures) korunur
+                    points = stroke_copy['points']
+                    stroke_copy['points'] = [{'x': x, 'y': y} for x, y in points.xy.tolist()]
+                    stroke_copy['pressures'] = points.pressures.tolist()
+                elif 'points' in stroke_copy:
                     points = stroke_copy['points']
                     serialized_points = []
                     
@@ -365,21 +740,14 @@ class SessionManager:
 
         return serialized
 
-    def serialize_layers(self, drawing_widget):
-        """DrawingWidget katmanlarını serileştir"""
-        if not hasattr(drawing_widget, 'layer_manager'):
-            return {
-                'order': [],
-                'active_layer': None,
-                'layers': []
-            }
-
-        state = drawing_widget.layer_manager.export_state()
-        serialized_state = self.serialize_layer_state(state)
+    def serialize_layers(self, tab_snapshot, blob_writer=None):
+        """snapshot_tab ile alınmış katmanları serileştir"""
+        state = tab_snapshot.get('layer_state')
+        serialized_state = self.serialize_layer_state(state, blob_writer)
 
         # Grup adlarını da tab verisine ekle
         try:
-            group_names = getattr(drawing_widget, 'group_names', {})
+            group_names = tab_snapshot.get('group_names')
             if isinstance(group_names, dict) and group_names:
                 # export_state içinden de gelebilir; öncelik DrawingWidget üstündeki runtime sözlükte
                 serialized_state['group_names'] = dict(group_names)
@@ -388,20 +756,15 @@ class SessionManager:
         except Exception:
             pass
 
-        if (
-            hasattr(drawing_widget, 'has_pdf_background')
-            and callable(getattr(drawing_widget, 'has_pdf_background'))
-            and drawing_widget.has_pdf_background()
-            and callable(getattr(drawing_widget, 'get_pdf_page_layer_states', None))
-        ):
-            pdf_payload = drawing_widget.get_pdf_page_layer_states()
-            serialized_pdf = self.serialize_pdf_layers_payload(pdf_payload)
+        pdf_payload = tab_snapshot.get('pdf_payload')
+        if pdf_payload:
+            serialized_pdf = self.serialize_pdf_layers_payload(pdf_payload, blob_writer)
             if serialized_pdf:
                 serialized_state['pdf_layers'] = serialized_pdf
 
         return serialized_state
 
-    def serialize_layer_state(self, state):
+    def serialize_layer_state(self, state, blob_writer=None):
         if not state:
             return {
                 'order': [],
@@ -423,7 +786,7 @@ class SessionManager:
                 'name': layer_data.get('name', layer_id),
                 'visible': layer_data.get('visible', True),
                 'locked': layer_data.get('locked', False),
-                'strokes': self.serialize_strokes(layer_data.get('strokes', []))
+                'strokes': self.serialize_strokes(layer_data.get('strokes', []), blob_writer)
             })
 
         return {
@@ -432,15 +795,15 @@ class SessionManager:
             'layers': serialized_layers
         }
 
-    def serialize_pdf_page_states(self, page_states):
+    def serialize_pdf_page_states(self, page_states, blob_writer=None):
         serialized = {}
         for page_index, state in page_states.items():
             if state is None:
                 continue
-            serialized[str(page_index)] = self.serialize_layer_state(state)
+            serialized[str(page_index)] = self.serialize_layer_state(state, blob_writer)
         return serialized
 
-    def serialize_pdf_layers_payload(self, payload):
+    def serialize_pdf_layers_payload(self, payload, blob_writer=None):
         if not payload or not isinstance(payload, dict):
             return None
 
@@ -452,7 +815,7 @@ class SessionManager:
             for page_index, state in page_states.items():
                 if state is None:
                     continue
-                serialized_pages[str(page_index)] = self.serialize_layer_state(state)
+                serialized_pages[str(page_index)] = self.serialize_layer_state(state, blob_writer)
             serialized_payload['page_states'] = serialized_pages
         else:
             serialized_payload['page_states'] = {}
@@ -478,8 +841,8 @@ class SessionManager:
 
         return serialized_payload
         
-    def deserialize_strokes(self, serialized_strokes):
-        """JSON'dan stroke'ları geri yükle"""
+    def deserialize_strokes(self, serialized_strokes, blob_reader=None):
+        """JSON'dan stroke'ları geri yükle (blob referanslarını blob_reader çözer)"""
         from PyQt6.QtGui import QColor
         from PyQt6.QtCore import Qt
         try:
@@ -512,6 +875,15 @@ class SessionManager:
                     if 'line_style' in stroke and isinstance(stroke['line_style'], int):
                         stroke['line_style'] = Qt.PenStyle(stroke['line_style'])
                         
+                    # 2.x: noktalar ayrı float32 blob'da
+                    points = stroke.get('points')
+                    if isinstance(points, dict) and BLOB_KEY in points and blob_reader is not None:
+                        stroke['points'] = blob_reader(points)
+
+                    # Serbest çizim noktalarını dizi tabanlı kapsayıcıya al
+                    if stroke.get('type') == 'freehand' and 'points' in stroke:
+                        ensure_stroke_points(stroke)
+
                     if np is not None:
                         is_bspline = (
                             stroke.get('type') == 'bspline'
@@ -547,13 +919,14 @@ class SessionManager:
             
         return strokes
 
-    def deserialize_layers(self, drawing_widget, serialized_layers):
+    def deserialize_layers(self, drawing_widget, serialized_layers, blob_reader=None):
         """Serileştirilmiş katmanları DrawingWidget'a yükle"""
         if not hasattr(drawing_widget, 'layer_manager'):
             return
 
-        state = self.deserialize_layer_state(serialized_layers)
-        drawing_widget.layer_manager.import_state(state)
+        state = self.deserialize_layer_state(serialized_layers, blob_reader)
+        # Yeni oluşturulmuş stroke'lar; tekrar kopyalamaya gerek yok
+        drawing_widget.layer_manager.import_state(state, copy_strokes=False)
 
         # Grup adlarını geri yükle
         try:
@@ -567,14 +940,14 @@ class SessionManager:
             and 'pdf_layers' in serialized_layers
             and hasattr(drawing_widget, 'import_pdf_page_states')
         ):
-            pdf_payload = self.deserialize_pdf_layers_payload(serialized_layers.get('pdf_layers'))
+            pdf_payload = self.deserialize_pdf_layers_payload(serialized_layers.get('pdf_layers'), blob_reader)
             if pdf_payload is not None and (
                 not hasattr(drawing_widget, 'has_pdf_background')
                 or drawing_widget.has_pdf_background()
             ):
                 drawing_widget.import_pdf_page_states(pdf_payload)
 
-    def deserialize_layer_state(self, serialized_layers):
+    def deserialize_layer_state(self, serialized_layers, blob_reader=None):
         if not serialized_layers:
             return {
                 'active_layer': None,
@@ -598,7 +971,7 @@ class SessionManager:
                 'name': layer.get('name', layer_id),
                 'visible': layer.get('visible', True),
                 'locked': layer.get('locked', False),
-                'strokes': self.deserialize_strokes(layer.get('strokes', []))
+                'strokes': self.deserialize_strokes(layer.get('strokes', []), blob_reader)
             }
             if layer_id not in ordered_ids:
                 ordered_ids.append(layer_id)
@@ -606,7 +979,7 @@ class SessionManager:
         state['layer_order'] = ordered_ids
         return state
 
-    def deserialize_pdf_page_states(self, serialized_page_states):
+    def deserialize_pdf_page_states(self, serialized_page_states, blob_reader=None):
         page_states = {}
         for key, value in serialized_page_states.items():
             try:
@@ -614,12 +987,12 @@ class SessionManager:
             except (TypeError, ValueError):
                 continue
 
-            state = self.deserialize_layer_state(value)
+            state = self.deserialize_layer_state(value, blob_reader)
             page_states[index] = state
 
         return page_states
 
-    def deserialize_pdf_layers_payload(self, payload):
+    def deserialize_pdf_layers_payload(self, payload, blob_reader=None):
         if not payload or not isinstance(payload, dict):
             return None
 
@@ -632,7 +1005,7 @@ class SessionManager:
                     index = int(key)
                 except (TypeError, ValueError):
                     continue
-                state = self.deserialize_layer_state(value)
+                state = self.deserialize_layer_state(value, blob_reader)
                 deserialized_states[index] = state
 
         result = {'page_states': deserialized_states}
@@ -676,14 +1049,16 @@ class SessionManager:
         except Exception:
             return []
             
-    def auto_save_session(self, main_window):
-        """Otomatik oturum kaydetme"""
+    def auto_save_session(self, main_window, blocking=False):
+        """Otomatik oturum kaydetme
+
+        Sürmekte veya sırada bekleyen bir kayıt varsa bu tur atlanır; kapanışta
+        blocking=True ile bekleyen kayıtlar bitirilip son durum yazılır.
+        """
+        if not blocking and self.is_saving():
+            return None
         try:
-            auto_save_path = os.path.join(self.sessions_dir, "auto_save.sdm")
-            result = self.save_session(main_window, auto_save_path)
-            if result and hasattr(main_window, 'show_status_message'):
-                main_window.show_status_message("Otomatik kayıt tamamlandı")
-            return result
+            return self.save_session(main_window, self.get_auto_save_path(), blocking=blocking)
         except Exception as e:
             if hasattr(main_window, 'show_status_message'):
                 main_window.show_status_message(f"Otomatik kayıt başarısız: {str(e)}")
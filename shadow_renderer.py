@@ -1,12 +1,79 @@
 import math
+from collections import OrderedDict
 
-from PyQt6.QtCore import QSize, QRectF, Qt, QPointF
+from PyQt6.QtCore import QSize, QRectF, Qt, QPointF, QByteArray, QDataStream, QIODevice
 from PyQt6.QtGui import QPixmap, QPainter, QBrush, QColor, QPainterPath, QPainterPathStroker
-from PyQt6.QtWidgets import QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect
+
+from image_filters import blur_shadow_image, blur_spread
+
+
+class ShadowPixmapCache:
+    """Render edilmiş gölge pixmap'leri için bellek sınırlı LRU önbellek.
+
+    Anahtar; şekil geometrisi (konumdan bağımsız), blur, boyut, renk, offset,
+    kalite ve zoom kademesinden oluşur. Opaklık çizim anında uygulandığı için
+    pixmap içeriğini etkilemez ve anahtara girmez.
+    """
+
+    DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024  # 64 MB
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes if max_bytes is not None else self.DEFAULT_MEMORY_BUDGET
+        self._entries = OrderedDict()  # key -> (değer, byte)
+        self._bytes = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, pixmap):
+        """Değeri ekle; pixmap boyutu bellek hesabında kullanılır"""
+        size = pixmap.width() * pixmap.height() * 4 if pixmap is not None else 0
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def memory_usage(self):
+        return self._bytes
+
 
 class ShadowRenderer:
     """Tüm şekiller için ortak gölge rendering sınıfı"""
-    
+
+    # Gölge pixmap'leri ekran çözünürlüğüne yakın üretilir; zoom 2'nin
+    # kuvvetlerine yuvarlanır ki küçük zoom değişimleri önbelleği bozmasın
+    MIN_ZOOM_BUCKET = 0.25
+    MAX_ZOOM_BUCKET = 2.0
+
+    _cache = ShadowPixmapCache()
+
+    @staticmethod
+    def clear_cache():
+        """Gölge pixmap önbelleğini boşalt"""
+        ShadowRenderer._cache.clear()
+
+    @staticmethod
+    def get_cache_memory_usage():
+        return ShadowRenderer._cache.memory_usage
+
     @staticmethod
     def draw_shape_shadow(painter, shape_type, shape_rect_or_points, stroke_data):
         """Ana gölge çizim methodu - rect veya points array alabilir"""
@@ -190,70 +257,38 @@ class ShadowRenderer:
             )
             pixmap_points = None
         
-        # Gölge pixmap oluştur
-        shadow_pixmap = QPixmap(shadow_pixmap_size)
-        shadow_pixmap.fill(Qt.GlobalColor.transparent)
-        
-        shadow_painter = QPainter(shadow_pixmap)
-        shadow_painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Gölge şeklini çiz
-        shadow_painter.setBrush(QBrush(shadow_color))
-        shadow_painter.setPen(Qt.PenStyle.NoPen)
-        
-        # Corner radius kontrolü
         corner_radius = stroke_data.get('corner_radius', 0)
-        
+        zoom_bucket = ShadowRenderer._zoom_bucket(painter)
+
+        # Konumdan bağımsız geometri anahtarı
         if pixmap_points is not None:
-            # Döndürülmüş şekil - points kullan
-            shadow_path = QPainterPath()
-            if shape_type == 'circle':
-                # Circle için center ve radius hesapla
-                center_x = sum(p.x() for p in pixmap_points) / len(pixmap_points)
-                center_y = sum(p.y() for p in pixmap_points) / len(pixmap_points)
-                radius = ((pixmap_points[1].x() - pixmap_points[0].x())**2 + (pixmap_points[1].y() - pixmap_points[0].y())**2)**0.5 / 2
-                shadow_path.addEllipse(center_x - radius - shadow_size, center_y - radius - shadow_size, 
-                                     (radius + shadow_size)*2, (radius + shadow_size)*2)
-            else:  # rectangle
-                if corner_radius > 0:
-                    # Döndürülmüş yuvarlak kenar rectangle için path oluştur
-                    shadow_path = ShadowRenderer._create_rounded_rectangle_shadow_path(pixmap_points, corner_radius, shadow_size)
-                else:
-                    # Normal köşeli rectangle
-                    shadow_path.moveTo(pixmap_points[0])
-                    for i in range(1, len(pixmap_points)):
-                        shadow_path.lineTo(pixmap_points[i])
-                    shadow_path.closeSubpath()
-            
-            shadow_painter.drawPath(shadow_path)
+            geometry_key = tuple((round(p.x(), 3), round(p.y(), 3)) for p in pixmap_points)
         else:
-            # Normal QRectF
-            shape_rect_in_pixmap = QRectF(
-                margin,
-                margin,
-                bounding_rect.width() + shadow_size * 2,
-                bounding_rect.height() + shadow_size * 2
-            )
-            
-            if shape_type == 'circle':
-                shadow_painter.drawEllipse(shape_rect_in_pixmap)
-            else:  # rectangle
-                if corner_radius > 0:
-                    # Yuvarlak kenar rectangle
-                    shadow_painter.drawRoundedRect(shape_rect_in_pixmap, corner_radius, corner_radius)
-                else:
-                    # Normal köşeli rectangle
-                    shadow_painter.drawRect(shape_rect_in_pixmap)
-        
-        shadow_painter.end()
-        
+            geometry_key = (round(bounding_rect.width(), 3), round(bounding_rect.height(), 3))
+
+        cache_key = (
+            'shape', shape_type, geometry_key, inner_shadow, blur_radius, shadow_size,
+            shadow_color.rgba(), shadow_offset_x, shadow_offset_y, corner_radius,
+            shadow_quality, zoom_bucket
+        )
+        final_pixmap = ShadowRenderer._cache.get(cache_key)
+
+        if final_pixmap is None:
+            if inner_shadow:
+                # İç gölge için özel işlem
+                final_pixmap = ShadowRenderer._create_inner_shadow_pixmap(
+                    None, bounding_rect, shape_type, margin, blur_radius,
+                    shadow_color, shadow_offset_x, shadow_offset_y, shadow_size,
+                    pixmap_points, corner_radius, zoom_bucket)
+            else:
+                shadow_pixmap = ShadowRenderer._create_shape_shadow_pixmap(
+                    shadow_pixmap_size, bounding_rect, shape_type, margin, shadow_color,
+                    shadow_size, pixmap_points, corner_radius, zoom_bucket)
+                # Dış gölge için blur uygula
+                final_pixmap = ShadowRenderer._apply_blur_to_pixmap(shadow_pixmap, blur_radius, shadow_color)
+            ShadowRenderer._cache.put(cache_key, final_pixmap, final_pixmap)
+
         if inner_shadow:
-            # İç gölge için özel işlem
-            inner_shadow_pixmap = ShadowRenderer._create_inner_shadow_pixmap(
-                shadow_pixmap, bounding_rect, shape_type, margin, blur_radius, 
-                shadow_color, shadow_offset_x, shadow_offset_y, shadow_size, 
-                pixmap_points if pixmap_points is not None else None, corner_radius)
-            
             painter.save()
             painter.setOpacity(shadow_opacity)
             
@@ -298,24 +333,76 @@ class ShadowRenderer:
                 shadow_pos_x = int(bounding_rect.x())
                 shadow_pos_y = int(bounding_rect.y())
             
-            painter.drawPixmap(shadow_pos_x, shadow_pos_y, inner_shadow_pixmap)
+            painter.drawPixmap(shadow_pos_x, shadow_pos_y, final_pixmap)
             painter.restore()
         else:
-            # Dış gölge için blur uygula
-            if blur_radius > 0:
-                blurred_shadow = ShadowRenderer._apply_blur_to_pixmap(shadow_pixmap, blur_radius)
-            else:
-                blurred_shadow = shadow_pixmap
-            
             painter.save()
             painter.setOpacity(shadow_opacity)
             
             shadow_pos_x = int(bounding_rect.x() + shadow_offset_x - margin)
             shadow_pos_y = int(bounding_rect.y() + shadow_offset_y - margin)
             
-            painter.drawPixmap(shadow_pos_x, shadow_pos_y, blurred_shadow)
+            painter.drawPixmap(shadow_pos_x, shadow_pos_y, final_pixmap)
             painter.restore()
 
+    @staticmethod
+    def _create_shape_shadow_pixmap(pixmap_size, bounding_rect, shape_type, margin, shadow_color,
+                                    shadow_size, pixmap_points, corner_radius, scale=1.0):
+        """Dış gölge şeklini (blur'suz) şeffaf pixmap'e çiz"""
+        shadow_pixmap = ShadowRenderer._create_shadow_canvas(
+            pixmap_size.width(), pixmap_size.height(), scale)
+        
+        shadow_painter = QPainter(shadow_pixmap)
+        shadow_painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # Gölge şeklini çiz
+        shadow_painter.setBrush(QBrush(shadow_color))
+        shadow_painter.setPen(Qt.PenStyle.NoPen)
+        
+        if pixmap_points is not None:
+            # Döndürülmüş şekil - points kullan
+            shadow_path = QPainterPath()
+            if shape_type == 'circle':
+                # Circle için center ve radius hesapla
+                center_x = sum(p.x() for p in pixmap_points) / len(pixmap_points)
+                center_y = sum(p.y() for p in pixmap_points) / len(pixmap_points)
+                radius = ((pixmap_points[1].x() - pixmap_points[0].x())**2 + (pixmap_points[1].y() - pixmap_points[0].y())**2)**0.5 / 2
+                shadow_path.addEllipse(center_x - radius - shadow_size, center_y - radius - shadow_size, 
+                                     (radius + shadow_size)*2, (radius + shadow_size)*2)
+            else:  # rectangle
+                if corner_radius > 0:
+                    # Döndürülmüş yuvarlak kenar rectangle için path oluştur
+                    shadow_path = ShadowRenderer._create_rounded_rectangle_shadow_path(pixmap_points, corner_radius, shadow_size)
+                else:
+                    # Normal köşeli rectangle
+                    shadow_path.moveTo(pixmap_points[0])
+                    for i in range(1, len(pixmap_points)):
+                        shadow_path.lineTo(pixmap_points[i])
+                    shadow_path.closeSubpath()
+            
+            shadow_painter.drawPath(shadow_path)
+        else:
+            # Normal QRectF
+            shape_rect_in_pixmap = QRectF(
+                margin,
+                margin,
+                bounding_rect.width() + shadow_size * 2,
+                bounding_rect.height() + shadow_size * 2
+            )
+            
+            if shape_type == 'circle':
+                shadow_painter.drawEllipse(shape_rect_in_pixmap)
+            else:  # rectangle
+                if corner_radius > 0:
+                    # Yuvarlak kenar rectangle
+                    shadow_painter.drawRoundedRect(shape_rect_in_pixmap, corner_radius, corner_radius)
+                else:
+                    # Normal köşeli rectangle
+                    shadow_painter.drawRect(shape_rect_in_pixmap)
+        
+        shadow_painter.end()
+        return shadow_pixmap
+
     @staticmethod
     def _draw_path_shadow(painter, path_or_points, stroke_data, shadow_blur):
         """QPainterPath tabanlı gölge çizimi"""
@@ -339,10 +426,10 @@ class ShadowRenderer:
         base_width = ShadowRenderer._get_path_width(stroke_data)
         expanded_width = max(0.1, base_width + shadow_size * 2)
 
-        base_path = ShadowRenderer._create_stroke_area_path(path, base_width, stroke_data)
-        shadow_path = ShadowRenderer._create_stroke_area_path(path, expanded_width, stroke_data)
-
         if shadow_blur <= 0:
+            base_path = ShadowRenderer._create_stroke_area_path(path, base_width, stroke_data)
+            shadow_path = ShadowRenderer._create_stroke_area_path(path, expanded_width, stroke_data)
+
             painter.save()
             painter.setOpacity(shadow_opacity)
             painter.setBrush(QBrush(shadow_color))
@@ -360,31 +447,45 @@ class ShadowRenderer:
             return
 
         blur_radius = ShadowRenderer._get_adjusted_blur_radius(shadow_blur, shadow_quality)
+        zoom_bucket = ShadowRenderer._zoom_bucket(painter)
 
-        bounding_rect = shadow_path.boundingRect()
-        margin = max(25, blur_radius * 2, shadow_size * 2, int(base_width) + 5)
-        shadow_pixmap_size = QSize(
-            int(bounding_rect.width() + margin * 2 + abs(shadow_offset_x)),
-            int(bounding_rect.height() + margin * 2 + abs(shadow_offset_y))
+        # Path konumdan bağımsız anahtarlanır; sonuç path'in sol üst köşesine göre saklanır
+        origin = path.boundingRect().topLeft()
+        cache_key = (
+            'path', ShadowRenderer._path_signature(path, origin), base_width, shadow_size,
+            ShadowRenderer._stroke_style_key(stroke_data), inner_shadow, blur_radius,
+            shadow_color.rgba(), shadow_offset_x, shadow_offset_y, shadow_quality, zoom_bucket
         )
+        cached = ShadowRenderer._cache.get(cache_key)
 
-        shadow_pixmap = QPixmap(shadow_pixmap_size)
-        shadow_pixmap.fill(Qt.GlobalColor.transparent)
+        if cached is None:
+            shadow_path = ShadowRenderer._create_stroke_area_path(path, expanded_width, stroke_data)
+            bounding_rect = shadow_path.boundingRect()
+            margin = max(25, blur_radius * 2, shadow_size * 2, int(base_width) + 5)
+            shadow_pixmap_size = QSize(
+                int(bounding_rect.width() + margin * 2 + abs(shadow_offset_x)),
+                int(bounding_rect.height() + margin * 2 + abs(shadow_offset_y))
+            )
 
-        shadow_painter = QPainter(shadow_pixmap)
-        shadow_painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        shadow_painter.setBrush(QBrush(shadow_color))
-        shadow_painter.setPen(Qt.PenStyle.NoPen)
+            shadow_pixmap = ShadowRenderer._create_shadow_canvas(
+                shadow_pixmap_size.width(), shadow_pixmap_size.height(), zoom_bucket)
 
-        path_in_pixmap = QPainterPath(shadow_path)
-        path_in_pixmap.translate(-bounding_rect.x() + margin, -bounding_rect.y() + margin)
-        shadow_painter.drawPath(path_in_pixmap)
-        shadow_painter.end()
+            shadow_painter = QPainter(shadow_pixmap)
+            shadow_painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            shadow_painter.setBrush(QBrush(shadow_color))
+            shadow_painter.setPen(Qt.PenStyle.NoPen)
 
-        if blur_radius > 0:
-            blurred_shadow = ShadowRenderer._apply_blur_to_pixmap(shadow_pixmap, blur_radius)
-        else:
-            blurred_shadow = shadow_pixmap
+            path_in_pixmap = QPainterPath(shadow_path)
+            path_in_pixmap.translate(-bounding_rect.x() + margin, -bounding_rect.y() + margin)
+            shadow_painter.drawPath(path_in_pixmap)
+            shadow_painter.end()
+
+            blurred_shadow = ShadowRenderer._apply_blur_to_pixmap(shadow_pixmap, blur_radius, shadow_color)
+            cached = (blurred_shadow, bounding_rect.translated(-origin), margin)
+            ShadowRenderer._cache.put(cache_key, cached, blurred_shadow)
+
+        blurred_shadow, relative_rect, margin = cached
+        bounding_rect = relative_rect.translated(origin)
 
         painter.save()
         painter.setOpacity(shadow_opacity)
@@ -393,11 +494,54 @@ class ShadowRenderer:
         draw_y = bounding_rect.y() + ( -shadow_offset_y if inner_shadow else shadow_offset_y) - margin
 
         if inner_shadow:
+            base_path = ShadowRenderer._create_stroke_area_path(path, base_width, stroke_data)
             painter.setClipPath(base_path)
 
         painter.drawPixmap(int(draw_x), int(draw_y), blurred_shadow)
         painter.restore()
 
+    @staticmethod
+    def _path_signature(path, origin):
+        """Path'in konumdan bağımsız içerik özeti"""
+        relative_path = path.translated(-origin.x(), -origin.y())
+        buffer = QByteArray()
+        stream = QDataStream(buffer, QIODevice.OpenModeFlag.WriteOnly)
+        stream << relative_path
+        return hash(bytes(buffer))
+
+    @staticmethod
+    def _stroke_style_key(stroke_data):
+        """Cap/join/miter ayarlarını hashlenebilir hale getir"""
+        return tuple(
+            getattr(value, 'value', value) for value in (
+                stroke_data.get('cap_style', Qt.PenCapStyle.RoundCap),
+                stroke_data.get('join_style', Qt.PenJoinStyle.RoundJoin),
+                stroke_data.get('miter_limit', 4),
+            )
+        )
+
+    @staticmethod
+    def _zoom_bucket(painter):
+        """Painter ölçeğini 2'nin kuvvetine yuvarla (gölge pixmap çözünürlüğü)"""
+        transform = painter.worldTransform()
+        scale = math.hypot(transform.m11(), transform.m12())
+        if not math.isfinite(scale) or scale <= 0:
+            return 1.0
+        bucket = 2.0 ** round(math.log2(scale))
+        return min(ShadowRenderer.MAX_ZOOM_BUCKET, max(ShadowRenderer.MIN_ZOOM_BUCKET, bucket))
+
+    @staticmethod
+    def _create_shadow_canvas(width, height, scale=1.0):
+        """Mantıksal boyutu width x height olan şeffaf pixmap
+
+        scale != 1 ise pixmap fiziksel olarak ölçeklenir ve devicePixelRatio
+        ayarlanır; üzerine çizim ve drawPixmap mantıksal koordinatlarla çalışır.
+        """
+        pixmap = QPixmap(max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+        pixmap.setDevicePixelRatio(scale)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        return pixmap
+
     @staticmethod
     def _ensure_path(path_or_points):
         """QPainterPath veya nokta listesini path'e dönüştür"""
@@ -477,6 +621,60 @@ class ShadowRenderer:
 
         return stroker.createStroke(path)
     
+    @staticmethod
+    def get_shadow_extent(stroke_data, path_shadow):
+        """Dış gölgenin şekil sınırına göre kapladığı alan: (pay, dx, dy)
+
+        Gölge, şeklin geometrik sınırının (dx, dy) kadar kaydırılıp her yönde
+        pay kadar büyütülmüş hali içinde kalır. path_shadow True ise gölge
+        çizgi alanından üretilir (serbest çizim, çizgi, B-spline).
+        Gölge yoksa veya iç gölgeyse (şekle kırpılır) None döner.
+        """
+        if not stroke_data.get('has_shadow', False) or stroke_data.get('inner_shadow', False):
+            return None
+        try:
+            shadow_size = max(0.0, float(stroke_data.get('shadow_size', 0) or 0))
+            shadow_blur = float(stroke_data.get('shadow_blur', 10) or 0)
+            offset_x = float(stroke_data.get('shadow_offset_x', 5) or 0)
+            offset_y = float(stroke_data.get('shadow_offset_y', 5) or 0)
+        except (TypeError, ValueError):
+            return None
+
+        if path_shadow:
+            grow = max(0.1, ShadowRenderer._get_path_width(stroke_data) + shadow_size * 2) / 2.0
+            grow *= ShadowRenderer._stroke_outline_factor(stroke_data)
+        else:
+            # Dikdörtgen gölgesi sağ/alt kenarda 2 * shadow_size büyür
+            grow = shadow_size * 2
+
+        if shadow_blur > 0:
+            radius = ShadowRenderer._get_adjusted_blur_radius(
+                shadow_blur, stroke_data.get('shadow_quality', 'medium'))
+            # Blur, zoom kovasının piksel ızgarasında uygulanır; en geniş yayılım alınır
+            bucket = ShadowRenderer.MIN_ZOOM_BUCKET
+            spread = 0.0
+            while bucket <= ShadowRenderer.MAX_ZOOM_BUCKET:
+                spread = max(spread, blur_spread(radius * bucket) / bucket)
+                bucket *= 2
+            # Pixmap tamsayı konuma çizilir ve boyutu yuvarlanır
+            grow += spread + 2.0
+        return grow, offset_x, offset_y
+
+    @staticmethod
+    def _stroke_outline_factor(stroke_data):
+        """Kalem kenarının yarım kalınlığa oranla en fazla ne kadar taşabileceği"""
+        factor = 1.0
+        cap_style = getattr(stroke_data.get('cap_style'), 'value', stroke_data.get('cap_style'))
+        join_style = getattr(stroke_data.get('join_style'), 'value', stroke_data.get('join_style'))
+        if cap_style == Qt.PenCapStyle.SquareCap.value:
+            factor = math.sqrt(2.0)
+        if join_style in (Qt.PenJoinStyle.MiterJoin.value, Qt.PenJoinStyle.SvgMiterJoin.value):
+            try:
+                factor = max(factor, float(stroke_data.get('miter_limit', 4)))
+            except (TypeError, ValueError):
+                factor = max(factor, 4.0)
+        return factor
+
     @staticmethod
     def _get_adjusted_blur_radius(shadow_blur, shadow_quality):
         """Performans ayarına göre blur yarıçapını ayarla"""
@@ -490,44 +688,23 @@ class ShadowRenderer:
             return int(base_blur * 1.2)
     
     @staticmethod
-    def _apply_blur_to_pixmap(pixmap, radius):
-        """Pixmap'e blur efekti uygula"""
+    def _apply_blur_to_pixmap(pixmap, radius, color):
+        """Tek renkli gölge pixmap'ine blur uygula (NumPy ayrık kutu bulanıklığı)"""
         if radius <= 0:
             return pixmap
-            
-        # QGraphicsScene kullanarak blur
-        scene = QGraphicsScene()
-        item = QGraphicsPixmapItem(pixmap)
-        scene.addItem(item)
-        
-        # Blur efekti
-        blur_effect = QGraphicsBlurEffect()
-        blur_effect.setBlurRadius(radius)
-        item.setGraphicsEffect(blur_effect)
-        
-        # Yeni pixmap
-        blurred_pixmap = QPixmap(pixmap.size())
-        blurred_pixmap.fill(Qt.GlobalColor.transparent)
-        
-        painter = QPainter(blurred_pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        scene.render(painter)
-        painter.end()
-        
+
+        # Yarıçap mantıksal piksel cinsinden; yüksek çözünürlüklü pixmap'te ölçeklenir
+        scale = pixmap.devicePixelRatio()
+        blurred_pixmap = QPixmap.fromImage(blur_shadow_image(pixmap.toImage(), radius * scale, color))
+        blurred_pixmap.setDevicePixelRatio(scale)
         return blurred_pixmap
     
     @staticmethod
-    def _create_inner_shadow_pixmap(base_shadow_pixmap, shape_rect, shape_type, margin, blur_radius, shadow_color, offset_x, offset_y, shadow_size, points, corner_radius):
+    def _create_inner_shadow_pixmap(base_shadow_pixmap, shape_rect, shape_type, margin, blur_radius, shadow_color, offset_x, offset_y, shadow_size, points, corner_radius, scale=1.0):
         """İç gölge için özel pixmap"""
         
-        if points is not None:
-            # Döndürülmüş şekil için büyük pixmap kullan
-            inner_shadow = QPixmap(int(shape_rect.width()), int(shape_rect.height()))
-        else:
-            # Normal şekil için standard boyut
-            inner_shadow = QPixmap(int(shape_rect.width()), int(shape_rect.height()))
-        
-        inner_shadow.fill(Qt.GlobalColor.transparent)
+        inner_shadow = ShadowRenderer._create_shadow_canvas(
+            int(shape_rect.width()), int(shape_rect.height()), scale)
         
         inner_painter = QPainter(inner_shadow)
         inner_painter.setRenderHint(QPainter.RenderHint.Antialiasing)
@@ -690,10 +867,7 @@ class ShadowRenderer:
         inner_painter.end()
         
         # Blur uygula
-        if blur_radius > 0:
-            return ShadowRenderer._apply_blur_to_pixmap(inner_shadow, blur_radius)
-        else:
-            return inner_shadow
+        return ShadowRenderer._apply_blur_to_pixmap(inner_shadow, blur_radius, shadow_color)
 
     @staticmethod
     def _is_axis_aligned_rectangle(points, tolerance=1e-3):
@@ -0,0 +1,166 @@
+import math
+
+from PyQt6.QtCore import QRectF
+
+from stroke_handler import StrokeHandler
+
+
+class StrokeSpatialIndex:
+    """Bir katmanın stroke'ları için düzgün ızgara (uniform grid) uzamsal indeksi.
+
+    Her stroke, çizim sınırları (kalınlık + gölge payı dahil) ile kesiştiği
+    hücrelere yazılır. Sorgular stroke'ların katman listesindeki index'lerini
+    çizim sırasına göre döndürür. İndekslenen liste nesnesi veya uzunluğu
+    değişirse indeks bir sonraki sorguda yeniden kurulur; yerinde dönüştürülen
+    stroke'lar update_strokes ile tek tek, listede yerinde yapılan
+    ekleme/silmeler splice ile güncellenir.
+    """
+
+    CELL_SIZE = 256.0
+    MAX_CELLS_PER_STROKE = 256  # Daha büyük stroke'lar her sorguda aday sayılır
+
+    def __init__(self, cell_size=None):
+        self.cell_size = float(cell_size or self.CELL_SIZE)
+        self._strokes = None
+        self._length = -1
+        self._valid = False
+        self._entries = {}  # id(stroke) -> [stroke, index, rect, cells]
+        self._cells = {}  # (cx, cy) -> set(id(stroke))
+        self._oversized = set()  # Sınırı çok büyük ya da hesaplanamayan stroke'lar
+
+    # ------------------------------------------------------------------
+    # Bakım
+    # ------------------------------------------------------------------
+    def invalidate(self):
+        """İndeksi geçersiz kıl; bir sonraki sorguda yeniden kurulur"""
+        self._valid = False
+
+    def is_synced(self, strokes):
+        return self._valid and strokes is self._strokes and len(strokes) == self._length
+
+    def rebuild(self, strokes):
+        """Verilen stroke listesi için indeksi baştan kur"""
+        self._entries = {}
+        self._cells = {}
+        self._oversized = set()
+        for index, stroke_data in enumerate(strokes):
+            self._insert_entry(index, stroke_data)
+        self._strokes = strokes
+        self._length = len(strokes)
+        self._valid = True
+
+    def update_strokes(self, strokes, changed_strokes):
+        """Yerinde değiştirilen stroke'ların sınırlarını yenile"""
+        if not self.is_synced(strokes):
+            return
+        for stroke_data in changed_strokes:
+            entry = self._entries.get(id(stroke_data))
+            if entry is None or entry[0] is not stroke_data:
+                # Listede olmayan bir stroke - güvenli tarafta kal
+                self._valid = False
+                return
+            index = entry[1]
+            self._remove_entry(id(stroke_data))
+            self._insert_entry(index, stroke_data)
+
+    def splice(self, strokes, start, removed, inserted):
+        """strokes[start:start + len(removed)] inserted ile değiştirildikten sonra güncelle
+
+        Sonraki stroke'ların sadece index'leri kaydırılır; sınırları yeniden
+        hesaplanmaz.
+        """
+        expected = self._length - len(removed) + len(inserted)
+        if not (self._valid and strokes is self._strokes and len(strokes) == expected):
+            self._valid = False
+            return
+        for stroke_data in removed:
+            entry = self._entries.get(id(stroke_data))
+            if entry is None or entry[0] is not stroke_data or entry[1] >= start + len(removed):
+                self._valid = False
+                return
+            self._remove_entry(id(stroke_data))
+        delta = len(inserted) - len(removed)
+        if delta:
+            end = start + len(removed)
+            for entry in self._entries.values():
+                if entry[1] >= end:
+                    entry[1] += delta
+        for offset, stroke_data in enumerate(inserted):
+            self._insert_entry(start + offset, stroke_data)
+        self._length = len(strokes)
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        x0 = math.floor(rect.left() / size)
+        x1 = math.floor(rect.right() / size)
+        y0 = math.floor(rect.top() / size)
+        y1 = math.floor(rect.bottom() / size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.MAX_CELLS_PER_STROKE:
+            return None
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def _insert_entry(self, index, stroke_data):
+        key = id(stroke_data)
+        rect = StrokeHandler.get_stroke_render_bounds(stroke_data)
+        cells = self._cells_for(rect) if rect is not None else None
+        if cells is None:
+            self._oversized.add(key)
+            cells = ()
+        else:
+            for cell in cells:
+                bucket = self._cells.get(cell)
+                if bucket is None:
+                    bucket = self._cells[cell] = set()
+                bucket.add(key)
+        self._entries[key] = [stroke_data, index, rect, cells]
+
+    def _remove_entry(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._oversized.discard(key)
+        for cell in entry[3]:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+
+    # ------------------------------------------------------------------
+    # Sorgular
+    # ------------------------------------------------------------------
+    def query_rect(self, strokes, rect):
+        """rect ile kesişen stroke'ların index'lerini (artan sırada) döndür"""
+        if not self.is_synced(strokes):
+            self.rebuild(strokes)
+
+        rect = QRectF(rect).normalized()
+        if rect.width() <= 0 or rect.height() <= 0:
+            rect = rect.adjusted(-0.5, -0.5, 0.5, 0.5)
+
+        cells = self._cells_for(rect)
+        if cells is None:
+            candidates = self._entries.keys()
+        else:
+            candidates = set(self._oversized)
+            for cell in cells:
+                bucket = self._cells.get(cell)
+                if bucket:
+                    candidates.update(bucket)
+
+        result = []
+        for key in candidates:
+            stroke_data, index, stroke_rect, _ = self._entries[key]
+            if stroke_rect is None or stroke_rect.intersects(rect):
+                if index >= len(strokes) or strokes[index] is not stroke_data:
+                    # Liste elemanı yerinde değiştirilmiş - yeniden kur ve tekrar sorgula
+                    self.rebuild(strokes)
+                    return self.query_rect(strokes, rect)
+                result.append(index)
+        result.sort()
+        return result
+
+    def query_point(self, strokes, pos, radius=0.0):
+        """pos noktasına radius mesafesinde olabilecek stroke'ların index'leri"""
+        r = max(0.5, float(radius))
+        return self.query_rect(strokes, QRectF(pos.x() - r, pos.y() - r, 2 * r, 2 * r))
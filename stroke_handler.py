@@ -1,7 +1,20 @@
 from PyQt6.QtCore import QPointF, QRectF
 from PyQt6.QtGui import QPen, QBrush
 from PyQt6.QtCore import Qt
+import math
 import numpy as np
+from stroke_points import BOUNDS_KEY, StrokePoints, ensure_stroke_points
+from shadow_renderer import ShadowRenderer
+from advanced_brush import SimpleBrush
+
+# Kenar yumuşatmanın kalem dışına taşırdığı pay (sahne birimi)
+_AA_MARGIN = 1.0
+# Çizim alanını etkileyen stil alanları
+_BOUNDS_STYLE_KEYS = (
+    'width', 'line_width', 'brush_mode', 'advanced_style', 'cap_style', 'join_style',
+    'miter_limit', 'has_shadow', 'inner_shadow', 'shadow_blur', 'shadow_size',
+    'shadow_offset_x', 'shadow_offset_y', 'shadow_quality', 'shadow_path_width',
+)
 
 def ensure_qpointf(point):
     """Point'i QPointF'e dönüştür (dict'ten veya zaten QPointF'ten)"""
@@ -13,6 +26,14 @@ def ensure_qpointf(point):
         # Başka bir format, deneme
         return QPointF(point.x(), point.y())
 
+def _invalidate_bspline_geometry(stroke_data):
+    """B-spline noktaları değişmeden önce önbellekteki path'i düşür"""
+    try:
+        from bspline_tool import invalidate_bspline_geometry
+        invalidate_bspline_geometry(stroke_data)
+    except ImportError:
+        pass
+
 class StrokeHandler:
     """Tüm stroke tiplerini modüler şekilde işleyen base sınıf"""
     
@@ -37,11 +58,7 @@ class StrokeHandler:
             return stroke_data['control_points']
         elif stroke_data['type'] == 'freehand':
             # Point'leri (x, y) tuple'larına çevir
-            points = []
-            for p in stroke_data['points']:
-                point_qf = ensure_qpointf(p)
-                points.append((point_qf.x(), point_qf.y()))
-            return points
+            return list(map(tuple, ensure_stroke_points(stroke_data).xy.tolist()))
         elif stroke_data['type'] == 'line':
             return [stroke_data['start_point'], stroke_data['end_point']]
         elif stroke_data['type'] == 'rectangle':
@@ -64,8 +81,12 @@ class StrokeHandler:
         if stroke_data['type'] == 'bspline':
             stroke_data['control_points'] = points
         elif stroke_data['type'] == 'freehand':
-            # (x, y) tuple'larını QPointF'lere çevir
-            stroke_data['points'] = [QPointF(p[0], p[1]) for p in points]
+            # (x, y) tuple'larından StrokePoints oluştur (aynı uzunluktaysa basınçları koru)
+            old_points = ensure_stroke_points(stroke_data)
+            new_points = StrokePoints.from_points(points)
+            if len(new_points) == len(old_points):
+                new_points.pressures[:] = old_points.pressures
+            stroke_data['points'] = new_points
         elif stroke_data['type'] == 'line':
             if len(points) >= 2:
                 stroke_data['start_point'] = points[0]
@@ -94,6 +115,7 @@ class StrokeHandler:
     def move_stroke(stroke_data, delta_x, delta_y):
         """Stroke'u belirtilen miktarda taşı"""
         if stroke_data['type'] == 'bspline':
+            _invalidate_bspline_geometry(stroke_data)
             # B-spline için hem edit_points hem control_points taşınmalı
             if 'edit_points' in stroke_data:
                 edit_points = stroke_data['edit_points']
@@ -107,10 +129,7 @@ class StrokeHandler:
                     control_points[i][1] += delta_y
                 
         elif stroke_data['type'] == 'freehand':
-            points = stroke_data['points']
-            for i in range(len(points)):
-                point_qf = ensure_qpointf(points[i])
-                points[i] = QPointF(point_qf.x() + delta_x, point_qf.y() + delta_y)
+            ensure_stroke_points(stroke_data).translate(delta_x, delta_y)
                 
         elif stroke_data['type'] == 'line':
             start = stroke_data['start_point']
@@ -151,6 +170,7 @@ class StrokeHandler:
                 shadow_backup[key] = stroke_data[key]
         
         if stroke_data['type'] == 'bspline':
+            _invalidate_bspline_geometry(stroke_data)
             control_points = stroke_data['control_points']
             for i in range(len(control_points)):
                 # Merkeze göre relatif pozisyon
@@ -166,19 +186,7 @@ class StrokeHandler:
                 control_points[i][1] = new_y + center_y
                 
         elif stroke_data['type'] == 'freehand':
-            points = stroke_data['points']
-            for i in range(len(points)):
-                # Merkeze göre relatif pozisyon
-                point_qf = ensure_qpointf(points[i])
-                rel_x = point_qf.x() - center_x
-                rel_y = point_qf.y() - center_y
-                
-                # Döndürme matrisi uygula
-                new_x = rel_x * cos_a - rel_y * sin_a
-                new_y = rel_x * sin_a + rel_y * cos_a
-                
-                # Merkezi geri ekle ve kaydet
-                points[i] = QPointF(new_x + center_x, new_y + center_y)
+            ensure_stroke_points(stroke_data).rotate(center_x, center_y, angle_rad)
                 
         elif stroke_data['type'] == 'line':
             # Başlangıç noktası
@@ -237,6 +245,7 @@ class StrokeHandler:
     def scale_stroke(stroke_data, center_x, center_y, scale_x, scale_y):
         """Stroke'u belirtilen merkez etrafında boyutlandır"""
         if stroke_data['type'] == 'bspline':
+            _invalidate_bspline_geometry(stroke_data)
             control_points = stroke_data['control_points']
             for i in range(len(control_points)):
                 # Merkeze göre relatif pozisyon
@@ -252,19 +261,7 @@ class StrokeHandler:
                 control_points[i][1] = new_y + center_y
                 
         elif stroke_data['type'] == 'freehand':
-            points = stroke_data['points']
-            for i in range(len(points)):
-                # Merkeze göre relatif pozisyon
-                point_qf = ensure_qpointf(points[i])
-                rel_x = point_qf.x() - center_x
-                rel_y = point_qf.y() - center_y
-                
-                # Ölçekleme uygula
-                new_x = rel_x * scale_x
-                new_y = rel_y * scale_y
-                
-                # Merkezi geri ekle ve kaydet
-                points[i] = QPointF(new_x + center_x, new_y + center_y)
+            ensure_stroke_points(stroke_data).scale(center_x, center_y, scale_x, scale_y)
                 
         elif stroke_data['type'] == 'line':
             # Başlangıç noktası
@@ -321,21 +318,265 @@ class StrokeHandler:
     
     @staticmethod
     def get_stroke_bounds(stroke_data):
-        """Stroke'un bounding box'ını hesapla"""
-        points = StrokeHandler.get_stroke_points(stroke_data)
-        if not points:
+        """Stroke'un geometrik bounding box'ı (kalınlık ve gölge hariç)
+
+        Sınır stroke üzerinde saklanır (bkz. get_stroke_render_bounds).
+        """
+        bounds = StrokeHandler._stored_bounds(stroke_data)
+        return None if bounds is None else QRectF(bounds[0])
+
+    @staticmethod
+    def get_strokes_bounds(strokes, indices):
+        """Verilen index'lerdeki stroke'ların sınırlarının birleşimi (yoksa None)"""
+        min_x = min_y = max_x = max_y = None
+        for index in indices:
+            if not 0 <= index < len(strokes):
+                continue
+            bounds = StrokeHandler.get_stroke_bounds(strokes[index])
+            if bounds is None:
+                continue
+            # QRectF.united sıfır boyutlu sınırları yok saydığı için elle birleştir
+            if min_x is None:
+                min_x, min_y = bounds.left(), bounds.top()
+                max_x, max_y = bounds.right(), bounds.bottom()
+            else:
+                min_x = min(min_x, bounds.left())
+                min_y = min(min_y, bounds.top())
+                max_x = max(max_x, bounds.right())
+                max_y = max(max_y, bounds.bottom())
+        if min_x is None:
             return None
-            
-        min_x = min(p[0] for p in points)
-        max_x = max(p[0] for p in points)
-        min_y = min(p[1] for p in points)
-        max_y = max(p[1] for p in points)
-        
         return QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
     
+    @staticmethod
+    def get_stroke_render_bounds(stroke_data):
+        """Stroke'un ekranda kapladığı alan (kalem yarı kalınlığı + gölge dahil)
+
+        Geometrik ve çizim sınırları ilk istekte hesaplanıp stroke'ta
+        (BOUNDS_KEY) saklanır. Kayıt, sınırı belirleyen alanların imzasını
+        taşır; dönüşüm veya stil değişikliğinden sonra imza tutmazsa yeniden
+        hesaplanır.
+        """
+        try:
+            bounds = StrokeHandler._stored_bounds(stroke_data)
+        except Exception:
+            return None
+        return None if bounds is None else QRectF(bounds[1])
+
+    @staticmethod
+    def update_stroke_bounds(stroke_data):
+        """Saklı sınırları yeniden hesapla (stroke yerinde değiştirildikten sonra)"""
+        try:
+            StrokeHandler._stored_bounds(stroke_data, refresh=True)
+        except Exception:
+            pass
+
+    @staticmethod
+    def get_render_padding(stroke_data):
+        """Geometrik sınırlara her yönde eklenecek çizim payı (kalınlık + gölge)
+
+        Araç önizlemeleri gibi tek bir pay gereken yerler içindir; gölge
+        kayması da her yöne eklenir.
+        """
+        pad = StrokeHandler._pen_half_width(stroke_data) + _AA_MARGIN
+        shadow_pad = 0.0
+        for path_shadow in (False, True):
+            extent = ShadowRenderer.get_shadow_extent(stroke_data, path_shadow)
+            if extent is not None:
+                grow, offset_x, offset_y = extent
+                shadow_pad = max(shadow_pad, grow + max(abs(offset_x), abs(offset_y)))
+        return max(pad, shadow_pad)
+
+    @staticmethod
+    def _stored_bounds(stroke_data, refresh=False):
+        """(geometri, çizim alanı) sınırlarını saklı kayıttan al veya hesaplayıp sakla"""
+        is_image = hasattr(stroke_data, 'stroke_type') and stroke_data.stroke_type == 'image'
+        if not is_image and not isinstance(stroke_data, dict):
+            return None
+        try:
+            signature = StrokeHandler._bounds_signature(stroke_data, is_image)
+        except Exception:
+            signature = None
+        if signature is None:
+            # İmzası çıkarılamayan (eski formatlı) stroke'lar saklanmadan hesaplanır
+            return StrokeHandler._compute_bounds(stroke_data, is_image)
+
+        if is_image:
+            entry = getattr(stroke_data, BOUNDS_KEY, None)
+        else:
+            entry = stroke_data.get(BOUNDS_KEY)
+        if not refresh and entry is not None and entry[0] == signature:
+            return entry[1]
+
+        bounds = StrokeHandler._compute_bounds(stroke_data, is_image)
+        if bounds is not None:
+            if is_image:
+                setattr(stroke_data, BOUNDS_KEY, (signature, bounds))
+            else:
+                stroke_data[BOUNDS_KEY] = (signature, bounds)
+        return bounds
+
+    @staticmethod
+    def _bounds_signature(stroke_data, is_image):
+        """Sınırı belirleyen alanların hashlenebilir özeti (desteklenmeyen tipte None)"""
+        if is_image:
+            return ('image', stroke_data.position.x(), stroke_data.position.y(),
+                    stroke_data.size.x(), stroke_data.size.y(), stroke_data.rotation,
+                    stroke_data.has_border, stroke_data.border_width,
+                    stroke_data.has_shadow, stroke_data.inner_shadow, stroke_data.shadow_blur,
+                    stroke_data.shadow_size, stroke_data.shadow_offset_x, stroke_data.shadow_offset_y)
+
+        stroke_type = stroke_data.get('type')
+        style = tuple(getattr(value, 'value', value) for value in
+                      (stroke_data.get(key) for key in _BOUNDS_STYLE_KEYS))
+        if stroke_type == 'freehand':
+            points = stroke_data.get('points')
+            if not isinstance(points, StrokePoints):
+                return None
+            # StrokePoints nesnesi kimliğiyle karşılaştırılır; sayaç yerinde değişiklikleri yakalar
+            return (stroke_type, points, len(points), points.version) + style
+        if stroke_type == 'line':
+            start = stroke_data['start_point']
+            end = stroke_data['end_point']
+            return (stroke_type, float(start[0]), float(start[1]),
+                    float(end[0]), float(end[1])) + style
+        if stroke_type == 'rectangle':
+            corners = tuple((float(p[0]), float(p[1])) for p in StrokeHandler.get_stroke_points(stroke_data))
+            return (stroke_type, corners) + style
+        if stroke_type == 'circle':
+            center = stroke_data['center']
+            return (stroke_type, float(center[0]), float(center[1]),
+                    float(stroke_data['radius'])) + style
+        if stroke_type == 'bspline':
+            from bspline_tool import _geometry_key
+            return (stroke_type, _geometry_key(stroke_data),
+                    bool(stroke_data.get('show_control_points', False))) + style
+        return None
+
+    @staticmethod
+    def _compute_bounds(stroke_data, is_image):
+        """(geometri, çizim alanı) QRectF çiftini hesapla"""
+        if is_image:
+            return StrokeHandler._compute_image_bounds(stroke_data)
+        if 'type' not in stroke_data:
+            return None
+        stroke_type = stroke_data['type']
+        if stroke_type == 'freehand':
+            points = stroke_data.get('points')
+            if not isinstance(points, StrokePoints):
+                # Eski format (ör. şekil kütüphanesi) - stroke'u değiştirmeden hesapla
+                points = StrokePoints.from_points(points or [], stroke_data.get('pressures'))
+            geometry = points.bounding_rect()
+        elif stroke_type == 'circle':
+            center = stroke_data['center']
+            radius = abs(float(stroke_data['radius']))
+            geometry = QRectF(center[0] - radius, center[1] - radius, 2 * radius, 2 * radius)
+        else:
+            points = StrokeHandler.get_stroke_points(stroke_data)
+            if not points:
+                return None
+            min_x = min(p[0] for p in points)
+            max_x = max(p[0] for p in points)
+            min_y = min(p[1] for p in points)
+            max_y = max(p[1] for p in points)
+            geometry = QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
+        if geometry is None:
+            return None
+
+        # Kalemin izlediği eğri: serbest çizimde yumuşatılmış path, B-spline'da örneklenmiş eğri
+        curve = geometry
+        half = StrokeHandler._pen_half_width(stroke_data)
+        if stroke_type == 'freehand':
+            if stroke_data.get('brush_mode', 'simple') == 'advanced':
+                style = stroke_data.get('advanced_style', 'solid')
+                if style == 'zigzag':
+                    half += 3.0  # Zigzag genliği
+                elif style == 'double':
+                    width = float(stroke_data.get('width', 2) or 0)
+                    half = max(1.0, width * 0.7) / 2.0 + 2.0  # İki paralel çizgi
+            elif len(points) >= 2:
+                curve = SimpleBrush.stroke_path(points, float(stroke_data.get('width', 2) or 0)).boundingRect()
+        elif stroke_type == 'bspline':
+            from bspline_tool import get_bspline_geometry
+            bspline = get_bspline_geometry(stroke_data)
+            if bspline is not None:
+                curve = bspline[0].boundingRect()
+        # Gölge serbest çizimde ham nokta path'inden, B-spline'da eğriden üretilir
+        shadow_base = curve if stroke_type == 'bspline' else geometry
+
+        render = StrokeHandler._inflate(curve, half + _AA_MARGIN)
+        if stroke_type == 'bspline' and stroke_data.get('show_control_points', False):
+            # Kontrol noktası tutamakları (yarıçap 5, kalem 2)
+            render = render.united(StrokeHandler._inflate(geometry, 6.0 + _AA_MARGIN))
+        extent = ShadowRenderer.get_shadow_extent(
+            stroke_data, stroke_type in ('freehand', 'line', 'bspline'))
+        if extent is not None:
+            grow, offset_x, offset_y = extent
+            shadow = StrokeHandler._inflate(shadow_base, grow + _AA_MARGIN).translated(offset_x, offset_y)
+            render = render.united(shadow)
+        return geometry, render
+
+    @staticmethod
+    def _compute_image_bounds(image):
+        """Resim: konum/boyut sınırı ve döndürülmüş resim + kenarlık + gölge alanı"""
+        geometry = image.get_bounds()
+        width, height = image.size.x(), image.size.y()
+        # Yerel (döndürme öncesi) koordinatlarda çizilen alan
+        local = QRectF(0, 0, width, height)
+        if image.has_border:
+            border = float(image.border_width or 0) / 2.0
+            local = local.adjusted(-border, -border, border, border)
+        if image.has_shadow and not image.inner_shadow:
+            # _render_outer_shadow ile aynı gölge dikdörtgeni
+            offset_x, offset_y = image.shadow_offset_x, image.shadow_offset_y
+            shadow_width, shadow_height = width, height
+            if image.shadow_size > 0:
+                enhanced_size = image.shadow_size * 2
+                offset_x -= enhanced_size
+                offset_y -= enhanced_size
+                shadow_width += 2 * enhanced_size
+                shadow_height += 2 * enhanced_size
+            if image.shadow_offset_x == 0 and image.shadow_offset_y == 0 and image.shadow_blur <= 1:
+                offset_y += 2
+            local = local.united(QRectF(offset_x, offset_y, shadow_width, shadow_height))
+
+        center_x, center_y = width / 2.0, height / 2.0
+        angle = math.radians(image.rotation or 0)
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        xs = []
+        ys = []
+        for x, y in ((local.left(), local.top()), (local.right(), local.top()),
+                     (local.left(), local.bottom()), (local.right(), local.bottom())):
+            rel_x, rel_y = x - center_x, y - center_y
+            xs.append(rel_x * cos_a - rel_y * sin_a + center_x)
+            ys.append(rel_x * sin_a + rel_y * cos_a + center_y)
+        render = QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+        render = render.translated(image.position.x(), image.position.y())
+        return geometry, StrokeHandler._inflate(render, _AA_MARGIN)
+
+    @staticmethod
+    def _pen_half_width(stroke_data):
+        """Çerçeve kaleminin yarı kalınlığı (çizim araçları en az 1 birim kalem kullanır)"""
+        try:
+            width = float(stroke_data.get('line_width', stroke_data.get('width', 2)) or 0)
+        except (TypeError, ValueError):
+            width = 2.0
+        return max(1.0, width) / 2.0
+
+    @staticmethod
+    def _inflate(rect, pad):
+        """Dikdörtgeni her yönde pad kadar büyüt"""
+        return rect.adjusted(-pad, -pad, pad, pad)
+
     @staticmethod
     def get_stroke_center(stroke_data):
         """Stroke'un merkezini hesapla"""
+        if isinstance(stroke_data, dict) and stroke_data.get('type') == 'freehand':
+            xy = ensure_stroke_points(stroke_data).xy
+            if not len(xy):
+                return None
+            center_x, center_y = xy.mean(axis=0, dtype=np.float64).tolist()
+            return QPointF(center_x, center_y)
         points = StrokeHandler.get_stroke_points(stroke_data)
         if not points:
             return None
@@ -384,11 +625,15 @@ class StrokeHandler:
             return False
             
         elif stroke_data['type'] == 'freehand':
-            # Serbest çizim için noktalara yakınlık
-            points = stroke_data['points']
-            for point in points:
-                point_qf = ensure_qpointf(point)
-                if (pos - point_qf).manhattanLength() < tolerance:
+            # Serbest çizim için noktalara yakınlık (manhattan mesafesi)
+            points = ensure_stroke_points(stroke_data)
+            bounds = points.bounding_rect()
+            if bounds is None or not bounds.adjusted(-tolerance, -tolerance, tolerance, tolerance).contains(pos):
+                return False
+            xy = points.xy
+            if len(xy):
+                distances = np.abs(xy[:, 0] - pos.x()) + np.abs(xy[:, 1] - pos.y())
+                if distances.min() < tolerance:
                     return True
                     
         elif stroke_data['type'] == 'line':
@@ -458,11 +703,12 @@ class StrokeHandler:
                     return True
                     
         elif stroke_data['type'] == 'freehand':
-            points = stroke_data['points']
-            for point in points:
-                point_qf = ensure_qpointf(point)
-                if rect.contains(point_qf):
-                    return True
+            xy = ensure_stroke_points(stroke_data).xy
+            area = QRectF(rect).normalized()
+            inside = ((xy[:, 0] >= area.left()) & (xy[:, 0] <= area.right())
+                      & (xy[:, 1] >= area.top()) & (xy[:, 1] <= area.bottom()))
+            if inside.any():
+                return True
                     
         elif stroke_data['type'] == 'line':
             start = QPointF(stroke_data['start_point'][0], stroke_data['start_point'][1])
@@ -504,12 +750,11 @@ class StrokeHandler:
                 painter.drawPoint(QPointF(cp[0], cp[1]))
                 
         elif stroke_data['type'] == 'freehand':
-            points = stroke_data['points']
+            points = ensure_stroke_points(stroke_data)
             pen.setWidth(max(2, size // 2))
             painter.setPen(pen)
-            for i, point in enumerate(points):
-                if i % 5 == 0:  # Performans için her 5. noktayı çiz
-                    painter.drawPoint(ensure_qpointf(point))
+            # Performans için her 5. noktayı çiz
+            painter.drawPoints(points[::5].to_polygon())
                     
         elif stroke_data['type'] == 'line':
             # Çizginin uç noktalarını vurgula
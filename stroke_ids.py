@@ -0,0 +1,186 @@
+import uuid
+
+
+STROKE_ID_KEY = 'stroke_id'  # Sözlük stroke'larda kimlik anahtarı (ImageStroke'ta öznitelik)
+
+
+def new_stroke_id():
+    """Oturumlar arasında da benzersiz yeni stroke kimliği"""
+    return uuid.uuid4().hex
+
+
+def get_stroke_id(stroke):
+    """Stroke'un kalıcı kimliği (atanmamışsa None)"""
+    if isinstance(stroke, dict):
+        return stroke.get(STROKE_ID_KEY)
+    return getattr(stroke, STROKE_ID_KEY, None)
+
+
+def set_stroke_id(stroke, stroke_id):
+    if isinstance(stroke, dict):
+        stroke[STROKE_ID_KEY] = stroke_id
+    else:
+        try:
+            setattr(stroke, STROKE_ID_KEY, stroke_id)
+        except Exception:
+            pass
+
+
+def ensure_stroke_id(stroke):
+    """Stroke'un kimliğini döndür; yoksa yeni kimlik ata"""
+    stroke_id = get_stroke_id(stroke)
+    if stroke_id is None:
+        stroke_id = new_stroke_id()
+        set_stroke_id(stroke, stroke_id)
+    return stroke_id
+
+
+def get_stroke_group_id(stroke):
+    if isinstance(stroke, dict):
+        return stroke.get('group_id')
+    return getattr(stroke, 'group_id', None)
+
+
+def get_stroke_parent_group_id(stroke):
+    """İç içe gruplarda dış grubun kimliği"""
+    if isinstance(stroke, dict):
+        return stroke.get('parent_group_id')
+    return getattr(stroke, 'parent_group_id', None)
+
+
+def _group_keys(stroke):
+    """Stroke'un grup haritasındaki anahtarları: (alan, grup kimliği)"""
+    keys = []
+    group_id = get_stroke_group_id(stroke)
+    if group_id:
+        keys.append(('group_id', group_id))
+    parent_group_id = get_stroke_parent_group_id(stroke)
+    if parent_group_id:
+        keys.append(('parent_group_id', parent_group_id))
+    return keys
+
+
+class StrokeIdIndex:
+    """Bir katmanın stroke'ları için kimlik -> konum ve grup -> üye indeksi.
+
+    Kimliği olmayan stroke'lara indekslenirken kimlik atanır; kopyalanarak
+    aynı kimlikle eklenen stroke'lar (yapıştırma, çoğaltma) yeni kimlik alır.
+    StrokeSpatialIndex gibi listede yerinde yapılan ekleme/silmeler splice ile
+    güncellenir; liste nesnesi veya uzunluğu başka yoldan değişirse indeks bir
+    sonraki sorguda yeniden kurulur. Grup haritası (group_id ve iç içe
+    gruplar için parent_group_id) yerinde değiştirilebildiği için
+    invalidate_groups ile ayrıca geçersiz kılınır.
+    """
+
+    def __init__(self):
+        self._strokes = None
+        self._length = -1
+        self._valid = False
+        self._positions = {}  # stroke_id -> index
+        self._groups = None  # (alan, grup kimliği) -> set(stroke_id), ilk sorguda kurulur
+
+    # ------------------------------------------------------------------
+    # Bakım
+    # ------------------------------------------------------------------
+    def invalidate(self):
+        self._valid = False
+
+    def invalidate_groups(self):
+        self._groups = None
+
+    def is_synced(self, strokes):
+        return self._valid and strokes is self._strokes and len(strokes) == self._length
+
+    def sync(self, strokes):
+        if not self.is_synced(strokes):
+            self.rebuild(strokes)
+
+    def rebuild(self, strokes, is_taken=None):
+        """Verilen stroke listesi için indeksi baştan kur"""
+        self._positions = {}
+        self._groups = None
+        for index, stroke_data in enumerate(strokes):
+            self._positions[self._claim_id(stroke_data, is_taken)] = index
+        self._strokes = strokes
+        self._length = len(strokes)
+        self._valid = True
+
+    def splice(self, strokes, start, removed, inserted, is_taken=None):
+        """strokes[start:start + len(removed)] inserted ile değiştirildikten sonra güncelle
+
+        is_taken verilirse başka katmanlarda kullanılan kimlikler de yeni
+        kimlikle değiştirilir. Sadece kaydırılan kuyruğun konumları yazılır.
+        """
+        expected = self._length - len(removed) + len(inserted)
+        if not (self._valid and strokes is self._strokes and len(strokes) == expected):
+            self.rebuild(strokes, is_taken)
+            return
+        for stroke_data in removed:
+            stroke_id = get_stroke_id(stroke_data)
+            self._positions.pop(stroke_id, None)
+            if self._groups is not None:
+                for key in _group_keys(stroke_data):
+                    self._discard_group_member(key, stroke_id)
+        for offset, stroke_data in enumerate(inserted):
+            stroke_id = self._claim_id(stroke_data, is_taken)
+            self._positions[stroke_id] = start + offset
+            if self._groups is not None:
+                for key in _group_keys(stroke_data):
+                    self._groups.setdefault(key, set()).add(stroke_id)
+        if len(inserted) != len(removed):
+            for index in range(start + len(inserted), len(strokes)):
+                self._positions[get_stroke_id(strokes[index])] = index
+        self._length = len(strokes)
+
+    def _claim_id(self, stroke_data, is_taken=None):
+        stroke_id = get_stroke_id(stroke_data)
+        if (stroke_id is None or stroke_id in self._positions
+                or (is_taken is not None and is_taken(stroke_id))):
+            stroke_id = new_stroke_id()
+            set_stroke_id(stroke_data, stroke_id)
+        return stroke_id
+
+    def _discard_group_member(self, key, stroke_id):
+        members = self._groups.get(key)
+        if members is not None:
+            members.discard(stroke_id)
+            if not members:
+                del self._groups[key]
+
+    # ------------------------------------------------------------------
+    # Sorgular
+    # ------------------------------------------------------------------
+    def contains(self, stroke_id):
+        """Kimlik indekste var mı (indeks eşitlenmemişse False)"""
+        return self._valid and stroke_id in self._positions
+
+    def index_of(self, strokes, stroke_id):
+        """Kimliğin listedeki index'i (yoksa None)"""
+        self.sync(strokes)
+        index = self._positions.get(stroke_id)
+        if index is None:
+            return None
+        if get_stroke_id(strokes[index]) != stroke_id:
+            # Kimlik yerinde değiştirilmiş - indeksi yeniden kur
+            self.rebuild(strokes)
+            index = self._positions.get(stroke_id)
+        return index
+
+    def indices_of(self, strokes, stroke_ids):
+        """Bulunan kimliklerin index'leri (artan sırada)"""
+        indices = (self.index_of(strokes, stroke_id) for stroke_id in stroke_ids)
+        return sorted(index for index in indices if index is not None)
+
+    def group_members(self, strokes, group_id, parent=False):
+        """group_id'ye (parent ise parent_group_id'ye) sahip stroke'ların index'leri (artan sırada)"""
+        if not group_id:
+            return []
+        self.sync(strokes)
+        if self._groups is None:
+            groups = {}
+            for stroke_data in strokes:
+                for key in _group_keys(stroke_data):
+                    groups.setdefault(key, set()).add(get_stroke_id(stroke_data))
+            self._groups = groups
+        field_name = 'parent_group_id' if parent else 'group_id'
+        return self.indices_of(strokes, self._groups.get((field_name, group_id), ()))
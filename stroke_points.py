@@ -0,0 +1,427 @@
+import numpy as np
+from PyQt6.QtCore import QPointF, QRectF
+from PyQt6.QtGui import QPolygonF, QPainterPath, QColor
+
+
+# Sözlük stroke'larda saklı sınır kaydının anahtarı (ImageStroke'ta öznitelik):
+# (imza, (geometri, çizim alanı)). Bellekte kalır, dosyaya yazılmaz.
+BOUNDS_KEY = '_bounds'
+
+
+def rdp_importance(xy, min_tolerance=0.0):
+    """Ramer–Douglas–Peucker önem değerleri.
+
+    Her nokta için RDP'nin o noktayı koruduğu en büyük toleransı döndürür;
+    t toleranslı sadeleştirme importance > t olan noktalardır, bu yüzden tek
+    geçişte tüm seviyeler elde edilir. Uç noktalar her zaman korunur (inf),
+    min_tolerance altındaki bölünmeler izlenmez (0).
+    """
+    count = len(xy)
+    importance = np.zeros(count, dtype=np.float32)
+    if count == 0:
+        return importance
+    importance[0] = importance[-1] = np.inf
+    points = np.asarray(xy, dtype=np.float64)
+    # Bölünmeler derinlik sırasıyla, aynı derinliktekiler birlikte (vektörel) işlenir
+    firsts = np.array([0])
+    lasts = np.array([count - 1])
+    caps = np.array([np.inf])
+    while len(firsts):
+        open_ = lasts - firsts >= 2
+        firsts, lasts, caps = firsts[open_], lasts[open_], caps[open_]
+        if not len(firsts):
+            break
+        sizes = lasts - firsts - 1
+        segment = np.repeat(np.arange(len(firsts)), sizes)
+        offsets = np.cumsum(sizes) - sizes
+        inner = firsts[segment] + 1 + (np.arange(len(segment)) - offsets[segment])
+
+        start = points[firsts][segment]
+        axis = (points[lasts] - points[firsts])[segment]
+        rel = points[inner] - start
+        length_sq = np.einsum('ij,ij->i', axis, axis)
+        # Segmente (doğruya değil) uzaklık: geri dönen kıvrımlar da korunur
+        t = np.clip(np.einsum('ij,ij->i', rel, axis) / np.where(length_sq > 0, length_sq, 1.0), 0.0, 1.0)
+        rel = rel - t[:, None] * axis
+        dist = np.sqrt(np.einsum('ij,ij->i', rel, rel))
+
+        peak = np.maximum.reduceat(dist, offsets)
+        # Her segmentte en uzak ilk nokta bölme noktasıdır
+        hits = np.flatnonzero(dist == peak[segment])
+        _, first_hit = np.unique(segment[hits], return_index=True)
+        splits = inner[hits[first_hit]]
+
+        keep = peak > min_tolerance
+        # Alt bölünmedeki nokta, üst bölünmesinden daha uzun yaşayamaz
+        values = np.minimum(peak, caps)[keep]
+        splits = splits[keep]
+        importance[splits] = values
+        firsts, lasts = np.concatenate((firsts[keep], splits)), np.concatenate((splits, lasts[keep]))
+        caps = np.concatenate((values, values))
+    return importance
+
+
+class StrokePoints:
+    """Serbest çizim noktaları için NumPy tabanlı kompakt kapsayıcı.
+
+    Noktalar tek bir float32 (N, 3) dizisinde x, y, basınç olarak tutulur
+    (nokta başına 12 byte). Eski kodla uyumluluk için QPointF dizisi gibi
+    davranır: len(), indeksleme, dilimleme, iterasyon ve append desteklenir.
+    Çizim ve dönüşümler için to_polygon/to_path ve vektörel
+    translate/rotate/scale kullanılmalıdır.
+
+    Sınır kutusu ilk bounding_rect çağrısında hesaplanıp saklanır; append,
+    translate ve scale saklı sınırı yerinde günceller, rotate ve tek nokta
+    ataması geçersiz kılar. xy görünümüne doğrudan yazan kod
+    invalidate_bounds çağırmalıdır.
+
+    Her yerinde değişiklik version sayacını artırır; noktalardan türetilen
+    önbellekler (ör. stroke çizim sınırları) bununla doğrulanır.
+
+    snapshot, aynı tamponu paylaşan salt okunur bir kopya döndürür (kopya
+    maliyeti yok). Paylaşılan tampon ilk yerinde değişiklikte (translate,
+    rotate, scale, tek nokta ataması) kopyalanır; append/extend anlık
+    görüntünün gördüğü aralığa yazmadığı için kopya gerektirmez. xy
+    görünümüne doğrudan yazan kod önce detach çağırmalıdır.
+
+    Uzak zoom için simplified, LOD_TOLERANCES seviyelerinde RDP ile
+    sadeleştirilmiş noktaları döndürür. Önem değerleri ilk istekte bir kez
+    hesaplanır; öteleme ve döndürme bunları korur, diğer değişiklikler siler.
+    """
+
+    __slots__ = ('_data', '_length', '_bounds', '_lod', '_shared', '_version')
+
+    # Sadeleştirme seviyeleri (sahne birimi cinsinden RDP toleransı)
+    LOD_TOLERANCES = (0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+    LOD_MIN_POINTS = 8  # Daha kısa çizimler sadeleştirilmez
+
+    def __init__(self, data=None, capacity=0):
+        if data is None:
+            self._data = np.zeros((max(int(capacity), 4), 3), dtype=np.float32)
+            self._length = 0
+        else:
+            array = np.array(data, dtype=np.float32, copy=True).reshape(-1, 3)
+            self._data = array
+            self._length = len(array)
+        self._bounds = None  # float32 [min_x, min_y, max_x, max_y] veya None
+        self._lod = None  # (RDP önem dizisi, {tolerans: index dizisi}) veya None
+        self._shared = False  # Tampon bir snapshot ile paylaşılıyor mu
+        self._version = 0  # Yerinde değişiklik sayacı
+
+    @classmethod
+    def from_points(cls, points, pressures=None):
+        """QPointF / dict / (x, y) listesinden oluştur"""
+        if isinstance(points, StrokePoints):
+            result = points.copy()
+            if pressures is not None and len(pressures) == len(result):
+                result.pressures[:] = pressures
+            return result
+
+        coords = []
+        for point in points:
+            if isinstance(point, QPointF):
+                coords.append((point.x(), point.y()))
+            elif isinstance(point, dict):
+                coords.append((point['x'], point['y']))
+            elif hasattr(point, 'x') and hasattr(point, 'y'):
+                coords.append((point.x(), point.y()))
+            else:
+                coords.append((point[0], point[1]))
+
+        array = np.ones((len(coords), 3), dtype=np.float32)
+        if coords:
+            array[:, :2] = coords
+            if pressures is not None and len(pressures) == len(coords):
+                array[:, 2] = pressures
+        return cls(array)
+
+    # ------------------------------------------------------------------
+    # NumPy görünümleri (kopyasız)
+    # ------------------------------------------------------------------
+    @property
+    def array(self):
+        """(N, 3) x/y/basınç görünümü"""
+        return self._data[:self._length]
+
+    @property
+    def xy(self):
+        """(N, 2) koordinat görünümü"""
+        return self._data[:self._length, :2]
+
+    @property
+    def pressures(self):
+        """(N,) basınç görünümü"""
+        return self._data[:self._length, 2]
+
+    @property
+    def version(self):
+        """Yerinde değişiklik sayacı"""
+        return self._version
+
+    @property
+    def nbytes(self):
+        return self._length * 3 * 4
+
+    # ------------------------------------------------------------------
+    # Liste uyumluluğu
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return StrokePoints(self.array[index])
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("StrokePoints index out of range")
+        x, y = self._data[index, :2].tolist()
+        return QPointF(x, y)
+
+    def __setitem__(self, index, point):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("StrokePoints index out of range")
+        self.detach()
+        if isinstance(point, dict):
+            self._data[index, 0] = point['x']
+            self._data[index, 1] = point['y']
+        else:
+            self._data[index, 0] = point.x()
+            self._data[index, 1] = point.y()
+        self._bounds = None
+        self._lod = None
+        self._version += 1
+
+    def __iter__(self):
+        for x, y in self.xy.tolist():
+            yield QPointF(x, y)
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __copy__(self):
+        return self.copy()
+
+    def __repr__(self):
+        return f"StrokePoints({self._length} points)"
+
+    def copy(self):
+        """Kompakt (fazla kapasitesiz) kopya"""
+        result = StrokePoints(self.array)
+        if self._bounds is not None:
+            result._bounds = self._bounds.copy()
+        if self._lod is not None:
+            result._lod = (self._lod[0], dict(self._lod[1]))
+        return result
+
+    def snapshot(self):
+        """Tamponu paylaşan salt okunur kopya (yazmada kopyalanır)"""
+        view = self._data[:self._length]
+        view.flags.writeable = False
+        result = StrokePoints.__new__(StrokePoints)
+        result._data = view
+        result._length = self._length
+        result._bounds = None if self._bounds is None else self._bounds.copy()
+        result._lod = None
+        result._shared = True
+        result._version = 0
+        self._shared = True
+        return result
+
+    def detach(self):
+        """Tampon bir snapshot ile paylaşılıyorsa yerinde yazmadan önce kopyala"""
+        if self._shared:
+            self._data = self._data.copy()
+            self._shared = False
+
+    def append(self, point, pressure=1.0):
+        """Nokta ekle (kapasite gerektiğinde ikiye katlanır)"""
+        if self._length >= len(self._data):
+            grown = np.empty((max(4, len(self._data) * 2), 3), dtype=np.float32)
+            grown[:self._length] = self._data[:self._length]
+            self._data = grown
+        if isinstance(point, dict):
+            x, y = point['x'], point['y']
+        else:
+            x, y = point.x(), point.y()
+        self._data[self._length] = (x, y, pressure)
+        if self._bounds is not None:
+            xy = self._data[self._length, :2]
+            np.minimum(self._bounds[:2], xy, out=self._bounds[:2])
+            np.maximum(self._bounds[2:], xy, out=self._bounds[2:])
+        self._length += 1
+        self._lod = None
+        self._version += 1
+
+    def extend(self, xy, pressures=None):
+        """(K, 2) koordinat dizisini tek seferde ekle"""
+        xy = np.asarray(xy, dtype=np.float32).reshape(-1, 2)
+        count = len(xy)
+        if not count:
+            return
+        needed = self._length + count
+        if needed > len(self._data):
+            grown = np.empty((max(needed, len(self._data) * 2), 3), dtype=np.float32)
+            grown[:self._length] = self._data[:self._length]
+            self._data = grown
+        block = self._data[self._length:needed]
+        block[:, :2] = xy
+        block[:, 2] = 1.0 if pressures is None else pressures
+        if self._bounds is not None:
+            np.minimum(self._bounds[:2], xy.min(axis=0), out=self._bounds[:2])
+            np.maximum(self._bounds[2:], xy.max(axis=0), out=self._bounds[2:])
+        self._length = needed
+        self._lod = None
+        self._version += 1
+
+    def take(self, mask_or_indices):
+        """Maske / index dizisine göre yeni StrokePoints döndür"""
+        return StrokePoints(self.array[mask_or_indices])
+
+    def tolist(self):
+        """QPointF listesi (eski API'ler için)"""
+        return [QPointF(x, y) for x, y in self.xy.tolist()]
+
+    # ------------------------------------------------------------------
+    # Çizim
+    # ------------------------------------------------------------------
+    def to_polygon(self):
+        """QPolygonF oluştur (nokta başına Python döngüsü olmadan)"""
+        polygon = QPolygonF()
+        if self._length == 0:
+            return polygon
+        polygon.resize(self._length)
+        buffer = polygon.data()
+        buffer.setsize(self._length * 2 * 8)
+        target = np.frombuffer(buffer, dtype=np.float64).reshape(self._length, 2)
+        target[:] = self.xy
+        return polygon
+
+    def to_path(self):
+        """Noktaları düz çizgilerle birleştiren QPainterPath"""
+        path = QPainterPath()
+        if self._length:
+            path.addPolygon(self.to_polygon())
+        return path
+
+    def bounding_rect(self):
+        """Noktaların sınır dikdörtgeni (boşsa None); sonuç önbelleklenir"""
+        if self._length == 0:
+            return None
+        if self._bounds is None:
+            xy = self.xy
+            self._bounds = np.concatenate([xy.min(axis=0), xy.max(axis=0)])
+        min_x, min_y, max_x, max_y = self._bounds.tolist()
+        return QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
+
+    def invalidate_bounds(self):
+        """Saklı sınırı ve LOD seviyelerini sil (xy görünümüne doğrudan yazıldıktan sonra)"""
+        self._bounds = None
+        self._lod = None
+        self._version += 1
+
+    def simplified(self, tolerance):
+        """tolerance'ı (sahne birimi) aşmayan en kaba LOD seviyesini döndür
+
+        En ince seviyeden küçük toleranslarda veya kısa çizimlerde noktaların
+        kendisi döner. Basınç değerleri seçilen noktalarla birlikte gelir.
+        """
+        level = None
+        for candidate in self.LOD_TOLERANCES:
+            if candidate > tolerance:
+                break
+            level = candidate
+        if level is None or self._length < self.LOD_MIN_POINTS:
+            return self
+        if self._lod is None:
+            self._lod = (rdp_importance(self.xy, self.LOD_TOLERANCES[0]), {})
+        importance, levels = self._lod
+        indices = levels.get(level)
+        if indices is None:
+            indices = levels[level] = np.flatnonzero(importance > level)
+        if len(indices) == self._length:
+            return self
+        return self.take(indices)
+
+    # ------------------------------------------------------------------
+    # Vektörel dönüşümler (yerinde)
+    # ------------------------------------------------------------------
+    def translate(self, dx, dy):
+        self.detach()
+        xy = self.xy
+        xy[:, 0] += dx
+        xy[:, 1] += dy
+        if self._bounds is not None:
+            # Noktalarla aynı float32 işlemi: sınır birebir aynı kalır
+            self._bounds[0::2] += dx
+            self._bounds[1::2] += dy
+        self._version += 1
+
+    def rotate(self, center_x, center_y, angle_rad):
+        self.detach()
+        xy = self.xy
+        rel = xy.astype(np.float64) - (center_x, center_y)
+        cos_a = np.cos(angle_rad)
+        sin_a = np.sin(angle_rad)
+        xy[:, 0] = rel[:, 0] * cos_a - rel[:, 1] * sin_a + center_x
+        xy[:, 1] = rel[:, 0] * sin_a + rel[:, 1] * cos_a + center_y
+        self._bounds = None  # Döndürme mesafeleri korur, LOD geçerli kalır
+        self._version += 1
+
+    def scale(self, center_x, center_y, scale_x, scale_y):
+        self.detach()
+        xy = self.xy
+        rel = xy.astype(np.float64) - (center_x, center_y)
+        xy[:, 0] = rel[:, 0] * scale_x + center_x
+        xy[:, 1] = rel[:, 1] * scale_y + center_y
+        self._lod = None
+        self._version += 1
+        if self._bounds is not None:
+            # Eksen hizalı ölçek uç noktaları korur (negatif ölçekte yer değiştirir)
+            corners = np.empty((2, 2), dtype=np.float32)
+            rel = self._bounds.reshape(2, 2).astype(np.float64) - (center_x, center_y)
+            corners[:, 0] = rel[:, 0] * scale_x + center_x
+            corners[:, 1] = rel[:, 1] * scale_y + center_y
+            self._bounds = np.concatenate([corners.min(axis=0), corners.max(axis=0)])
+
+
+def ensure_stroke_points(stroke_data):
+    """Serbest çizimin 'points' alanını StrokePoints'e çevir (gerekirse yerinde)
+
+    Eski formatta (QPointF/dict listesi + 'pressures') gelen stroke'lar
+    ilk erişimde dönüştürülür.
+    """
+    points = stroke_data.get('points')
+    if isinstance(points, StrokePoints):
+        return points
+    points = StrokePoints.from_points(points or [], stroke_data.pop('pressures', None))
+    stroke_data['points'] = points
+    return points
+
+
+def snapshot_stroke(stroke):
+    """Stroke'un başka bir thread'de güvenle okunabilecek anlık görüntüsü
+
+    Sözlük ve liste alanları yüzeysel kopyalanır, StrokePoints tamponu
+    paylaşılır (yazmada kopyalanır). Sözlük olmayan stroke'lar (ImageStroke)
+    to_dict ile sözlüğe çevrilir.
+    """
+    if not isinstance(stroke, dict):
+        return stroke.to_dict() if hasattr(stroke, 'to_dict') else stroke
+    result = {}
+    for key, value in stroke.items():
+        if key == BOUNDS_KEY:
+            continue
+        if isinstance(value, StrokePoints):
+            value = value.snapshot()
+        elif isinstance(value, list):
+            value = list(value)
+        elif isinstance(value, QColor):
+            value = QColor(value)
+        result[key] = value
+    return result
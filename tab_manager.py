@@ -1,15 +1,35 @@
+import time
+
 from PyQt6.QtWidgets import QTabWidget, QWidget, QVBoxLayout, QScrollArea, QInputDialog
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from DrawingWidget import DrawingWidget
-from undo_redo_manager import UndoRedoManager
+from undo_redo_manager import UndoRedoManager, _estimate_stroke_bytes
 
 class TabManager:
-    """Tab yönetimi işlemlerini yöneten sınıf"""
+    """Tab yönetimi işlemlerini yöneten sınıf
+
+    Her sekme bir QScrollArea'dır. Oturumdan açılan sekmeler ilk kez
+    etkinleşene kadar DrawingWidget'sız, sadece serileştirilmiş verileriyle
+    (payload) bekler. Yüklü sekmelerin tahmini bellek kullanımı bütçeyi
+    aşarsa en uzun süredir kullanılmayanlar yeniden bu kompakt hâle
+    döndürülür (uyutma); PDF sayfa önbellekleri ve geri alma geçmişi bırakılır.
+    """
+
+    MEMORY_BUDGET_BYTES = 512 * 1024 * 1024  # Yüklü sekmelerin toplam bütçesi
+    HIBERNATE_IDLE_SECONDS = 300  # Bu süreden kısa süre önce kullanılan sekme uyutulmaz
+    HIBERNATE_CHECK_INTERVAL_MS = 60 * 1000
     
     def __init__(self, main_window):
         self.main_window = main_window
         self.tab_widget = None
+        self._tab_payloads = {}  # sayfa (QScrollArea) -> bekleyen serileştirilmiş tab verisi
+        self._last_used = {}  # sayfa -> son kullanıldığı (etkin olduğu son) an (time.monotonic)
+        self._active_page = None  # Boşta kalma süresi sekmeden çıkıldığında başlar
         self.setup_tab_widget()
+
+        self._hibernate_timer = QTimer(self.tab_widget)
+        self._hibernate_timer.timeout.connect(self.enforce_memory_budget)
+        self._hibernate_timer.start(self.HIBERNATE_CHECK_INTERVAL_MS)
     
     def setup_tab_widget(self):
         """Tab widget'ını oluştur ve ayarla"""
@@ -58,13 +78,38 @@ class TabManager:
     
     def create_new_tab(self, tab_name=None):
         """Yeni tab oluştur"""
-        # Yeni DrawingWidget oluştur
-        drawing_widget = DrawingWidget()
-        drawing_widget.set_main_window(self.main_window)
+        scroll_area = self._create_scroll_area()
         
-        # DrawingWidget'ı QScrollArea ile sar
+        # Tab adını belirle
+        if tab_name is None:
+            tab_count = self.tab_widget.count() + 1
+            tab_name = f"Çizim {tab_count}"
+        
+        drawing_widget = self._create_drawing_widget(scroll_area)
+        
+        # Tab'ı ekle (scroll_area'yı tab olarak ekle)
+        index = self.tab_widget.addTab(scroll_area, tab_name)
+        self.tab_widget.setCurrentIndex(index)
+        
+        # Toolbar'da aktif aracı seç
+        self.main_window.set_tool(self.main_window.settings.get_active_tool())
+        
+        return drawing_widget
+
+    def create_lazy_tab(self, tab_name, payload, index=None):
+        """Widget'ı ilk etkinleşmeye ertelenmiş sekme ekle
+
+        payload, SessionManager.create_tab_payload biçimindeki tab verisidir.
+        """
+        scroll_area = self._create_scroll_area()
+        self._tab_payloads[scroll_area] = payload
+        if index is None:
+            index = self.tab_widget.count()
+        return self.tab_widget.insertTab(index, scroll_area, tab_name)
+
+    def _create_scroll_area(self):
+        # DrawingWidget'ı saracak QScrollArea
         scroll_area = QScrollArea()
-        scroll_area.setWidget(drawing_widget)
         scroll_area.setWidgetResizable(False)  # Widget'ın kendi boyutunu korusun
         scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)  # Merkezde konumlandır
         scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
@@ -105,6 +150,14 @@ class TabManager:
                 background: #a0a0a0;
             }
         """)
+        return scroll_area
+
+    def _create_drawing_widget(self, scroll_area):
+        """Sekmenin DrawingWidget'ını oluştur, ayarları uygula ve scroll area'ya koy"""
+        drawing_widget = DrawingWidget()
+        drawing_widget.set_main_window(self.main_window)
+        scroll_area.setWidget(drawing_widget)
+        self._last_used[scroll_area] = time.monotonic()
         
         # Undo/Redo manager ekle
         undo_manager = UndoRedoManager()
@@ -114,15 +167,6 @@ class TabManager:
         undo_manager.canUndoChanged.connect(self.main_window.undo_action.setEnabled)
         undo_manager.canRedoChanged.connect(self.main_window.redo_action.setEnabled)
         
-        # Tab adını belirle
-        if tab_name is None:
-            tab_count = self.tab_widget.count() + 1
-            tab_name = f"Çizim {tab_count}"
-        
-        # Tab'ı ekle (scroll_area'yı tab olarak ekle)
-        index = self.tab_widget.addTab(scroll_area, tab_name)
-        self.tab_widget.setCurrentIndex(index)
-        
         # Yeni tab için ayarları yükle
         self.main_window.load_settings_to_tab(drawing_widget)
         
@@ -130,20 +174,108 @@ class TabManager:
         active_tool = self.main_window.settings.get_active_tool()
         drawing_widget.set_active_tool(active_tool)
         
-        # Toolbar'da aktif aracı seç
-        self.main_window.set_tool(active_tool)
-        
         # Zoom level'ı %100 olarak ayarla
         drawing_widget.set_zoom_level(1.0)  # %100 zoom
         
         return drawing_widget
+
+    # ------------------------------------------------------------------
+    # Bekleyen sekmeler ve uyutma
+    # ------------------------------------------------------------------
+    def is_tab_loaded(self, index):
+        page = self.tab_widget.widget(index)
+        return page is not None and page not in self._tab_payloads
+
+    def get_tab_payload(self, index):
+        """Sekme yüklenmemişse/uyutulmuşsa serileştirilmiş verisi, değilse None"""
+        return self._tab_payloads.get(self.tab_widget.widget(index))
+
+    def load_tab(self, index):
+        """Bekleyen sekmenin DrawingWidget'ını oluşturup verisini yükle"""
+        page = self.tab_widget.widget(index)
+        payload = self._tab_payloads.pop(page, None)
+        if payload is None:
+            return self.get_tab_widget_at_index(index, load=False)
+        drawing_widget = self._create_drawing_widget(page)
+        try:
+            self.main_window.session_manager.apply_tab_payload(self.main_window, drawing_widget, payload)
+        except Exception as e:
+            print(f"Sekme yüklenemedi ({self.get_tab_text(index)}): {e}")
+        return drawing_widget
+
+    def hibernate_tab(self, index):
+        """Yüklü sekmeyi kompakt serileştirilmiş hâline döndür (aktif sekme hariç)"""
+        page = self.tab_widget.widget(index)
+        if page is None or page in self._tab_payloads or index == self.tab_widget.currentIndex():
+            return False
+        drawing_widget = page.widget()
+        if drawing_widget is None:
+            return False
+        self._tab_payloads[page] = self.main_window.session_manager.create_tab_payload(
+            drawing_widget, self.get_tab_text(index))
+        # PDF katmanı widget'la birlikte bırakılır (bellekteki sayfa/karo önbellekleri);
+        # diskteki sayfa önbelleği yeniden açılışı hızlandırmak için kalır
+        self._release_tab_resources(page)
+        undo_manager = getattr(drawing_widget, 'undo_manager', None)
+        if undo_manager is not None:
+            # Geri alma geçmişi bırakılır; sinyaller aktif sekmenin butonlarını etkilemesin
+            undo_manager.blockSignals(True)
+            undo_manager.clear_history()
+        page.takeWidget()
+        drawing_widget.deleteLater()
+        return True
+
+    def estimate_tab_memory(self, index):
+        """Yüklü sekmenin tahmini bellek kullanımı (byte); bekleyen sekmeler için 0"""
+        if not self.is_tab_loaded(index):
+            return 0
+        drawing_widget = self.get_tab_widget_at_index(index, load=False)
+        if drawing_widget is None:
+            return 0
+        total = 0
+        layer_manager = getattr(drawing_widget, 'layer_manager', None)
+        if layer_manager is not None:
+            for layer in layer_manager.iter_layers():
+                total += sum(_estimate_stroke_bytes(stroke) for stroke in layer['strokes'])
+        undo_manager = getattr(drawing_widget, 'undo_manager', None)
+        if undo_manager is not None:
+            total += undo_manager.get_memory_usage()
+        layer = getattr(drawing_widget, 'pdf_background_layer', None)
+        if layer is not None and hasattr(layer, 'get_memory_usage'):
+            total += layer.get_memory_usage()
+        return total
+
+    def enforce_memory_budget(self):
+        """Bütçe aşıldıysa en uzun süredir boşta olan sekmeleri uyut"""
+        usage = {index: self.estimate_tab_memory(index) for index in range(self.tab_widget.count())}
+        total = sum(usage.values())
+        if total <= self.MEMORY_BUDGET_BYTES:
+            return 0
+        now = time.monotonic()
+        current = self.tab_widget.currentIndex()
+        candidates = sorted(
+            (index for index, size in usage.items()
+             if size and index != current
+             and now - self._last_used.get(self.tab_widget.widget(index), now) >= self.HIBERNATE_IDLE_SECONDS),
+            key=lambda index: self._last_used.get(self.tab_widget.widget(index), now)
+        )
+        hibernated = 0
+        for index in candidates:
+            if total <= self.MEMORY_BUDGET_BYTES:
+                break
+            if self.hibernate_tab(index):
+                total -= usage[index]
+                hibernated += 1
+        return hibernated
     
     def close_tab(self, index):
         """Tab'ı kapat"""
         if self.tab_widget.count() > 1:  # En az bir tab kalsın
+            self._forget_page(self.tab_widget.widget(index))
             self.tab_widget.removeTab(index)
         else:
             # Son tab ise sadece temizle
+            self.load_tab(index)
             widget = self.tab_widget.widget(index)
             if widget and hasattr(widget, 'widget'):
                 # Eğer QScrollArea ise, içindeki drawing widget'ı al
@@ -154,6 +286,21 @@ class TabManager:
             if drawing_widget:
                 drawing_widget.clear_all_strokes()
     
+    def _forget_page(self, page):
+        """Kaldırılan sekmenin kaynaklarını ve kayıtlarını bırak"""
+        self._tab_payloads.pop(page, None)
+        self._last_used.pop(page, None)
+        if page is self._active_page:
+            self._active_page = None
+        self._release_tab_resources(page)
+
+    def _release_tab_resources(self, widget):
+        """Kapanan tab'ın arka plan kaynaklarını (PDF rasterizer thread'i) bırak"""
+        drawing_widget = widget.widget() if widget and hasattr(widget, 'widget') else widget
+        layer = getattr(drawing_widget, 'pdf_background_layer', None)
+        if layer is not None and hasattr(layer, 'close'):
+            layer.close()
+
     def get_current_drawing_widget(self):
         """Aktif çizim widget'ını döndür"""
         current_widget = self.tab_widget.currentWidget()
@@ -164,6 +311,16 @@ class TabManager:
     
     def on_tab_changed(self, index):
         """Tab değiştiğinde çağrılır"""
+        now = time.monotonic()
+        # Önceki sekme bu ana kadar kullanıldı; boşta kalma süresi şimdi başlar
+        if self._active_page in self._last_used:
+            self._last_used[self._active_page] = now
+        self._active_page = None
+        if index >= 0:
+            # Bekleyen sekme ilk etkinleşmede yüklenir
+            self.load_tab(index)
+            self._active_page = self.tab_widget.widget(index)
+            self._last_used[self._active_page] = now
         self.main_window.connect_toolbar_to_active_tab()
         
         # Aktif tab'ın undo/redo durumunu güncelle
@@ -176,8 +333,14 @@ class TabManager:
         """Tab sayısını döndür"""
         return self.tab_widget.count()
     
-    def get_tab_widget_at_index(self, index):
-        """Belirtilen indeksteki widget'ı döndür"""
+    def get_tab_widget_at_index(self, index, load=True):
+        """Belirtilen indeksteki widget'ı döndür
+
+        Sekme bekliyorsa (lazy/uyutulmuş) load=True ile önce yüklenir,
+        load=False ile None döner.
+        """
+        if load:
+            self.load_tab(index)
         widget = self.tab_widget.widget(index)
         if widget and hasattr(widget, 'widget'):
             # Eğer QScrollArea ise, içindeki widget'ı döndür
@@ -214,4 +377,5 @@ class TabManager:
     def clear_all_tabs(self):
         """Tüm tab'ları temizle"""
         while self.tab_widget.count() > 0:
+            self._forget_page(self.tab_widget.widget(0))
             self.tab_widget.removeTab(0) 
\ No newline at end of file
@@ -1,7 +1,55 @@
 from PyQt6.QtCore import QObject, QPointF
 from PyQt6.QtGui import QTabletEvent
+import numpy as np
 import time
 
+
+class TabletSampleBuffer:
+    """Ham tablet örnekleri için NumPy halka tamponu.
+
+    Her satır widget koordinatında x, y, basınç, x/y eğim ve zaman damgası
+    tutar. Tampon dolarsa örnek atılmaz, kapasite ikiye katlanır.
+    """
+
+    COLUMNS = 6  # x, y, pressure, x_tilt, y_tilt, timestamp
+
+    def __init__(self, capacity=512):
+        self._data = np.zeros((max(int(capacity), 8), self.COLUMNS), dtype=np.float64)
+        self._head = 0  # İlk bekleyen örnek
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, x, y, pressure, x_tilt=0.0, y_tilt=0.0, timestamp=0.0):
+        capacity = len(self._data)
+        if self._count >= capacity:
+            self._data = np.concatenate((self.peek(), np.zeros_like(self._data)))
+            self._head = 0
+            capacity = len(self._data)
+        self._data[(self._head + self._count) % capacity] = (x, y, pressure, x_tilt, y_tilt, timestamp)
+        self._count += 1
+
+    def peek(self):
+        """Bekleyen örnekleri sırayla (kopya) döndür"""
+        end = self._head + self._count
+        capacity = len(self._data)
+        if end <= capacity:
+            return self._data[self._head:end].copy()
+        return np.concatenate((self._data[self._head:], self._data[:end - capacity]))
+
+    def drain(self):
+        """Bekleyen örnekleri döndür ve tamponu boşalt"""
+        samples = self.peek()
+        self._head = 0
+        self._count = 0
+        return samples
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+
 class TabletHandler(QObject):
     """Tablet kalemi için optimize edilmiş event handler"""
     
@@ -11,11 +59,13 @@ class TabletHandler(QObject):
         self.last_pressure = 1.0
         self.pressure_threshold = 0.01  # Çok hassas pressure değişimi
         self.last_tablet_time = 0
-        self.tablet_throttle_interval = 1.0 / 500.0  # 500 FPS max tablet (real-time yazım)
         
         # Tablet pressure smoothing
         self.pressure_buffer = []
         self.pressure_buffer_size = 3
+
+        # Kare başına toplu işlenen ham örnekler
+        self.samples = TabletSampleBuffer()
         
         # Performance flags
         self.high_frequency_mode = False  # Tablet yüksek frekansta event gönderiyorsa
@@ -46,6 +96,45 @@ class TabletHandler(QObject):
         else:
             return sum(self.pressure_buffer) / len(self.pressure_buffer)
     
+    def smooth_pressures(self, pressures):
+        """_smooth_pressure'ın vektörel karşılığı: her değer önceki
+        pressure_buffer_size örnekle (geçmiş dahil) ortalanır"""
+        pressures = np.asarray(pressures, dtype=np.float64)
+        if len(pressures) == 0:
+            return pressures
+        size = max(1, self.pressure_buffer_size)
+        history = self.pressure_buffer[-(size - 1):] if size > 1 else []
+        values = np.concatenate((np.asarray(history, dtype=np.float64), pressures))
+        sums = np.concatenate(([0.0], np.cumsum(values)))
+        ends = np.arange(len(history) + 1, len(values) + 1)
+        starts = np.maximum(ends - size, 0)
+        smoothed = (sums[ends] - sums[starts]) / (ends - starts)
+        self.pressure_buffer = values[-size:].tolist()
+        return smoothed
+
+    def queue_event(self, event: QTabletEvent):
+        """Tablet hareketini dönüştürmeden örnek tamponuna ekle"""
+        self.is_tablet_active = True
+        pos = event.position()
+        pressure = event.pressure()
+        self.last_pressure = pressure
+        try:
+            x_tilt, y_tilt = event.xTilt(), event.yTilt()
+        except Exception:
+            x_tilt = y_tilt = 0.0
+        try:
+            timestamp = event.timestamp() / 1000.0
+        except Exception:
+            timestamp = time.perf_counter()
+        self.last_tablet_time = timestamp
+        self.samples.push(pos.x(), pos.y(), pressure, x_tilt, y_tilt, timestamp)
+
+    def take_samples(self):
+        """Bekleyen ham örnekleri (N, 6) dizi olarak al; yoksa None"""
+        if not len(self.samples):
+            return None
+        return self.samples.drain()
+
     def get_optimized_pressure(self, event):
         """Event'ten optimize edilmiş pressure al"""
         if hasattr(event, 'pressure'):
@@ -67,13 +156,10 @@ class TabletHandler(QObject):
         """Tablet state'ini sıfırla"""
         self.is_tablet_active = False
         self.pressure_buffer = []
+        self.samples.clear()
         
     def set_high_frequency_mode(self, enabled):
         """Yüksek frekanslı tablet için mod ayarla"""
         self.high_frequency_mode = enabled
-        if enabled:
-            self.tablet_throttle_interval = 1.0 / 200.0  # Yüksek frekans için orta throttling
-            self.pressure_buffer_size = 2  # Daha küçük buffer
-        else:
-            self.tablet_throttle_interval = 1.0 / 500.0  # Normal tablet için çok yüksek FPS
-            self.pressure_buffer_size = 2  # Yazım için küçük buffer 
\ No newline at end of file
+        # Örnekler kare başına toplu işlendiği için sadece basınç penceresi değişir
+        self.pressure_buffer_size = 2 
\ No newline at end of file
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# Testler ekransız çalışır; modüller depo kökünden içe aktarılır
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QColor, QImage
+
+
+def _grab(widget):
+    image = widget.grab().toImage().convertToFormat(QImage.Format.Format_ARGB32)
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    return np.frombuffer(bits, np.uint8).reshape(image.height(), image.width(), 4).astype(int)
+
+
+@pytest.fixture
+def drawing_widget(qapp):
+    from DrawingWidget import DrawingWidget
+    from stroke_points import StrokePoints
+    widget = DrawingWidget()
+    widget.resize(600, 400)
+    widget.background_settings['type'] = 'grid'
+    for row in range(6):
+        points = [QPointF(40 + i * 7, 50 + row * 50 + 15 * math.sin(i / 4)) for i in range(70)]
+        widget.strokes.append({'type': 'freehand', 'points': StrokePoints.from_points(points),
+                               'color': QColor('#204080'), 'width': 3})
+    widget.update_contents()
+    yield widget
+    widget.deleteLater()
+
+
+@pytest.mark.parametrize('zoom, pan', [
+    (1.0, (-13.3, -7.7)),
+    (1.0, (-13.0, -7.0)),
+    (1.37, (5.21, -3.9)),
+])
+def test_tiled_output_matches_direct_rendering(drawing_widget, zoom, pan):
+    """Karolar piksel altı pan offset'inde de doğrudan çizimle aynı pikselleri üretmeli"""
+    renderer = drawing_widget.canvas_renderer
+    drawing_widget.set_zoom_level(zoom)
+    drawing_widget.set_pan_offset(QPointF(*pan))
+
+    renderer.invalidate_tiles()
+    tiled = _grab(drawing_widget)
+    cached = _grab(drawing_widget)
+
+    renderer.tile_cache.enabled = False
+    renderer.background_cache.enabled = False
+    direct = _grab(drawing_widget)
+
+    assert np.array_equal(tiled, cached)
+    assert np.abs(tiled - direct).max() <= 2
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtGui import QColor
+
+
+def _rectangle(**extra):
+    stroke = {'type': 'rectangle', 'corners': [(0, 0), (200, 0), (200, 100), (0, 100)],
+              'color': QColor('#204080'), 'line_width': 4, 'line_style': Qt.PenStyle.DashLine,
+              'fill': True, 'fill_color': QColor('yellow'), 'fill_opacity': 1.0, 'is_filled': True,
+              'corner_radius': 0, 'stroke_id': 'rect-1'}
+    stroke.update(extra)
+    return stroke
+
+
+def _circle():
+    return {'type': 'circle', 'center': (100, 100), 'radius': 80,
+            'color': QColor('black'), 'line_width': 6, 'stroke_id': 'circle-1'}
+
+
+def _erase(eraser, widget, start, end):
+    eraser.start_erase(QPointF(*start))
+    eraser.update_erase(QPointF(*start), widget)
+    changed = eraser.update_erase(QPointF(*end), widget)
+    eraser.finish_erase()
+    return changed
+
+
+def _distance_to_polyline(xy, point):
+    d = np.diff(xy, axis=0)
+    t = np.clip(((point - xy[:-1]) * d).sum(axis=1) / np.maximum((d * d).sum(axis=1), 1e-12), 0, 1)
+    nearest = xy[:-1] + d * t[:, None]
+    return np.hypot(*(nearest - point).T).min()
+
+
+@pytest.fixture
+def drawing_widget(qapp):
+    from DrawingWidget import DrawingWidget
+    widget = DrawingWidget()
+    yield widget
+    widget.deleteLater()
+
+
+def test_rectangle_outline_is_cut_not_deleted(drawing_widget):
+    """Kenara değen silgi dikdörtgeni silmez; çerçeveyi o noktada keser"""
+    from eraser_tool import EraserTool
+    drawing_widget.layer_manager.append_stroke(_rectangle())
+    eraser = EraserTool()
+    eraser.set_radius(6)
+    assert _erase(eraser, drawing_widget, (100, -10), (100, 10))
+
+    strokes = drawing_widget.strokes
+    assert len(strokes) == 1
+    stroke = strokes[0]
+    assert stroke['type'] == 'freehand'
+    assert stroke['stroke_id'] == 'rect-1'
+    assert stroke['width'] == 4 and stroke['style'] == Qt.PenStyle.DashLine
+    assert stroke['color'] == QColor('#204080')
+    assert 'fill_color' not in stroke and 'corners' not in stroke
+
+    xy = stroke['points'].array[:, :2].astype(np.float64)
+    # Kesik ek yerinin karşısında değil silgi altında: uçlar silgi kenarında
+    assert np.hypot(*(xy[0] - (100, 0))) == pytest.approx(8, abs=0.5)
+    assert np.hypot(*(xy[-1] - (100, 0))) == pytest.approx(8, abs=0.5)
+    # Kalan parça üç köşeden geçer
+    for corner in ((200, 0), (200, 100), (0, 100), (0, 0)):
+        assert _distance_to_polyline(xy, np.array(corner, dtype=np.float64)) < 0.5
+
+
+def test_circle_is_split_into_arcs(drawing_widget):
+    from eraser_tool import EraserTool
+    drawing_widget.layer_manager.append_stroke(_circle())
+    eraser = EraserTool()
+    eraser.set_radius(5)
+    # Çemberi iki yerden kesen yatay geçiş: iki yay kalır
+    assert _erase(eraser, drawing_widget, (0, 100), (200, 100))
+
+    strokes = drawing_widget.strokes
+    assert len(strokes) == 2
+    assert strokes[0]['stroke_id'] == 'circle-1'
+    for stroke in strokes:
+        assert stroke['type'] == 'freehand' and stroke['width'] == 6
+        xy = stroke['points'].array[:, :2].astype(np.float64)
+        radii = np.hypot(xy[:, 0] - 100, xy[:, 1] - 100)
+        assert np.allclose(radii, 80, atol=0.5)
+        assert np.abs(xy[:, 1] - 100).min() >= 8 - 0.5
+    # Yaylar üst ve alt yarılardır
+    assert sorted(np.sign(s['points'].array[1, 1] - 100) for s in strokes) == [-1, 1]
+
+
+def test_shapes_away_from_the_eraser_are_untouched(drawing_widget):
+    from eraser_tool import EraserTool
+    rectangle = _rectangle()
+    circle = _circle()
+    drawing_widget.layer_manager.append_stroke(rectangle)
+    drawing_widget.layer_manager.append_stroke(circle)
+    eraser = EraserTool()
+    eraser.set_radius(5)
+    # Dikdörtgenin ve çemberin içinde, çerçevelerden uzakta
+    assert not _erase(eraser, drawing_widget, (90, 60), (110, 60))
+    assert drawing_widget.strokes[0] is rectangle and rectangle['type'] == 'rectangle'
+    assert drawing_widget.strokes[1] is circle and circle['type'] == 'circle'
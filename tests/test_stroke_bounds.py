@@ -0,0 +1,160 @@
+import math
+
+import numpy as np
+import pytest
+from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtGui import QColor, QImage, QPainter
+
+
+CANVAS = 640
+ORIGIN = 320
+
+
+def _wave(count=40, amplitude=40, step=9):
+    return [QPointF(-180 + i * step, amplitude * math.sin(i / 3) * (1 if i % 2 else -1))
+            for i in range(count)]
+
+
+def _shadow(blur, size, offset_x, offset_y, **extra):
+    data = {'has_shadow': True, 'shadow_color': QColor(0, 0, 0), 'shadow_opacity': 1.0,
+            'shadow_blur': blur, 'shadow_size': size,
+            'shadow_offset_x': offset_x, 'shadow_offset_y': offset_y}
+    data.update(extra)
+    return data
+
+
+def _freehand(width, **extra):
+    from stroke_points import StrokePoints
+    stroke = {'type': 'freehand', 'points': StrokePoints.from_points(_wave()),
+              'color': QColor('#204080'), 'width': width}
+    stroke.update(extra)
+    return stroke
+
+
+def _bspline(width, **extra):
+    from scipy.interpolate import splprep
+    points = np.array([(x, 90 * math.sin(x / 45.0)) for x in range(-150, 151, 25)], dtype=float)
+    tck, u = splprep(points.T, s=0, k=3)
+    stroke = {'type': 'bspline', 'control_points': np.array(tck[1]).T.tolist(),
+              'knots': tck[0].tolist(), 'degree': 3, 'u': u.tolist(),
+              'color': QColor('#802040'), 'width': width}
+    stroke.update(extra)
+    return stroke
+
+
+STROKES = {
+    'freehand_thick': lambda: _freehand(14),
+    'freehand_thin': lambda: _freehand(1.5),
+    'freehand_zigzag': lambda: _freehand(5, brush_mode='advanced', advanced_style='zigzag'),
+    'freehand_double': lambda: _freehand(6, brush_mode='advanced', advanced_style='double'),
+    'freehand_dashed': lambda: _freehand(10, brush_mode='advanced', advanced_style='dashed'),
+    'freehand_shadow': lambda: _freehand(6, **_shadow(6, 3, 14, 9)),
+    'freehand_wide_blur': lambda: _freehand(3, **_shadow(10, 0, 4, 4, shadow_quality='high')),
+    'line_shadow': lambda: {'type': 'line', 'start_point': (-150, -60), 'end_point': (140, 80),
+                            'color': QColor('black'), 'width': 22,
+                            **_shadow(0, 4, -15, 12)},
+    'line_square_cap_shadow': lambda: {'type': 'line', 'start_point': (-150, -60), 'end_point': (140, 80),
+                                       'color': QColor('black'), 'width': 8,
+                                       'cap_style': Qt.PenCapStyle.SquareCap,
+                                       **_shadow(3, 2, 6, 6)},
+    'rectangle_shadow': lambda: {'type': 'rectangle', 'corners': [(-120, -80), (110, -80), (110, 90), (-120, 90)],
+                                 'color': QColor('black'), 'line_width': 16,
+                                 **_shadow(5, 3, 10, 10)},
+    'rectangle_rotated': lambda: {'type': 'rectangle', 'corners': [(-100, 0), (0, -100), (100, 0), (0, 100)],
+                                  'color': QColor('black'), 'line_width': 12,
+                                  **_shadow(0, 0, -8, 8)},
+    'circle_shadow': lambda: {'type': 'circle', 'center': (0, 0), 'radius': 110,
+                              'color': QColor('black'), 'line_width': 14,
+                              **_shadow(4, 2, 12, -9, shadow_quality='high')},
+    'bspline': lambda: _bspline(12),
+    'bspline_shadow_points': lambda: _bspline(4, show_control_points=True, **_shadow(3, 1, 9, 9)),
+}
+
+
+def _render(drawing_widget, stroke):
+    image = QImage(CANVAS, CANVAS, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    painter.translate(ORIGIN, ORIGIN)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+    if hasattr(stroke, 'render'):
+        stroke.render(painter)
+    else:
+        drawing_widget.canvas_renderer.draw_stroke_full(painter, stroke)
+    painter.end()
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    return np.frombuffer(bits, np.uint8).reshape(CANVAS, CANVAS, 4)[..., 3].copy()
+
+
+def _assert_inside(alpha, bounds):
+    ys, xs = np.nonzero(alpha)
+    assert len(xs), "stroke çizilmedi"
+    assert 0 < xs.min() and xs.max() < CANVAS - 1 and 0 < ys.min() and ys.max() < CANVAS - 1
+    # Piksel [x, x + 1) aralığını kaplar
+    assert xs.min() - ORIGIN + 1 > bounds.left()
+    assert xs.max() - ORIGIN < bounds.right()
+    assert ys.min() - ORIGIN + 1 > bounds.top()
+    assert ys.max() - ORIGIN < bounds.bottom()
+
+
+@pytest.fixture(scope='module')
+def drawing_widget(qapp):
+    from DrawingWidget import DrawingWidget
+    widget = DrawingWidget()
+    yield widget
+    widget.deleteLater()
+
+
+@pytest.mark.parametrize('name', sorted(STROKES))
+def test_render_bounds_cover_drawn_pixels(drawing_widget, name):
+    """Kalın uçlar, kesikli stiller ve gölgeler saklı çizim sınırının dışına taşmamalı"""
+    from stroke_handler import StrokeHandler
+    stroke = STROKES[name]()
+    bounds = StrokeHandler.get_stroke_render_bounds(stroke)
+    _assert_inside(_render(drawing_widget, stroke), bounds)
+
+
+def test_image_render_bounds_cover_rotation_border_and_shadow(drawing_widget, tmp_path):
+    from image_stroke import ImageStroke
+    from stroke_handler import StrokeHandler
+    path = str(tmp_path / 'image.png')
+    source = QImage(120, 80, QImage.Format.Format_ARGB32)
+    source.fill(QColor('#3060c0'))
+    source.save(path)
+
+    image = ImageStroke(path, QPointF(-60, -40), QPointF(120, 80), rotation=33)
+    image.has_border = True
+    image.border_width = 10
+    image.has_shadow = True
+    image.shadow_size = 4
+    image.shadow_offset_x = 14
+    image.shadow_offset_y = 10
+    bounds = StrokeHandler.get_stroke_render_bounds(image)
+    _assert_inside(_render(drawing_widget, image), bounds)
+
+
+def test_stored_bounds_follow_in_place_transforms():
+    from stroke_handler import StrokeHandler
+    from stroke_points import BOUNDS_KEY
+    stroke = _freehand(4)
+    before = StrokeHandler.get_stroke_render_bounds(stroke)
+    assert BOUNDS_KEY in stroke
+
+    StrokeHandler.move_stroke(stroke, 30, -20)
+    moved = StrokeHandler.get_stroke_render_bounds(stroke)
+    assert moved.left() == pytest.approx(before.left() + 30, abs=1e-3)
+    assert moved.top() == pytest.approx(before.top() - 20, abs=1e-3)
+
+    stroke['width'] = 20
+    assert StrokeHandler.get_stroke_render_bounds(stroke).width() > moved.width() + 15
+
+
+def test_stored_bounds_are_not_serialized():
+    from session_manager import SessionManager
+    from stroke_handler import StrokeHandler
+    from stroke_points import BOUNDS_KEY, snapshot_stroke
+    stroke = _freehand(4)
+    StrokeHandler.get_stroke_render_bounds(stroke)
+    assert BOUNDS_KEY not in SessionManager().serialize_strokes([stroke])[0]
+    assert BOUNDS_KEY not in snapshot_stroke(stroke)
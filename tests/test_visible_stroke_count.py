@@ -0,0 +1,58 @@
+import pytest
+from PyQt6.QtGui import QColor
+
+
+def _line(offset):
+    return {'type': 'line', 'start_point': (offset, 0), 'end_point': (offset + 10, 10),
+            'color': QColor('black'), 'width': 2}
+
+
+def _recounted(manager):
+    return sum(len(layer['strokes']) for layer in manager.iter_visible_layers())
+
+
+@pytest.fixture
+def layer_manager(qapp):
+    from DrawingWidget import DrawingWidget
+    widget = DrawingWidget()
+    yield widget.layer_manager
+    widget.deleteLater()
+
+
+def test_counter_follows_edits_without_recounting(layer_manager, monkeypatch):
+    """Sayaç düzenlemelerde farkla güncellenir; katmanlar yeniden sayılmaz"""
+    manager = layer_manager
+    second = manager.create_layer("Layer 2")
+    monkeypatch.setattr(manager, 'recount_visible_strokes', lambda: pytest.fail("yeniden sayıldı"))
+
+    for i in range(5):
+        manager.append_stroke(_line(i * 20))
+    manager.insert_strokes(0, [_line(200), _line(220)], layer_id=second)
+    assert manager.count_visible_strokes() == 7
+
+    manager.remove_strokes([0, 2])
+    manager.replace_strokes(0, 1, [_line(300), _line(320)])
+    assert manager.count_visible_strokes() == _recounted(manager) == 6
+
+    manager.set_layer_visibility(second, False)
+    assert manager.count_visible_strokes() == 4
+    manager.rename_layer(second, "Gizli")
+    manager.set_layer_visibility(second, False)
+    manager.append_stroke(_line(400), layer_id=second)
+    assert manager.count_visible_strokes() == _recounted(manager) == 4
+
+    manager.set_layer_visibility(second, True)
+    assert manager.count_visible_strokes() == 7
+    manager.delete_layer(second)
+    assert manager.count_visible_strokes() == _recounted(manager) == 4
+
+
+def test_counter_is_rebuilt_on_import(layer_manager):
+    manager = layer_manager
+    manager.append_stroke(_line(0))
+    state = manager.export_state()
+    state['layers'][manager.active_layer_id]['strokes'].append(_line(40))
+    manager.import_state(state)
+    assert manager.count_visible_strokes() == _recounted(manager) == 2
+    manager.clear_all()
+    assert manager.count_visible_strokes() == 0
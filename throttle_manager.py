@@ -1,204 +1,275 @@
+import math
 import time
+from collections import deque
 from enum import Enum
 
+from PyQt6.QtCore import Qt, QTimer
+
+
 class ThrottleType(Enum):
     """Throttle türleri"""
     GENERAL = "general"
     FREEHAND = "freehand"
     TABLET = "tablet"
 
+
 class ThrottleManager:
-    """DrawingWidget için throttling işlemlerini yöneten sınıf"""
-    
+    """DrawingWidget için kare hızı sınırlı yeniden çizim zamanlayıcısı.
+
+    Girdi olaylarının istediği güncellemeler hemen uygulanmaz; bekleyen en
+    kapsamlı tür (overlay > kirli bölge) saklanır ve ekran yenileme
+    aralığında en fazla bir kez yeniden çizim istenir. Aralık, ekranın
+    bildirdiği yenileme hızıyla çalışan bir QTimer'dır; görüntünün kare
+    sunumuna (vsync) bağlı değildir, sadece çizim sıklığını sınırlar.
+    Ölçülen paint süreleri performans modunun seçiminde kullanılır.
+    """
+
+    # Bekleyen güncelleme türleri (büyük olan küçüğü kapsar)
+    _DIRTY = 1
+    _OVERLAY = 2
+
+    DEFAULT_REFRESH_RATE = 60.0
+    FRAME_HISTORY = 30  # Ortalama için saklanan paint süresi sayısı
+
+    # Performans modlarının kare hızı sınırı (None: ekran yenileme hızı)
+    PERFORMANCE_MODES = {
+        "high_performance": None,
+        "balanced": 60,
+        "battery_saver": 30,
+    }
+
     def __init__(self, drawing_widget):
         self.drawing_widget = drawing_widget
-        
-        # Throttle türleri için ayrı time tracking
-        self._last_update_times = {
-            ThrottleType.GENERAL: 0,
-            ThrottleType.FREEHAND: 0,
-            ThrottleType.TABLET: 0
-        }
-        
-        # Throttle ayarları
+
+        # Tür bazında zamanlayıcı kullanımı (kapalıysa güncelleme anında uygulanır)
         self.throttle_settings = {
-            ThrottleType.GENERAL: {
-                'stroke_threshold': 100,  # 100'den fazla stroke varsa throttling
-                'fps_limit': 30,          # 30 FPS limit
-                'enabled': True
-            },
-            ThrottleType.FREEHAND: {
-                'stroke_threshold': 50,   # 50'den fazla stroke varsa hafif throttling
-                'fps_limit': 60,          # 60 FPS limit
-                'enabled': True
-            },
-            ThrottleType.TABLET: {
-                'stroke_threshold': 80,   # 80'den fazla stroke varsa hafif throttling
-                'fps_limit': 90,          # 90 FPS - tablet için yüksek
-                'enabled': True
-            }
+            throttle_type: {'enabled': True} for throttle_type in ThrottleType
         }
-    
-    def should_throttle(self, throttle_type: ThrottleType) -> bool:
-        """Throttling gerekip gerekmediğini kontrol et"""
-        settings = self.throttle_settings[throttle_type]
-        
-        if not settings['enabled']:
+        self.fps_limit = self.PERFORMANCE_MODES["balanced"]
+        self.performance_mode = "balanced"
+        self.auto_adjust = True  # set_performance_mode çağrılınca kapanır
+
+        self._pending = 0
+        self._last_flush = 0.0
+        self._frame_times = deque(maxlen=self.FRAME_HISTORY)
+        self._frames_since_adjust = 0
+        self._requests = 0
+        self._flushes = 0
+
+        self._timer = QTimer(drawing_widget)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+
+    # ------------------------------------------------------------------
+    # Kare zamanlaması
+    # ------------------------------------------------------------------
+    def refresh_rate(self) -> float:
+        """Widget'ın bulunduğu ekranın yenileme hızı (Hz)"""
+        try:
+            screen = self.drawing_widget.screen()
+            rate = float(screen.refreshRate()) if screen is not None else 0.0
+        except Exception:
+            rate = 0.0
+        return rate if rate > 1.0 else self.DEFAULT_REFRESH_RATE
+
+    def frame_interval(self) -> float:
+        """İki yeniden çizim arasındaki en kısa süre (saniye)"""
+        rate = self.refresh_rate()
+        if self.fps_limit:
+            rate = min(rate, float(self.fps_limit))
+        return 1.0 / rate
+
+    def _schedule(self):
+        """Bekleyen güncellemeyi son çizimden bir kare aralığı sonra uygula"""
+        if self._timer.isActive():
+            return
+        delay = self._last_flush + self.frame_interval() - time.perf_counter()
+        self._timer.start(max(0, int(math.ceil(delay * 1000.0))))
+
+    def _apply(self, kind):
+        widget = self.drawing_widget
+        if hasattr(widget, 'process_tablet_samples'):
+            # Kare boyunca biriken tablet örnekleri çizimden hemen önce işlenir
+            widget.process_tablet_samples()
+        if kind >= self._OVERLAY:
+            # Karolara dokunulmaz; içerik değiştiyse çağıran önceden geçersiz kılmıştır
+            getattr(widget, 'update_overlay', widget.update)()
+        if hasattr(widget, 'update_dirty'):
+            widget.update_dirty()
+        self._last_flush = time.perf_counter()
+        self._flushes += 1
+
+    def flush(self) -> bool:
+        """Bekleyen güncellemeyi hemen uygula"""
+        self._timer.stop()
+        kind = self._pending
+        self._pending = 0
+        if not kind:
             return False
-            
-        # Stroke sayısı threshold'u geçmişse throttling aktif
-        stroke_count = 0
-        if hasattr(self.drawing_widget, 'layer_manager'):
-            stroke_count = self.drawing_widget.layer_manager.count_visible_strokes()
-        elif hasattr(self.drawing_widget, 'strokes'):
-            stroke_count = len(self.drawing_widget.strokes)
-        return stroke_count > settings['stroke_threshold']
-    
-    def can_update(self, throttle_type: ThrottleType) -> bool:
-        """Update yapılıp yapılamayacağını kontrol et"""
-        if not self.should_throttle(throttle_type):
-            return True  # Throttling gerekmiyor, direkt update
-            
-        settings = self.throttle_settings[throttle_type]
-        current_time = time.time()
-        last_time = self._last_update_times[throttle_type]
-        min_interval = 1.0 / settings['fps_limit']
-        
-        return current_time - last_time > min_interval
-    
-    def update_with_throttle(self, throttle_type: ThrottleType) -> bool:
-        """Throttling kontrolü yaparak update işlemi"""
-        if self.can_update(throttle_type):
-            self.drawing_widget.update()
-            self._last_update_times[throttle_type] = time.time()
-            return True
+        self._apply(kind)
+        return True
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    # ------------------------------------------------------------------
+    # Güncelleme istekleri
+    # ------------------------------------------------------------------
+    def update_with_throttle(self, throttle_type: ThrottleType, dirty_only: bool = False) -> bool:
+        """Güncelleme iste; bir sonraki karede diğer isteklerle birleştirilir
+
+        Varsayılan olarak overlay (canlı çizim ve araç katmanı) yenilenir.
+        Tamamlanmış stroke karoları geçersiz kılınmaz; içeriği değiştiren
+        çağıran önce invalidate_canvas_strokes/invalidate_contents çağırmalıdır.
+        dirty_only=True ise sadece araçların mark_dirty ile bildirdiği bölge yenilenir;
+        bölgeler kare uygulanana kadar birikir.
+        Güncelleme hemen uygulandıysa True döner.
+        """
+        widget = self.drawing_widget
+        if dirty_only and hasattr(widget, 'update_dirty'):
+            kind = self._DIRTY
+        else:
+            kind = self._OVERLAY
+
+        self._requests += 1
+        self._pending = max(self._pending, kind)
+        if not self.throttle_settings[throttle_type]['enabled']:
+            return self.flush()
+        self._schedule()
         return False
-    
+
     def throttled_update(self) -> bool:
-        """Genel akıllı throttling"""
+        """Genel güncelleme (overlay)"""
         return self.update_with_throttle(ThrottleType.GENERAL)
-            
-    def throttled_freehand_update(self) -> bool:
-        """Freehand için minimal throttling"""
-        return self.update_with_throttle(ThrottleType.FREEHAND)
-    
-    def throttled_tablet_update(self) -> bool:
-        """Tablet için akıllı throttling - yazım kalitesini korur"""
-        return self.update_with_throttle(ThrottleType.TABLET)
-    
+
+    def throttled_freehand_update(self, dirty_only: bool = False) -> bool:
+        """Freehand güncellemesi (sadece canlı çizim katmanı)"""
+        return self.update_with_throttle(ThrottleType.FREEHAND, dirty_only=dirty_only)
+
+    def throttled_tablet_update(self, dirty_only: bool = False) -> bool:
+        """Tablet güncellemesi (sadece canlı çizim katmanı)"""
+        return self.update_with_throttle(ThrottleType.TABLET, dirty_only=dirty_only)
+
     def force_update(self):
-        """Throttling'i bypass ederek direkt update"""
+        """Zamanlayıcıyı bypass ederek direkt tam update"""
+        self._timer.stop()
+        self._pending = 0
         self.drawing_widget.update()
-        # Tüm throttle timer'larını güncelle
-        current_time = time.time()
-        for throttle_type in ThrottleType:
-            self._last_update_times[throttle_type] = current_time
-    
+        self._last_flush = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # Paint süresi ölçümü
+    # ------------------------------------------------------------------
+    def record_frame_time(self, seconds: float):
+        """paintEvent süresini kaydet; auto_adjust açıksa modu periyodik güncelle"""
+        self._frame_times.append(seconds)
+        if not self.auto_adjust:
+            return
+        self._frames_since_adjust += 1
+        if self._frames_since_adjust >= self.FRAME_HISTORY:
+            self._frames_since_adjust = 0
+            self._adjust_to_frame_times()
+
+    def get_frame_stats(self) -> dict:
+        """Son karelerin paint süreleri (milisaniye)"""
+        times = self._frame_times
+        budget_ms = 1000.0 / self.refresh_rate()
+        if not times:
+            return {'frames': 0, 'average_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0,
+                    'budget_ms': budget_ms}
+        return {
+            'frames': len(times),
+            'average_ms': sum(times) / len(times) * 1000.0,
+            'max_ms': max(times) * 1000.0,
+            'last_ms': times[-1] * 1000.0,
+            'budget_ms': budget_ms,
+        }
+
+    # ------------------------------------------------------------------
+    # Ayarlar
+    # ------------------------------------------------------------------
     def configure_throttle(self, throttle_type: ThrottleType, **kwargs):
-        """Throttle ayarlarını güncelle"""
-        settings = self.throttle_settings[throttle_type]
-        
-        if 'stroke_threshold' in kwargs:
-            settings['stroke_threshold'] = kwargs['stroke_threshold']
-        if 'fps_limit' in kwargs:
-            settings['fps_limit'] = kwargs['fps_limit']
+        """Throttle ayarlarını güncelle (fps_limit tüm türler için ortaktır)"""
         if 'enabled' in kwargs:
-            settings['enabled'] = kwargs['enabled']
-    
+            self.throttle_settings[throttle_type]['enabled'] = kwargs['enabled']
+        if 'fps_limit' in kwargs:
+            self.fps_limit = kwargs['fps_limit']
+
     def disable_throttle(self, throttle_type: ThrottleType = None):
-        """Throttling'i devre dışı bırak"""
-        if throttle_type is None:
-            # Tüm throttling'i devre dışı bırak
-            for t_type in ThrottleType:
-                self.throttle_settings[t_type]['enabled'] = False
-        else:
-            self.throttle_settings[throttle_type]['enabled'] = False
-    
+        """Zamanlayıcıyı devre dışı bırak (güncellemeler anında uygulanır)"""
+        for t_type in ([throttle_type] if throttle_type is not None else ThrottleType):
+            self.throttle_settings[t_type]['enabled'] = False
+        self.flush()
+
     def enable_throttle(self, throttle_type: ThrottleType = None):
-        """Throttling'i etkinleştir"""
-        if throttle_type is None:
-            # Tüm throttling'i etkinleştir
-            for t_type in ThrottleType:
-                self.throttle_settings[t_type]['enabled'] = True
-        else:
-            self.throttle_settings[throttle_type]['enabled'] = True
-    
+        """Zamanlayıcıyı etkinleştir"""
+        for t_type in ([throttle_type] if throttle_type is not None else ThrottleType):
+            self.throttle_settings[t_type]['enabled'] = True
+
     def get_throttle_stats(self) -> dict:
-        """Throttle istatistiklerini döndür"""
+        """Zamanlayıcı istatistiklerini döndür"""
         if hasattr(self.drawing_widget, 'layer_manager'):
             stroke_count = self.drawing_widget.layer_manager.count_visible_strokes()
         else:
             stroke_count = len(self.drawing_widget.strokes) if hasattr(self.drawing_widget, 'strokes') else 0
-        current_time = time.time()
-        
-        stats = {
+        return {
             'stroke_count': stroke_count,
-            'throttle_states': {}
+            'performance_mode': self.performance_mode,
+            'refresh_rate': self.refresh_rate(),
+            'frame_interval_ms': self.frame_interval() * 1000.0,
+            'pending': self.has_pending(),
+            'requests': self._requests,
+            'flushes': self._flushes,
+            'frame_times': self.get_frame_stats(),
+            'throttle_states': {
+                throttle_type.value: {'enabled': settings['enabled']}
+                for throttle_type, settings in self.throttle_settings.items()
+            },
         }
-        
-        for throttle_type in ThrottleType:
-            settings = self.throttle_settings[throttle_type]
-            last_time = self._last_update_times[throttle_type]
-            
-            stats['throttle_states'][throttle_type.value] = {
-                'enabled': settings['enabled'],
-                'should_throttle': self.should_throttle(throttle_type),
-                'can_update': self.can_update(throttle_type),
-                'fps_limit': settings['fps_limit'],
-                'stroke_threshold': settings['stroke_threshold'],
-                'time_since_last_update': current_time - last_time if last_time > 0 else 0
-            }
-        
-        return stats
-    
+
     def reset_timers(self):
-        """Tüm throttle timer'larını sıfırla"""
-        for throttle_type in ThrottleType:
-            self._last_update_times[throttle_type] = 0
-    
-    def set_performance_mode(self, mode: str):
-        """Performans modunu ayarla"""
-        if mode == "high_performance":
-            # Yüksek performans - daha az throttling
-            self.configure_throttle(ThrottleType.GENERAL, stroke_threshold=200, fps_limit=60)
-            self.configure_throttle(ThrottleType.FREEHAND, stroke_threshold=100, fps_limit=120)
-            self.configure_throttle(ThrottleType.TABLET, stroke_threshold=150, fps_limit=144)
-            
-        elif mode == "balanced":
-            # Dengeli mod - varsayılan ayarlar
-            self.configure_throttle(ThrottleType.GENERAL, stroke_threshold=100, fps_limit=30)
-            self.configure_throttle(ThrottleType.FREEHAND, stroke_threshold=50, fps_limit=60)
-            self.configure_throttle(ThrottleType.TABLET, stroke_threshold=80, fps_limit=90)
-            
-        elif mode == "battery_saver":
-            # Pil tasarrufu - daha fazla throttling
-            self.configure_throttle(ThrottleType.GENERAL, stroke_threshold=50, fps_limit=20)
-            self.configure_throttle(ThrottleType.FREEHAND, stroke_threshold=25, fps_limit=30)
-            self.configure_throttle(ThrottleType.TABLET, stroke_threshold=40, fps_limit=45)
-            
-        elif mode == "no_throttling":
-            # Throttling yok - maksimum kalite
+        """Kare zamanlamasını ve ölçümleri sıfırla"""
+        self._last_flush = 0.0
+        self._frame_times.clear()
+        self._frames_since_adjust = 0
+        self._requests = 0
+        self._flushes = 0
+
+    def _apply_mode(self, mode: str) -> bool:
+        if mode == "no_throttling":
+            # Zamanlayıcı yok - her istek anında çizilir
             self.disable_throttle()
-    
+        elif mode in self.PERFORMANCE_MODES:
+            self.fps_limit = self.PERFORMANCE_MODES[mode]
+            self.enable_throttle()
+        else:
+            return False
+        self.performance_mode = mode
+        return True
+
+    def set_performance_mode(self, mode: str):
+        """Performans modunu ayarla; elle seçilen mod otomatik ayarı kapatır"""
+        if self._apply_mode(mode):
+            self.auto_adjust = False
+
+    def _adjust_to_frame_times(self):
+        stats = self.get_frame_stats()
+        if not stats['frames']:
+            return
+        budget = stats['budget_ms']
+        average = stats['average_ms']
+        if average > budget:
+            # Paint bir kareye sığmıyor - girdiye zaman bırakmak için kare hızını düşür
+            mode = "battery_saver"
+        elif average > budget * 0.5:
+            mode = "balanced"
+        else:
+            mode = "high_performance"
+        if mode != self.performance_mode:
+            self._apply_mode(mode)
+
     def auto_adjust_settings(self):
-        """Sistem performansına göre otomatik ayarlama"""
-        import psutil
-        
-        try:
-            # CPU kullanımı kontrol et
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory_percent = psutil.virtual_memory().percent
-            
-            if cpu_percent > 80 or memory_percent > 85:
-                # Yüksek sistem yükü - daha agresif throttling
-                self.set_performance_mode("battery_saver")
-            elif cpu_percent > 60 or memory_percent > 70:
-                # Orta sistem yükü - dengeli mod
-                self.set_performance_mode("balanced")
-            else:
-                # Düşük sistem yükü - yüksek performans
-                self.set_performance_mode("high_performance")
-                
-        except ImportError:
-            # psutil yoksa varsayılan dengeli moda geç
-            self.set_performance_mode("balanced") 
\ No newline at end of file
+        """Ölçülen paint sürelerine göre performans modunu seç"""
+        self.auto_adjust = True
+        self._adjust_to_frame_times()
@@ -1,57 +1,154 @@
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, pyqtSignal, QPointF
+from PyQt6.QtGui import QColor
+import numpy as np
 import copy
+import enum
+from stroke_points import BOUNDS_KEY, StrokePoints
+from stroke_ids import ensure_stroke_id, get_stroke_id
+
+def _canonical(value):
+    """Fingerprint için değeri hashlenebilir, içerik tabanlı bir yapıya çevir"""
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], QPointF):
+            try:
+                return ('pts',) + tuple(c for p in value for c in (p.x(), p.y()))
+            except AttributeError:
+                pass
+        return tuple(_canonical(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _canonical(item)) for key, item in value.items() if key != BOUNDS_KEY)
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, QPointF):
+        return ('p', value.x(), value.y())
+    if isinstance(value, QColor):
+        return ('c', value.rgba())
+    if isinstance(value, np.ndarray):
+        return ('a', value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, StrokePoints):
+        return ('sp', value.array.tobytes())
+    if isinstance(value, enum.Enum):
+        return (type(value).__name__, value.value)
+    if hasattr(value, 'to_dict'):
+        # ImageStroke gibi nesneler
+        return ('o', type(value).__name__, _canonical(value.to_dict()))
+    # Bilinmeyen tür: repr adres içerebilir, bu durumda stroke sadece
+    # her kayıtta "değişmiş" sayılır (yanlış eşleşme olmaz)
+    return repr(value)
+
+
+def stroke_fingerprint(stroke_data):
+    """Stroke içeriğinin özeti; eşleşme içerik karşılaştırmasıyla doğrulanmalıdır"""
+    return hash(_canonical(stroke_data))
+
+
+def _estimate_stroke_bytes(stroke_data):
+    """Havuzdaki bir stroke kopyasının yaklaşık bellek kullanımı"""
+    size = 512
+    if isinstance(stroke_data, dict):
+        for value in stroke_data.values():
+            if isinstance(value, (list, tuple)):
+                size += 64 * len(value)
+            elif isinstance(value, (np.ndarray, StrokePoints)):
+                size += value.nbytes
+        return size
+    # Resimler: pixmap boyutu baskın
+    try:
+        image_size = stroke_data.size
+        size += int(abs(image_size.x()) * abs(image_size.y()) * 4)
+    except Exception:
+        size += 64 * 1024
+    return size
+
 
 class UndoRedoManager(QObject):
-    """Undo/Redo işlemleri için yönetici sınıf"""
+    """Undo/Redo işlemleri için yönetici sınıf
+
+    Her kayıt tam bir kopya yerine önceki kayda göre katman başına farkı
+    (StrokeDeltaCommand) tutar. Havuz anahtarı (stroke_id, sürüm) çiftidir;
+    bir stroke'un yeni sürümü sadece yeni olduğunda veya değiştiği
+    bildirilip içeriği gerçekten farklı çıktığında kopyalanır ve referans
+    sayısı sıfıra inince atılır. Geçmiş, kayıt sayısı yerine
+    havuzun tahmini bellek kullanımıyla (max_memory_bytes) sınırlanır.
+    """
     
     # Signals
     canUndoChanged = pyqtSignal(bool)
     canRedoChanged = pyqtSignal(bool)
     stateChanged = pyqtSignal()
+
+    DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
     
-    def __init__(self, max_history=50):
+    def __init__(self, max_history=None, max_memory_bytes=None):
         super().__init__()
-        self.max_history = max_history
-        self.history = []  # Geçmiş durumlar
+        self.max_history = max_history  # None: sadece bellek sınırı
+        self.max_memory_bytes = max_memory_bytes or self.DEFAULT_MEMORY_BUDGET
+        self.history = []  # StrokeDeltaCommand listesi, history[0] temel durum
         self.current_index = -1  # Şu anki pozisyon
+        self._pool = {}  # (stroke_id, sürüm) -> [payload, refcount, bytes, özet]
+        self._pool_bytes = 0
+        self._latest = {}  # stroke_id -> (havuz anahtarı, canlı nesnenin id'si)
+        self._revision = 0
+        self._base = None  # history[0] durumunun kimlik görüntüsü
+        self._current = None  # history[current_index] durumunun kimlik görüntüsü
         
-    def save_state(self, strokes_data, description="Action"):
-        """Mevcut durumu kaydet"""
+    def save_state(self, strokes_data, description="Action", changed_ids=None):
+        """Mevcut durumu kaydet
+
+        changed_ids son kayıttan beri değiştiği bildirilen stroke kimlikleridir;
+        None ise tüm stroke'ların içeriği kontrol edilir.
+        """
         # Eğer redo geçmişindeyse, ileri durumları sil
         if self.current_index < len(self.history) - 1:
+            for command in self.history[self.current_index + 1:]:
+                self._release_command(command)
             self.history = self.history[:self.current_index + 1]
-        
-        # Yeni durumu ekle
-        state = {
-            'strokes': copy.deepcopy(strokes_data),
-            'description': description,
-            'timestamp': self._get_timestamp()
-        }
-        
-        self.history.append(state)
+
+        snapshot = self._make_snapshot(strokes_data, changed_ids)
+
+        if self._current is None:
+            # İlk kayıt: temel durum
+            for keys in snapshot['layers'].values():
+                for key in keys:
+                    self._retain(key)
+            self._base = snapshot
+            self._current = _copy_snapshot(snapshot)
+            command = StrokeDeltaCommand({}, None, None, description)
+        else:
+            command = StrokeDeltaCommand.from_snapshots(self._current, snapshot, description)
+            for key in command.referenced_ids():
+                self._retain(key)
+            command.execute(self._current)
+
+        command.timestamp = self._get_timestamp()
+        self.history.append(command)
         self.current_index += 1
-        
-        # Maksimum geçmiş sınırını kontrol et
-        if len(self.history) > self.max_history:
-            self.history.pop(0)
-            self.current_index -= 1
-            
+
+        self._drop_unreferenced()
+        self._enforce_limits()
         self._emit_signals()
-        
-    def undo(self):
-        """Geri al"""
+
+    def undo(self, live_state=None, changed_ids=None):
+        """Geri al
+
+        live_state verilirse (kopyalanmamış export_state) istenen sürümdeki
+        stroke nesneleri yeniden kullanılır, sadece farklı olanlar kopyalanır.
+        changed_ids save_state'teki gibidir.
+        """
         if self.can_undo():
+            self.history[self.current_index].undo(self._current)
             self.current_index -= 1
             self._emit_signals()
-            return self._get_current_state()
+            return self._build_state(self._current, live_state, changed_ids)
         return None
         
-    def redo(self):
+    def redo(self, live_state=None, changed_ids=None):
         """İleri al"""
         if self.can_redo():
             self.current_index += 1
+            self.history[self.current_index].execute(self._current)
             self._emit_signals()
-            return self._get_current_state()
+            return self._build_state(self._current, live_state, changed_ids)
         return None
         
     def can_undo(self):
@@ -66,6 +163,11 @@ class UndoRedoManager(QObject):
         """Geçmişi temizle"""
         self.history.clear()
         self.current_index = -1
+        self._pool.clear()
+        self._pool_bytes = 0
+        self._latest.clear()
+        self._base = None
+        self._current = None
         self._emit_signals()
         
     def get_current_state(self):
@@ -74,9 +176,174 @@ class UndoRedoManager(QObject):
         
     def _get_current_state(self):
         """Internal: şu anki durumu al"""
-        if 0 <= self.current_index < len(self.history):
-            return copy.deepcopy(self.history[self.current_index]['strokes'])
+        if self._current is not None and 0 <= self.current_index < len(self.history):
+            return self._build_state(self._current)
         return []
+
+    # ------------------------------------------------------------------
+    # Kimlik görüntüleri
+    # ------------------------------------------------------------------
+    def _make_snapshot(self, state, changed_ids=None):
+        """Durumu {meta, layers: {layer_id: [havuz anahtarı, ...]}} biçimine çevir
+
+        Havuzda olmayan stroke sürümleri burada (bir kez) kopyalanır.
+        """
+        if isinstance(state, dict) and 'layers' in state:
+            meta = {key: value for key, value in state.items() if key != 'layers'}
+            meta['layers'] = {}
+            layers = {}
+            for layer_id, layer_data in state['layers'].items():
+                meta['layers'][layer_id] = {
+                    key: value for key, value in layer_data.items() if key != 'strokes'
+                }
+                layers[layer_id] = self._intern_strokes(layer_data.get('strokes', []), changed_ids)
+            meta = copy.deepcopy(meta)
+        else:
+            # Eski kullanım: düz stroke listesi
+            meta = None
+            layers = {None: self._intern_strokes(state or [], changed_ids)}
+        return {'meta': meta, 'layers': layers}
+
+    def _known_version(self, stroke_data, stroke_id, changed_ids):
+        """Canlı stroke havuzdaki son sürümüyle aynıysa o sürümün anahtarını döndür
+
+        Aynı nesne olup değiştiği bildirilmemişse içerik hiç incelenmez; aksi
+        halde özet ve ardından tam içerik karşılaştırılır. İkinci değer
+        hesaplandıysa içeriğin özetidir.
+        """
+        latest = self._latest.get(stroke_id)
+        entry = self._pool.get(latest[0]) if latest is not None else None
+        if entry is not None and latest[1] == id(stroke_data) and changed_ids is not None \
+                and stroke_id not in changed_ids:
+            return latest[0], None
+        canonical = _canonical(stroke_data)
+        digest = hash(canonical)
+        if entry is not None and entry[3] == digest and _canonical(entry[0]) == canonical:
+            return latest[0], digest
+        return None, digest
+
+    def _intern_strokes(self, strokes, changed_ids=None):
+        keys = []
+        for stroke_data in strokes:
+            stroke_id = ensure_stroke_id(stroke_data)
+            key, digest = self._known_version(stroke_data, stroke_id, changed_ids)
+            if key is None:
+                # Referans sayısı 0 ile eklenir; kullanılmazsa _drop_unreferenced atar
+                self._revision += 1
+                key = (stroke_id, self._revision)
+                payload = copy.deepcopy(stroke_data)
+                size = _estimate_stroke_bytes(payload)
+                self._pool[key] = [payload, 0, size, digest]
+                self._pool_bytes += size
+            self._latest[stroke_id] = (key, id(stroke_data))
+            keys.append(key)
+        return keys
+
+    def _build_state(self, snapshot, live_state=None, changed_ids=None):
+        """Kimlik görüntüsünden yeni (sahiplenilebilir) bir durum oluştur"""
+        reusable = {}
+        if live_state is not None:
+            if isinstance(live_state, dict) and 'layers' in live_state:
+                live_layers = [layer.get('strokes', []) for layer in live_state['layers'].values()]
+            else:
+                live_layers = [live_state]
+            wanted = {key[0] for keys in snapshot['layers'].values() for key in keys}
+            for strokes in live_layers:
+                for stroke_data in strokes:
+                    stroke_id = get_stroke_id(stroke_data)
+                    if stroke_id not in wanted:
+                        continue
+                    key, _ = self._known_version(stroke_data, stroke_id, changed_ids)
+                    if key is not None:
+                        reusable.setdefault(key, []).append(stroke_data)
+
+        def resolve(key):
+            candidates = reusable.get(key)
+            stroke_data = candidates.pop() if candidates else copy.deepcopy(self._pool[key][0])
+            self._latest[key[0]] = (key, id(stroke_data))
+            return stroke_data
+
+        meta = snapshot['meta']
+        if meta is None:
+            return [resolve(key) for key in snapshot['layers'].get(None, [])]
+
+        state = copy.deepcopy(meta)
+        for layer_id, layer_meta in state['layers'].items():
+            layer_meta['strokes'] = [
+                resolve(key) for key in snapshot['layers'].get(layer_id, [])
+            ]
+        return state
+
+    # ------------------------------------------------------------------
+    # Havuz ve bellek bütçesi
+    # ------------------------------------------------------------------
+    def _retain(self, key):
+        self._pool[key][1] += 1
+
+    def _release(self, key):
+        entry = self._pool.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            self._discard(key)
+
+    def _discard(self, key):
+        self._pool_bytes -= self._pool.pop(key)[2]
+        latest = self._latest.get(key[0])
+        if latest is not None and latest[0] == key:
+            del self._latest[key[0]]
+
+    def _release_command(self, command):
+        for key in command.referenced_ids():
+            self._release(key)
+
+    def _drop_unreferenced(self):
+        for key in [key for key, entry in self._pool.items() if entry[1] <= 0]:
+            self._discard(key)
+
+    def _enforce_limits(self):
+        """Bütçe aşılırsa en eski kayıtları temel duruma kat
+
+        Bütçeye sadece geri alma için tutulan içerik sayılır; o anki durumda
+        kullanılan stroke'lar zaten sayfada bulunur. Bütçe ne kadar küçük
+        olursa olsun son işlem geri alınabilir kalır.
+        """
+        while self.current_index > 0 and self.max_history is not None and len(self.history) > self.max_history:
+            self._drop_oldest()
+        while self.current_index > 1 and self._history_bytes() > self.max_memory_bytes:
+            self._drop_oldest()
+
+    def _history_bytes(self):
+        current_ids = set()
+        for keys in self._current['layers'].values():
+            current_ids.update(keys)
+        current_bytes = sum(self._pool[key][2] for key in current_ids if key in self._pool)
+        return self._pool_bytes - current_bytes
+
+    def get_memory_usage(self):
+        """Geri alma geçmişinin tahmini bellek kullanımı (byte)"""
+        if self._current is None:
+            return 0
+        return self._history_bytes()
+
+    def _drop_oldest(self):
+        """history[1]'i temel duruma uygula ve history[0]'ı at"""
+        old_base_ids = [
+            key for keys in self._base['layers'].values() for key in keys
+        ]
+        command = self.history[1]
+        command.execute(self._base)
+        for keys in self._base['layers'].values():
+            for key in keys:
+                self._retain(key)
+        for key in old_base_ids:
+            self._release(key)
+        self._release_command(command)
+        command.clear()
+
+        self.history.pop(0)
+        self.current_index -= 1
         
     def _emit_signals(self):
         """Sinyalleri yayınla"""
@@ -92,23 +359,30 @@ class UndoRedoManager(QObject):
     def get_history_info(self):
         """Geçmiş bilgilerini al (debug için)"""
         info = []
-        for i, state in enumerate(self.history):
+        for i, command in enumerate(self.history):
             marker = " -> " if i == self.current_index else "    "
-            info.append(f"{marker}{i}: {state['description']} ({state['timestamp']})")
+            info.append(f"{marker}{i}: {command.description} ({command.timestamp})")
         return "\n".join(info)
         
     def get_undo_description(self):
         """Undo edilecek işlemin açıklamasını al"""
         if self.can_undo():
-            return self.history[self.current_index]['description']
+            return self.history[self.current_index].description
         return ""
         
     def get_redo_description(self):
         """Redo edilecek işlemin açıklamasını al"""
         if self.can_redo():
-            return self.history[self.current_index + 1]['description']
+            return self.history[self.current_index + 1].description
         return ""
 
+
+def _copy_snapshot(snapshot):
+    return {
+        'meta': snapshot['meta'],
+        'layers': {layer_id: list(ids) for layer_id, ids in snapshot['layers'].items()},
+    }
+
 class Command:
     """Command pattern için base class"""
     def __init__(self, description="Command"):
@@ -122,57 +396,91 @@ class Command:
         """Komutu geri al"""
         raise NotImplementedError
 
-class AddStrokeCommand(Command):
-    """Stroke ekleme komutu"""
-    def __init__(self, drawing_widget, stroke_data):
-        super().__init__(f"Add {stroke_data.get('type', 'stroke')}")
-        self.drawing_widget = drawing_widget
-        self.stroke_data = stroke_data
-        
-    def execute(self):
-        """Stroke'u ekle"""
-        self.drawing_widget.strokes.append(self.stroke_data)
-        self.drawing_widget.update()
-        
-    def undo(self):
-        """Stroke'u kaldır"""
-        if self.stroke_data in self.drawing_widget.strokes:
-            self.drawing_widget.strokes.remove(self.stroke_data)
-            self.drawing_widget.update()
-
-class ClearAllCommand(Command):
-    """Tümünü temizle komutu"""
-    def __init__(self, drawing_widget):
-        super().__init__("Clear all")
-        self.drawing_widget = drawing_widget
-        self.saved_state = copy.deepcopy(drawing_widget.layer_manager.export_state())
+class StrokeDeltaCommand(Command):
+    """İki kayıt arasındaki farkı tutan komut
 
-    def execute(self):
-        """Tümünü temizle"""
-        self.drawing_widget.layer_manager.clear_all()
-        self.drawing_widget.update()
+    layer_deltas: {layer_id: (start, before_ids, after_ids, existed_before, exists_after)}
+    Bir katmanın stroke kimlik listesinde [start, start+len(before_ids))
+    aralığı after_ids ile değiştirilir; eklenen, silinen ve değiştirilen
+    stroke'lar bu aralığa düşer. İçerikler UndoRedoManager havuzundadır.
+    """
+    def __init__(self, layer_deltas, meta_before, meta_after, description="Action"):
+        super().__init__(description)
+        self.layer_deltas = layer_deltas
+        self.meta_before = meta_before
+        self.meta_after = meta_after
+        self.timestamp = ""
 
-    def undo(self):
-        """Stroke'ları geri getir"""
-        self.drawing_widget.layer_manager.import_state(copy.deepcopy(self.saved_state))
-        self.drawing_widget.update()
-
-class DeleteStrokeCommand(Command):
-    """Stroke silme komutu"""
-    def __init__(self, drawing_widget, stroke_index):
-        super().__init__("Delete stroke")
-        self.drawing_widget = drawing_widget
-        self.stroke_index = stroke_index
-        self.deleted_stroke = None
-        
-    def execute(self):
-        """Stroke'u sil"""
-        if 0 <= self.stroke_index < len(self.drawing_widget.strokes):
-            self.deleted_stroke = self.drawing_widget.strokes.pop(self.stroke_index)
-            self.drawing_widget.update()
-            
-    def undo(self):
-        """Stroke'u geri ekle"""
-        if self.deleted_stroke is not None:
-            self.drawing_widget.strokes.insert(self.stroke_index, self.deleted_stroke)
-            self.drawing_widget.update()
+    @classmethod
+    def from_snapshots(cls, old_snapshot, new_snapshot, description="Action"):
+        """İki kimlik görüntüsü arasındaki farktan komut oluştur"""
+        old_layers = old_snapshot['layers']
+        new_layers = new_snapshot['layers']
+        layer_deltas = {}
+        for layer_id in list(old_layers.keys()) + [key for key in new_layers if key not in old_layers]:
+            before = old_layers.get(layer_id)
+            after = new_layers.get(layer_id)
+            if before == after:
+                continue
+            before_ids = before or []
+            after_ids = after or []
+
+            # Ortak baş ve son kısımları atla
+            start = 0
+            limit = min(len(before_ids), len(after_ids))
+            while start < limit and before_ids[start] == after_ids[start]:
+                start += 1
+            end_before = len(before_ids)
+            end_after = len(after_ids)
+            while (end_before > start and end_after > start
+                   and before_ids[end_before - 1] == after_ids[end_after - 1]):
+                end_before -= 1
+                end_after -= 1
+
+            layer_deltas[layer_id] = (
+                start,
+                before_ids[start:end_before],
+                after_ids[start:end_after],
+                before is not None,
+                after is not None,
+            )
+
+        meta_after = new_snapshot['meta']
+        if meta_after == old_snapshot['meta']:
+            meta_after = old_snapshot['meta']
+        return cls(layer_deltas, old_snapshot['meta'], meta_after, description)
+
+    def referenced_ids(self):
+        """Bu komutun havuzda tuttuğu stroke kimlikleri"""
+        for _, before_ids, after_ids, _, _ in self.layer_deltas.values():
+            yield from before_ids
+            yield from after_ids
+
+    def execute(self, snapshot):
+        """Farkı ileri yönde uygula"""
+        for layer_id, (start, before_ids, after_ids, _, exists_after) in self.layer_deltas.items():
+            self._apply(snapshot, layer_id, start, before_ids, after_ids, exists_after)
+        if self.meta_after is not None:
+            snapshot['meta'] = self.meta_after
+
+    def undo(self, snapshot):
+        """Farkı geri yönde uygula"""
+        for layer_id, (start, before_ids, after_ids, existed_before, _) in self.layer_deltas.items():
+            self._apply(snapshot, layer_id, start, after_ids, before_ids, existed_before)
+        if self.meta_before is not None:
+            snapshot['meta'] = self.meta_before
+
+    def clear(self):
+        """Temel duruma katılan komutun farklarını bırak"""
+        self.layer_deltas = {}
+        self.meta_before = None
+        self.meta_after = None
+
+    @staticmethod
+    def _apply(snapshot, layer_id, start, old_ids, new_ids, keep_layer):
+        layers = snapshot['layers']
+        if not keep_layer:
+            layers.pop(layer_id, None)
+            return
+        stroke_ids = layers.get(layer_id, [])
+        layers[layer_id] = stroke_ids[:start] + list(new_ids) + stroke_ids[start + len(old_ids):]